@@ -0,0 +1,52 @@
+"""add insider signals table
+
+Revision ID: 20261019_0100_004
+Revises: 20260129_0100_003
+Create Date: 2026-10-19 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019_0100_004'
+down_revision: Union[str, None] = '20260129_0100_003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create insider_signals table
+    op.create_table(
+        'insider_signals',
+        sa.Column('stock_code', sa.String(length=10), nullable=False),
+        sa.Column('as_of_date', sa.Date(), nullable=False),
+        sa.Column('last_rcept_dt', sa.Date(), nullable=True),
+        sa.Column('net_shares_30d', sa.BigInteger(), nullable=False),
+        sa.Column('net_shares_90d', sa.BigInteger(), nullable=False),
+        sa.Column('net_shares_180d', sa.BigInteger(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.Column('buy_count', sa.Integer(), nullable=False),
+        sa.Column('sell_count', sa.Integer(), nullable=False),
+        sa.Column('distinct_buyers_90d', sa.Integer(), nullable=False),
+        sa.Column('largest_holder', sa.String(length=100), nullable=True),
+        sa.Column('largest_holding_rate', sa.Numeric(precision=10, scale=4), nullable=True),
+        sa.Column('recent_trend', sa.String(length=10), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['stock_code'], ['stocks.code'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('stock_code'),
+    )
+    op.create_index('ix_insider_signals_as_of_date', 'insider_signals', ['as_of_date'], unique=False)
+    op.create_index('ix_insider_signals_net_shares_90d', 'insider_signals', ['net_shares_90d'], unique=False)
+    op.create_index('ix_insider_signals_distinct_buyers_90d', 'insider_signals', ['distinct_buyers_90d'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_insider_signals_distinct_buyers_90d', table_name='insider_signals')
+    op.drop_index('ix_insider_signals_net_shares_90d', table_name='insider_signals')
+    op.drop_index('ix_insider_signals_as_of_date', table_name='insider_signals')
+    op.drop_table('insider_signals')
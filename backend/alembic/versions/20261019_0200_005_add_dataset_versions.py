@@ -0,0 +1,47 @@
+"""add dataset versions table
+
+Revision ID: 20261019_0200_005
+Revises: 20261019_0100_004
+Create Date: 2026-10-19 02:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019_0200_005'
+down_revision: Union[str, None] = '20261019_0100_004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DATASETS = ['stocks', 'prices', 'financial_metrics', 'value_scores', 'insider']
+
+
+def upgrade() -> None:
+    # Create dataset_versions table
+    dataset_versions = op.create_table(
+        'dataset_versions',
+        sa.Column('dataset', sa.String(length=32), nullable=False),
+        sa.Column('epoch', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('dataset'),
+    )
+
+    # Seed one row per dataset so bumps are plain UPDATEs
+    now = datetime.utcnow()
+    op.bulk_insert(
+        dataset_versions,
+        [
+            {'dataset': name, 'epoch': 0, 'created_at': now, 'updated_at': now}
+            for name in DATASETS
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dataset_versions')
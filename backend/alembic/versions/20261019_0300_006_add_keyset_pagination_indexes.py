@@ -0,0 +1,42 @@
+"""add keyset pagination indexes
+
+Revision ID: 20261019_0300_006
+Revises: 20261019_0200_005
+Create Date: 2026-10-19 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019_0300_006'
+down_revision: Union[str, None] = '20261019_0200_005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (created_at, id) / (run, rank, id) keys for cursor pagination
+    op.create_index(
+        'ix_backtest_runs_created_at_id', 'backtest_runs', ['created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_backtest_recommendations_run_rank',
+        'backtest_recommendations',
+        ['backtest_run_id', 'recommendation_rank', 'id'],
+        unique=False,
+    )
+
+    # Epoch row for the backtests dataset (a run may already have inserted it)
+    op.execute(
+        "INSERT INTO dataset_versions (dataset, epoch, created_at, updated_at) "
+        "SELECT 'backtests', 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+        "WHERE NOT EXISTS (SELECT 1 FROM dataset_versions WHERE dataset = 'backtests')"
+    )
+
+def downgrade() -> None:
+    op.execute("DELETE FROM dataset_versions WHERE dataset = 'backtests'")
+    op.drop_index('ix_backtest_recommendations_run_rank', table_name='backtest_recommendations')
+    op.drop_index('ix_backtest_runs_created_at_id', table_name='backtest_runs')
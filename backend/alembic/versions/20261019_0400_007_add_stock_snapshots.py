@@ -0,0 +1,120 @@
+"""add stock snapshots table
+
+Revision ID: 20261019_0400_007
+Revises: 20261019_0300_006
+Create Date: 2026-10-19 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019_0400_007'
+down_revision: Union[str, None] = '20261019_0300_006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+METRIC_COLUMNS = (
+    'per', 'pbr', 'psr', 'ev_ebitda', 'roe', 'roa', 'operating_margin', 'net_profit_growth',
+    'debt_ratio', 'current_ratio', 'interest_coverage', 'operating_cashflow', 'dividend_yield',
+    'dividend_payout_ratio', 'consecutive_dividend_years',
+)
+SCORE_COLUMNS = (
+    'total_score', 'valuation_score', 'profitability_score', 'stability_score', 'dividend_score',
+    'upside_potential', 'ai_summary', 'strengths', 'risks',
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stock_snapshots',
+        sa.Column('stock_code', sa.String(length=10), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('market', sa.String(length=20), nullable=False),
+        sa.Column('sector', sa.String(length=50), nullable=True),
+        sa.Column('market_cap', sa.BigInteger(), nullable=True),
+        sa.Column('current_price', sa.Integer(), nullable=True),
+        sa.Column('change_rate', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('metrics_date', sa.Date(), nullable=True),
+        sa.Column('per', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('pbr', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('psr', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('ev_ebitda', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('roe', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('roa', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('operating_margin', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('net_profit_growth', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('debt_ratio', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('current_ratio', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('interest_coverage', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('operating_cashflow', sa.BigInteger(), nullable=True),
+        sa.Column('dividend_yield', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('dividend_payout_ratio', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('consecutive_dividend_years', sa.Integer(), nullable=True),
+        sa.Column('score_date', sa.Date(), nullable=True),
+        sa.Column('total_score', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('valuation_score', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('profitability_score', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('stability_score', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('dividend_score', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('upside_potential', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('ai_summary', sa.Text(), nullable=True),
+        sa.Column('strengths', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('risks', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('previous_score_date', sa.Date(), nullable=True),
+        sa.Column('previous_total_score', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('total_score_change', sa.Numeric(precision=6, scale=2), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['stock_code'], ['stocks.code'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('stock_code'),
+    )
+    op.create_index(
+        'ix_stock_snapshots_score_date_total', 'stock_snapshots', ['score_date', 'total_score'], unique=False
+    )
+    op.create_index('ix_stock_snapshots_market', 'stock_snapshots', ['market'], unique=False)
+
+    # Backfill from the existing rows; the next scoring run rebuilds it anyway
+    metrics = ', '.join(f'm.{name}' for name in METRIC_COLUMNS)
+    scores = ', '.join(f's.{name}' for name in SCORE_COLUMNS)
+    op.execute(
+        f"""
+        INSERT INTO stock_snapshots (
+            stock_code, name, market, sector, market_cap, current_price, change_rate, updated_at,
+            metrics_date, {', '.join(METRIC_COLUMNS)},
+            score_date, {', '.join(SCORE_COLUMNS)},
+            previous_score_date, previous_total_score, total_score_change, refreshed_at
+        )
+        SELECT
+            st.code, st.name, st.market, st.sector, st.market_cap, st.current_price,
+            st.change_rate, st.updated_at,
+            m.date, {metrics},
+            s.date, {scores},
+            p.date, p.total_score, s.total_score - p.total_score, CURRENT_TIMESTAMP
+        FROM stocks st
+        LEFT JOIN (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY date DESC) AS recency
+            FROM value_scores
+        ) s ON s.stock_code = st.code AND s.recency = 1
+        LEFT JOIN (
+            SELECT stock_code, date, total_score,
+                   ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY date DESC) AS recency
+            FROM value_scores
+        ) p ON p.stock_code = st.code AND p.recency = 2
+        LEFT JOIN (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY date DESC) AS recency
+            FROM financial_metrics
+        ) m ON m.stock_code = st.code AND m.recency = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stock_snapshots_market', table_name='stock_snapshots')
+    op.drop_index('ix_stock_snapshots_score_date_total', table_name='stock_snapshots')
+    op.drop_table('stock_snapshots')
@@ -0,0 +1,43 @@
+"""add historical lookup indexes
+
+Revision ID: 20261019_0500_008
+Revises: 20261019_0400_007
+Create Date: 2026-10-19 05:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019_0500_008'
+down_revision: Union[str, None] = '20261019_0400_007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (stock, date) keys for the backtest's latest-row-on-or-before lookups
+    op.create_index(
+        'ix_historical_stock_prices_stock_code_date',
+        'historical_stock_prices',
+        ['stock_code', 'date'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_historical_financial_metrics_stock_code_snapshot_date',
+        'historical_financial_metrics',
+        ['stock_code', 'snapshot_date'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_historical_financial_metrics_stock_code_snapshot_date',
+        table_name='historical_financial_metrics',
+    )
+    op.drop_index(
+        'ix_historical_stock_prices_stock_code_date', table_name='historical_stock_prices'
+    )
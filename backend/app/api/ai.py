@@ -1,9 +1,10 @@
 """AI API routes"""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.core.profiling import ProfiledRoute
+from app.db.database import get_async_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.schemas.ai import (
@@ -13,10 +14,12 @@ from app.schemas.ai import (
     AIChatResponse,
     StrategyRequest,
     StrategyResponse,
+    StrategyType,
 )
 from app.services.ai_service import ai_service
+from app.services.insider_signal_service import InsiderSignalService
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("/status")
@@ -32,7 +35,6 @@ async def ai_status():
 async def analyze_stock(
     request: StockAnalysisRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
     """
     Generate AI-powered stock analysis
@@ -58,7 +60,6 @@ async def analyze_stock(
 async def chat(
     request: AIChatRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
     """
     AI chatbot for investment Q&A
@@ -84,7 +85,7 @@ async def chat(
 async def execute_strategy(
     request: StrategyRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Execute AI-powered trading strategy analysis
@@ -102,8 +103,30 @@ async def execute_strategy(
             detail="AI service not available. Please configure GEMINI_API_KEY.",
         )
 
+    # Ground the insider strategy in actual DART filings
+    insider_signals = None
+    if request.strategyType == StrategyType.INSIDER_TRADING:
+        top_buying = await db.run_sync(
+            lambda session: InsiderSignalService(session).get_top_buying(
+                market=request.market, limit=request.stockCount * 3
+            )
+        )
+        insider_signals = [
+            {
+                "stock_code": stock.code,
+                "stock_name": stock.name,
+                "market": stock.market,
+                "net_shares_30d": signal.net_shares_30d,
+                "net_shares_90d": signal.net_shares_90d,
+                "net_shares_180d": signal.net_shares_180d,
+                "distinct_buyers_90d": signal.distinct_buyers_90d,
+                "largest_holder": signal.largest_holder,
+            }
+            for signal, stock in top_buying
+        ]
+
     try:
-        return await ai_service.execute_strategy(request)
+        return await ai_service.execute_strategy(request, insider_signals)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -3,12 +3,17 @@ API endpoints for backtesting functionality.
 """
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from app.db.database import get_db
+from app.core.http_cache import ConditionalGet
+from app.core.pagination import decode_cursor, encode_cursor, set_page_headers
+from app.core.profiling import ProfiledRoute
+from app.db.database import get_async_db, get_db
 from app.models.backtest import BacktestRecommendation, BacktestRun, BacktestStatus
 from app.schemas.backtest import (
     BacktestCreateRequest,
@@ -19,11 +24,15 @@ from app.schemas.backtest import (
 )
 from app.services.backtest_analytics import BacktestAnalytics
 from app.services.backtest_engine import BacktestEngine
+from app.services.dataset_epochs import BACKTESTS, DatasetEpochs, version_token
 from app.services.historical_data_service import HistoricalDataService
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/backtest", tags=["backtest"])
+router = APIRouter(prefix="/api/backtest", tags=["backtest"], route_class=ProfiledRoute)
+
+# Analytics only change when a run is created, changes status or is deleted
+analytics_cache = ConditionalGet(BACKTESTS)
 
 
 def backtest_to_summary(bt: BacktestRun) -> BacktestRunSummary:
@@ -122,6 +131,7 @@ async def create_single_backtest(
     try:
         backtest = BacktestRun(**backtest_data.model_dump())
         db.add(backtest)
+        DatasetEpochs(db).bump(BACKTESTS)
         db.commit()
         db.refresh(backtest)
 
@@ -137,47 +147,113 @@ async def create_single_backtest(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _page_total(
+    db: AsyncSession, query: Select, position: Dict[str, Any], scope: str
+) -> Tuple[int, str]:
+    """
+    Total row count for X-Total-Count, and the token to carry it in cursors
+
+    The first page counts; later pages reuse the count from the cursor until
+    a backtest run is created, updated or deleted (the backtests epoch).
+
+    Args:
+        db: Database session
+        query: Filtered query before keyset conditions
+        position: Decoded cursor ({} on the first page)
+        scope: Filters the count applies to
+
+    Returns:
+        (total_count, token)
+    """
+    epochs = await db.run_sync(lambda session: DatasetEpochs(session).current(BACKTESTS))
+    token = f"{version_token(epochs)}:{scope}"
+    total = position.get("total")
+    if position.get("total_token") == token and isinstance(total, int):
+        return total, token
+    return await db.scalar(select(func.count()).select_from(query.subquery())), token
+
+
 @router.get("/runs", response_model=List[BacktestRunSummary])
 async def list_backtests(
+    request: Request,
+    response: Response,
     strategy_type: Optional[str] = None,
     market: Optional[str] = None,
     status: Optional[BacktestStatus] = None,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=200),
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    List backtest runs with optional filters.
+    List backtest runs with optional filters, newest first.
+
+    Pages are keyset-paginated on (created_at, id): pass the X-Next-Cursor
+    header (or follow the Link header) as `cursor` for the next page.
+    X-Total-Count carries the number of matching runs.
 
     Args:
         strategy_type: Filter by strategy type
         market: Filter by market
         status: Filter by status
         limit: Maximum number of results
-        offset: Offset for pagination
+        offset: Offset for pagination (deprecated; ignored with a cursor)
+        cursor: Cursor from the previous page
         db: Database session
 
     Returns:
         List of backtest run summaries
     """
-    query = db.query(BacktestRun)
+    query = select(BacktestRun)
 
     if strategy_type:
-        query = query.filter(BacktestRun.strategy_type == strategy_type)
+        query = query.where(BacktestRun.strategy_type == strategy_type)
 
     if market:
-        query = query.filter(BacktestRun.market == market)
+        query = query.where(BacktestRun.market == market)
 
     if status:
-        query = query.filter(BacktestRun.status == status)
+        query = query.where(BacktestRun.status == status)
 
-    backtests = query.order_by(BacktestRun.created_at.desc()).offset(offset).limit(limit).all()
+    position = decode_cursor(cursor) if cursor else {}
+    total_count, total_token = await _page_total(
+        db, query, position, f"{strategy_type}:{market}:{status and status.value}"
+    )
+
+    page = query.order_by(BacktestRun.created_at.desc(), BacktestRun.id.desc())
+    if cursor:
+        try:
+            last_created_at = datetime.fromisoformat(position["created_at"])
+            last_id = int(position["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page = page.where(
+            tuple_(BacktestRun.created_at, BacktestRun.id) < tuple_(last_created_at, last_id)
+        )
+    elif offset:
+        page = page.offset(offset)
+
+    backtests = (await db.scalars(page.limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(backtests) > limit:
+        backtests = backtests[:limit]
+        last = backtests[-1]
+        next_cursor = encode_cursor(
+            {
+                "created_at": last.created_at.isoformat(),
+                "id": last.id,
+                "total": total_count,
+                "total_token": total_token,
+            }
+        )
+    set_page_headers(request, response, total_count, next_cursor)
 
     return [backtest_to_summary(bt) for bt in backtests]
 
 
 @router.get("/runs/{backtest_id}", response_model=BacktestRunSchema)
-async def get_backtest_detail(backtest_id: int, db: Session = Depends(get_db)):
+async def get_backtest_detail(backtest_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get detailed information about a specific backtest run.
 
@@ -188,7 +264,11 @@ async def get_backtest_detail(backtest_id: int, db: Session = Depends(get_db)):
     Returns:
         Detailed backtest run with recommendations
     """
-    backtest = db.query(BacktestRun).filter(BacktestRun.id == backtest_id).first()
+    backtest = await db.scalar(
+        select(BacktestRun)
+        .where(BacktestRun.id == backtest_id)
+        .options(selectinload(BacktestRun.recommendations))
+    )
 
     if not backtest:
         raise HTTPException(status_code=404, detail="Backtest run not found")
@@ -199,31 +279,65 @@ async def get_backtest_detail(backtest_id: int, db: Session = Depends(get_db)):
 @router.get("/runs/{backtest_id}/recommendations", response_model=List[BacktestRecommendationSchema])
 async def get_backtest_recommendations(
     backtest_id: int,
-    limit: int = 100,
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Get recommendations from a specific backtest run.
+    Get recommendations from a specific backtest run, best rank first.
+
+    Keyset-paginated on (recommendation_rank, id) like GET /runs.
 
     Args:
         backtest_id: ID of backtest run
         limit: Maximum number of results
-        offset: Offset for pagination
+        offset: Offset for pagination (deprecated; ignored with a cursor)
+        cursor: Cursor from the previous page
         db: Database session
 
     Returns:
         List of backtest recommendations
     """
-    recommendations = (
-        db.query(BacktestRecommendation)
-        .filter(BacktestRecommendation.backtest_run_id == backtest_id)
-        .order_by(BacktestRecommendation.recommendation_rank)
-        .offset(offset)
-        .limit(limit)
-        .all()
+    query = select(BacktestRecommendation).where(
+        BacktestRecommendation.backtest_run_id == backtest_id
     )
 
+    position = decode_cursor(cursor) if cursor else {}
+    total_count, total_token = await _page_total(db, query, position, str(backtest_id))
+
+    page = query.order_by(BacktestRecommendation.recommendation_rank, BacktestRecommendation.id)
+    if cursor:
+        try:
+            last_rank = int(position["rank"])
+            last_id = int(position["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page = page.where(
+            tuple_(BacktestRecommendation.recommendation_rank, BacktestRecommendation.id)
+            > tuple_(last_rank, last_id)
+        )
+    elif offset:
+        page = page.offset(offset)
+
+    recommendations = (await db.scalars(page.limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(recommendations) > limit:
+        recommendations = recommendations[:limit]
+        last = recommendations[-1]
+        next_cursor = encode_cursor(
+            {
+                "rank": last.recommendation_rank,
+                "id": last.id,
+                "total": total_count,
+                "total_token": total_token,
+            }
+        )
+    set_page_headers(request, response, total_count, next_cursor)
+
     return recommendations
 
 
@@ -279,17 +393,18 @@ async def delete_backtest(backtest_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Backtest run not found")
 
     db.delete(backtest)
+    DatasetEpochs(db).bump(BACKTESTS)
     db.commit()
 
     logger.info(f"Deleted backtest run {backtest_id}")
     return {"message": f"Backtest {backtest_id} deleted successfully"}
 
 
-@router.get("/analytics/compare")
+@router.get("/analytics/compare", dependencies=[Depends(analytics_cache)])
 async def compare_strategies(
     strategy_types: Optional[str] = None,
     market: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Compare performance across different strategies.
@@ -302,17 +417,23 @@ async def compare_strategies(
     Returns:
         Strategy comparison data
     """
-    analytics = BacktestAnalytics(db)
-
     strategy_list = strategy_types.split(",") if strategy_types else None
 
-    comparison = analytics.compare_strategies(strategy_types=strategy_list, market=market)
+    comparison = await db.run_sync(
+        lambda session: BacktestAnalytics(session).compare_strategies(
+            strategy_types=strategy_list, market=market
+        )
+    )
 
     return comparison
 
 
-@router.get("/analytics/runs/{backtest_id}/patterns")
-async def analyze_recommendation_patterns(backtest_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/analytics/runs/{backtest_id}/patterns", dependencies=[Depends(analytics_cache)]
+)
+async def analyze_recommendation_patterns(
+    backtest_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """
     Analyze patterns in recommendations from a backtest run.
 
@@ -323,17 +444,18 @@ async def analyze_recommendation_patterns(backtest_id: int, db: Session = Depend
     Returns:
         Pattern analysis data
     """
-    analytics = BacktestAnalytics(db)
-    patterns = analytics.analyze_recommendation_patterns(backtest_id)
+    patterns = await db.run_sync(
+        lambda session: BacktestAnalytics(session).analyze_recommendation_patterns(backtest_id)
+    )
 
     return patterns
 
 
-@router.get("/analytics/time-series")
+@router.get("/analytics/time-series", dependencies=[Depends(analytics_cache)])
 async def get_time_series_performance(
     strategy_type: Optional[str] = None,
     market: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get time series of backtest performance over time.
@@ -346,16 +468,17 @@ async def get_time_series_performance(
     Returns:
         Time series performance data
     """
-    analytics = BacktestAnalytics(db)
-    time_series = analytics.get_time_series_performance(
-        strategy_type=strategy_type, market=market
+    time_series = await db.run_sync(
+        lambda session: BacktestAnalytics(session).get_time_series_performance(
+            strategy_type=strategy_type, market=market
+        )
     )
 
     return time_series
 
 
-@router.get("/analytics/summary")
-async def get_summary_statistics(db: Session = Depends(get_db)):
+@router.get("/analytics/summary", dependencies=[Depends(analytics_cache)])
+async def get_summary_statistics(db: AsyncSession = Depends(get_async_db)):
     """
     Get overall summary statistics for all backtests.
 
@@ -365,15 +488,16 @@ async def get_summary_statistics(db: Session = Depends(get_db)):
     Returns:
         Summary statistics
     """
-    analytics = BacktestAnalytics(db)
-    summary = analytics.get_summary_statistics()
+    summary = await db.run_sync(
+        lambda session: BacktestAnalytics(session).get_summary_statistics()
+    )
 
     return summary
 
 
-@router.get("/analytics/stock-frequency")
+@router.get("/analytics/stock-frequency", dependencies=[Depends(analytics_cache)])
 async def get_stock_frequency_analysis(
-    min_occurrences: int = 2, db: Session = Depends(get_db)
+    min_occurrences: int = 2, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Find stocks that appear frequently across multiple backtests.
@@ -385,8 +509,11 @@ async def get_stock_frequency_analysis(
     Returns:
         Stock frequency analysis
     """
-    analytics = BacktestAnalytics(db)
-    frequency = analytics.get_stock_frequency_analysis(min_occurrences=min_occurrences)
+    frequency = await db.run_sync(
+        lambda session: BacktestAnalytics(session).get_stock_frequency_analysis(
+            min_occurrences=min_occurrences
+        )
+    )
 
     return {"frequent_stocks": frequency}
 
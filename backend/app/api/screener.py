@@ -1,20 +1,37 @@
 """Stock Screener API routes"""
 
-from typing import Dict, Any
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
 
+from app.core.dependencies import get_current_user
+from app.core.http_cache import ConditionalGet
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.profiling import ProfiledRoute
 from app.db.database import get_db
-from app.models.stock import Stock
-from app.models.value_score import ValueScore
-from app.models.financial_metrics import FinancialMetrics
-from app.schemas.stock import ScreenerRequest, ScreenerResponse, ScreenerResult
-
-router = APIRouter()
-
-
-@router.post("", response_model=ScreenerResponse)
+from app.models.screener_filter import ScreenerFilter
+from app.models.user import User
+from app.schemas.stock import (
+    SavedScreenResult,
+    ScreenerRequest,
+    ScreenerResponse,
+    ScreenerResult,
+)
+from app.services.dataset_epochs import FINANCIAL_METRICS, PRICES, STOCKS, VALUE_SCORES
+from app.services.saved_screens import SavedScreenService
+from app.services.screener_engine import (
+    DEFAULT_SORT,
+    NUMERIC_FIELDS,
+    compile_filters,
+    get_snapshot,
+    parse_sort,
+)
+
+router = APIRouter(route_class=ProfiledRoute)
+
+screener_cache = ConditionalGet(STOCKS, PRICES, FINANCIAL_METRICS, VALUE_SCORES)
+
+
+@router.post("", response_model=ScreenerResponse, dependencies=[Depends(screener_cache)])
 def screen_stocks(
     request: ScreenerRequest,
     db: Session = Depends(get_db),
@@ -23,113 +40,98 @@ def screen_stocks(
 
     filters = request.filters
 
-    # Get latest date for value scores and financial metrics
-    latest_value_score_date = db.query(ValueScore.date).order_by(desc(ValueScore.date)).first()
-    latest_financial_date = db.query(FinancialMetrics.date).order_by(desc(FinancialMetrics.date)).first()
-
-    if not latest_value_score_date or not latest_financial_date:
-        return ScreenerResponse(
-            results=[],
-            total_count=0,
-            filters_applied=filters,
-        )
-
-    # Build base query
-    query = (
-        db.query(Stock, ValueScore, FinancialMetrics)
-        .join(ValueScore, Stock.code == ValueScore.stock_code)
-        .join(
-            FinancialMetrics,
-            and_(
-                Stock.code == FinancialMetrics.stock_code,
-                FinancialMetrics.date == latest_financial_date[0]
-            )
-        )
-        .filter(ValueScore.date == latest_value_score_date[0])
-    )
-
-    # Apply filters
-    if "market" in filters and filters["market"]:
-        markets = filters["market"]
-        if isinstance(markets, list):
-            query = query.filter(Stock.market.in_(markets))
-        else:
-            query = query.filter(Stock.market == markets)
-
-    if "market_cap_min" in filters and filters["market_cap_min"]:
-        query = query.filter(Stock.market_cap >= filters["market_cap_min"])
-
-    if "market_cap_max" in filters and filters["market_cap_max"]:
-        query = query.filter(Stock.market_cap <= filters["market_cap_max"])
-
-    if "sector" in filters and filters["sector"]:
-        sectors = filters["sector"]
-        if isinstance(sectors, list):
-            query = query.filter(Stock.sector.in_(sectors))
-        else:
-            query = query.filter(Stock.sector == sectors)
-
-    # Financial filters
-    if "PER_max" in filters and filters["PER_max"]:
-        query = query.filter(FinancialMetrics.per <= filters["PER_max"])
-
-    if "PBR_max" in filters and filters["PBR_max"]:
-        query = query.filter(FinancialMetrics.pbr <= filters["PBR_max"])
-
-    if "ROE_min" in filters and filters["ROE_min"]:
-        query = query.filter(FinancialMetrics.roe >= filters["ROE_min"])
-
-    if "debt_ratio_max" in filters and filters["debt_ratio_max"]:
-        query = query.filter(FinancialMetrics.debt_ratio <= filters["debt_ratio_max"])
-
-    if "dividend_yield_min" in filters and filters["dividend_yield_min"]:
-        query = query.filter(FinancialMetrics.dividend_yield >= filters["dividend_yield_min"])
-
-    # Value score filters
-    if "value_score_min" in filters and filters["value_score_min"]:
-        query = query.filter(ValueScore.total_score >= filters["value_score_min"])
-
-    # Apply sorting
-    if request.sort_by == "value_score":
-        sort_column = ValueScore.total_score
-    elif request.sort_by == "PER":
-        sort_column = FinancialMetrics.per
-    elif request.sort_by == "PBR":
-        sort_column = FinancialMetrics.pbr
-    elif request.sort_by == "ROE":
-        sort_column = FinancialMetrics.roe
-    elif request.sort_by == "market_cap":
-        sort_column = Stock.market_cap
+    if request.sort:
+        sort_keys = request.sort
     else:
-        sort_column = ValueScore.total_score
-
-    if request.order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(sort_column)
-
-    # Apply limit
-    query = query.limit(request.limit)
-
-    # Execute query
-    results = query.all()
-
-    # Build response
-    screener_results = []
-    for stock, value_score, financial_metrics in results:
-        result = ScreenerResult(
-            stock_code=stock.code,
-            stock_name=stock.name,
-            value_score=value_score.total_score,
-            current_price=stock.current_price,
-            PER=financial_metrics.per,
-            PBR=financial_metrics.pbr,
-            ROE=financial_metrics.roe,
+        # Unknown sort_by values keep falling back to the Value Score
+        sort_by = request.sort_by if request.sort_by in NUMERIC_FIELDS else DEFAULT_SORT
+        sort_keys = [f"-{sort_by}" if request.order == "desc" else sort_by]
+
+    try:
+        predicates = compile_filters(filters)
+        sort = parse_sort(sort_keys)
+        snapshot = get_snapshot(db)
+        mask = snapshot.mask(predicates)
+        facets = snapshot.facet_counts(mask, request.facets) if request.facets else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    remaining = mask
+    if request.cursor:
+        position = decode_cursor(request.cursor)
+        key, code = position.get("key"), position.get("code")
+        if (
+            position.get("sort") != [list(item) for item in sort]
+            or not isinstance(key, list)
+            or len(key) != len(sort)
+            or not all(value is None or isinstance(value, (int, float)) for value in key)
+            or not isinstance(code, str)
+        ):
+            raise HTTPException(status_code=400, detail="Cursor does not match the sort order")
+        remaining = mask & snapshot.after(sort, key, code)
+
+    matches = snapshot.order(remaining, sort)
+    page = matches[: request.limit]
+
+    screener_results = [
+        ScreenerResult(
+            stock_code=snapshot.codes[i],
+            stock_name=snapshot.names[i],
+            value_score=snapshot.value("value_score", i),
+            current_price=snapshot.value("current_price", i),
+            PER=snapshot.value("PER", i),
+            PBR=snapshot.value("PBR", i),
+            ROE=snapshot.value("ROE", i),
+        )
+        for i in page
+    ]
+
+    next_cursor = None
+    if len(matches) > len(page):
+        last = page[-1]
+        next_cursor = encode_cursor(
+            {
+                "sort": sort,
+                "key": snapshot.sort_key(sort, last),
+                "code": snapshot.codes[last],
+            }
         )
-        screener_results.append(result)
 
     return ScreenerResponse(
         results=screener_results,
-        total_count=len(screener_results),
+        total_count=int(mask.sum()),
         filters_applied=filters,
+        facets=facets,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/saved/{filter_id}", response_model=SavedScreenResult)
+def get_saved_screen(
+    filter_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Matching stocks of a saved screen, with changes since the previous scoring run
+
+    Requires authentication
+    """
+    # Ownership comes from the database: deleted screens are gone at once
+    screen = (
+        db.query(ScreenerFilter)
+        .filter(ScreenerFilter.id == filter_id, ScreenerFilter.user_id == current_user.id)
+        .first()
     )
+    if not screen:
+        raise HTTPException(status_code=404, detail="Saved screen not found")
+
+    service = SavedScreenService(db)
+    try:
+        result = service.get(screen)
+        if result is None:
+            # Not evaluated yet, edited since, or Redis is unavailable: evaluate it now
+            result = service.evaluate(screen)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
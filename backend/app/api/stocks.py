@@ -4,154 +4,219 @@ from typing import Optional, List
 from datetime import datetime, date
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, func
 
+from app.core.http_cache import ConditionalGet
+from app.core.profiling import ProfiledRoute
 from app.db.database import get_db
-from app.models.stock import Stock
-from app.models.value_score import ValueScore
+from app.models.stock_snapshot import StockSnapshot
 from app.models.financial_metrics import FinancialMetrics
 from app.models.insider_trading import InsiderTrading
 from app.schemas.stock import (
     TopPicksResponse,
-    TopPickItem,
     StockDetailResponse,
     StockResponse,
-    KeyMetrics,
-    CategoryScores,
+    StockRankResponse,
 )
 from app.schemas.insider_trading import (
     InsiderTradingResponse,
     InsiderTradingSummary,
     InsiderTradingListResponse,
+    InsiderBuyingItem,
+    InsiderBuyingResponse,
+)
+from app.services.dataset_epochs import (
+    FINANCIAL_METRICS,
+    INSIDER,
+    PRICES,
+    STOCKS,
+    VALUE_SCORES,
+)
+from app.services.insider_signal_service import InsiderSignalService
+from app.services.leaderboard_service import (
+    CATEGORIES,
+    LeaderboardService,
+    build_card,
+    normalize_category,
+    normalize_market,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
+# Every field on a top-pick card or detail page comes from these datasets
+ranking_cache = ConditionalGet(STOCKS, PRICES, FINANCIAL_METRICS, VALUE_SCORES)
+detail_cache = ConditionalGet(STOCKS, PRICES, FINANCIAL_METRICS, VALUE_SCORES, INSIDER)
 
-@router.get("/top-picks", response_model=TopPicksResponse)
+
+@router.get(
+    "/top-picks", response_model=TopPicksResponse, dependencies=[Depends(ranking_cache)]
+)
 def get_top_picks(
     market: Optional[str] = Query(None, description="KOSPI, KOSDAQ, or ALL"),
     limit: int = Query(20, ge=10, le=50, description="Number of results"),
+    offset: int = Query(0, ge=0, description="Number of ranked stocks to skip"),
     category: Optional[str] = Query(None, description="valuation, profitability, stability, dividend"),
     db: Session = Depends(get_db),
 ):
     """Get top value picks based on Value Score"""
 
-    # Get latest date with value scores
-    latest_date = db.query(ValueScore.date).order_by(desc(ValueScore.date)).first()
+    # Published leaderboards answer without touching the database
+    published = LeaderboardService().top_picks(market, category, limit, offset)
+    if published:
+        top_picks, total_count, score_date = published
+        return TopPicksResponse(
+            data=top_picks,
+            total_count=total_count,
+            updated_at=datetime.combine(score_date, datetime.min.time()),
+        )
+
+    # Latest scoring run, from the per-stock snapshot
+    latest_date = db.query(func.max(StockSnapshot.score_date)).scalar()
     if not latest_date:
         return TopPicksResponse(data=[], total_count=0, updated_at=datetime.utcnow())
 
-    # Build query
     query = (
-        db.query(Stock, ValueScore, FinancialMetrics)
-        .join(ValueScore, Stock.code == ValueScore.stock_code)
-        .outerjoin(
-            FinancialMetrics,
-            and_(
-                Stock.code == FinancialMetrics.stock_code,
-                FinancialMetrics.date == latest_date[0]
-            )
-        )
-        .filter(ValueScore.date == latest_date[0])
-        .filter(Stock.current_price.isnot(None))
+        db.query(StockSnapshot)
+        .filter(StockSnapshot.score_date == latest_date)
+        .filter(StockSnapshot.current_price.isnot(None))
     )
 
     # Filter by market
     if market and market != "ALL":
-        query = query.filter(Stock.market == market)
+        query = query.filter(StockSnapshot.market == market)
 
     # Sort by category score if specified
-    if category == "valuation":
-        query = query.order_by(desc(ValueScore.valuation_score))
-    elif category == "profitability":
-        query = query.order_by(desc(ValueScore.profitability_score))
-    elif category == "stability":
-        query = query.order_by(desc(ValueScore.stability_score))
-    elif category == "dividend":
-        query = query.order_by(desc(ValueScore.dividend_score))
-    else:
-        query = query.order_by(desc(ValueScore.total_score))
-
-    # Apply limit
-    results = query.limit(limit).all()
-
-    # Build response
+    column = CATEGORIES[normalize_category(category)]
+    query = query.order_by(desc(getattr(StockSnapshot, column)))
+
+    total_count = query.count()
+    results = query.offset(offset).limit(limit).all()
+
+    # Build response (a snapshot row has the Stock, ValueScore and metrics fields)
     top_picks = []
-    for rank, (stock, value_score, financial_metrics) in enumerate(results, start=1):
-        # Build key metrics
-        key_metrics = KeyMetrics(
-            PER=financial_metrics.per if financial_metrics else None,
-            PBR=financial_metrics.pbr if financial_metrics else None,
-            ROE=financial_metrics.roe if financial_metrics else None,
-            debt_ratio=financial_metrics.debt_ratio if financial_metrics else None,
-            dividend_yield=financial_metrics.dividend_yield if financial_metrics else None,
-        )
+    for rank, row in enumerate(results, start=offset + 1):
+        top_pick = build_card(row, row, row)
+        top_pick.rank = rank
+        top_picks.append(top_pick)
+
+    return TopPicksResponse(
+        data=top_picks,
+        total_count=total_count,
+        updated_at=datetime.combine(latest_date, datetime.min.time()),
+    )
 
-        # Build category scores
-        category_scores = CategoryScores(
-            valuation=value_score.valuation_score or 0,
-            profitability=value_score.profitability_score or 0,
-            stability=value_score.stability_score or 0,
-            dividend=value_score.dividend_score or 0,
-        )
 
-        # Build upside potential string
-        upside_potential = None
-        if value_score.upside_potential:
-            upside_potential = f"+{value_score.upside_potential}%"
+@router.get("/insider-buying", response_model=InsiderBuyingResponse)
+def get_insider_buying(
+    market: Optional[str] = Query(None, description="KOSPI, KOSDAQ, or ALL"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results"),
+    db: Session = Depends(get_db),
+):
+    """Get stocks ranked by recent insider net buying"""
 
-        top_pick = TopPickItem(
+    results = InsiderSignalService(db).get_top_buying(market=market, limit=limit)
+
+    data = [
+        InsiderBuyingItem(
             rank=rank,
             stock_code=stock.code,
             stock_name=stock.name,
             market=stock.market,
             current_price=stock.current_price,
-            change_rate=stock.change_rate,
-            value_score=value_score.total_score,
-            category_scores=category_scores,
-            key_metrics=key_metrics,
-            ai_summary=value_score.ai_summary,
-            upside_potential=upside_potential,
+            net_shares_30d=signal.net_shares_30d,
+            net_shares_90d=signal.net_shares_90d,
+            net_shares_180d=signal.net_shares_180d,
+            distinct_buyers_90d=signal.distinct_buyers_90d,
+            largest_holder=signal.largest_holder,
+            largest_holding_rate=signal.largest_holding_rate,
+            last_rcept_dt=signal.last_rcept_dt,
+            recent_trend=signal.recent_trend,
         )
-        top_picks.append(top_pick)
+        for rank, (signal, stock) in enumerate(results, start=1)
+    ]
 
-    return TopPicksResponse(
-        data=top_picks,
-        total_count=len(top_picks),
-        updated_at=datetime.combine(latest_date[0], datetime.min.time()),
+    return InsiderBuyingResponse(
+        data=data,
+        total_count=len(data),
+        as_of_date=results[0][0].as_of_date if results else None,
     )
 
 
-@router.get("/{stock_code}", response_model=StockDetailResponse)
-def get_stock_detail(
+@router.get(
+    "/{stock_code}/rank",
+    response_model=StockRankResponse,
+    dependencies=[Depends(ranking_cache)],
+)
+def get_stock_rank(
     stock_code: str,
+    market: Optional[str] = Query(None, description="KOSPI, KOSDAQ, or ALL"),
+    category: Optional[str] = Query(None, description="valuation, profitability, stability, dividend"),
     db: Session = Depends(get_db),
 ):
-    """Get detailed stock information"""
+    """Get a stock's position in the top-picks ranking"""
+    market = normalize_market(market)
+    category = normalize_category(category)
+
+    ranked = LeaderboardService().rank(stock_code, market, category)
+    if ranked is None:
+        ranked = _rank_from_db(db, stock_code, market, category)
+    if ranked is None or ranked["rank"] is None:
+        raise HTTPException(status_code=404, detail="Stock not ranked")
+
+    return StockRankResponse(
+        stock_code=stock_code,
+        market=market,
+        category=category,
+        rank=ranked["rank"],
+        score=ranked["score"],
+        total_count=ranked["total_count"],
+        score_date=ranked["score_date"],
+    )
 
-    # Get stock
-    stock = db.query(Stock).filter(Stock.code == stock_code).first()
-    if not stock:
-        raise HTTPException(status_code=404, detail="Stock not found")
 
-    # Get latest value score
-    latest_value_score = (
-        db.query(ValueScore)
-        .filter(ValueScore.stock_code == stock_code)
-        .order_by(desc(ValueScore.date))
-        .first()
-    )
+def _rank_from_db(db: Session, stock_code: str, market: str, category: str):
+    """Rank a stock with SQL when no leaderboard is published"""
+    latest_date = db.query(func.max(StockSnapshot.score_date)).scalar()
+    if not latest_date:
+        return None
 
-    # Get latest financial metrics
-    latest_financial = (
-        db.query(FinancialMetrics)
-        .filter(FinancialMetrics.stock_code == stock_code)
-        .order_by(desc(FinancialMetrics.date))
-        .first()
+    column = getattr(StockSnapshot, CATEGORIES[category])
+    ranked = (
+        db.query(StockSnapshot)
+        .filter(StockSnapshot.score_date == latest_date)
+        .filter(StockSnapshot.current_price.isnot(None))
     )
+    if market != "ALL":
+        ranked = ranked.filter(StockSnapshot.market == market)
+
+    score = ranked.filter(StockSnapshot.stock_code == stock_code).with_entities(column).scalar()
+    if score is None:
+        return None
+
+    return {
+        "rank": ranked.filter(column > score).count() + 1,
+        "score": float(score),
+        "total_count": ranked.count(),
+        "score_date": latest_date,
+    }
+
 
-    # Get historical financial metrics (last 4 quarters)
+@router.get(
+    "/{stock_code}", response_model=StockDetailResponse, dependencies=[Depends(detail_cache)]
+)
+def get_stock_detail(
+    stock_code: str,
+    db: Session = Depends(get_db),
+):
+    """Get detailed stock information"""
+
+    # Latest price, metrics and scores in one row
+    snapshot = db.query(StockSnapshot).filter(StockSnapshot.stock_code == stock_code).first()
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Stock not found")
+    scored = snapshot.score_date is not None
+
+    # Get historical financial metrics (last 4 quarters, latest first)
     historical_financial = (
         db.query(FinancialMetrics)
         .filter(FinancialMetrics.stock_code == stock_code)
@@ -159,21 +224,22 @@ def get_stock_detail(
         .limit(4)
         .all()
     )
+    latest_financial = snapshot if snapshot.metrics_date is not None else None
 
     # Build value score object
     value_score = {
-        "total": latest_value_score.total_score if latest_value_score else 0,
-        "valuation": latest_value_score.valuation_score if latest_value_score else 0,
-        "profitability": latest_value_score.profitability_score if latest_value_score else 0,
-        "stability": latest_value_score.stability_score if latest_value_score else 0,
-        "dividend": latest_value_score.dividend_score if latest_value_score else 0,
+        "total": snapshot.total_score if scored else 0,
+        "valuation": snapshot.valuation_score if scored else 0,
+        "profitability": snapshot.profitability_score if scored else 0,
+        "stability": snapshot.stability_score if scored else 0,
+        "dividend": snapshot.dividend_score if scored else 0,
     }
 
     # Build AI analysis object
     ai_analysis = {
-        "summary": latest_value_score.ai_summary if latest_value_score else None,
-        "strengths": latest_value_score.strengths if latest_value_score else [],
-        "risks": latest_value_score.risks if latest_value_score else [],
+        "summary": snapshot.ai_summary if scored else None,
+        "strengths": snapshot.strengths if scored else [],
+        "risks": snapshot.risks if scored else [],
     }
 
     # Build financial metrics object
@@ -197,7 +263,7 @@ def get_stock_detail(
             for fm in historical_financial
         ],
         "sector_comparison": {
-            "sector": stock.sector,
+            "sector": snapshot.sector,
             "avg_PER": None,  # TODO: Calculate from database
             "avg_ROE": None,
             "avg_debt_ratio": None,
@@ -219,33 +285,21 @@ def get_stock_detail(
         .all()
     )
 
-    # Build insider trading response
+    # Build insider trading response (summary from the precomputed signal)
     insider_trading = None
     if insider_records:
         insider_data = []
-        net_buy = 0
-        net_sell = 0
-        largest_holder = None
-        largest_rate = 0
-
         for record in insider_records:
             # Determine transaction type
             tx_type = None
             if record.sp_stock_lmp_irds_cnt is not None:
                 if record.sp_stock_lmp_irds_cnt > 0:
                     tx_type = "매수"
-                    net_buy += 1
                 elif record.sp_stock_lmp_irds_cnt < 0:
                     tx_type = "매도"
-                    net_sell += 1
                 else:
                     tx_type = "변동없음"
 
-            # Track largest holder
-            if record.sp_stock_lmp_rate and float(record.sp_stock_lmp_rate) > largest_rate:
-                largest_rate = float(record.sp_stock_lmp_rate)
-                largest_holder = record.repror
-
             insider_data.append(
                 InsiderTradingResponse(
                     id=record.id,
@@ -265,29 +319,38 @@ def get_stock_detail(
                 )
             )
 
-        # Determine trend
-        if net_buy > net_sell:
-            trend = "매수우세"
-        elif net_sell > net_buy:
-            trend = "매도우세"
+        signal = InsiderSignalService(db).get_signal(stock_code)
+        if signal:
+            summary = InsiderTradingSummary(
+                total_transactions=signal.transaction_count,
+                net_buy_count=signal.buy_count,
+                net_sell_count=signal.sell_count,
+                largest_holder=signal.largest_holder,
+                largest_holding_rate=signal.largest_holding_rate,
+                recent_trend=signal.recent_trend,
+                net_shares_30d=signal.net_shares_30d,
+                net_shares_90d=signal.net_shares_90d,
+                net_shares_180d=signal.net_shares_180d,
+                distinct_buyers_90d=signal.distinct_buyers_90d,
+                as_of_date=signal.as_of_date,
+            )
         else:
-            trend = "중립"
+            # No filings within the signal lookback window
+            summary = InsiderTradingSummary(
+                total_transactions=0,
+                net_buy_count=0,
+                net_sell_count=0,
+                recent_trend="중립",
+            )
 
         insider_trading = InsiderTradingListResponse(
             data=insider_data,
-            summary=InsiderTradingSummary(
-                total_transactions=len(insider_records),
-                net_buy_count=net_buy,
-                net_sell_count=net_sell,
-                largest_holder=largest_holder,
-                largest_holding_rate=largest_rate if largest_rate > 0 else None,
-                recent_trend=trend,
-            ),
+            summary=summary,
             total_count=len(insider_records),
         )
 
     return StockDetailResponse(
-        stock_info=stock,
+        stock_info=StockResponse.model_validate(snapshot),
         value_score=value_score,
         ai_analysis=ai_analysis,
         financial_metrics=financial_metrics,
@@ -2,15 +2,16 @@
 
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.core.profiling import ProfiledRoute
+from app.db.database import get_async_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.watchlist import Watchlist
 from app.models.stock import Stock
-from app.models.value_score import ValueScore
+from app.models.stock_snapshot import StockSnapshot
 from app.schemas.watchlist import (
     WatchlistCreate,
     WatchlistUpdate,
@@ -18,36 +19,35 @@ from app.schemas.watchlist import (
     WatchlistResponse,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=WatchlistResponse)
 async def get_watchlist(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get current user's watchlist
 
     Requires authentication
     """
-    # Get user's watchlist items with stock and value score info
-    watchlist_items = (
-        db.query(Watchlist, Stock, ValueScore)
+    # Latest price and scores per stock come from the snapshot (one row per stock)
+    watchlist_items = await db.execute(
+        select(Watchlist, Stock, StockSnapshot)
         .join(Stock, Watchlist.stock_code == Stock.code)
-        .outerjoin(ValueScore, Stock.code == ValueScore.stock_code)
-        .filter(Watchlist.user_id == current_user.id)
+        .outerjoin(StockSnapshot, Stock.code == StockSnapshot.stock_code)
+        .where(Watchlist.user_id == current_user.id)
         .order_by(desc(Watchlist.added_at))
-        .all()
     )
 
     # Format response
     items = []
-    for watchlist, stock, value_score in watchlist_items:
-        # Calculate value score change (simplified - TODO: implement actual change calculation)
+    for watchlist, stock, snapshot in watchlist_items:
+        # Change since the previous scoring run
         value_score_change = None
-        if value_score:
-            value_score_change = "+3.5"  # Placeholder
+        if snapshot and snapshot.total_score_change is not None:
+            value_score_change = f"{snapshot.total_score_change:+.1f}"
 
         item = WatchlistItem(
             id=watchlist.id,
@@ -55,8 +55,8 @@ async def get_watchlist(
             stock_name=stock.name,
             target_price=watchlist.target_price,
             alert_enabled=watchlist.alert_enabled,
-            current_price=stock.current_price,
-            value_score=value_score.total_score if value_score else None,
+            current_price=snapshot.current_price if snapshot else stock.current_price,
+            value_score=snapshot.total_score if snapshot else None,
             value_score_change=value_score_change,
             added_at=watchlist.added_at,
         )
@@ -69,7 +69,7 @@ async def get_watchlist(
 async def add_to_watchlist(
     data: WatchlistCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Add a stock to watchlist
@@ -77,7 +77,7 @@ async def add_to_watchlist(
     Requires authentication
     """
     # Check if stock exists
-    stock = db.query(Stock).filter(Stock.code == data.stock_code).first()
+    stock = await db.get(Stock, data.stock_code)
     if not stock:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -85,13 +85,11 @@ async def add_to_watchlist(
         )
 
     # Check if already in watchlist
-    existing = (
-        db.query(Watchlist)
-        .filter(
+    existing = await db.scalar(
+        select(Watchlist.id).where(
             Watchlist.user_id == current_user.id,
             Watchlist.stock_code == data.stock_code,
         )
-        .first()
     )
 
     if existing:
@@ -109,8 +107,8 @@ async def add_to_watchlist(
     )
 
     db.add(watchlist_item)
-    db.commit()
-    db.refresh(watchlist_item)
+    await db.commit()
+    await db.refresh(watchlist_item)
 
     return {
         "id": watchlist_item.id,
@@ -126,7 +124,7 @@ async def update_watchlist_item(
     watchlist_id: int,
     data: WatchlistUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Update watchlist item
@@ -134,13 +132,11 @@ async def update_watchlist_item(
     Requires authentication
     """
     # Get watchlist item
-    watchlist_item = (
-        db.query(Watchlist)
-        .filter(
+    watchlist_item = await db.scalar(
+        select(Watchlist).where(
             Watchlist.id == watchlist_id,
             Watchlist.user_id == current_user.id,
         )
-        .first()
     )
 
     if not watchlist_item:
@@ -156,8 +152,7 @@ async def update_watchlist_item(
     if data.alert_enabled is not None:
         watchlist_item.alert_enabled = data.alert_enabled
 
-    db.commit()
-    db.refresh(watchlist_item)
+    await db.commit()
 
     return {
         "id": watchlist_item.id,
@@ -171,7 +166,7 @@ async def update_watchlist_item(
 async def remove_from_watchlist(
     watchlist_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Remove a stock from watchlist
@@ -179,13 +174,11 @@ async def remove_from_watchlist(
     Requires authentication
     """
     # Get watchlist item
-    watchlist_item = (
-        db.query(Watchlist)
-        .filter(
+    watchlist_item = await db.scalar(
+        select(Watchlist).where(
             Watchlist.id == watchlist_id,
             Watchlist.user_id == current_user.id,
         )
-        .first()
     )
 
     if not watchlist_item:
@@ -194,7 +187,7 @@ async def remove_from_watchlist(
             detail="Watchlist item not found",
         )
 
-    db.delete(watchlist_item)
-    db.commit()
+    await db.delete(watchlist_item)
+    await db.commit()
 
     return None
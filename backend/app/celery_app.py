@@ -2,14 +2,134 @@
 
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Queue
 
 from app.core.config import settings
 
+# Queues (see scripts/start_services.sh for the matching workers)
+QUEUE_INGEST_IO = "ingest-io"  # KRX/DART HTTP crawling - thread pool, high concurrency
+QUEUE_COMPUTE = "compute"  # Scoring and aggregation - prefork, one process per core
+QUEUE_BACKTEST = "backtest"  # Long-running backtests - isolated so they never block scoring
+
+# Message priorities (Redis transport: lower values are consumed first)
+PRIORITY_HIGH = 0  # Orchestrators and chord callbacks - cheap, and they unblock other work
+PRIORITY_NORMAL = 5  # Single-stock requests
+PRIORITY_LOW = 8  # Bulk fan-out work
+
+# Pipeline stages dominated by HTTP calls
+IO_PIPELINE_STAGES = {"stock_list", "prices", "financial_metrics"}
+
+TASK_ROUTES = {
+    # Orchestrators / callbacks
+    "app.tasks.data_tasks.full_data_pipeline_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_HIGH,
+    },
+    "app.tasks.pipeline_tasks.run_data_pipeline_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_HIGH,
+    },
+    "app.tasks.pipeline_tasks.complete_pipeline_stage_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_HIGH,
+    },
+    "app.tasks.dart_tasks.fetch_all_dart_financial_metrics_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_HIGH,
+    },
+    "app.tasks.dart_tasks.summarize_dart_batches_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_HIGH,
+    },
+    "app.tasks.insider_tasks.fetch_all_insider_trading_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_HIGH,
+    },
+    "app.tasks.insider_tasks.summarize_insider_trading_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_HIGH,
+    },
+    # Single-stock requests
+    "app.tasks.data_tasks.collect_stock_prices_task": {
+        "queue": QUEUE_INGEST_IO,
+        "priority": PRIORITY_NORMAL,
+    },
+    "app.tasks.data_tasks.calculate_financial_metrics_task": {
+        "queue": QUEUE_INGEST_IO,
+        "priority": PRIORITY_NORMAL,
+    },
+    "app.tasks.dart_tasks.fetch_dart_financial_metrics_task": {
+        "queue": QUEUE_INGEST_IO,
+        "priority": PRIORITY_NORMAL,
+    },
+    "app.tasks.data_tasks.calculate_value_score_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_NORMAL,
+    },
+    # Bulk work
+    "app.tasks.data_tasks.collect_stock_list_task": {
+        "queue": QUEUE_INGEST_IO,
+        "priority": PRIORITY_LOW,
+    },
+    "app.tasks.data_tasks.collect_all_stock_prices_task": {
+        "queue": QUEUE_INGEST_IO,
+        "priority": PRIORITY_LOW,
+    },
+    "app.tasks.data_tasks.calculate_all_financial_metrics_task": {
+        "queue": QUEUE_INGEST_IO,
+        "priority": PRIORITY_LOW,
+    },
+    "app.tasks.dart_tasks.*": {"queue": QUEUE_INGEST_IO, "priority": PRIORITY_LOW},
+    "app.tasks.insider_tasks.fetch_insider_trading_task": {
+        "queue": QUEUE_INGEST_IO,
+        "priority": PRIORITY_LOW,
+    },
+    "app.tasks.data_tasks.calculate_all_value_scores_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_LOW,
+    },
+    "app.tasks.insider_tasks.refresh_insider_signals_task": {
+        "queue": QUEUE_COMPUTE,
+        "priority": PRIORITY_LOW,
+    },
+    "app.tasks.backtest_tasks.*": {"queue": QUEUE_BACKTEST, "priority": PRIORITY_NORMAL},
+}
+
+
+def route_pipeline_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Route pipeline stage/chunk tasks by the stage they run
+
+    Price and DART stages go to the I/O queue, scoring stages to compute.
+    Returns None for other tasks so TASK_ROUTES applies.
+    """
+    if name not in (
+        "app.tasks.pipeline_tasks.run_pipeline_stage_task",
+        "app.tasks.pipeline_tasks.run_pipeline_chunk_task",
+    ):
+        return None
+
+    stage = (kwargs or {}).get("stage")
+    if stage is None and args and len(args) > 1:
+        stage = args[1]
+
+    queue = QUEUE_INGEST_IO if stage in IO_PIPELINE_STAGES else QUEUE_COMPUTE
+    priority = PRIORITY_HIGH if name.endswith("run_pipeline_stage_task") else PRIORITY_LOW
+    return {"queue": queue, "priority": priority}
+
+
 # Create Celery app
 celery_app = Celery(
     "valuehunt",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.tasks.data_tasks",
+        "app.tasks.dart_tasks",
+        "app.tasks.insider_tasks",
+        "app.tasks.pipeline_tasks",
+        "app.tasks.monitoring",
+    ],
 )
 
 # Configure Celery
@@ -22,6 +142,15 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    # Queues and routing
+    task_queues=(Queue(QUEUE_INGEST_IO), Queue(QUEUE_COMPUTE), Queue(QUEUE_BACKTEST)),
+    task_default_queue=QUEUE_COMPUTE,
+    task_routes=(route_pipeline_task, TASK_ROUTES),
+    task_default_priority=PRIORITY_NORMAL,
+    broker_transport_options={"priority_steps": list(range(10)), "sep": ":"},
+    # Long compute/backtest tasks must not be hoarded by one process; the
+    # ingest-io worker raises this on the command line for its short tasks
+    worker_prefetch_multiplier=1,
     # RedBeat scheduler (Redis-backed, persistent across restarts)
     redbeat_redis_url=settings.CELERY_BROKER_URL,
     redbeat_key_prefix="valuehunt:redbeat:",
@@ -34,16 +163,11 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.data_tasks.collect_stock_list_task",
         "schedule": crontab(hour=6, minute=0, day_of_week="1-5"),
     },
-    # Daily price update - Every weekday at 4 PM (after market close)
-    "collect-stock-prices-daily": {
-        "task": "app.tasks.data_tasks.collect_all_stock_prices_task",
+    # Daily data pipeline (prices + metrics -> Value Scores) - Every weekday at 4 PM
+    "run-data-pipeline-daily": {
+        "task": "app.tasks.pipeline_tasks.run_data_pipeline_task",
         "schedule": crontab(hour=16, minute=0, day_of_week="1-5"),
     },
-    # Daily Value Score calculation - Every weekday at 7 PM
-    "calculate-value-scores-daily": {
-        "task": "app.tasks.data_tasks.calculate_all_value_scores_task",
-        "schedule": crontab(hour=19, minute=0, day_of_week="1-5"),
-    },
     # Weekly DART financial data collection - Every Monday at 2 AM
     "collect-dart-financial-data-weekly": {
         "task": "app.tasks.dart_tasks.fetch_all_dart_financial_metrics_task",
@@ -59,4 +183,9 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.insider_tasks.fetch_all_insider_trading_task",
         "schedule": crontab(hour=3, minute=0, day_of_week=1),
     },
+    # Daily insider signal refresh (rolling windows) - Every day at 5 AM
+    "refresh-insider-signals-daily": {
+        "task": "app.tasks.insider_tasks.refresh_insider_signals_task",
+        "schedule": crontab(hour=5, minute=0),
+    },
 }
@@ -10,6 +10,11 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./test.db"
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT: float = 2.0
+    DB_POOL_SIZE: int = 10  # Connections kept open per worker process
+    DB_MAX_OVERFLOW: int = 20  # Extra connections allowed under burst
+    ASYNC_DB_POOL_SIZE: int = 20  # Async engine (async API routes), per worker process
+    ASYNC_DB_MAX_OVERFLOW: int = 10
 
     # JWT
     SECRET_KEY: str = "dev-secret-key-change-in-production"
@@ -24,6 +29,7 @@ class Settings(BaseSettings):
     # Gemini AI (primary)
     GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-2.5-flash"
+    GEMINI_API_ENDPOINT: str = ""  # e.g. http://localhost:8090 for the load-test stand-in
 
     # Email
     SENDGRID_API_KEY: str = ""
@@ -31,6 +37,16 @@ class Settings(BaseSettings):
 
     # Data Sources
     DART_API_KEY: str = ""
+    DART_MAX_CONCURRENCY: int = 20  # In-flight requests per async DART client
+    DART_HTTP_TIMEOUT: float = 30.0
+    STATEMENT_CACHE_DIR: str = "./data/dart_cache"  # Raw DART statements (Parquet)
+    STATEMENT_CACHE_REVALIDATE_HOURS: float = 24.0  # For reports still open to filing
+
+    # Upstream rate limits (shared across all workers via Redis)
+    DART_RATE_LIMIT_PER_SECOND: float = 2.0
+    DART_RATE_LIMIT_BURST: int = 1
+    FDR_RATE_LIMIT_PER_SECOND: float = 5.0
+    FDR_RATE_LIMIT_BURST: int = 5
 
     # Environment
     ENVIRONMENT: str = "development"
@@ -40,6 +56,28 @@ class Settings(BaseSettings):
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    CELERY_METRICS_PORT: int = 9808  # Worker Prometheus exporter (0 disables)
+
+    # Query budget warnings (see app.db.query_stats)
+    QUERY_COUNT_WARN_THRESHOLD: int = 30  # Queries per API request
+    QUERY_TIME_WARN_MS: float = 500.0  # DB time per API request
+    QUERY_REPEAT_WARN_THRESHOLD: int = 10  # Repeats of one statement per request (N+1)
+    TASK_QUERY_COUNT_WARN_THRESHOLD: int = 20000  # Queries per Celery task
+
+    # On-demand profiling (see app.core.profiling)
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str = ""  # Required value of the X-Profile request header
+    PROFILE_DIR: str = "./data/profiles"
+
+    # OpenTelemetry tracing (see app.core.tracing)
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "otlp"  # otlp, file or console
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_FILE_PATH: str = "./data/traces.jsonl"
+
+    # Conditional GET on read-heavy routes (see app.core.http_cache)
+    HTTP_CACHE_MAX_AGE: int = 0  # Browsers revalidate with If-None-Match on every poll
+    HTTP_CACHE_SHARED_MAX_AGE: int = 60  # Seconds a CDN may serve without revalidating
 
     # Sentry
     SENTRY_DSN: str = ""
@@ -0,0 +1,87 @@
+"""Conditional GET for read-heavy routes
+
+Routes that only change when a pipeline stage writes new data declare the
+datasets they are built from. Their ETag is the version token of those
+datasets' epochs (see app.services.dataset_epochs), read from Redis before
+the route body runs, so a matching If-None-Match is answered with 304 Not
+Modified without a single SQL query:
+
+    @router.get("/top-picks", dependencies=[Depends(ConditionalGet(VALUE_SCORES, PRICES))])
+
+ETags are weak: the same data may be serialized (or compressed) differently.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.database import get_db
+from app.services.dataset_epochs import DATASETS, DatasetEpochs, version_token
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against one ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ConditionalGet:
+    """
+    Dependency that sets ETag / Cache-Control and short-circuits GET with 304
+
+    GET responses are public: browsers revalidate every time (max-age) while
+    a CDN may serve them for HTTP_CACHE_SHARED_MAX_AGE seconds. Read-only
+    POST routes (the screener takes its filters as a JSON body) get an ETag
+    that also covers the body and are marked private, since shared caches do
+    not store POST responses. They are never answered with 304: If-None-Match
+    only revalidates GET/HEAD, so a POST always gets its full body and the
+    client compares ETags itself.
+    """
+
+    def __init__(self, *datasets: str, max_age: Optional[int] = None):
+        """
+        Args:
+            datasets: Names from app.services.dataset_epochs.DATASETS
+            max_age: Browser max-age in seconds (default: HTTP_CACHE_MAX_AGE)
+        """
+        unknown = set(datasets) - set(DATASETS)
+        if unknown:
+            raise ValueError(f"Unknown datasets: {sorted(unknown)}")
+        self.datasets = datasets
+        self.max_age = settings.HTTP_CACHE_MAX_AGE if max_age is None else max_age
+
+    async def __call__(
+        self, request: Request, response: Response, db: Session = Depends(get_db)
+    ) -> None:
+        # Redis read (database only on a cache miss), kept off the event loop
+        epochs = await run_in_threadpool(DatasetEpochs(db).current, *self.datasets)
+        token = version_token(epochs)
+
+        if request.method in ("GET", "HEAD"):
+            cache_control = (
+                f"public, max-age={self.max_age}, "
+                f"s-maxage={settings.HTTP_CACHE_SHARED_MAX_AGE}"
+            )
+        else:
+            body = await request.body()
+            token = f"{token}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"
+            cache_control = f"private, max-age={self.max_age}"
+
+        headers = {"ETag": f'W/"{token}"', "Cache-Control": cache_control}
+        if request.method in ("GET", "HEAD") and etag_matches(
+            request.headers.get("if-none-match"), headers["ETag"]
+        ):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
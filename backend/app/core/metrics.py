@@ -0,0 +1,154 @@
+"""Prometheus metrics for Celery tasks, upstream data sources and queue depths
+
+The API serves these at /metrics; Celery workers serve them from a small
+exporter on CELERY_METRICS_PORT (see app.tasks.monitoring). Prefork workers
+must set PROMETHEUS_MULTIPROC_DIR (an empty, writable directory) before
+starting so samples recorded in pool child processes are aggregated.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Sequence
+
+import redis
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+from app.core.config import settings
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+TASK_DURATION = Histogram(
+    "valuehunt_celery_task_duration_seconds",
+    "Celery task run time",
+    ["task", "state"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800),
+)
+
+TASKS_TOTAL = Counter(
+    "valuehunt_celery_tasks_total",
+    "Celery task outcomes",
+    ["task", "state"],  # state: success, failure, retry
+)
+
+TASK_DB_QUERIES = Histogram(
+    "valuehunt_celery_task_db_queries",
+    "SQL queries executed per Celery task",
+    ["task"],
+    buckets=(1, 10, 50, 100, 500, 1000, 5000, 10000, 50000),
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "valuehunt_upstream_request_duration_seconds",
+    "Latency of calls to external data sources",
+    ["upstream", "operation", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+
+@contextmanager
+def track_upstream(upstream: str, operation: str) -> Iterator[None]:
+    """
+    Time and trace a call to an external data source
+
+    Usage:
+        with track_upstream("krx", "daily_prices"):
+            df = fdr.DataReader(...)
+
+    Args:
+        upstream: Data source (dart, krx)
+        operation: Endpoint or call name (keep the set small - it is a label)
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with tracer.start_as_current_span(
+            f"{upstream} {operation}",
+            attributes={"upstream": upstream, "upstream.operation": operation},
+        ):
+            yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_LATENCY.labels(upstream, operation, outcome).observe(
+            time.perf_counter() - start
+        )
+
+
+class QueueDepthCollector:
+    """Samples Celery queue lengths from the Redis broker at scrape time"""
+
+    def __init__(self, queues: Optional[Sequence[str]] = None, client=None):
+        """
+        Args:
+            queues: Queue names (defaults to the queues configured on the Celery app)
+            client: Redis client for the broker (created lazily from CELERY_BROKER_URL)
+        """
+        self._queues = queues
+        self._client = client
+
+    @property
+    def queues(self) -> Sequence[str]:
+        if self._queues is None:
+            from app.celery_app import celery_app
+
+            self._queues = [q.name for q in celery_app.conf.task_queues]
+        return self._queues
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                settings.CELERY_BROKER_URL,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            )
+        return self._client
+
+    @staticmethod
+    def _priority_keys(queue: str) -> list:
+        # The Redis transport keeps one list per priority step: "queue" for
+        # priority 0 and "queue:<n>" for the others
+        from app.celery_app import celery_app
+
+        options = celery_app.conf.broker_transport_options or {}
+        sep = options.get("sep", "\x06\x16")
+        steps = options.get("priority_steps", [0])
+        return [queue if step == 0 else f"{queue}{sep}{step}" for step in steps]
+
+    def collect(self):
+        depth = GaugeMetricFamily(
+            "valuehunt_celery_queue_depth", "Messages waiting in a Celery queue", labels=["queue"]
+        )
+        try:
+            pipe = self.client.pipeline()
+            keys = {queue: self._priority_keys(queue) for queue in self.queues}
+            for queue_keys in keys.values():
+                for key in queue_keys:
+                    pipe.llen(key)
+            lengths = iter(pipe.execute())
+            for queue, queue_keys in keys.items():
+                depth.add_metric([queue], sum(next(lengths) for _ in queue_keys))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to sample queue depths: {e}")
+            return
+        yield depth
+
+
+_registry: Optional[CollectorRegistry] = None
+
+
+def get_registry() -> CollectorRegistry:
+    """Registry to expose: this process (or all processes in multiprocess mode) plus queue depths"""
+    global _registry
+    if _registry is None:
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        registry.register(QueueDepthCollector())
+        _registry = registry
+    return _registry
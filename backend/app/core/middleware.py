@@ -0,0 +1,42 @@
+"""ASGI middleware"""
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.query_stats import track_queries
+
+
+class QueryStatsMiddleware:
+    """
+    Count SQL queries per request
+
+    Adds a Server-Timing header with the query count and DB time, and logs a
+    warning when a request exceeds the QUERY_* thresholds or repeats one
+    statement often enough to look like an N+1 loop.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", stats.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        stats.warn_if_excessive(
+            f"{scope['method']} {scope['path']}",
+            max_count=settings.QUERY_COUNT_WARN_THRESHOLD,
+            max_ms=settings.QUERY_TIME_WARN_MS,
+            max_repeats=settings.QUERY_REPEAT_WARN_THRESHOLD,
+        )
@@ -0,0 +1,55 @@
+"""Opaque cursors for keyset pagination
+
+A cursor is the sort key of the last row on a page, so the next page is
+"rows after this key" - an index range scan (or a mask on the screener
+snapshot) that costs the same on page 1 and page 1,000, unlike OFFSET.
+
+Cursors are URL-safe base64 JSON. Clients must treat them as opaque; the
+payload may change between releases.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Opaque cursor for a JSON-serializable payload"""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Payload of a cursor from encode_cursor
+
+    Raises:
+        HTTPException: 400 when the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        payload = None
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return payload
+
+
+def set_page_headers(
+    request: Request, response: Response, total_count: int, next_cursor: Optional[str]
+) -> None:
+    """
+    Pagination headers for routes whose body is a bare list
+
+    X-Total-Count carries the number of matching rows; the next page is
+    linked (RFC 8288) and also given as X-Next-Cursor.
+    """
+    response.headers["X-Total-Count"] = str(total_count)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
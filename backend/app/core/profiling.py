@@ -0,0 +1,189 @@
+"""On-demand cProfile profiling for API requests and Celery tasks
+
+Disabled unless PROFILING_ENABLED is set. Then:
+
+- API: send `X-Profile: <PROFILING_TOKEN>` with a request. The response carries
+  an `X-Profile-Id` header naming the stored profile. The event loop thread is
+  profiled for the whole request, including background tasks started by it.
+  Sync endpoints run in the threadpool; routes built with ProfiledRoute are
+  profiled there as well. Only one request is profiled at a time.
+- Celery: send a task with `headers={"profile": True}`, e.g.
+  `task.apply_async(args, headers={"profile": True})`.
+
+Profiles are written to PROFILE_DIR as `<id>.prof` (pstats; open with
+snakeviz or `python -m pstats`) and `<id>.txt` (top functions by cumulative
+time).
+"""
+
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import re
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_REQUEST_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_TASK_HEADER = "profile"
+
+# Functions listed in the text report
+REPORT_LIMIT = 60
+
+_current_session: ContextVar[Optional["ProfileSession"]] = ContextVar(
+    "profile_session", default=None
+)
+
+# One profiled request at a time (cProfile is per thread, and concurrent
+# sessions on the event loop thread would overwrite each other)
+_request_lock = threading.Lock()
+
+
+def profile_id(label: str) -> str:
+    """Unique, filesystem-safe profile identifier"""
+    slug = re.sub(r"[^A-Za-z0-9_]+", "-", label).strip("-")[:80]
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{secrets.token_hex(3)}"
+
+
+class ProfileSession:
+    """cProfile samples collected for one request or task, possibly from several threads"""
+
+    def __init__(self):
+        self.stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> cProfile.Profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def stop(self, profiler: cProfile.Profile) -> None:
+        profiler.disable()
+        with self._lock:
+            if self.stats is None:
+                self.stats = pstats.Stats(profiler)
+            else:
+                self.stats.add(profiler)
+
+    def save(self, name: str, directory: Optional[str] = None) -> Optional[Path]:
+        """
+        Write the profile as <name>.prof and a <name>.txt summary
+
+        Returns:
+            Path of the .prof file, or None if nothing was recorded or writing failed
+        """
+        if self.stats is None:
+            return None
+
+        root = Path(directory or settings.PROFILE_DIR)
+        try:
+            root.mkdir(parents=True, exist_ok=True)
+            path = root / f"{name}.prof"
+            self.stats.dump_stats(path)
+
+            report = io.StringIO()
+            pstats.Stats(str(path), stream=report).sort_stats("cumulative").print_stats(
+                REPORT_LIMIT
+            )
+            (root / f"{name}.txt").write_text(report.getvalue())
+        except OSError as e:
+            logger.warning(f"Failed to save profile {name}: {e}")
+            return None
+
+        logger.info(f"Saved profile {path}")
+        return path
+
+
+def _profiled_sync(func: Callable) -> Callable:
+    """Profile a sync endpoint in the worker thread when its request is profiled"""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        session = _current_session.get()
+        if session is None:
+            return func(*args, **kwargs)
+
+        profiler = session.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            session.stop(profiler)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute whose sync endpoints can be profiled in the threadpool"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if not asyncio.iscoroutinefunction(endpoint):
+            endpoint = _profiled_sync(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class ProfilingMiddleware:
+    """Profile requests that carry the admin profiling header"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _requested(scope: Scope) -> bool:
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED:
+            return False
+        token = Headers(scope=scope).get(PROFILE_REQUEST_HEADER)
+        return bool(
+            token
+            and settings.PROFILING_TOKEN
+            and secrets.compare_digest(token, settings.PROFILING_TOKEN)
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not _request_lock.acquire(blocking=False):
+            logger.info(f"Profiling busy, serving {scope['path']} unprofiled")
+            await self.app(scope, receive, send)
+            return
+
+        name = profile_id(f"{scope['method']}-{scope['path']}")
+        session = ProfileSession()
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, name)
+            await send(message)
+
+        token = _current_session.set(session)
+        profiler = session.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session.stop(profiler)
+            _current_session.reset(token)
+            _request_lock.release()
+            session.save(name)
+
+
+def task_profiling_requested(request) -> bool:
+    """Check whether a Celery task was sent with the profile header"""
+    if not settings.PROFILING_ENABLED:
+        return False
+    headers = getattr(request, "headers", None) or {}
+    return bool(getattr(request, PROFILE_TASK_HEADER, None) or headers.get(PROFILE_TASK_HEADER))
@@ -0,0 +1,170 @@
+"""Distributed token-bucket rate limiting for upstream data sources
+
+All Celery workers and API processes share one bucket per upstream (DART, FDR)
+stored in Redis, so the combined request rate stays at the configured limit no
+matter how many tasks fan out in parallel.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+from app.db.redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+# Reservation-style token bucket. Every call takes its tokens immediately (the
+# balance may go negative) and returns how long the caller must wait before its
+# reservation is valid. Concurrent callers are therefore spaced exactly 1/rate
+# apart. Redis server time is used so worker clock skew does not matter.
+_TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - requested
+
+local wait = 0
+if tokens < 0 then
+  wait = -tokens / rate
+end
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', key, math.ceil((capacity / rate + wait) * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class TokenBucketRateLimiter:
+    """Redis-backed token bucket keyed per upstream, with sync and async acquire"""
+
+    KEY_PREFIX = "valuehunt:ratelimit:"
+    REDIS_RETRY_SECONDS = 30
+
+    def __init__(self, name: str, rate: float, capacity: int = 1):
+        """
+        Args:
+            name: Upstream name used as the Redis key suffix (e.g. "dart")
+            rate: Sustained requests per second across all processes
+            capacity: Maximum burst size
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive: {rate}")
+
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = max(int(capacity), 1)
+        self.key = f"{self.KEY_PREFIX}{name}"
+
+        self._redis_down_until = 0.0
+        self._script = None
+
+        # In-process fallback bucket (used when Redis is unreachable)
+        self._lock = threading.Lock()
+        self._local_tokens = float(self.capacity)
+        self._local_ts: Optional[float] = None
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Block until `tokens` requests are allowed
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 1) -> float:
+        """
+        Wait (without blocking the event loop) until `tokens` requests are allowed
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = await self._reserve_async(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def _mark_redis_down(self, error: Exception) -> None:
+        logger.warning(
+            f"Rate limiter '{self.name}' could not reach Redis ({error}); "
+            f"using in-process bucket for {self.REDIS_RETRY_SECONDS}s"
+        )
+        self._redis_down_until = time.monotonic() + self.REDIS_RETRY_SECONDS
+
+    def _reserve(self, tokens: int) -> float:
+        if self._redis_available():
+            try:
+                if self._script is None:
+                    self._script = get_redis().register_script(_TOKEN_BUCKET_SCRIPT)
+                result = self._script(
+                    keys=[self.key], args=[self.rate, self.capacity, tokens]
+                )
+                return float(result)
+            except (redis.RedisError, OSError) as e:
+                self._mark_redis_down(e)
+
+        return self._reserve_local(tokens)
+
+    async def _reserve_async(self, tokens: int) -> float:
+        if self._redis_available():
+            try:
+                # Async clients are per event loop, so the script is bound per call
+                script = get_async_redis().register_script(_TOKEN_BUCKET_SCRIPT)
+                result = await script(
+                    keys=[self.key], args=[self.rate, self.capacity, tokens]
+                )
+                return float(result)
+            except (redis.RedisError, OSError) as e:
+                self._mark_redis_down(e)
+
+        return self._reserve_local(tokens)
+
+    def _reserve_local(self, tokens: int) -> float:
+        """Same reservation algorithm as the Lua script, for a single process"""
+        with self._lock:
+            now = time.monotonic()
+            if self._local_ts is None:
+                self._local_ts = now
+
+            elapsed = max(0.0, now - self._local_ts)
+            self._local_tokens = (
+                min(self.capacity, self._local_tokens + elapsed * self.rate) - tokens
+            )
+            self._local_ts = now
+
+            if self._local_tokens < 0:
+                return -self._local_tokens / self.rate
+            return 0.0
+
+
+# Shared limiters per upstream
+dart_rate_limiter = TokenBucketRateLimiter(
+    "dart", settings.DART_RATE_LIMIT_PER_SECOND, settings.DART_RATE_LIMIT_BURST
+)
+fdr_rate_limiter = TokenBucketRateLimiter(
+    "fdr", settings.FDR_RATE_LIMIT_PER_SECOND, settings.FDR_RATE_LIMIT_BURST
+)
@@ -0,0 +1,119 @@
+"""OpenTelemetry tracing
+
+Disabled unless TRACING_ENABLED is set; `tracer` is then a no-op, so spans in
+service code cost next to nothing. When enabled, setup_tracing() installs a
+tracer provider and instruments FastAPI, SQLAlchemy, Redis, httpx and Celery.
+The Celery instrumentation injects the trace context into task headers on
+publish and restores it in the worker, so a request or beat-triggered
+pipeline shows up as one trace across processes.
+
+Exporters (TRACING_EXPORTER):
+    otlp     OTLP/HTTP to TRACING_OTLP_ENDPOINT (e.g. a local collector or Jaeger)
+    file     One JSON span per line in TRACING_FILE_PATH (tests, offline debugging)
+    console  Pretty-printed spans on stdout
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("valuehunt")
+
+_configured = False
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(lines)
+        except OSError as e:
+            logger.warning(f"Failed to write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _span_processor():
+    exporter_name = settings.TRACING_EXPORTER.lower()
+
+    if exporter_name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT))
+    if exporter_name == "file":
+        return SimpleSpanProcessor(JsonLinesSpanExporter(settings.TRACING_FILE_PATH))
+    if exporter_name == "console":
+        return SimpleSpanProcessor(ConsoleSpanExporter())
+
+    raise ValueError(f"Unknown TRACING_EXPORTER: {settings.TRACING_EXPORTER}")
+
+
+def setup_tracing(service_name: str, app=None) -> bool:
+    """
+    Configure tracing for this process (no-op unless TRACING_ENABLED)
+
+    Args:
+        service_name: Resource service.name (valuehunt-api, valuehunt-worker)
+        app: FastAPI application to instrument
+
+    Returns:
+        True if tracing is active
+    """
+    global _configured
+    if not settings.TRACING_ENABLED:
+        return False
+
+    if not _configured:
+        from opentelemetry.instrumentation.celery import CeleryInstrumentor
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        from opentelemetry.instrumentation.redis import RedisInstrumentor
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+
+        from app.db.database import async_engine, engine
+
+        provider = TracerProvider(resource=Resource.create({SERVICE_NAME: service_name}))
+        provider.add_span_processor(_span_processor())
+        trace.set_tracer_provider(provider)
+
+        SQLAlchemyInstrumentor().instrument(engines=[engine, async_engine.sync_engine])
+        RedisInstrumentor().instrument()
+        HTTPXClientInstrumentor().instrument()
+        CeleryInstrumentor().instrument()
+
+        _configured = True
+        logger.info(f"Tracing enabled for {service_name} ({settings.TRACING_EXPORTER})")
+
+    if app is not None:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+        FastAPIInstrumentor.instrument_app(app, excluded_urls="/health,/metrics")
+
+    return True
@@ -0,0 +1,142 @@
+"""Bulk insert helpers using the database's native ON CONFLICT and COPY support"""
+
+import io
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import JSON, Date, DateTime, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Rows per INSERT statement (keeps bind parameters well below driver limits)
+BULK_CHUNK_SIZE = 1000
+
+# Rows per executemany batch in bulk_load_frame (one statement, many parameter sets)
+LOAD_CHUNK_SIZE = 50_000
+
+
+def _insert(db: Session, model):
+    """Dialect-specific insert construct (PostgreSQL in production, SQLite in tests)"""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def bulk_insert_ignore(
+    db: Session, model, rows: List[Dict[str, Any]], conflict_columns: List[str]
+) -> int:
+    """
+    INSERT ... ON CONFLICT (conflict_columns) DO NOTHING
+
+    Args:
+        db: Database session (caller commits)
+        model: SQLAlchemy model class
+        rows: Column -> value dictionaries
+        conflict_columns: Columns of the unique constraint to deduplicate on
+
+    Returns:
+        Number of rows actually inserted
+    """
+    inserted = 0
+    for i in range(0, len(rows), BULK_CHUNK_SIZE):
+        stmt = (
+            _insert(db, model)
+            .values(rows[i : i + BULK_CHUNK_SIZE])
+            .on_conflict_do_nothing(index_elements=conflict_columns)
+        )
+        inserted += db.execute(stmt).rowcount
+    return inserted
+
+
+def _sqlite_columns(table, frame: pd.DataFrame) -> List[list]:
+    """Column values in SQLAlchemy's SQLite storage format, converted a column at a time"""
+    columns = []
+    for name in frame.columns:
+        column_type = table.c[name].type
+        values = frame[name]
+        if isinstance(column_type, JSON):
+            values = values.map(json.dumps)
+        elif isinstance(column_type, (DateTime, Date)):
+            # Format each distinct value once (a price history has only a few thousand dates)
+            fmt = "%Y-%m-%d %H:%M:%S.%f" if isinstance(column_type, DateTime) else "%Y-%m-%d"
+            codes, uniques = pd.factorize(pd.to_datetime(values))
+            values = pd.Series(np.asarray(uniques.strftime(fmt), dtype=object)[codes])
+            values[codes == -1] = None
+        if values.isna().any():
+            values = values.astype(object).where(values.notna(), None)
+        columns.append(values.tolist())
+    return columns
+
+
+def bulk_load_frame(db: Session, model, frame: pd.DataFrame) -> int:
+    """
+    Append a DataFrame to a table as fast as the backend allows
+
+    PostgreSQL uses COPY FROM STDIN, SQLite a raw executemany with values
+    pre-converted per column, anything else chunked ORM-less INSERTs. No
+    conflict handling and no Python-side column defaults - meant for loading
+    complete rows into empty tables.
+
+    Args:
+        db: Database session (caller commits)
+        model: SQLAlchemy model class
+        frame: One column per table column to load (NaN/None become NULL)
+
+    Returns:
+        Number of rows loaded
+    """
+    if frame.empty:
+        return 0
+
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    column_list = ", ".join(frame.columns)
+
+    if dialect == "postgresql":
+        frame = frame.copy()
+        for name in frame.columns:
+            if isinstance(table.c[name].type, JSON):
+                frame[name] = frame[name].map(json.dumps)
+
+        buffer = io.StringIO()
+        frame.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+        return len(frame)
+
+    if dialect == "sqlite":
+        # Building secondary indexes once after the load is several times faster
+        # than maintaining them row by row
+        connection = db.connection()
+        for index in table.indexes:
+            index.drop(connection, checkfirst=True)
+
+        placeholders = ", ".join("?" for _ in frame.columns)
+        cursor = connection.connection.cursor()
+        try:
+            for i in range(0, len(frame), LOAD_CHUNK_SIZE):
+                cursor.executemany(
+                    f"INSERT INTO {table.name} ({column_list}) VALUES ({placeholders})",
+                    zip(*_sqlite_columns(table, frame.iloc[i : i + LOAD_CHUNK_SIZE])),
+                )
+        finally:
+            cursor.close()
+
+        for index in table.indexes:
+            index.create(connection)
+        return len(frame)
+
+    stmt = insert(table)
+    for i in range(0, len(frame), LOAD_CHUNK_SIZE):
+        chunk = frame.iloc[i : i + LOAD_CHUNK_SIZE].astype(object)
+        db.execute(stmt, chunk.where(chunk.notna(), None).to_dict("records"))
+    return len(frame)
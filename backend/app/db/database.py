@@ -1,6 +1,20 @@
-"""Database connection and session management"""
+"""Database connection and session management
+
+Two engines share one database:
+
+- `engine` / `get_db`: synchronous (psycopg2). Celery tasks, services and
+  the sync API routes, which FastAPI runs in its threadpool.
+- `async_engine` / `get_async_db`: asyncio (asyncpg, aiosqlite for SQLite).
+  `async def` API routes, so a request waiting on the database does not
+  block the event loop. Its pool is sized separately (ASYNC_DB_POOL_SIZE),
+  since one worker's event loop multiplexes many requests over it.
+"""
+
+from typing import AsyncIterator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -18,13 +32,49 @@ else:
     engine = create_engine(
         settings.DATABASE_URL,
         pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=20,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
     )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """
+    The same database URL with its asyncio driver
+
+    e.g. postgresql://... -> postgresql+asyncpg://...,
+    sqlite:///./test.db -> sqlite+aiosqlite:///./test.db
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend} databases")
+    parsed = parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    if "sslmode" in parsed.query:
+        # libpq spelling; asyncpg calls it ssl
+        sslmode = parsed.query["sslmode"]
+        parsed = parsed.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return parsed.render_as_string(hide_password=False)
+
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(async_database_url(settings.DATABASE_URL))
+else:
+    async_engine = create_async_engine(
+        async_database_url(settings.DATABASE_URL),
+        pool_pre_ping=True,
+        pool_size=settings.ASYNC_DB_POOL_SIZE,
+        max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    )
+
+# Objects stay usable after commit: lazy refreshes are not possible outside
+# the async session's greenlet
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -36,3 +86,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async database session dependency"""
+    async with AsyncSessionLocal() as db:
+        yield db
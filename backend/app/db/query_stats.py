@@ -0,0 +1,121 @@
+"""Per-request / per-task SQL query accounting
+
+SQLAlchemy cursor events count every statement executed while a
+track_queries() block is active in the current context (request, Celery task
+or test). Identical statements repeated many times in one block are the usual
+signature of an N+1 loop, so the most repeated statement is reported too.
+
+Usage:
+    with track_queries() as stats:
+        ...
+    stats.count, stats.duration_ms, stats.most_repeated()
+"""
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+@dataclass
+class QueryStats:
+    """Queries executed inside one tracked block"""
+
+    count: int = 0
+    duration_ms: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def most_repeated(self) -> Tuple[Optional[str], int]:
+        """Most frequently executed statement and how often it ran"""
+        if not self.statements:
+            return None, 0
+        return self.statements.most_common(1)[0]
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (https://w3c.github.io/server-timing/)"""
+        return f'db;dur={self.duration_ms:.1f};desc="{self.count} queries"'
+
+    def warn_if_excessive(
+        self,
+        label: str,
+        max_count: Optional[int] = None,
+        max_ms: Optional[float] = None,
+        max_repeats: Optional[int] = None,
+    ) -> bool:
+        """
+        Log a warning when the block exceeded any of the given thresholds
+
+        Args:
+            label: What was tracked (e.g. "GET /api/v1/stocks/005930")
+            max_count: Maximum number of queries (None to skip the check)
+            max_ms: Maximum total DB time in milliseconds (None to skip)
+            max_repeats: Maximum executions of one statement (None to skip)
+
+        Returns:
+            True if a warning was logged
+        """
+        problems = []
+        if max_count is not None and self.count > max_count:
+            problems.append(f"{self.count} queries")
+        if max_ms is not None and self.duration_ms > max_ms:
+            problems.append(f"{self.duration_ms:.0f}ms in DB")
+
+        statement, repeats = self.most_repeated()
+        if max_repeats is not None and repeats > max_repeats:
+            problems.append(
+                f"possible N+1: statement ran {repeats} times: {' '.join(statement.split())[:200]}"
+            )
+
+        if problems:
+            logger.warning(f"{label}: {'; '.join(problems)}")
+        return bool(problems)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count queries executed in the current context until the block exits"""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def start_tracking() -> Tuple[QueryStats, object]:
+    """Begin tracking outside a with-block (e.g. across Celery signals)"""
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_tracking(token) -> None:
+    _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+
+    starts = conn.info.get("query_start_time")
+    if starts:
+        stats.duration_ms += (time.perf_counter() - starts.pop()) * 1000
+    stats.count += 1
+    stats.statements[statement] += 1
@@ -0,0 +1,46 @@
+"""Redis connection management"""
+
+import asyncio
+import weakref
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+_redis_client: Optional[redis.Redis] = None
+
+# asyncio clients are bound to the loop they were created on (Celery tasks may
+# run several short-lived loops per process), so keep one client per loop
+_async_redis_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_redis() -> redis.Redis:
+    """Get shared synchronous Redis client (lazily created)"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+    return _redis_client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Get asyncio Redis client for the running event loop (lazily created)"""
+    loop = asyncio.get_running_loop()
+    client = _async_redis_clients.get(loop)
+    if client is None:
+        client = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+        _async_redis_clients[loop] = client
+    return client
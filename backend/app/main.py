@@ -5,10 +5,16 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.core.config import settings
 from app.core.logging_config import setup_logging
+from app.core.middleware import QueryStatsMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.tracing import setup_tracing
+from app.core.metrics import get_registry
 
 # Setup logging
 setup_logging()
@@ -42,8 +48,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "X-Total-Count", "X-Next-Cursor", "Link"],
 )
 
+# SQL query count / DB time per request (Server-Timing header, N+1 warnings)
+app.add_middleware(QueryStatsMiddleware)
+
+# Opt-in profiling (PROFILING_ENABLED + X-Profile admin header)
+app.add_middleware(ProfilingMiddleware)
+
+# HTTP request metrics (exposed with the task/upstream/queue metrics at /metrics)
+Instrumentator(excluded_handlers=["/metrics", "/health"]).instrument(app)
+
 
 # Health check endpoint
 @app.get("/health")
@@ -56,6 +72,13 @@ async def health_check():
     }
 
 
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics (samples Celery queue depths from Redis on each scrape)"""
+    return Response(generate_latest(get_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -95,6 +118,9 @@ app.include_router(chat.router, prefix="/api/v1/chat", tags=["Chat"])
 app.include_router(ai.router, prefix="/api/v1/ai", tags=["AI"])
 app.include_router(backtest.router, prefix="/api/v1", tags=["Backtest"])
 
+# OpenTelemetry (no-op unless TRACING_ENABLED)
+setup_tracing("valuehunt-api", app=app)
+
 
 if __name__ == "__main__":
     import uvicorn
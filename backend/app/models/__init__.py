@@ -7,6 +7,9 @@ from app.models.value_score import ValueScore
 from app.models.watchlist import Watchlist
 from app.models.screener_filter import ScreenerFilter
 from app.models.insider_trading import InsiderTrading
+from app.models.insider_signal import InsiderSignal
+from app.models.dataset_version import DatasetVersion
+from app.models.stock_snapshot import StockSnapshot
 from app.models.backtest import (
     BacktestRun,
     BacktestRecommendation,
@@ -24,6 +27,9 @@ __all__ = [
     "Watchlist",
     "ScreenerFilter",
     "InsiderTrading",
+    "InsiderSignal",
+    "DatasetVersion",
+    "StockSnapshot",
     "BacktestRun",
     "BacktestRecommendation",
     "BacktestSchedule",
@@ -4,7 +4,7 @@ Backtesting models for AI stock recommendation algorithm validation.
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum as SQLEnum, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
@@ -64,6 +64,11 @@ class BacktestRun(Base):
     # Relationships
     recommendations = relationship("BacktestRecommendation", back_populates="backtest_run", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination of the run listing (newest first)
+        Index('ix_backtest_runs_created_at_id', 'created_at', 'id'),
+    )
+
 
 class BacktestRecommendation(Base):
     """
@@ -113,6 +118,11 @@ class BacktestRecommendation(Base):
     backtest_run = relationship("BacktestRun", back_populates="recommendations")
     stock = relationship("Stock")
 
+    __table_args__ = (
+        # Keyset pagination of one run's recommendations by rank
+        Index('ix_backtest_recommendations_run_rank', 'backtest_run_id', 'recommendation_rank', 'id'),
+    )
+
 
 class BacktestSchedule(Base):
     """
@@ -163,6 +173,8 @@ class HistoricalStockPrice(Base):
 
     # Unique constraint: one price record per stock per date
     __table_args__ = (
+        # Latest price on or before a date, per stock
+        Index('ix_historical_stock_prices_stock_code_date', 'stock_code', 'date'),
         {'sqlite_autoincrement': True},
     )
 
@@ -209,5 +221,11 @@ class HistoricalFinancialMetrics(Base):
     stock = relationship("Stock")
 
     __table_args__ = (
+        # Latest metrics snapshot on or before a date, per stock
+        Index(
+            'ix_historical_financial_metrics_stock_code_snapshot_date',
+            'stock_code',
+            'snapshot_date',
+        ),
         {'sqlite_autoincrement': True},
     )
@@ -1,9 +1,13 @@
 """Base model and common mixins"""
 
 from datetime import datetime
-from sqlalchemy import Column, DateTime
+from sqlalchemy import JSON, Column, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declared_attr
 
+# JSONB on PostgreSQL, plain JSON elsewhere (SQLite test and benchmark databases)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 class TimestampMixin:
     """Mixin for created_at and updated_at timestamps"""
@@ -0,0 +1,18 @@
+"""Dataset Version model"""
+
+from sqlalchemy import Column, String, BigInteger
+
+from app.db.database import Base
+from app.models.base import TimestampMixin
+
+
+class DatasetVersion(Base, TimestampMixin):
+    """Epoch counter per dataset, bumped whenever a pipeline stage commits new data"""
+
+    __tablename__ = "dataset_versions"
+
+    dataset = Column(String(32), primary_key=True)  # stocks, prices, value_scores, ...
+    epoch = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DatasetVersion(dataset={self.dataset}, epoch={self.epoch})>"
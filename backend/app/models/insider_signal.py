@@ -0,0 +1,44 @@
+"""Insider Signal model"""
+
+from sqlalchemy import Column, String, Date, Integer, BigInteger, Numeric, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.db.database import Base
+from app.models.base import TimestampMixin
+
+
+class InsiderSignal(Base, TimestampMixin):
+    """Precomputed per-stock insider trading signal (refreshed when filings are ingested)"""
+
+    __tablename__ = "insider_signals"
+
+    stock_code = Column(
+        String(10), ForeignKey("stocks.code", ondelete="CASCADE"), primary_key=True
+    )
+    as_of_date = Column(Date, nullable=False, index=True)  # 기준일
+    last_rcept_dt = Column(Date, nullable=True)  # 최근 공시 접수일자
+
+    # Net change in shares held by insiders (buys - sells)
+    net_shares_30d = Column(BigInteger, nullable=False, default=0)
+    net_shares_90d = Column(BigInteger, nullable=False, default=0, index=True)
+    net_shares_180d = Column(BigInteger, nullable=False, default=0)
+
+    # Transaction counts over 180 days
+    transaction_count = Column(Integer, nullable=False, default=0)
+    buy_count = Column(Integer, nullable=False, default=0)
+    sell_count = Column(Integer, nullable=False, default=0)
+
+    distinct_buyers_90d = Column(Integer, nullable=False, default=0, index=True)
+
+    largest_holder = Column(String(100), nullable=True)  # 최대 보유 보고자
+    largest_holding_rate = Column(Numeric(10, 4), nullable=True)  # 보유 비율 (%)
+    recent_trend = Column(String(10), nullable=False, default="중립")  # 매수우세, 매도우세, 중립
+
+    # Relationship
+    stock = relationship("Stock", back_populates="insider_signal")
+
+    def __repr__(self):
+        return (
+            f"<InsiderSignal(stock_code={self.stock_code}, "
+            f"net_shares_90d={self.net_shares_90d}, trend={self.recent_trend})>"
+        )
@@ -1,11 +1,10 @@
 """Screener Filter model"""
 
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, Integer, String, ForeignKey, Uuid
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
-from app.models.base import TimestampMixin
+from app.models.base import JSONType, TimestampMixin
 
 
 class ScreenerFilter(Base, TimestampMixin):
@@ -14,9 +13,9 @@ class ScreenerFilter(Base, TimestampMixin):
     __tablename__ = "screener_filters"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
-    filters = Column(JSONB, nullable=False)  # JSON object with filter criteria
+    filters = Column(JSONType, nullable=False)  # JSON object with filter criteria
 
     # Relationships
     user = relationship("User", back_populates="screener_filters")
@@ -44,6 +44,12 @@ class Stock(Base, TimestampMixin):
         cascade="all, delete-orphan",
         order_by="InsiderTrading.rcept_dt.desc()",
     )
+    insider_signal = relationship(
+        "InsiderSignal",
+        back_populates="stock",
+        cascade="all, delete-orphan",
+        uselist=False,
+    )
 
     def __repr__(self):
         return f"<Stock(code={self.code}, name={self.name}, market={self.market})>"
@@ -0,0 +1,92 @@
+"""Stock Snapshot model"""
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+)
+from sqlalchemy.orm import synonym
+
+from app.db.database import Base
+from app.models.base import JSONType
+
+
+class StockSnapshot(Base):
+    """
+    Latest price, metrics and scores per stock (rebuilt at the end of each scoring run)
+
+    Columns carry the names they have on Stock, FinancialMetrics and
+    ValueScore, so a row can stand in for any of them (e.g. build_card).
+    """
+
+    __tablename__ = "stock_snapshots"
+
+    stock_code = Column(
+        String(10), ForeignKey("stocks.code", ondelete="CASCADE"), primary_key=True
+    )
+    code = synonym("stock_code")
+
+    # Stock
+    name = Column(String(100), nullable=False)
+    market = Column(String(20), nullable=False)
+    sector = Column(String(50))
+    market_cap = Column(BigInteger)
+    current_price = Column(Integer)
+    change_rate = Column(Numeric(5, 2))
+    updated_at = Column(DateTime, nullable=False)  # stocks.updated_at
+
+    # Latest FinancialMetrics row
+    metrics_date = Column(Date)
+    per = Column(Numeric(10, 2))
+    pbr = Column(Numeric(10, 2))
+    psr = Column(Numeric(10, 2))
+    ev_ebitda = Column(Numeric(10, 2))
+    roe = Column(Numeric(5, 2))
+    roa = Column(Numeric(5, 2))
+    operating_margin = Column(Numeric(5, 2))
+    net_profit_growth = Column(Numeric(5, 2))
+    debt_ratio = Column(Numeric(5, 2))
+    current_ratio = Column(Numeric(5, 2))
+    interest_coverage = Column(Numeric(10, 2))
+    operating_cashflow = Column(BigInteger)
+    dividend_yield = Column(Numeric(5, 2))
+    dividend_payout_ratio = Column(Numeric(5, 2))
+    consecutive_dividend_years = Column(Integer)
+
+    # Latest ValueScore row
+    score_date = Column(Date)
+    total_score = Column(Numeric(5, 2))
+    valuation_score = Column(Numeric(5, 2))
+    profitability_score = Column(Numeric(5, 2))
+    stability_score = Column(Numeric(5, 2))
+    dividend_score = Column(Numeric(5, 2))
+    upside_potential = Column(Numeric(5, 2))
+    ai_summary = Column(Text)
+    strengths = Column(JSONType)
+    risks = Column(JSONType)
+
+    # Previous ValueScore row
+    previous_score_date = Column(Date)
+    previous_total_score = Column(Numeric(5, 2))
+    total_score_change = Column(Numeric(6, 2))  # total_score - previous_total_score
+
+    refreshed_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # Latest-run universe, ranked (top picks, screener)
+        Index('ix_stock_snapshots_score_date_total', 'score_date', 'total_score'),
+        Index('ix_stock_snapshots_market', 'market'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<StockSnapshot(stock_code={self.stock_code}, score_date={self.score_date}, "
+            f"total_score={self.total_score})>"
+        )
@@ -1,10 +1,10 @@
 """Value Score model"""
 
 from sqlalchemy import Column, Integer, String, Date, Numeric, Text, ForeignKey, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
+from app.models.base import JSONType
 
 
 class ValueScore(Base):
@@ -28,8 +28,8 @@ class ValueScore(Base):
     ai_summary = Column(Text)  # AI-generated summary text
 
     # Structured AI Insights (JSON arrays)
-    strengths = Column(JSONB)  # List of strength points: [{"text": "..."}, ...]
-    risks = Column(JSONB)  # List of risk points: [{"text": "..."}, ...]
+    strengths = Column(JSONType)  # List of strength points: [{"text": "..."}, ...]
+    risks = Column(JSONType)  # List of risk points: [{"text": "..."}, ...]
 
     # Relationships
     stock = relationship("Stock", back_populates="value_scores")
@@ -1,7 +1,6 @@
 """Watchlist model"""
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Uuid
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -14,7 +13,7 @@ class Watchlist(Base):
     __tablename__ = "watchlist"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     stock_code = Column(String(10), ForeignKey("stocks.code", ondelete="CASCADE"), nullable=False)
     target_price = Column(Integer)  # User's target price for the stock
     alert_enabled = Column(Boolean, default=True, nullable=False)
@@ -45,6 +45,13 @@ class InsiderTradingSummary(BaseModel):
     largest_holding_rate: Optional[Decimal] = None
     recent_trend: str  # "매수우세", "매도우세", "중립"
 
+    # Precomputed signal (insider_signals)
+    net_shares_30d: Optional[int] = None
+    net_shares_90d: Optional[int] = None
+    net_shares_180d: Optional[int] = None
+    distinct_buyers_90d: Optional[int] = None
+    as_of_date: Optional[date] = None
+
 
 class InsiderTradingListResponse(BaseModel):
     """Schema for insider trading list response"""
@@ -52,3 +59,29 @@ class InsiderTradingListResponse(BaseModel):
     data: List[InsiderTradingResponse]
     summary: InsiderTradingSummary
     total_count: int
+
+
+class InsiderBuyingItem(BaseModel):
+    """Stock ranked by recent insider buying"""
+
+    rank: int
+    stock_code: str
+    stock_name: str
+    market: str
+    current_price: Optional[int] = None
+    net_shares_30d: int
+    net_shares_90d: int
+    net_shares_180d: int
+    distinct_buyers_90d: int
+    largest_holder: Optional[str] = None
+    largest_holding_rate: Optional[Decimal] = None
+    last_rcept_dt: Optional[date] = None
+    recent_trend: str
+
+
+class InsiderBuyingResponse(BaseModel):
+    """Schema for the insider buying ranking"""
+
+    data: List[InsiderBuyingItem]
+    total_count: int
+    as_of_date: Optional[date] = None
@@ -80,6 +80,17 @@ class TopPicksResponse(BaseModel):
     updated_at: datetime
 
 
+class StockRankResponse(BaseModel):
+    """Schema for a stock's position in a top-picks ranking"""
+    stock_code: str
+    market: str
+    category: str
+    rank: int
+    score: float
+    total_count: int
+    score_date: date
+
+
 class StockDetailResponse(BaseModel):
     """Schema for detailed stock information"""
     stock_info: StockResponse
@@ -99,7 +110,13 @@ class ScreenerRequest(BaseModel):
     )
     sort_by: str = Field(default="value_score", description="Sort field")
     order: str = Field(default="desc", description="Sort order (asc/desc)")
+    sort: Optional[List[str]] = Field(
+        default=None,
+        description='Multi-key sort, "-" prefix for descending (overrides sort_by/order)',
+    )
+    facets: List[str] = Field(default_factory=list, description="Fields to count matches by (market, sector)")
     limit: int = Field(default=50, ge=1, le=100)
+    cursor: Optional[str] = Field(default=None, description="next_cursor of the previous page")
 
 
 class ScreenerResult(BaseModel):
@@ -118,3 +135,16 @@ class ScreenerResponse(BaseModel):
     results: List[ScreenerResult]
     total_count: int
     filters_applied: Dict[str, Any]
+    facets: Optional[Dict[str, Dict[str, int]]] = None
+    next_cursor: Optional[str] = None
+
+
+class SavedScreenResult(BaseModel):
+    """Stored result of a saved screener filter"""
+    filter_id: int
+    stock_codes: List[str]
+    total_count: int
+    added: List[str] = Field(default_factory=list, description="New matches since the previous scoring run")
+    removed: List[str] = Field(default_factory=list, description="Stocks that no longer match")
+    score_date: Optional[date] = None
+    evaluated_at: datetime
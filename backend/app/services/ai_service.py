@@ -7,14 +7,16 @@ import asyncio
 import json
 import re
 from datetime import datetime
-from typing import List, Any
+from typing import List, Any, Optional
 
 import google.generativeai as genai
 
 from app.core.config import settings
+from app.core.metrics import track_upstream
 from app.schemas.ai import (
     StockAnalysisRequest,
     StockAnalysisResponse,
+    StockMetrics,
     AIChatRequest,
     AIChatResponse,
     StrategyRequest,
@@ -33,7 +35,14 @@ class AIService:
         self.model_name = settings.GEMINI_MODEL
         self._configured = False
         if settings.GEMINI_API_KEY:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
+            endpoint = {}
+            if settings.GEMINI_API_ENDPOINT:
+                # Alternate server (e.g. loadtest/fake_gemini.py); REST honours http://
+                endpoint = {
+                    "transport": "rest",
+                    "client_options": {"api_endpoint": settings.GEMINI_API_ENDPOINT},
+                }
+            genai.configure(api_key=settings.GEMINI_API_KEY, **endpoint)
             self._configured = True
 
     def is_available(self) -> bool:
@@ -49,7 +58,8 @@ class AIService:
         prompt = self._build_stock_analysis_prompt(request)
 
         try:
-            response = await asyncio.to_thread(model.generate_content, prompt)
+            with track_upstream("gemini", "analyze_stock"):
+                response = await asyncio.to_thread(model.generate_content, prompt)
             return self._parse_stock_analysis(response.text)
         except Exception as e:
             raise ValueError(f"Failed to generate stock analysis: {str(e)}")
@@ -63,7 +73,8 @@ class AIService:
         prompt = self._build_chat_prompt(request)
 
         try:
-            response = await asyncio.to_thread(model.generate_content, prompt)
+            with track_upstream("gemini", "chat"):
+                response = await asyncio.to_thread(model.generate_content, prompt)
             text = response.text
             return AIChatResponse(
                 reply=text,
@@ -72,23 +83,33 @@ class AIService:
         except Exception as e:
             raise ValueError(f"Failed to generate chat response: {str(e)}")
 
-    async def execute_strategy(self, request: StrategyRequest) -> StrategyResponse:
-        """Execute a trading strategy analysis"""
+    async def execute_strategy(
+        self, request: StrategyRequest, insider_signals: Optional[List[dict]] = None
+    ) -> StrategyResponse:
+        """
+        Execute a trading strategy analysis
+
+        Args:
+            request: Strategy request
+            insider_signals: Ranked insider-buying candidates from the signal table,
+                used by the INSIDER_TRADING strategy instead of the model's guesses
+        """
         if not self._configured:
             raise ValueError("Gemini API key not configured")
 
         model = genai.GenerativeModel(self.model_name)
-        prompt = self._build_strategy_prompt(request)
+        prompt = self._build_strategy_prompt(request, insider_signals)
 
         try:
-            response = await asyncio.to_thread(model.generate_content, prompt)
+            with track_upstream("gemini", "execute_strategy"):
+                response = await asyncio.to_thread(model.generate_content, prompt)
             return self._parse_strategy_response(response.text, request.strategyType)
         except Exception as e:
             raise ValueError(f"Failed to execute strategy: {str(e)}")
 
     def _build_stock_analysis_prompt(self, request: StockAnalysisRequest) -> str:
         """Build prompt for stock analysis"""
-        metrics = request.metrics or {}
+        metrics = request.metrics or StockMetrics()
 
         return f"""당신은 한국 주식 시장 전문 애널리스트입니다. 다음 종목에 대한 간결하고 명확한 투자 분석을 제공해주세요.
 
@@ -135,11 +156,16 @@ JSON만 출력하고 다른 텍스트는 포함하지 마세요."""
 
         return prompt
 
-    def _build_strategy_prompt(self, request: StrategyRequest) -> str:
+    def _build_strategy_prompt(
+        self, request: StrategyRequest, insider_signals: Optional[List[dict]] = None
+    ) -> str:
         """Build prompt based on strategy type"""
         market = request.market or "한국"
         stock_count = request.stockCount
 
+        if request.strategyType == StrategyType.INSIDER_TRADING and insider_signals:
+            return self._build_insider_trading_prompt(market, stock_count, insider_signals)
+
         strategy_prompts = {
             StrategyType.UNDERVALUED_SCREENER: self._build_undervalued_prompt(market, stock_count),
             StrategyType.FEAR_DRIVEN_QUALITY: self._build_fear_driven_prompt(market, stock_count),
@@ -284,10 +310,27 @@ JSON만 출력하고 다른 텍스트는 포함하지 마세요."""
 
 JSON만 출력하고 다른 텍스트는 포함하지 마세요."""
 
-    def _build_insider_trading_prompt(self, market: str, stock_count: int) -> str:
+    def _build_insider_trading_prompt(
+        self, market: str, stock_count: int, insider_signals: Optional[List[dict]] = None
+    ) -> str:
+        candidates = ""
+        if insider_signals:
+            lines = [
+                f"- {s['stock_name']} ({s['stock_code']}, {s['market']}): "
+                f"90일 순매수 {s['net_shares_90d']:,}주, 30일 순매수 {s['net_shares_30d']:,}주, "
+                f"180일 순매수 {s['net_shares_180d']:,}주, 90일 매수 내부자 {s['distinct_buyers_90d']}명, "
+                f"최대 보유자 {s.get('largest_holder') or 'N/A'}"
+                for s in insider_signals
+            ]
+            candidates = (
+                "\n\nDART 임원ㆍ주요주주 소유보고 기반 내부자 순매수 상위 종목 (실제 공시 집계):\n"
+                + "\n".join(lines)
+                + "\n\n반드시 위 목록에 있는 종목 중에서만 선정하고, 위 수치를 근거로 분석해주세요."
+            )
+
         return f"""당신은 한국 주식 시장의 내부자 거래 분석 전문가입니다.
 
-현재 {market} 주식 시장에서 임원 및 대주주가 지속적으로 자사주를 매수하고 있는 종목 {stock_count}개를 찾아주세요.
+현재 {market} 주식 시장에서 임원 및 대주주가 지속적으로 자사주를 매수하고 있는 종목 {stock_count}개를 찾아주세요.{candidates}
 
 분석 기준:
 - 최근 6개월간 내부자(임원, 대주주) 순매수 패턴
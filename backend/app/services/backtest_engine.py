@@ -14,8 +14,10 @@ from app.models.backtest import (
     BacktestRun,
     BacktestStatus,
 )
+from app.core.tracing import tracer
 from app.models.stock import Stock
 from app.services.ai_service import AIService
+from app.services.dataset_epochs import BACKTESTS, DatasetEpochs
 from app.services.historical_data_service import HistoricalDataService
 from app.services.value_scorer import ValueScorer
 
@@ -50,25 +52,39 @@ class BacktestEngine:
             # Update status to running
             backtest.status = BacktestStatus.RUNNING
             backtest.started_at = datetime.utcnow()
+            DatasetEpochs(self.db).bump(BACKTESTS)
             self.db.commit()
 
             logger.info(f"Starting backtest run {backtest_run_id}: {backtest.name}")
 
             # Step 1: Generate recommendations at the simulation date
-            recommendations = await self._generate_historical_recommendations(backtest)
+            with tracer.start_as_current_span(
+                "backtest.generate_recommendations",
+                attributes={"backtest.id": backtest_run_id},
+            ):
+                recommendations = await self._generate_historical_recommendations(backtest)
 
             if not recommendations:
                 raise ValueError("No recommendations generated")
 
             # Step 2: Calculate actual performance after holding period
-            await self._calculate_performance(backtest, recommendations)
+            with tracer.start_as_current_span(
+                "backtest.calculate_performance",
+                attributes={"backtest.id": backtest_run_id},
+            ):
+                await self._calculate_performance(backtest, recommendations)
 
             # Step 3: Calculate aggregate statistics
-            await self._calculate_statistics(backtest)
+            with tracer.start_as_current_span(
+                "backtest.calculate_statistics",
+                attributes={"backtest.id": backtest_run_id},
+            ):
+                await self._calculate_statistics(backtest)
 
             # Update status to completed
             backtest.status = BacktestStatus.COMPLETED
             backtest.completed_at = datetime.utcnow()
+            DatasetEpochs(self.db).bump(BACKTESTS)
             self.db.commit()
 
             logger.info(f"Backtest run {backtest_run_id} completed successfully")
@@ -79,6 +95,7 @@ class BacktestEngine:
             backtest.status = BacktestStatus.FAILED
             backtest.error_message = str(e)
             backtest.completed_at = datetime.utcnow()
+            DatasetEpochs(self.db).bump(BACKTESTS)
             self.db.commit()
             raise
 
@@ -136,20 +153,21 @@ class BacktestEngine:
         """
         stock_scores = []
 
-        for stock in stocks:
-            # Get historical price at simulation date
-            historical_price = self.historical_service.get_historical_price(
-                stock.code, backtest.simulation_date
-            )
+        # Historical prices and metrics at simulation date, one query each
+        stock_codes = [stock.code for stock in stocks]
+        historical_prices = self.historical_service.get_historical_price_batch(
+            stock_codes, backtest.simulation_date
+        )
+        historical_metrics_by_code = self.historical_service.get_historical_metrics_batch(
+            stock_codes, backtest.simulation_date
+        )
 
+        for stock in stocks:
+            historical_price = historical_prices.get(stock.code)
             if not historical_price:
                 continue
 
-            # Get historical metrics at simulation date
-            historical_metrics = self.historical_service.get_historical_metrics(
-                stock.code, backtest.simulation_date
-            )
-
+            historical_metrics = historical_metrics_by_code.get(stock.code)
             if not historical_metrics:
                 continue
 
@@ -171,7 +189,7 @@ class BacktestEngine:
                 debt_ratio=historical_metrics.debt_ratio,
                 current_ratio=historical_metrics.current_ratio,
                 interest_coverage=historical_metrics.interest_coverage,
-                operating_cash_flow=historical_metrics.operating_cash_flow,
+                operating_cashflow=historical_metrics.operating_cash_flow,
                 dividend_yield=historical_metrics.dividend_yield,
                 dividend_payout_ratio=historical_metrics.dividend_payout_ratio,
                 consecutive_dividend_years=historical_metrics.consecutive_dividend_years,
@@ -282,12 +300,18 @@ class BacktestEngine:
 
         end_date = backtest.simulation_date + timedelta(days=30 * backtest.holding_period_months)
 
-        for rec in recommendations:
-            # Get price performance during holding period
-            performance = self.historical_service.get_price_return(
-                rec.stock_code, backtest.simulation_date, end_date
-            )
+        # Reload the committed recommendations in one query, not one refresh each
+        self.db.query(BacktestRecommendation).filter(
+            BacktestRecommendation.backtest_run_id == backtest.id
+        ).all()
 
+        # Get price performance during holding period
+        performances = self.historical_service.get_price_return_batch(
+            [rec.stock_code for rec in recommendations], backtest.simulation_date, end_date
+        )
+
+        for rec in recommendations:
+            performance = performances.get(rec.stock_code)
             if performance:
                 rec.price_after_holding = performance["end_price"]
                 rec.actual_return_pct = performance["return_pct"]
@@ -434,6 +458,7 @@ class BacktestEngine:
             self.db.add(backtest)
             backtest_runs.append(backtest)
 
+        DatasetEpochs(self.db).bump(BACKTESTS)
         self.db.commit()
 
         logger.info(f"Created {len(backtest_runs)} backtest runs from {start_date.date()} to {end_date.date()}")
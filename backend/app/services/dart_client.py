@@ -0,0 +1,319 @@
+"""Native asyncio client for the DART Open API
+
+Uses one pooled httpx connection set (keep-alive) per client and a semaphore to
+bound in-flight requests. Every request also takes a token from the shared DART
+rate limiter, so many concurrent clients across workers stay within the limit.
+
+Usage:
+    async with AsyncDartClient() as client:
+        statements = await client.fetch_financial_statements(corp_code, 2024)
+"""
+
+import asyncio
+import io
+import logging
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pandas as pd
+
+from app.core.config import settings
+from app.core.metrics import track_upstream
+from app.core.rate_limiter import dart_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+DART_API_BASE_URL = "https://opendart.fss.or.kr/api"
+
+# DART status codes (https://opendart.fss.or.kr/guide/main.do)
+DART_STATUS_OK = "000"
+DART_STATUS_NO_DATA = "013"
+
+# Maximum corp_codes per multi-company key-account request (fnlttMultiAcnt)
+MULTI_ACCOUNT_MAX_CORPS = 100
+
+# stock_code -> corp_code, shared by all clients in the process
+_corp_code_map: Dict[str, str] = {}
+
+
+def split_statements(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Split raw statement rows into 'BS', 'IS', 'CF' DataFrames by sj_div
+
+    Companies filing a single statement of comprehensive income report
+    revenue and net income under CIS; those rows go with IS (pivot_accounts
+    reads CIS as IS, and an IS row comes first when both exist).
+    """
+    return {
+        "BS": df[df["sj_div"] == "BS"],  # Balance Sheet
+        "IS": df[df["sj_div"].isin(["IS", "CIS"])],  # Income Statement
+        "CF": df[df["sj_div"] == "CF"],  # Cash Flow
+    }
+
+
+class AsyncDartClient:
+    """Async DART API client with pooled HTTP connections and bounded concurrency"""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            api_key: DART API key (defaults to settings.DART_API_KEY)
+            max_concurrency: Maximum in-flight requests for this client
+            timeout: Per-request timeout in seconds
+        """
+        self.api_key = api_key if api_key is not None else settings.DART_API_KEY
+        self.max_concurrency = max_concurrency or settings.DART_MAX_CONCURRENCY
+        self.timeout = timeout or settings.DART_HTTP_TIMEOUT
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = None
+        self._corp_code_lock = None
+
+    def is_available(self) -> bool:
+        """Check if DART API key is configured"""
+        return bool(self.api_key)
+
+    async def __aenter__(self) -> "AsyncDartClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Create the pooled HTTP client"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=DART_API_BASE_URL,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._corp_code_lock = asyncio.Lock()
+
+    async def close(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+            self._corp_code_lock = None
+
+    async def _request(self, path: str, params: Dict[str, Any]) -> httpx.Response:
+        """Send a GET request respecting the concurrency bound and rate limit"""
+        if self._client is None:
+            await self.open()
+
+        async with self._semaphore:
+            await dart_rate_limiter.acquire_async()
+            with track_upstream("dart", path):
+                response = await self._client.get(
+                    path, params={"crtfc_key": self.api_key, **params}
+                )
+                response.raise_for_status()
+            return response
+
+    async def _get_list(self, path: str, params: Dict[str, Any]) -> Optional[List[Dict]]:
+        """
+        Call a JSON endpoint and return its `list` payload
+
+        Returns:
+            List of records, empty list if DART has no data, or None on error
+        """
+        try:
+            response = await self._request(path, params)
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"DART request {path} failed: {e}")
+            return None
+
+        status = payload.get("status")
+        if status == DART_STATUS_NO_DATA:
+            return []
+        if status != DART_STATUS_OK:
+            logger.error(
+                f"DART request {path} returned status {status}: {payload.get('message')}"
+            )
+            return None
+
+        return payload.get("list", [])
+
+    async def fetch_statement_rows(
+        self,
+        corp_code: str,
+        year: int,
+        reprt_code: str = "11011",
+        fs_div: str = "CFS",
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch raw full financial statement rows (fnlttSinglAcntAll)
+
+        Args:
+            corp_code: 8-digit DART corporation code
+            year: Fiscal year (YYYY format)
+            reprt_code: Report code - 11011=Annual, 11012=Semi-annual, 11013=Q1, 11014=Q3
+            fs_div: CFS=Consolidated, OFS=Separate
+
+        Returns:
+            DataFrame with one row per account or None if failed/empty
+        """
+        records = await self._get_list(
+            "/fnlttSinglAcntAll.json",
+            {
+                "corp_code": corp_code,
+                "bsns_year": str(year),
+                "reprt_code": reprt_code,
+                "fs_div": fs_div,
+            },
+        )
+
+        if not records:
+            logger.warning(f"No data for corp {corp_code}, year {year}")
+            return None
+
+        return pd.DataFrame(records)
+
+    async def fetch_financial_statements(
+        self,
+        corp_code: str,
+        year: int,
+        reprt_code: str = "11011",
+        fs_div: str = "CFS",
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Fetch full financial statements split by statement type
+
+        Returns:
+            Dictionary with 'BS', 'IS', 'CF' DataFrames or None if failed
+        """
+        df = await self.fetch_statement_rows(corp_code, year, reprt_code, fs_div)
+        if df is None:
+            return None
+
+        return split_statements(df)
+
+    async def fetch_multi_company_accounts(
+        self,
+        corp_codes: List[str],
+        year: int,
+        reprt_code: str = "11011",
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch key accounts for many companies per request (fnlttMultiAcnt)
+
+        DART returns the main BS/IS accounts (자산총계, 부채총계, 매출액, 영업이익,
+        당기순이익, ...) for up to 100 corp_codes per call. Larger lists are split
+        and fetched concurrently.
+
+        Args:
+            corp_codes: 8-digit DART corporation codes
+            year: Fiscal year (YYYY format)
+            reprt_code: Report code - 11011=Annual, 11012=Semi-annual, 11013=Q1, 11014=Q3
+
+        Returns:
+            Long-format DataFrame (one row per corp/account/fs_div) with numeric
+            thstrm_amount, or None if every request failed
+        """
+        chunks = [
+            corp_codes[i : i + MULTI_ACCOUNT_MAX_CORPS]
+            for i in range(0, len(corp_codes), MULTI_ACCOUNT_MAX_CORPS)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._get_list(
+                    "/fnlttMultiAcnt.json",
+                    {
+                        "corp_code": ",".join(chunk),
+                        "bsns_year": str(year),
+                        "reprt_code": reprt_code,
+                    },
+                )
+                for chunk in chunks
+            )
+        )
+
+        if all(records is None for records in results):
+            return None
+
+        records = [record for chunk_records in results if chunk_records for record in chunk_records]
+        df = pd.DataFrame(records)
+        if df.empty:
+            return df
+
+        # Multi-company amounts are formatted with thousands separators
+        df["thstrm_amount"] = pd.to_numeric(
+            df["thstrm_amount"].astype(str).str.replace(",", "", regex=False),
+            errors="coerce",
+        )
+        return df
+
+    async def fetch_insider_trading(self, corp_code: str) -> Optional[pd.DataFrame]:
+        """
+        Fetch executive/major shareholder ownership reports (elestock)
+
+        Args:
+            corp_code: 8-digit DART corporation code
+
+        Returns:
+            DataFrame with insider trading data or None if failed/empty
+        """
+        records = await self._get_list("/elestock.json", {"corp_code": corp_code})
+
+        if not records:
+            return None
+
+        return pd.DataFrame(records)
+
+    async def fetch_corp_codes(self) -> Optional[pd.DataFrame]:
+        """
+        Download the full corp_code list (corpCode.xml zip)
+
+        Returns:
+            DataFrame with corp_code, corp_name, stock_code, modify_date
+        """
+        try:
+            response = await self._request("/corpCode.xml", {})
+            with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+                xml_data = zf.read("CORPCODE.xml")
+        except (httpx.HTTPError, zipfile.BadZipFile, KeyError) as e:
+            logger.error(f"Failed to download DART corp codes: {e}")
+            return None
+
+        tree = ET.XML(xml_data)
+        records = [
+            {child.tag: (child.text or "").strip() for child in item}
+            for item in tree.findall("list")
+        ]
+        return pd.DataFrame(records)
+
+    async def get_corp_code(self, stock_code: str) -> Optional[str]:
+        """
+        Convert 6-digit stock code to 8-digit DART corp_code
+
+        The corp code list is downloaded once per process and shared.
+        """
+        if not _corp_code_map:
+            if self._client is None:
+                await self.open()
+
+            async with self._corp_code_lock:
+                if not _corp_code_map:
+                    df = await self.fetch_corp_codes()
+                    if df is None or df.empty:
+                        return None
+
+                    listed = df[df["stock_code"] != ""]
+                    _corp_code_map.update(zip(listed["stock_code"], listed["corp_code"]))
+                    logger.info(f"Loaded {len(_corp_code_map)} DART corp codes")
+
+        return _corp_code_map.get(stock_code)
@@ -1,14 +1,19 @@
 """DART API integration service for Korean financial statements"""
 
+import asyncio
 import logging
-import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 import OpenDartReader
 
 from app.core.config import settings
+from app.core.metrics import track_upstream
+from app.core.rate_limiter import dart_rate_limiter
+from app.core.tracing import tracer
+from app.services.dart_client import AsyncDartClient, split_statements
+from app.services.statement_cache import statement_cache
 
 logger = logging.getLogger(__name__)
 
@@ -16,15 +21,12 @@ logger = logging.getLogger(__name__)
 class DartService:
     """DART API integration service for Korean financial statements"""
 
-    RATE_LIMIT_SECONDS = 0.5
-
     def __init__(self):
         """Initialize DART service with API key from config"""
         self.api_key = settings.DART_API_KEY
         self.dart = None
         self._corp_code_cache: Dict[str, Optional[str]] = {}
         self._configured = False
-        self._last_request_time: Optional[datetime] = None
 
         if self.api_key:
             try:
@@ -58,7 +60,8 @@ class DartService:
             self._rate_limit()
 
             # Fetch corp_code list and filter
-            corp_list = self.dart.list()
+            with track_upstream("dart", "corp_list"):
+                corp_list = self.dart.list()
             match = corp_list[corp_list["stock_code"] == stock_code]
 
             if not match.empty:
@@ -80,6 +83,8 @@ class DartService:
         """
         Fetch financial statements from DART
 
+        Past reports are served from the on-disk statement cache.
+
         Args:
             corp_code: 8-digit DART corporation code
             year: Fiscal year (YYYY format)
@@ -89,27 +94,29 @@ class DartService:
             Dictionary with 'BS', 'IS', 'CF' DataFrames or None if failed
         """
         try:
-            self._rate_limit()
+            df = statement_cache.get(corp_code, year, reprt_code)
 
-            logger.info(f"Fetching financial statements for corp {corp_code}, year {year}")
+            if df is None:
+                self._rate_limit()
 
-            df = self.dart.finstate_all(
-                corp_code=corp_code,
-                bsns_year=str(year),
-                reprt_code=reprt_code,
-                fs_div="CFS",  # Consolidated Financial Statements
-            )
+                logger.info(f"Fetching financial statements for corp {corp_code}, year {year}")
 
-            if df is None or df.empty:
-                logger.warning(f"No data for corp {corp_code}, year {year}")
-                return None
+                with track_upstream("dart", "finstate_all"):
+                    df = self.dart.finstate_all(
+                        corp_code=corp_code,
+                        bsns_year=str(year),
+                        reprt_code=reprt_code,
+                        fs_div="CFS",  # Consolidated Financial Statements
+                    )
+
+                if df is None or df.empty:
+                    logger.warning(f"No data for corp {corp_code}, year {year}")
+                    return None
+
+                statement_cache.put(df, corp_code, year, reprt_code)
 
             # Split by statement type
-            statements = {
-                "BS": df[df["sj_div"] == "BS"],  # Balance Sheet
-                "IS": df[df["sj_div"] == "IS"],  # Income Statement
-                "CF": df[df["sj_div"] == "CF"],  # Cash Flow
-            }
+            statements = split_statements(df)
 
             logger.info(
                 f"Successfully fetched statements for {corp_code}: "
@@ -136,51 +143,14 @@ class DartService:
             Dictionary with calculated financial metrics or None if failed
         """
         try:
-            from app.utils.dart_mappings import (
-                calculate_current_ratio,
-                calculate_debt_ratio,
-                calculate_operating_margin,
-                calculate_roa,
-                calculate_roe,
-                extract_account,
-            )
+            frames = [df for df in statements.values() if df is not None and not df.empty]
+            rows = pd.concat(frames).assign(_company="") if frames else None
 
-            bs = statements.get("BS")
-            is_stmt = statements.get("IS")
-            cf = statements.get("CF")
-
-            # Extract raw values from financial statements
-            total_assets = extract_account(bs, "자산총계")
-            total_liabilities = extract_account(bs, "부채총계")
-            total_equity = extract_account(bs, "자본총계")
-            current_assets = extract_account(bs, "유동자산")
-            current_liabilities = extract_account(bs, "유동부채")
-
-            revenue = extract_account(is_stmt, "매출액")
-            operating_income = extract_account(is_stmt, "영업이익")
-            net_income = extract_account(is_stmt, "당기순이익")
-
-            operating_cashflow = extract_account(cf, "영업활동현금흐름")
-
-            # Calculate metrics
-            metrics = {
-                "roe": calculate_roe(net_income, total_equity),
-                "roa": calculate_roa(net_income, total_assets),
-                "operating_margin": calculate_operating_margin(operating_income, revenue),
-                "debt_ratio": calculate_debt_ratio(total_liabilities, total_equity),
-                "current_ratio": calculate_current_ratio(current_assets, current_liabilities),
-                "operating_cashflow": operating_cashflow,
-                # Note: PER, PBR, PSR require stock price - calculated separately
-                "per": None,
-                "pbr": None,
-                "psr": None,
-                "ev_ebitda": None,
-                "net_profit_growth": None,  # Requires historical comparison
-                "interest_coverage": None,
-                "dividend_yield": None,
-                "dividend_payout_ratio": None,
-                "consecutive_dividend_years": None,
-            }
+            metrics_frame = self.parse_financial_metrics_frame(rows, key="_company")
+            if metrics_frame.empty:
+                metrics = self._metrics_to_dict(pd.Series(dtype=float))
+            else:
+                metrics = self._metrics_to_dict(metrics_frame.iloc[0])
 
             logger.info(
                 f"Parsed metrics - ROE: {metrics['roe']}, ROA: {metrics['roa']}, "
@@ -192,6 +162,64 @@ class DartService:
             logger.error(f"Error parsing metrics: {e}")
             return None
 
+    def parse_financial_metrics_frame(
+        self, rows: Optional[pd.DataFrame], key: str = "stock_code"
+    ) -> pd.DataFrame:
+        """
+        Parse long-format statement rows for many companies in a single pass
+
+        Args:
+            rows: Statement rows (key, sj_div, account_nm, thstrm_amount[, fs_div])
+            key: Column identifying the company
+
+        Returns:
+            DataFrame indexed by key with metric columns plus `complete`
+            (all KEY_ACCOUNTS present) and `is_valid` (validate_metrics passed)
+        """
+        from app.utils.dart_mappings import (
+            ACCOUNT_NAMES,
+            KEY_ACCOUNTS,
+            calculate_metrics_frame,
+            pivot_accounts,
+            validate_metrics_frame,
+        )
+
+        accounts = pivot_accounts(rows, key=key)
+        metrics = calculate_metrics_frame(accounts)
+
+        key_columns = [ACCOUNT_NAMES[name] for name in KEY_ACCOUNTS]
+        metrics["complete"] = accounts[key_columns].notna().all(axis=1)
+        metrics["is_valid"] = ~validate_metrics_frame(metrics).any(axis=1)
+
+        return metrics
+
+    @staticmethod
+    def _metrics_to_dict(row: pd.Series) -> Dict[str, Any]:
+        """Convert one parse_financial_metrics_frame row into a FinancialMetrics dict"""
+
+        def value(field: str) -> Optional[float]:
+            v = row.get(field)
+            return None if v is None or pd.isna(v) else float(v)
+
+        return {
+            "roe": value("roe"),
+            "roa": value("roa"),
+            "operating_margin": value("operating_margin"),
+            "debt_ratio": value("debt_ratio"),
+            "current_ratio": value("current_ratio"),
+            "operating_cashflow": value("operating_cashflow"),
+            # Note: PER, PBR, PSR require stock price - calculated separately
+            "per": None,
+            "pbr": None,
+            "psr": None,
+            "ev_ebitda": None,
+            "net_profit_growth": None,  # Requires historical comparison
+            "interest_coverage": None,
+            "dividend_yield": None,
+            "dividend_payout_ratio": None,
+            "consecutive_dividend_years": None,
+        }
+
     def calculate_metrics_from_stock_code(
         self, stock_code: str, year: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
@@ -233,14 +261,194 @@ class DartService:
 
         return metrics
 
-    def _rate_limit(self) -> None:
-        """Enforce delay between API requests to respect rate limits"""
-        if self._last_request_time:
-            elapsed = (datetime.now() - self._last_request_time).total_seconds()
-            if elapsed < self.RATE_LIMIT_SECONDS:
-                time.sleep(self.RATE_LIMIT_SECONDS - elapsed)
+    async def get_financial_metrics(
+        self,
+        stock_code: str,
+        year: Optional[int] = None,
+        client: Optional[AsyncDartClient] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async counterpart of calculate_metrics_from_stock_code
+
+        Uses the pooled AsyncDartClient instead of the blocking OpenDartReader,
+        so many stocks can be fetched concurrently from one worker.
+
+        Args:
+            stock_code: 6-digit Korean stock code
+            year: Fiscal year (defaults to previous year)
+            client: Shared AsyncDartClient (a temporary one is opened if omitted)
+
+        Returns:
+            Dictionary with calculated metrics or None if failed
+        """
+        if not self.api_key:
+            logger.warning("DART service not available")
+            return None
+
+        if year is None:
+            year = datetime.now().year - 1
+
+        if client is None:
+            async with AsyncDartClient(api_key=self.api_key) as own_client:
+                return await self.get_financial_metrics(stock_code, year, own_client)
+
+        with tracer.start_as_current_span(
+            "DartService.get_financial_metrics",
+            attributes={"stock.code": stock_code, "dart.year": year},
+        ):
+            corp_code = await self._get_corp_code_async(stock_code, client)
+            if not corp_code:
+                logger.warning(f"Could not map {stock_code} to corp_code")
+                return None
 
-        self._last_request_time = datetime.now()
+            statements = await self._fetch_financial_statements_async(corp_code, year, client)
+            if not statements:
+                logger.warning(f"Could not fetch statements for {stock_code}")
+                return None
+
+            return self.parse_financial_metrics(statements)
+
+    async def get_financial_metrics_batch(
+        self,
+        stock_codes: List[str],
+        year: Optional[int] = None,
+        client: Optional[AsyncDartClient] = None,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Calculate metrics for many stocks using multi-company key-account requests
+
+        Key accounts for up to 100 companies come back in a single fnlttMultiAcnt
+        call. Only companies whose key accounts are missing are re-fetched one by
+        one with finstate_all.
+
+        Args:
+            stock_codes: 6-digit Korean stock codes
+            year: Fiscal year (defaults to previous year)
+            client: Shared AsyncDartClient (a temporary one is opened if omitted)
+
+        Returns:
+            Dictionary of stock_code -> metrics (None if unavailable)
+        """
+        if not self.api_key:
+            logger.warning("DART service not available")
+            return {code: None for code in stock_codes}
+
+        if year is None:
+            year = datetime.now().year - 1
+
+        if client is None:
+            async with AsyncDartClient(api_key=self.api_key) as own_client:
+                return await self.get_financial_metrics_batch(stock_codes, year, own_client)
+
+        with tracer.start_as_current_span(
+            "DartService.get_financial_metrics_batch",
+            attributes={"dart.year": year, "stock.count": len(stock_codes)},
+        ):
+            corp_codes = await asyncio.gather(
+                *(self._get_corp_code_async(code, client) for code in stock_codes)
+            )
+            mapped = {code: corp for code, corp in zip(stock_codes, corp_codes) if corp}
+
+            results: Dict[str, Optional[Dict[str, Any]]] = {code: None for code in stock_codes}
+            accounts = await self._fetch_multi_company_accounts_cached(mapped, year, client)
+
+            if accounts is not None and not accounts.empty:
+                metrics_frame = self.parse_financial_metrics_frame(accounts, key="stock_code")
+                metrics_frame = metrics_frame[
+                    metrics_frame["complete"] & metrics_frame.index.isin(list(mapped))
+                ]
+
+                invalid = int((~metrics_frame["is_valid"]).sum())
+                if invalid:
+                    logger.warning(f"{invalid} stocks have out-of-range or missing metrics")
+
+                for stock_code, row in metrics_frame.iterrows():
+                    results[stock_code] = self._metrics_to_dict(row)
+
+            fallback = [code for code in mapped if results[code] is None]
+            if fallback:
+                logger.info(
+                    f"Key accounts incomplete for {len(fallback)}/{len(mapped)} stocks, "
+                    "falling back to finstate_all"
+                )
+                fallback_metrics = await asyncio.gather(
+                    *(self.get_financial_metrics(code, year, client) for code in fallback),
+                    return_exceptions=True,
+                )
+                for code, metrics in zip(fallback, fallback_metrics):
+                    if isinstance(metrics, Exception):
+                        logger.error(f"Error fetching statements for {code}: {metrics}")
+                        continue
+                    results[code] = metrics
+
+            return results
+
+    async def _fetch_financial_statements_async(
+        self, corp_code: str, year: int, client: AsyncDartClient, reprt_code: str = "11011"
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        """Fetch statements through the async client, using the on-disk cache"""
+        df = statement_cache.get(corp_code, year, reprt_code)
+
+        if df is None:
+            df = await client.fetch_statement_rows(corp_code, year, reprt_code)
+            if df is None:
+                return None
+            statement_cache.put(df, corp_code, year, reprt_code)
+
+        return split_statements(df)
+
+    async def _fetch_multi_company_accounts_cached(
+        self,
+        corp_codes: Dict[str, str],
+        year: int,
+        client: AsyncDartClient,
+        reprt_code: str = "11011",
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch key accounts for stock_code -> corp_code pairs, using the on-disk cache
+
+        Only companies without a cached (or still valid) entry are requested.
+        """
+        frames = []
+        missing: Dict[str, str] = {}
+        for stock_code, corp_code in corp_codes.items():
+            cached = statement_cache.get(corp_code, year, reprt_code, dataset="multi")
+            if cached is None:
+                missing[stock_code] = corp_code
+            else:
+                frames.append(cached)
+
+        if missing:
+            logger.info(
+                f"Key accounts cached for {len(corp_codes) - len(missing)}/{len(corp_codes)} "
+                f"stocks, fetching {len(missing)}"
+            )
+            fetched = await client.fetch_multi_company_accounts(
+                list(missing.values()), year, reprt_code
+            )
+            if fetched is None and not frames:
+                return None
+
+            if fetched is not None and not fetched.empty:
+                for stock_code, group_df in fetched.groupby("stock_code"):
+                    corp_code = missing.get(str(stock_code).strip())
+                    if corp_code:
+                        statement_cache.put(group_df, corp_code, year, reprt_code, dataset="multi")
+                frames.append(fetched)
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    async def _get_corp_code_async(
+        self, stock_code: str, client: AsyncDartClient
+    ) -> Optional[str]:
+        """Resolve corp_code from the local cache or the async client"""
+        return self._corp_code_cache.get(stock_code) or await client.get_corp_code(stock_code)
+
+    def _rate_limit(self) -> None:
+        """Wait for a token from the DART bucket shared by all workers"""
+        dart_rate_limiter.acquire()
 
     def fetch_insider_trading(self, corp_code: str) -> Optional[pd.DataFrame]:
         """
@@ -257,8 +465,9 @@ class DartService:
 
             logger.info(f"Fetching insider trading data for corp {corp_code}")
 
-            # Use OpenDartReader's major_shareholders_exec method
-            df = self.dart.report(corp=corp_code, key_word="임원ㆍ주요주주특정증권등소유상황보고서")
+            # 임원ㆍ주요주주 소유보고 (elestock), returns the full filing history
+            with track_upstream("dart", "elestock"):
+                df = self.dart.major_shareholders_exec(corp_code)
 
             if df is None or df.empty:
                 logger.warning(f"No insider trading data for corp {corp_code}")
@@ -292,6 +501,34 @@ class DartService:
 
         return self.fetch_insider_trading(corp_code)
 
+    async def fetch_insider_trading_async(
+        self, stock_code: str, client: Optional[AsyncDartClient] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Async counterpart of fetch_insider_trading_by_stock_code
+
+        Args:
+            stock_code: 6-digit Korean stock code
+            client: Shared AsyncDartClient (a temporary one is opened if omitted)
+
+        Returns:
+            DataFrame with insider trading data or None if failed
+        """
+        if not self.api_key:
+            logger.warning("DART service not available")
+            return None
+
+        if client is None:
+            async with AsyncDartClient(api_key=self.api_key) as own_client:
+                return await self.fetch_insider_trading_async(stock_code, own_client)
+
+        corp_code = await self._get_corp_code_async(stock_code, client)
+        if not corp_code:
+            logger.warning(f"Could not map {stock_code} to corp_code")
+            return None
+
+        return await client.fetch_insider_trading(corp_code)
+
 
 # Singleton instance
 dart_service = DartService()
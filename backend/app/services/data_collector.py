@@ -5,13 +5,18 @@ FinanceDataReader를 사용하여 KRX 데이터 수집
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any
 
 import FinanceDataReader as fdr
 import pandas as pd
 from sqlalchemy.orm import Session
 
+from app.core.metrics import track_upstream
+from app.core.rate_limiter import fdr_rate_limiter
+from app.services.dataset_epochs import FINANCIAL_METRICS, PRICES, STOCKS, DatasetEpochs
+from app.services.leaderboard_service import refresh_leaderboard_cards
+from app.services.stock_snapshots import StockSnapshotService
 from app.models.stock import Stock
 from app.models.financial_metrics import FinancialMetrics
 
@@ -35,7 +40,9 @@ class DataCollector:
             logger.info("Collecting stock list from KRX...")
 
             # KRX 전체 종목 리스트 조회
-            df_krx = fdr.StockListing('KRX')
+            fdr_rate_limiter.acquire()
+            with track_upstream("krx", "stock_listing"):
+                df_krx = fdr.StockListing('KRX')
 
             if df_krx.empty:
                 logger.warning("No stocks found in KRX listing")
@@ -82,6 +89,10 @@ class DataCollector:
                     logger.error(f"Error processing stock {row.get('Code', 'unknown')}: {e}")
                     continue
 
+            # 스냅샷·리더보드 카드의 종목 정보 갱신 및 신규 종목 행 추가
+            StockSnapshotService(self.db).refresh_stocks()
+            refresh_leaderboard_cards(self.db)
+            DatasetEpochs(self.db).bump(STOCKS)
             self.db.commit()
             logger.info(f"Successfully collected {count} stocks")
             return count
@@ -115,11 +126,13 @@ class DataCollector:
                 end_date = datetime.now()
 
             # 주가 데이터 조회
-            df = fdr.DataReader(
-                stock_code,
-                start_date.strftime('%Y-%m-%d'),
-                end_date.strftime('%Y-%m-%d')
-            )
+            fdr_rate_limiter.acquire()
+            with track_upstream("krx", "daily_prices"):
+                df = fdr.DataReader(
+                    stock_code,
+                    start_date.strftime('%Y-%m-%d'),
+                    end_date.strftime('%Y-%m-%d')
+                )
 
             if df.empty:
                 logger.warning(f"No price data found for {stock_code}")
@@ -148,17 +161,27 @@ class DataCollector:
             logger.error(f"Error collecting prices for {stock_code}: {e}")
             return False
 
-    def collect_all_stock_prices(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    def collect_all_stock_prices(
+        self,
+        limit: Optional[int] = None,
+        stock_codes: Optional[List[str]] = None,
+        bump_epoch: bool = True,
+    ) -> Dict[str, Any]:
         """
         전체 종목의 주가 데이터 수집
 
         Args:
             limit: 수집할 종목 수 제한 (테스트용)
+            stock_codes: 처리할 종목 코드 목록 (파이프라인 청크)
+            bump_epoch: prices epoch 갱신 여부 (파이프라인 청크는 False)
 
         Returns:
             수집 결과 통계
         """
-        stocks = self.db.query(Stock).all()
+        query = self.db.query(Stock)
+        if stock_codes is not None:
+            query = query.filter(Stock.code.in_(stock_codes))
+        stocks = query.all()
 
         if limit:
             stocks = stocks[:limit]
@@ -191,6 +214,13 @@ class DataCollector:
             "success_rate": f"{(success/total*100):.2f}%" if total > 0 else "0%",
         }
 
+        if success and bump_epoch:
+            # 스냅샷·리더보드 카드의 현재가·등락률도 epoch 커밋 전에 갱신
+            StockSnapshotService(self.db).refresh_stocks(stock_codes)
+            refresh_leaderboard_cards(self.db, stock_codes)
+            DatasetEpochs(self.db).bump(PRICES)
+            self.db.commit()
+
         logger.info(f"Price collection completed: {result}")
         return result
 
@@ -228,28 +258,107 @@ class DataCollector:
             # DART API에서 데이터 수집 시도
             dart_data = self._fetch_dart_data(stock_code) if use_dart else None
 
-            # DART 실패 시 더미 데이터로 대체
-            if dart_data is None:
-                logger.info(f"Using mock data for {stock_code}")
-                dart_data = self._generate_mock_metrics()
+            return self._save_financial_metrics(stock_code, today, dart_data)
+
+        except Exception as e:
+            logger.error(f"Error calculating metrics for {stock_code}: {e}")
+            self.db.rollback()
+            return False
+
+    def _save_financial_metrics(
+        self, stock_code: str, metrics_date: date, dart_data: Optional[Dict[str, Any]]
+    ) -> bool:
+        """재무 지표 저장 (DART 실패 시 더미 데이터로 대체)"""
+        if dart_data is None:
+            logger.info(f"Using mock data for {stock_code}")
+            dart_data = self._generate_mock_metrics()
+
+        # FinancialMetrics 객체 생성
+        metrics = FinancialMetrics(
+            stock_code=stock_code,
+            date=metrics_date,
+            **dart_data
+        )
+
+        self.db.add(metrics)
+        self.db.commit()
+
+        logger.info(f"Created financial metrics for {stock_code}")
+        return True
+
+    async def calculate_financial_metrics_batch(
+        self, stock_codes: List[str], use_dart: bool = True, bump_epoch: bool = True
+    ) -> Dict[str, Any]:
+        """
+        여러 종목의 재무 지표를 비동기 DART 요청으로 한 번에 계산 및 저장
+
+        다중회사 주요계정 API로 최대 100개 회사를 한 번에 조회하고, 계정이 누락된
+        종목만 finstate_all로 개별 조회 (하나의 AsyncDartClient 커넥션 풀 공유)
+
+        Args:
+            stock_codes: 종목 코드 목록
+            use_dart: DART API 사용 여부
+            bump_epoch: financial_metrics epoch 갱신 여부 (파이프라인 청크는 False)
+
+        Returns:
+            수집 결과 통계
+        """
+        from app.services.dart_client import AsyncDartClient
+        from app.services.dart_service import dart_service
+
+        today = datetime.now().date()
 
-            # FinancialMetrics 객체 생성
-            metrics = FinancialMetrics(
-                stock_code=stock_code,
-                date=today,
-                **dart_data
+        known = {
+            code
+            for (code,) in self.db.query(Stock.code).filter(Stock.code.in_(stock_codes))
+        }
+        existing = {
+            code
+            for (code,) in self.db.query(FinancialMetrics.stock_code).filter(
+                FinancialMetrics.stock_code.in_(stock_codes),
+                FinancialMetrics.date == today,
             )
+        }
+        pending = [code for code in stock_codes if code in known and code not in existing]
 
-            self.db.add(metrics)
+        dart_results: Dict[str, Optional[Dict[str, Any]]] = {}
+        if use_dart and dart_service.api_key and pending:
+            try:
+                async with AsyncDartClient() as client:
+                    dart_results = await dart_service.get_financial_metrics_batch(
+                        pending, client=client
+                    )
+            except Exception as e:
+                logger.warning(f"DART batch fetch failed: {e}. Falling back to mock data.")
+
+        success = len(existing)
+        failed = len(stock_codes) - len(known)
+        for code in pending:
+            dart_data = dart_results.get(code)
+            try:
+                if self._save_financial_metrics(code, today, dart_data):
+                    success += 1
+                else:
+                    failed += 1
+            except Exception as e:
+                logger.error(f"Error saving metrics for {code}: {e}")
+                self.db.rollback()
+                failed += 1
+
+        if success > len(existing) and bump_epoch:
+            DatasetEpochs(self.db).bump(FINANCIAL_METRICS)
             self.db.commit()
 
-            logger.info(f"Created financial metrics for {stock_code}")
-            return True
+        total = len(stock_codes)
+        result = {
+            "total": total,
+            "success": success,
+            "failed": failed,
+            "success_rate": f"{(success/total*100):.2f}%" if total > 0 else "0%",
+        }
 
-        except Exception as e:
-            logger.error(f"Error calculating metrics for {stock_code}: {e}")
-            self.db.rollback()
-            return False
+        logger.info(f"Batch financial metrics collection completed: {result}")
+        return result
 
     def _fetch_dart_data(self, stock_code: str) -> Optional[Dict[str, Any]]:
         """DART API에서 재무 데이터 수집 시도"""
@@ -335,5 +444,9 @@ class DataCollector:
             "success_rate": f"{(success/total*100):.2f}%" if total > 0 else "0%",
         }
 
+        if success:
+            DatasetEpochs(self.db).bump(FINANCIAL_METRICS)
+            self.db.commit()
+
         logger.info(f"Financial metrics collection completed: {result}")
         return result
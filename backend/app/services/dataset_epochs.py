@@ -0,0 +1,187 @@
+"""Dataset epochs for coherent cache invalidation
+
+Every dataset the API serves has an epoch counter that only moves forward.
+Pipeline stages bump their dataset's epoch in the same transaction as the
+data they write, so the `dataset_versions` table is always consistent with
+the data itself. Once the transaction commits, the new epochs are copied to
+a Redis hash so API workers can read them without touching the database:
+
+    valuehunt:dataset_epochs  HASH  value_scores -> 42, prices -> 17, ...
+
+Caches and ETags are keyed on the epochs of the datasets they were built
+from (see version_token), so a new scoring run changes every dependent key
+at once; nothing relies on a TTL guess.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, Optional
+
+import redis
+from sqlalchemy import event, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.redis_client import get_redis
+from app.models.dataset_version import DatasetVersion
+
+logger = logging.getLogger(__name__)
+
+STOCKS = "stocks"
+PRICES = "prices"
+FINANCIAL_METRICS = "financial_metrics"
+VALUE_SCORES = "value_scores"
+INSIDER = "insider"
+BACKTESTS = "backtests"
+DATASETS = (STOCKS, PRICES, FINANCIAL_METRICS, VALUE_SCORES, INSIDER, BACKTESTS)
+
+EPOCHS_KEY = "valuehunt:dataset_epochs"
+_PENDING = "dataset_epochs"  # Session.info key for epochs awaiting commit
+
+# HSET that never moves an epoch backwards (commits may publish out of order)
+_SET_MAX_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    local current = tonumber(redis.call('HGET', KEYS[1], ARGV[i]) or '-1')
+    if tonumber(ARGV[i + 1]) > current then
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+return 1
+"""
+
+# Seconds to skip Redis after a connection failure before trying again
+REDIS_RETRY_SECONDS = 30.0
+_redis_down_until = 0.0
+
+
+def _mark_redis_down(error: Exception) -> None:
+    global _redis_down_until
+    logger.warning(
+        f"Redis unavailable for dataset epochs ({error}); "
+        f"reading them from the database for {REDIS_RETRY_SECONDS:.0f}s"
+    )
+    _redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+
+def _publish(epochs: Dict[str, int]) -> None:
+    """Copy committed epochs to Redis, keeping the highest value per dataset"""
+    if not epochs:
+        return
+    args = []
+    for dataset, epoch in epochs.items():
+        args.extend([dataset, epoch])
+    get_redis().eval(_SET_MAX_SCRIPT, 1, EPOCHS_KEY, *args)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    epochs = session.info.pop(_PENDING, None)
+    if not epochs:
+        return
+    try:
+        _publish(epochs)
+    except (redis.RedisError, OSError) as e:
+        logger.warning(f"Failed to publish dataset epochs {epochs}: {e}")
+        # Redis now holds stale epochs: read the database during the backoff,
+        # and drop the stale fields so the first read after it re-seeds them
+        _mark_redis_down(e)
+        try:
+            get_redis().hdel(EPOCHS_KEY, *epochs)
+        except (redis.RedisError, OSError):
+            pass
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def version_token(epochs: Dict[str, int]) -> str:
+    """
+    Stable string naming a combination of dataset epochs
+
+    Used in cache keys and ETags, e.g. "prices.17-value_scores.42".
+    """
+    return "-".join(f"{dataset}.{epochs[dataset]}" for dataset in sorted(epochs))
+
+
+class DatasetEpochs:
+    """Bump and read dataset epochs"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bump(self, *datasets: str) -> Dict[str, int]:
+        """
+        Advance the epochs of datasets changed in the current transaction
+
+        The new values reach Redis only after the caller commits.
+
+        Args:
+            datasets: Names from DATASETS
+
+        Returns:
+            New epoch per dataset (caller commits)
+        """
+        bumped = {}
+        for dataset in datasets:
+            if dataset not in DATASETS:
+                raise ValueError(f"Unknown dataset: {dataset}")
+            bumped[dataset] = self._increment(dataset)
+
+        self.db.info.setdefault(_PENDING, {}).update(bumped)
+        return bumped
+
+    def _increment(self, dataset: str) -> int:
+        statement = (
+            update(DatasetVersion)
+            .where(DatasetVersion.dataset == dataset)
+            .values(epoch=DatasetVersion.epoch + 1)
+            .returning(DatasetVersion.epoch)
+            .execution_options(synchronize_session=False)
+        )
+        epoch = self.db.execute(statement).scalar()
+        if epoch is None:
+            # First bump on a database created without the seeding migration
+            try:
+                with self.db.begin_nested():
+                    self.db.add(DatasetVersion(dataset=dataset, epoch=1))
+                return 1
+            except IntegrityError:
+                epoch = self.db.execute(statement).scalar()
+        return epoch
+
+    def current(self, *datasets: str) -> Dict[str, int]:
+        """
+        Current epoch per dataset (all datasets if none are named)
+
+        Reads the Redis hash; falls back to the database when Redis is
+        unreachable or has not seen a dataset yet (and then re-seeds Redis).
+        """
+        names = list(datasets or DATASETS)
+        cached: Optional[list] = None
+        if time.monotonic() >= _redis_down_until:
+            try:
+                cached = get_redis().hmget(EPOCHS_KEY, names)
+            except (redis.RedisError, OSError) as e:
+                _mark_redis_down(e)
+
+        if cached is not None and None not in cached:
+            return {name: int(epoch) for name, epoch in zip(names, cached)}
+
+        epochs = self._from_db(names)
+        if cached is not None:
+            try:
+                _publish(epochs)
+            except (redis.RedisError, OSError) as e:
+                _mark_redis_down(e)
+        return epochs
+
+    def _from_db(self, names: Iterable[str]) -> Dict[str, int]:
+        names = list(names)
+        stored = dict(
+            self.db.query(DatasetVersion.dataset, DatasetVersion.epoch).filter(
+                DatasetVersion.dataset.in_(names)
+            )
+        )
+        return {name: int(stored.get(name, 0)) for name in names}
@@ -1,16 +1,20 @@
 """
 Service for collecting and storing historical stock data for backtesting.
 """
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional
 
 import FinanceDataReader as fdr
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
+from app.core.metrics import track_upstream
+from app.core.rate_limiter import fdr_rate_limiter
 from app.models.backtest import HistoricalFinancialMetrics, HistoricalStockPrice
 from app.models.stock import Stock
+from app.services.dart_client import AsyncDartClient
 from app.services.dart_service import DartService
 
 logger = logging.getLogger(__name__)
@@ -47,7 +51,9 @@ class HistoricalDataService:
             )
 
             # Fetch data from FinanceDataReader
-            df = fdr.DataReader(stock_code, start_date, end_date)
+            await fdr_rate_limiter.acquire_async()
+            with track_upstream("krx", "daily_prices"):
+                df = fdr.DataReader(stock_code, start_date, end_date)
 
             if df.empty:
                 logger.warning(f"No price data found for {stock_code}")
@@ -144,6 +150,7 @@ class HistoricalDataService:
         self,
         stock_code: str,
         snapshot_date: datetime,
+        dart_client: Optional[AsyncDartClient] = None,
     ) -> Optional[HistoricalFinancialMetrics]:
         """
         Collect financial metrics as they would have appeared at a specific date.
@@ -151,6 +158,7 @@ class HistoricalDataService:
         Args:
             stock_code: Stock code
             snapshot_date: The date to snapshot metrics from
+            dart_client: Shared async DART client (pooled connections)
 
         Returns:
             HistoricalFinancialMetrics object or None
@@ -164,8 +172,15 @@ class HistoricalDataService:
 
             lookback_date = snapshot_date - timedelta(days=90)
 
-            # Try to get actual DART data (this will likely fail for old dates)
-            metrics_data = await self.dart_service.get_financial_metrics(stock_code)
+            # Latest annual report published by snapshot_date (filed by end of March)
+            report_year = snapshot_date.year - 1 if snapshot_date.month > 3 else snapshot_date.year - 2
+
+            # Try to get actual DART data (DART provides statements from 2015 onwards)
+            metrics_data = await self.dart_service.get_financial_metrics(
+                stock_code, year=report_year, client=dart_client
+            )
+            if metrics_data:
+                metrics_data.setdefault("report_date", datetime(report_year, 12, 31))
 
             if not metrics_data:
                 # Fall back to estimating based on current patterns
@@ -250,6 +265,55 @@ class HistoricalDataService:
             self.db.rollback()
             return None
 
+    async def collect_all_historical_financial_metrics(
+        self,
+        snapshot_date: datetime,
+        market: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> dict:
+        """
+        Collect historical metrics for all stocks with overlapping DART requests.
+
+        A single pooled AsyncDartClient is shared by all stocks, and at most
+        max_concurrency requests are in flight at once.
+
+        Args:
+            snapshot_date: The date to snapshot metrics from
+            market: Optional market filter (KOSPI/KOSDAQ)
+            max_concurrency: Maximum concurrent DART requests
+
+        Returns:
+            Dictionary with success/failure counts
+        """
+        query = self.db.query(Stock)
+        if market and market != "ALL":
+            query = query.filter(Stock.market == market)
+
+        stocks = query.all()
+        results = {"success": 0, "failed": 0, "total": len(stocks)}
+
+        async with AsyncDartClient(max_concurrency=max_concurrency) as client:
+            collected = await asyncio.gather(
+                *(
+                    self.collect_historical_financial_metrics(
+                        stock.code, snapshot_date, dart_client=client
+                    )
+                    for stock in stocks
+                )
+            )
+
+        for metrics in collected:
+            if metrics:
+                results["success"] += 1
+            else:
+                results["failed"] += 1
+
+        logger.info(
+            f"Historical metrics collection for {snapshot_date.date()} completed: "
+            f"{results['success']} success, {results['failed']} failed"
+        )
+        return results
+
     def _estimate_historical_metrics(
         self,
         stock_code: str,
@@ -368,6 +432,86 @@ class HistoricalDataService:
             .first()
         )
 
+    def get_historical_price_batch(
+        self,
+        stock_codes: List[str],
+        target_date: datetime,
+    ) -> Dict[str, HistoricalStockPrice]:
+        """
+        Get the closest historical price on or before target_date for many stocks
+        in one query (batch form of get_historical_price).
+
+        Args:
+            stock_codes: Stock codes
+            target_date: Target date
+
+        Returns:
+            Dictionary of stock code to HistoricalStockPrice; stocks without a
+            price are missing
+        """
+        latest = (
+            self.db.query(
+                HistoricalStockPrice.stock_code,
+                func.max(HistoricalStockPrice.date).label("date"),
+            )
+            .filter(
+                and_(
+                    HistoricalStockPrice.stock_code.in_(stock_codes),
+                    HistoricalStockPrice.date <= target_date,
+                )
+            )
+            .group_by(HistoricalStockPrice.stock_code)
+            .subquery()
+        )
+        prices = self.db.query(HistoricalStockPrice).join(
+            latest,
+            and_(
+                HistoricalStockPrice.stock_code == latest.c.stock_code,
+                HistoricalStockPrice.date == latest.c.date,
+            ),
+        )
+        return {price.stock_code: price for price in prices}
+
+    def get_historical_metrics_batch(
+        self,
+        stock_codes: List[str],
+        target_date: datetime,
+    ) -> Dict[str, HistoricalFinancialMetrics]:
+        """
+        Get the closest historical metrics on or before target_date for many
+        stocks in one query (batch form of get_historical_metrics).
+
+        Args:
+            stock_codes: Stock codes
+            target_date: Target date
+
+        Returns:
+            Dictionary of stock code to HistoricalFinancialMetrics; stocks
+            without metrics are missing
+        """
+        latest = (
+            self.db.query(
+                HistoricalFinancialMetrics.stock_code,
+                func.max(HistoricalFinancialMetrics.snapshot_date).label("snapshot_date"),
+            )
+            .filter(
+                and_(
+                    HistoricalFinancialMetrics.stock_code.in_(stock_codes),
+                    HistoricalFinancialMetrics.snapshot_date <= target_date,
+                )
+            )
+            .group_by(HistoricalFinancialMetrics.stock_code)
+            .subquery()
+        )
+        metrics = self.db.query(HistoricalFinancialMetrics).join(
+            latest,
+            and_(
+                HistoricalFinancialMetrics.stock_code == latest.c.stock_code,
+                HistoricalFinancialMetrics.snapshot_date == latest.c.snapshot_date,
+            ),
+        )
+        return {row.stock_code: row for row in metrics}
+
     def get_price_return(
         self,
         stock_code: str,
@@ -404,6 +548,72 @@ class HistoricalDataService:
             .all()
         )
 
+        return self._price_return(start_price, end_price, prices)
+
+    def get_price_return_batch(
+        self,
+        stock_codes: List[str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, dict]:
+        """
+        Calculate price returns between two dates for many stocks in three
+        queries (batch form of get_price_return).
+
+        Args:
+            stock_codes: Stock codes
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Dictionary of stock code to return metrics; stocks without enough
+            prices are missing
+        """
+        start_prices = self.get_historical_price_batch(stock_codes, start_date)
+        end_prices = self.get_historical_price_batch(stock_codes, end_date)
+
+        period_prices: Dict[str, List[HistoricalStockPrice]] = {}
+        for price in self.db.query(HistoricalStockPrice).filter(
+            and_(
+                HistoricalStockPrice.stock_code.in_(stock_codes),
+                HistoricalStockPrice.date >= start_date,
+                HistoricalStockPrice.date <= end_date,
+            )
+        ):
+            period_prices.setdefault(price.stock_code, []).append(price)
+
+        returns = {}
+        for stock_code in stock_codes:
+            start_price = start_prices.get(stock_code)
+            end_price = end_prices.get(stock_code)
+            if not start_price or not end_price:
+                continue
+
+            performance = self._price_return(
+                start_price, end_price, period_prices.get(stock_code, [])
+            )
+            if performance:
+                returns[stock_code] = performance
+
+        return returns
+
+    def _price_return(
+        self,
+        start_price: HistoricalStockPrice,
+        end_price: HistoricalStockPrice,
+        prices: List[HistoricalStockPrice],
+    ) -> Optional[dict]:
+        """
+        Return metrics for one stock from its start, end and in-period prices.
+
+        Args:
+            start_price: Price on or before the start date
+            end_price: Price on or before the end date
+            prices: All prices between the two dates
+
+        Returns:
+            Dictionary with return metrics or None
+        """
         if not prices:
             return None
 
@@ -0,0 +1,200 @@
+"""Precomputed insider trading signals
+
+Ownership reports are aggregated per stock into the insider_signals table when
+new filings are ingested (and once a day so the rolling windows move forward).
+The stock detail page and the insider-buying ranking then read one row per
+stock instead of re-aggregating filings on every request.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import desc, insert
+from sqlalchemy.orm import Session
+
+from app.models.insider_signal import InsiderSignal
+from app.models.insider_trading import InsiderTrading
+from app.models.stock import Stock
+from app.services.dataset_epochs import INSIDER, DatasetEpochs
+
+logger = logging.getLogger(__name__)
+
+# Rolling windows (days) for net share changes; the longest is the lookback
+SIGNAL_WINDOWS = (30, 90, 180)
+SIGNAL_LOOKBACK_DAYS = max(SIGNAL_WINDOWS)
+
+
+def compute_insider_signals(filings: pd.DataFrame, as_of: date) -> pd.DataFrame:
+    """
+    Aggregate ownership reports into one signal row per stock
+
+    Args:
+        filings: Columns stock_code, rcept_no, rcept_dt, repror,
+            sp_stock_lmp_irds_cnt, sp_stock_lmp_rate (already limited to the lookback)
+        as_of: Reference date for the rolling windows
+
+    Returns:
+        DataFrame indexed by stock_code with InsiderSignal columns
+    """
+    if filings.empty:
+        return pd.DataFrame()
+
+    codes = filings["stock_code"]
+    age = (pd.Timestamp(as_of) - pd.to_datetime(filings["rcept_dt"])).dt.days
+    change = pd.to_numeric(filings["sp_stock_lmp_irds_cnt"], errors="coerce").fillna(0)
+    rate = pd.to_numeric(filings["sp_stock_lmp_rate"], errors="coerce")
+
+    signals = pd.DataFrame(
+        {
+            f"net_shares_{days}d": change.where(age < days, 0).groupby(codes).sum()
+            for days in SIGNAL_WINDOWS
+        }
+    )
+    signals["transaction_count"] = codes.groupby(codes).size()
+    signals["buy_count"] = (change > 0).groupby(codes).sum()
+    signals["sell_count"] = (change < 0).groupby(codes).sum()
+    signals["distinct_buyers_90d"] = (
+        filings["repror"].where((change > 0) & (age < 90)).groupby(codes).nunique()
+    )
+    signals["last_rcept_dt"] = filings.groupby("stock_code")["rcept_dt"].max()
+
+    # Largest holder: each reporter's most recent holding, then the highest rate
+    latest = (
+        filings.assign(rate=rate)
+        .sort_values(["rcept_dt", "rcept_no"])
+        .drop_duplicates(["stock_code", "repror"], keep="last")
+    )
+    top = (
+        latest[latest["rate"].notna()]
+        .sort_values("rate", ascending=False)
+        .drop_duplicates("stock_code")
+        .set_index("stock_code")
+    )
+    signals["largest_holder"] = top["repror"]
+    signals["largest_holding_rate"] = top["rate"]
+
+    counts = [f"net_shares_{days}d" for days in SIGNAL_WINDOWS] + [
+        "transaction_count",
+        "buy_count",
+        "sell_count",
+        "distinct_buyers_90d",
+    ]
+    signals[counts] = signals[counts].astype("int64")
+
+    signals["recent_trend"] = np.select(
+        [signals["net_shares_90d"] > 0, signals["net_shares_90d"] < 0],
+        ["매수우세", "매도우세"],
+        default="중립",
+    )
+    signals["as_of_date"] = as_of
+
+    return signals
+
+
+class InsiderSignalService:
+    """Maintains and serves the insider_signals table"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh(
+        self, stock_codes: Optional[List[str]] = None, as_of: Optional[date] = None
+    ) -> int:
+        """
+        Recompute signals from stored filings
+
+        Stocks without filings in the lookback window lose their signal row.
+
+        Args:
+            stock_codes: Stocks to refresh (all stocks when None)
+            as_of: Reference date (defaults to today)
+
+        Returns:
+            Number of signal rows written (caller commits)
+        """
+        as_of = as_of or date.today()
+        since = as_of - timedelta(days=SIGNAL_LOOKBACK_DAYS)
+
+        query = self.db.query(
+            InsiderTrading.stock_code,
+            InsiderTrading.rcept_no,
+            InsiderTrading.rcept_dt,
+            InsiderTrading.repror,
+            InsiderTrading.sp_stock_lmp_irds_cnt,
+            InsiderTrading.sp_stock_lmp_rate,
+        ).filter(InsiderTrading.rcept_dt > since, InsiderTrading.rcept_dt <= as_of)
+
+        existing = self.db.query(InsiderSignal)
+        if stock_codes is not None:
+            query = query.filter(InsiderTrading.stock_code.in_(stock_codes))
+            existing = existing.filter(InsiderSignal.stock_code.in_(stock_codes))
+
+        filings = pd.DataFrame(
+            query.all(),
+            columns=[
+                "stock_code",
+                "rcept_no",
+                "rcept_dt",
+                "repror",
+                "sp_stock_lmp_irds_cnt",
+                "sp_stock_lmp_rate",
+            ],
+        )
+        signals = compute_insider_signals(filings, as_of)
+        rows = self._to_rows(signals)
+
+        existing.delete(synchronize_session=False)
+        if rows:
+            self.db.execute(insert(InsiderSignal.__table__), rows)
+        DatasetEpochs(self.db).bump(INSIDER)
+
+        logger.info(f"Refreshed insider signals for {len(rows)} stocks (as of {as_of})")
+        return len(rows)
+
+    def get_signal(self, stock_code: str) -> Optional[InsiderSignal]:
+        """Get the signal row for one stock (primary key lookup)"""
+        return self.db.get(InsiderSignal, stock_code)
+
+    def get_top_buying(
+        self, market: Optional[str] = None, limit: int = 20
+    ) -> List[Tuple[InsiderSignal, Stock]]:
+        """
+        Rank stocks by recent insider buying
+
+        Stocks with positive 90-day net buying are ordered by the number of
+        distinct insiders buying, then by net shares.
+
+        Args:
+            market: KOSPI, KOSDAQ, or None/ALL for both
+            limit: Maximum number of results
+
+        Returns:
+            List of (InsiderSignal, Stock) tuples
+        """
+        query = (
+            self.db.query(InsiderSignal, Stock)
+            .join(Stock, Stock.code == InsiderSignal.stock_code)
+            .filter(InsiderSignal.net_shares_90d > 0)
+        )
+
+        if market and market != "ALL":
+            query = query.filter(Stock.market == market)
+
+        return (
+            query.order_by(
+                desc(InsiderSignal.distinct_buyers_90d), desc(InsiderSignal.net_shares_90d)
+            )
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def _to_rows(signals: pd.DataFrame) -> List[Dict[str, Any]]:
+        if signals.empty:
+            return []
+
+        rows = signals.rename_axis("stock_code").reset_index()
+        return rows.astype(object).where(rows.notna(), None).to_dict("records")
@@ -0,0 +1,391 @@
+"""Redis sorted-set leaderboards for top picks
+
+The scoring job publishes, per scoring date, one sorted set per
+(market, category) ranking the stocks by that score, plus a hash of the
+per-stock card rendered by /stocks/top-picks. A pointer key names the
+latest published date, so reads never query the database:
+
+    valuehunt:leaderboard:latest                      -> "2026-10-16"
+    valuehunt:leaderboard:2026-10-16:KOSPI:valuation  ZSET code -> score
+    valuehunt:leaderboard:2026-10-16:cards            HASH code -> card JSON
+
+Top-N, any offset and "what rank is stock X" are O(log N) sorted-set reads.
+When a newer date is published, the previous date's keys expire after a
+short grace period so in-flight readers still see a complete ranking.
+
+Cards carry the stock's name and price, which change between scoring runs:
+the stock list and price collectors rewrite those fields (refresh_cards)
+before they commit their stocks/prices epoch bump, so a new ETag never
+carries the previous prices.
+"""
+
+import json
+import logging
+import time
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import redis
+from sqlalchemy import and_, desc
+from sqlalchemy.orm import Session
+
+from app.db.redis_client import get_redis
+from app.models.financial_metrics import FinancialMetrics
+from app.models.stock import Stock
+from app.models.value_score import ValueScore
+from app.schemas.stock import CategoryScores, KeyMetrics, TopPickItem
+from app.services.dataset_epochs import VALUE_SCORES, DatasetEpochs
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_KEY_PREFIX = "valuehunt:leaderboard:"
+LATEST_KEY = f"{LEADERBOARD_KEY_PREFIX}latest"
+SUPERSEDED_TTL_SECONDS = 3600
+
+MARKETS = ("ALL", "KOSPI", "KOSDAQ")
+# category query value -> ValueScore column
+CATEGORIES = {
+    "total": "total_score",
+    "valuation": "valuation_score",
+    "profitability": "profitability_score",
+    "stability": "stability_score",
+    "dividend": "dividend_score",
+}
+
+# Seconds to skip Redis after a connection failure before trying again
+REDIS_RETRY_SECONDS = 30.0
+_redis_down_until = 0.0
+
+
+def normalize_market(market: Optional[str]) -> str:
+    return market if market else "ALL"
+
+
+def normalize_category(category: Optional[str]) -> str:
+    """Unknown categories rank by total score, as the SQL path does"""
+    return category if category in CATEGORIES else "total"
+
+
+def _board_key(score_date: str, market: str, category: str) -> str:
+    return f"{LEADERBOARD_KEY_PREFIX}{score_date}:{market}:{category}"
+
+
+def _cards_key(score_date: str) -> str:
+    return f"{LEADERBOARD_KEY_PREFIX}{score_date}:cards"
+
+
+def _date_keys(score_date: str) -> List[str]:
+    keys = [_cards_key(score_date)]
+    for market in MARKETS:
+        keys.extend(_board_key(score_date, market, category) for category in CATEGORIES)
+    return keys
+
+
+def build_card(
+    stock: Stock, value_score: ValueScore, metrics: Optional[FinancialMetrics]
+) -> TopPickItem:
+    """Top-pick card for one stock (rank is filled in at read time)"""
+    upside_potential = None
+    if value_score.upside_potential:
+        upside_potential = f"+{value_score.upside_potential}%"
+
+    return TopPickItem(
+        rank=0,
+        stock_code=stock.code,
+        stock_name=stock.name,
+        market=stock.market,
+        current_price=stock.current_price,
+        change_rate=stock.change_rate,
+        value_score=value_score.total_score,
+        category_scores=CategoryScores(
+            valuation=value_score.valuation_score or 0,
+            profitability=value_score.profitability_score or 0,
+            stability=value_score.stability_score or 0,
+            dividend=value_score.dividend_score or 0,
+        ),
+        key_metrics=KeyMetrics(
+            PER=metrics.per if metrics else None,
+            PBR=metrics.pbr if metrics else None,
+            ROE=metrics.roe if metrics else None,
+            debt_ratio=metrics.debt_ratio if metrics else None,
+            dividend_yield=metrics.dividend_yield if metrics else None,
+        ),
+        ai_summary=value_score.ai_summary,
+        upside_potential=upside_potential,
+    )
+
+
+class LeaderboardService:
+    """Publish and read the top-pick leaderboards"""
+
+    def __init__(self, db: Optional[Session] = None):
+        self.db = db
+
+    @property
+    def redis(self) -> redis.Redis:
+        return get_redis()
+
+    def _available(self) -> bool:
+        return time.monotonic() >= _redis_down_until
+
+    def _mark_down(self, error: Exception) -> None:
+        global _redis_down_until
+        logger.warning(
+            f"Redis unavailable for leaderboards ({error}); "
+            f"using the database for {REDIS_RETRY_SECONDS:.0f}s"
+        )
+        _redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    # Publishing
+
+    def _scored_rows(
+        self, score_date: date, stock_code: Optional[str] = None
+    ) -> List[Tuple[Stock, ValueScore, Optional[FinancialMetrics]]]:
+        query = (
+            self.db.query(Stock, ValueScore, FinancialMetrics)
+            .join(ValueScore, Stock.code == ValueScore.stock_code)
+            .outerjoin(
+                FinancialMetrics,
+                and_(
+                    Stock.code == FinancialMetrics.stock_code,
+                    FinancialMetrics.date == score_date,
+                ),
+            )
+            .filter(ValueScore.date == score_date)
+            .filter(Stock.current_price.isnot(None))
+        )
+        if stock_code:
+            query = query.filter(Stock.code == stock_code)
+        return query.all()
+
+    def _write_rows(self, pipe, score_date: str, rows) -> None:
+        boards: Dict[str, Dict[str, float]] = {}
+        cards: Dict[str, str] = {}
+        for stock, value_score, metrics in rows:
+            cards[stock.code] = build_card(stock, value_score, metrics).model_dump_json(
+                exclude={"rank"}
+            )
+            for market in ("ALL", stock.market):
+                for category, column in CATEGORIES.items():
+                    key = _board_key(score_date, market, category)
+                    boards.setdefault(key, {})[stock.code] = float(
+                        getattr(value_score, column) or 0
+                    )
+
+        if cards:
+            pipe.hset(_cards_key(score_date), mapping=cards)
+        for key, members in boards.items():
+            pipe.zadd(key, members)
+
+    def publish(self, score_date: Optional[date] = None) -> Dict[str, object]:
+        """
+        Rebuild the leaderboards for a scoring date and point readers at it
+
+        Args:
+            score_date: Scoring date to publish (default: latest ValueScore date)
+
+        Returns:
+            Dictionary with the published date and number of stocks
+        """
+        if score_date is None:
+            latest = self.db.query(ValueScore.date).order_by(desc(ValueScore.date)).first()
+            if not latest:
+                return {"status": "skipped", "message": "No value scores"}
+            score_date = latest[0]
+
+        rows = self._scored_rows(score_date)
+        day = score_date.isoformat()
+        previous = self.redis.get(LATEST_KEY)
+
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(*_date_keys(day))
+        self._write_rows(pipe, day, rows)
+        if previous is None or previous <= day:
+            pipe.set(LATEST_KEY, day)
+            superseded = previous if previous and previous != day else None
+        else:
+            # Backfilled an older date: readers stay on the newer one
+            superseded = day
+        if superseded:
+            for key in _date_keys(superseded):
+                pipe.expire(key, SUPERSEDED_TTL_SECONDS)
+        pipe.execute()
+
+        logger.info(f"Published top-pick leaderboards for {day}: {len(rows)} stocks")
+        return {"status": "success", "date": day, "stocks": len(rows)}
+
+    def publish_stock(self, stock_code: str) -> bool:
+        """
+        Refresh one stock in the latest leaderboards after it was re-scored
+
+        Returns:
+            True if the stock was updated, False if it is not on the latest date
+        """
+        day = self.redis.get(LATEST_KEY)
+        if not day:
+            return False
+        rows = self._scored_rows(date.fromisoformat(day), stock_code)
+        if not rows:
+            return False
+
+        pipe = self.redis.pipeline(transaction=True)
+        self._write_rows(pipe, day, rows)
+        pipe.execute()
+        return True
+
+    def refresh_cards(self, stock_codes: Optional[Sequence[str]] = None) -> int:
+        """
+        Copy the current name and price of stocks into the latest cards
+
+        Rankings are left alone; they only change when scores do.
+
+        Args:
+            stock_codes: Stocks to refresh (default: every card)
+
+        Returns:
+            Number of cards rewritten
+        """
+        day = self.redis.get(LATEST_KEY)
+        if not day:
+            return 0
+        key = _cards_key(day)
+        if stock_codes is None:
+            cards = self.redis.hgetall(key)
+        else:
+            cards = dict(zip(stock_codes, self.redis.hmget(key, list(stock_codes))))
+        cards = {code: raw for code, raw in cards.items() if raw is not None}
+        if not cards:
+            return 0
+
+        stocks = self.db.query(Stock.code, Stock.name, Stock.current_price, Stock.change_rate)
+        if stock_codes is not None:
+            stocks = stocks.filter(Stock.code.in_(list(cards)))
+
+        updated = {}
+        for code, name, current_price, change_rate in stocks:
+            if code not in cards:
+                continue
+            card = TopPickItem(rank=0, **json.loads(cards[code])).model_copy(
+                update={
+                    "stock_name": name,
+                    "current_price": current_price,
+                    "change_rate": change_rate,
+                }
+            )
+            updated[code] = card.model_dump_json(exclude={"rank"})
+
+        if updated:
+            self.redis.hset(key, mapping=updated)
+        return len(updated)
+
+    # Reading
+
+    def top_picks(
+        self,
+        market: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Optional[Tuple[List[TopPickItem], int, date]]:
+        """
+        Read one page of a leaderboard
+
+        Returns:
+            (cards, total ranked stocks, scoring date), or None when no
+            leaderboard is published or Redis is unreachable
+        """
+        if not self._available():
+            return None
+        try:
+            day = self.redis.get(LATEST_KEY)
+            if not day:
+                return None
+            key = _board_key(day, normalize_market(market), normalize_category(category))
+
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zrevrange(key, offset, offset + limit - 1)
+            pipe.zcard(key)
+            codes, total = pipe.execute()
+            raw_cards = self.redis.hmget(_cards_key(day), codes) if codes else []
+        except (redis.RedisError, OSError) as e:
+            self._mark_down(e)
+            return None
+
+        items = []
+        for rank, raw in enumerate(raw_cards, start=offset + 1):
+            if raw is None:
+                continue
+            items.append(TopPickItem(rank=rank, **json.loads(raw)))
+        return items, total, date.fromisoformat(day)
+
+    def rank(
+        self, stock_code: str, market: Optional[str] = None, category: Optional[str] = None
+    ) -> Optional[Dict[str, object]]:
+        """
+        Rank of one stock within a leaderboard
+
+        Returns:
+            Dictionary with rank (1-based, None if unranked), score, total_count
+            and score_date, or None when no leaderboard is available
+        """
+        if not self._available():
+            return None
+        try:
+            day = self.redis.get(LATEST_KEY)
+            if not day:
+                return None
+            key = _board_key(day, normalize_market(market), normalize_category(category))
+
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zscore(key, stock_code)
+            pipe.zcard(key)
+            score, total = pipe.execute()
+            # Tied stocks share a rank, as in the SQL fallback
+            above = self.redis.zcount(key, f"({score}", "+inf") if score is not None else None
+        except (redis.RedisError, OSError) as e:
+            self._mark_down(e)
+            return None
+
+        return {
+            "rank": above + 1 if above is not None else None,
+            "score": score,
+            "total_count": total,
+            "score_date": date.fromisoformat(day),
+        }
+
+
+def publish_leaderboards(db: Session) -> Dict[str, object]:
+    """
+    Publish the latest scoring date; Redis outages are logged, not raised
+
+    Scoring bumps the value_scores epoch before the leaderboards are rebuilt,
+    so it is bumped again here: top-pick ETags handed out in between named the
+    new epoch but carried the old ranking.
+    """
+    try:
+        result = LeaderboardService(db).publish()
+    except (redis.RedisError, OSError) as e:
+        logger.warning(f"Failed to publish top-pick leaderboards: {e}")
+        return {"status": "error", "message": str(e)}
+
+    if result["status"] == "success":
+        DatasetEpochs(db).bump(VALUE_SCORES)
+        db.commit()
+    return result
+
+
+def refresh_leaderboard_cards(
+    db: Session, stock_codes: Optional[Sequence[str]] = None
+) -> Dict[str, object]:
+    """
+    Rewrite the name and price on published cards; Redis outages are logged, not raised
+
+    Call before committing the stocks/prices epoch bump, so top-pick ETags
+    naming the new epoch carry the new prices.
+    """
+    try:
+        refreshed = LeaderboardService(db).refresh_cards(stock_codes)
+    except (redis.RedisError, OSError) as e:
+        logger.warning(f"Failed to refresh top-pick cards: {e}")
+        return {"status": "error", "message": str(e)}
+    return {"status": "success", "cards": refreshed}
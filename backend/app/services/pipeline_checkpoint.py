@@ -0,0 +1,100 @@
+"""Redis-backed checkpoints for the staged data pipeline
+
+Each pipeline run keeps one Redis hash recording its parameters, the stocks
+it covers, which stages and chunks have completed, and their results. A run
+that failed part-way can be resumed with the same run_id and only the
+unfinished stages/chunks are executed again.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from app.db.redis_client import get_redis
+
+CHECKPOINT_KEY_PREFIX = "valuehunt:pipeline:"
+CHECKPOINT_TTL_SECONDS = 7 * 24 * 3600
+
+STAGE_DONE = "done"
+STAGE_FAILED = "failed"
+
+
+class PipelineCheckpoint:
+    """Stage and chunk completion state for one pipeline run"""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.key = f"{CHECKPOINT_KEY_PREFIX}{run_id}"
+
+    @property
+    def redis(self):
+        return get_redis()
+
+    def _set(self, mapping: Dict[str, str]) -> None:
+        pipe = self.redis.pipeline()
+        pipe.hset(self.key, mapping=mapping)
+        pipe.expire(self.key, CHECKPOINT_TTL_SECONDS)
+        pipe.execute()
+
+    def exists(self) -> bool:
+        return bool(self.redis.exists(self.key))
+
+    # Run parameters
+
+    def save_params(self, params: Dict[str, Any]) -> None:
+        self._set({"params": json.dumps(params)})
+
+    def get_params(self) -> Dict[str, Any]:
+        raw = self.redis.hget(self.key, "params")
+        return json.loads(raw) if raw else {}
+
+    def save_stock_codes(self, stock_codes: List[str]) -> None:
+        """Freeze the stock universe so resumed runs chunk identically"""
+        self._set({"stock_codes": json.dumps(stock_codes)})
+
+    def get_stock_codes(self) -> Optional[List[str]]:
+        raw = self.redis.hget(self.key, "stock_codes")
+        return json.loads(raw) if raw else None
+
+    # Stages
+
+    def stage_status(self, stage: str) -> Optional[str]:
+        return self.redis.hget(self.key, f"stage:{stage}")
+
+    def is_stage_done(self, stage: str) -> bool:
+        return self.stage_status(stage) == STAGE_DONE
+
+    def mark_stage(self, stage: str, status: str, result: Optional[Dict] = None) -> None:
+        mapping = {f"stage:{stage}": status}
+        if result is not None:
+            mapping[f"stage:{stage}:result"] = json.dumps(result)
+        self._set(mapping)
+
+    def stage_result(self, stage: str) -> Optional[Dict]:
+        raw = self.redis.hget(self.key, f"stage:{stage}:result")
+        return json.loads(raw) if raw else None
+
+    def claim_stage(self, stage: str) -> bool:
+        """
+        Atomically claim a stage for dispatch
+
+        Stages with several inputs become ready when the last input finishes;
+        the claim makes sure concurrent callbacks dispatch them only once.
+        """
+        claimed = self.redis.hsetnx(self.key, f"claim:{stage}", "1")
+        self.redis.expire(self.key, CHECKPOINT_TTL_SECONDS)
+        return bool(claimed)
+
+    def release_stage(self, stage: str) -> None:
+        self.redis.hdel(self.key, f"claim:{stage}")
+
+    # Chunks
+
+    def mark_chunk_done(self, stage: str, index: int, result: Dict) -> None:
+        self._set({f"chunk:{stage}:{index}": json.dumps(result)})
+
+    def completed_chunks(self, stage: str) -> Dict[int, Dict]:
+        prefix = f"chunk:{stage}:"
+        return {
+            int(field[len(prefix) :]): json.loads(value)
+            for field, value in self.redis.hscan_iter(self.key, match=f"{prefix}*")
+        }
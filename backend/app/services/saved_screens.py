@@ -0,0 +1,260 @@
+"""Saved screen results, materialized after each scoring run
+
+Users save screener filters as ScreenerFilter rows. Once a scoring run has
+published new scores, every saved screen is evaluated in one pass over the
+screener snapshot (see app.services.screener_engine); screens that share a
+condition share its mask, and screens with identical filters share the whole
+result. Each result is stored in one Redis hash:
+
+    valuehunt:screen:42  HASH
+        codes     "000660,005930,035420"   matching stock codes, sorted
+        added     "035420"                 entered since the previous run
+        removed   "051910"                 left since the previous run
+        ...
+
+Opening a saved screen is a primary-key lookup of its ScreenerFilter (so
+deleted screens are gone at once) and a single HGETALL; a result stored for
+different filters than the screen now has is re-evaluated. "added" is the
+list of new matches to notify the user about.
+"""
+
+import hashlib
+import logging
+import time
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import redis
+from sqlalchemy.orm import Session
+
+from app.db.redis_client import get_redis
+from app.models.screener_filter import ScreenerFilter
+from app.schemas.stock import SavedScreenResult
+from app.services.screener_engine import (
+    Predicate,
+    ScreenerSnapshot,
+    compile_filters,
+    get_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+SCREEN_KEY_PREFIX = "valuehunt:screen:"
+# Results outlive a long market holiday; deleted screens expire on their own
+SCREEN_TTL_SECONDS = 10 * 24 * 3600
+
+# Seconds to skip Redis after a connection failure before trying again
+REDIS_RETRY_SECONDS = 30.0
+_redis_down_until = 0.0
+
+
+def _screen_key(filter_id: int) -> str:
+    return f"{SCREEN_KEY_PREFIX}{filter_id}"
+
+
+def pack_codes(codes: Iterable[str]) -> str:
+    """Sorted stock codes as one comma-separated string"""
+    return ",".join(codes)
+
+
+def unpack_codes(packed: Optional[str]) -> np.ndarray:
+    """Inverse of pack_codes (an empty array for None or "")"""
+    return np.array(packed.split(",") if packed else [], dtype=object)
+
+
+def _compile(screen: ScreenerFilter) -> Tuple[Predicate, ...]:
+    """Predicates of a saved screen; fields unknown to the screener are ignored"""
+    return compile_filters(screen.filters or {}, ignore_unknown=True)
+
+
+def filters_fingerprint(predicates: Tuple[Predicate, ...]) -> str:
+    """Short digest of compiled filters; diffs are only kept while it is unchanged"""
+    return hashlib.blake2b(repr(predicates).encode(), digest_size=8).hexdigest()
+
+
+def diff_codes(previous: np.ndarray, current: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(added, removed) between two sorted code arrays"""
+    added = np.setdiff1d(current, previous, assume_unique=True)
+    removed = np.setdiff1d(previous, current, assume_unique=True)
+    return added, removed
+
+
+class SavedScreenService:
+    """Evaluate saved screens and read their stored results"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def redis(self) -> redis.Redis:
+        return get_redis()
+
+    def _available(self) -> bool:
+        return time.monotonic() >= _redis_down_until
+
+    def _mark_down(self, error: Exception) -> None:
+        global _redis_down_until
+        logger.warning(
+            f"Redis unavailable for saved screens ({error}); "
+            f"evaluating on request for {REDIS_RETRY_SECONDS:.0f}s"
+        )
+        _redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def _mapping(
+        self,
+        screen: ScreenerFilter,
+        snapshot: ScreenerSnapshot,
+        fingerprint: str,
+        codes: np.ndarray,
+        added: np.ndarray,
+        removed: np.ndarray,
+    ) -> Dict[str, str]:
+        return {
+            "user_id": str(screen.user_id),
+            "fingerprint": fingerprint,
+            "token": snapshot.token,
+            "score_date": snapshot.score_date.isoformat() if snapshot.score_date else "",
+            "evaluated_at": datetime.utcnow().isoformat(),
+            "codes": pack_codes(codes),
+            "added": pack_codes(added),
+            "removed": pack_codes(removed),
+        }
+
+    def evaluate_all(self) -> Dict[str, object]:
+        """
+        Evaluate every saved screen against the current snapshot
+
+        Screens already evaluated on this snapshot with the same filters are
+        left alone, so a repeated call keeps the diffs of the scoring run.
+
+        Returns:
+            Dictionary with counts of evaluated, unchanged and invalid screens
+        """
+        snapshot = get_snapshot(self.db)
+        screens = self.db.query(ScreenerFilter).order_by(ScreenerFilter.id).all()
+        keys = [_screen_key(screen.id) for screen in screens]
+
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.hmget(key, ["fingerprint", "token", "codes"])
+        previous = pipe.execute() if keys else []
+
+        masks: Dict[Predicate, np.ndarray] = {}
+        results: Dict[Tuple[Predicate, ...], np.ndarray] = {}
+        counts = {"evaluated": 0, "unchanged": 0, "invalid": 0, "with_new_matches": 0}
+
+        pipe = self.redis.pipeline(transaction=False)
+        for screen, key, (old_fingerprint, old_token, old_codes) in zip(screens, keys, previous):
+            try:
+                predicates = _compile(screen)
+            except ValueError as e:
+                logger.warning(f"Saved screen {screen.id} has invalid filters: {e}")
+                counts["invalid"] += 1
+                continue
+
+            fingerprint = filters_fingerprint(predicates)
+            if old_fingerprint == fingerprint and old_token == snapshot.token:
+                counts["unchanged"] += 1
+                pipe.expire(key, SCREEN_TTL_SECONDS)
+                continue
+
+            if predicates not in results:
+                results[predicates] = snapshot.codes[snapshot.mask(predicates, masks)]
+            codes = results[predicates]
+
+            if old_fingerprint == fingerprint:
+                added, removed = diff_codes(unpack_codes(old_codes), codes)
+            else:
+                # New or edited screen: nothing comparable to diff against
+                added = removed = codes[:0]
+
+            mapping = self._mapping(screen, snapshot, fingerprint, codes, added, removed)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, SCREEN_TTL_SECONDS)
+            counts["evaluated"] += 1
+            counts["with_new_matches"] += int(len(added) > 0)
+        pipe.execute()
+
+        logger.info(
+            f"Evaluated saved screens on snapshot {snapshot.token}: {counts}, "
+            f"{len(results)} distinct filter sets, {len(masks)} distinct conditions"
+        )
+        return {"status": "success", "screens": len(screens), **counts}
+
+    def evaluate(self, screen: ScreenerFilter) -> SavedScreenResult:
+        """
+        Evaluate one screen now and store it (without diffs)
+
+        Used when a screen is opened before any run has evaluated it, or after
+        its filters were edited.
+
+        Raises:
+            ValueError: The saved filters are invalid
+        """
+        snapshot = get_snapshot(self.db)
+        predicates = _compile(screen)
+        codes = snapshot.codes[snapshot.mask(predicates)]
+        mapping = self._mapping(
+            screen, snapshot, filters_fingerprint(predicates), codes, codes[:0], codes[:0]
+        )
+
+        if self._available():
+            try:
+                pipe = self.redis.pipeline(transaction=True)
+                pipe.hset(_screen_key(screen.id), mapping=mapping)
+                pipe.expire(_screen_key(screen.id), SCREEN_TTL_SECONDS)
+                pipe.execute()
+            except (redis.RedisError, OSError) as e:
+                self._mark_down(e)
+        return self._result(screen.id, mapping)
+
+    def get(self, screen: ScreenerFilter) -> Optional[SavedScreenResult]:
+        """
+        Stored result of a screen, if it was evaluated with its current filters
+
+        Args:
+            screen: The saved screen, already checked to belong to the user
+
+        Returns:
+            The result, or None when it is not stored, the filters were edited
+            since it was evaluated or Redis is unreachable
+
+        Raises:
+            ValueError: The saved filters are invalid
+        """
+        fingerprint = filters_fingerprint(_compile(screen))
+        if not self._available():
+            return None
+        try:
+            mapping = self.redis.hgetall(_screen_key(screen.id))
+        except (redis.RedisError, OSError) as e:
+            self._mark_down(e)
+            return None
+
+        if not mapping or mapping.get("fingerprint") != fingerprint:
+            return None
+        return self._result(screen.id, mapping)
+
+    @staticmethod
+    def _result(filter_id: int, mapping: Dict[str, str]) -> SavedScreenResult:
+        codes = unpack_codes(mapping.get("codes")).tolist()
+        score_date = mapping.get("score_date")
+        return SavedScreenResult(
+            filter_id=filter_id,
+            stock_codes=codes,
+            total_count=len(codes),
+            added=unpack_codes(mapping.get("added")).tolist(),
+            removed=unpack_codes(mapping.get("removed")).tolist(),
+            score_date=date.fromisoformat(score_date) if score_date else None,
+            evaluated_at=datetime.fromisoformat(mapping["evaluated_at"]),
+        )
+
+
+def refresh_saved_screens(db: Session) -> Dict[str, object]:
+    """Evaluate all saved screens; Redis outages are logged, not raised"""
+    try:
+        return SavedScreenService(db).evaluate_all()
+    except (redis.RedisError, OSError) as e:
+        logger.warning(f"Failed to evaluate saved screens: {e}")
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,375 @@
+"""Columnar in-memory screener
+
+The screener universe is small (one row per listed stock, ~2,500) and only
+changes when a pipeline stage writes new prices, metrics or scores. Each API
+process therefore keeps the stock_snapshots rows (see
+app.services.stock_snapshots) as NumPy column arrays and rebuilds them when
+the dataset epochs change (see
+app.services.dataset_epochs). A request is a handful of vectorized
+comparisons ANDed into a boolean mask, a lexsort of the matches and, if
+asked, facet counts - no SQL at all.
+
+Filters are the JSON object sent to POST /screener:
+
+    {"market": ["KOSPI"],           categorical: value or list of values
+     "PER_max": 15,                 <field>_min / <field>_max: inclusive range
+     "ROE_pct_min": 80}             <field>_pct_min / _pct_max: percentile rank
+                                    (0-100) within the whole universe
+
+Stocks missing a value never match a filter on that field, as with SQL NULL.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.stock_snapshot import StockSnapshot
+from app.services.dataset_epochs import (
+    FINANCIAL_METRICS,
+    PRICES,
+    STOCKS,
+    VALUE_SCORES,
+    DatasetEpochs,
+    version_token,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DATASETS = (STOCKS, PRICES, FINANCIAL_METRICS, VALUE_SCORES)
+
+# Filter/sort field -> stock_snapshots column
+NUMERIC_FIELDS = {
+    "market_cap": StockSnapshot.market_cap,
+    "current_price": StockSnapshot.current_price,
+    "change_rate": StockSnapshot.change_rate,
+    "PER": StockSnapshot.per,
+    "PBR": StockSnapshot.pbr,
+    "PSR": StockSnapshot.psr,
+    "EV_EBITDA": StockSnapshot.ev_ebitda,
+    "ROE": StockSnapshot.roe,
+    "ROA": StockSnapshot.roa,
+    "operating_margin": StockSnapshot.operating_margin,
+    "net_profit_growth": StockSnapshot.net_profit_growth,
+    "debt_ratio": StockSnapshot.debt_ratio,
+    "current_ratio": StockSnapshot.current_ratio,
+    "interest_coverage": StockSnapshot.interest_coverage,
+    "operating_cashflow": StockSnapshot.operating_cashflow,
+    "dividend_yield": StockSnapshot.dividend_yield,
+    "dividend_payout_ratio": StockSnapshot.dividend_payout_ratio,
+    "consecutive_dividend_years": StockSnapshot.consecutive_dividend_years,
+    "value_score": StockSnapshot.total_score,
+    "valuation_score": StockSnapshot.valuation_score,
+    "profitability_score": StockSnapshot.profitability_score,
+    "stability_score": StockSnapshot.stability_score,
+    "dividend_score": StockSnapshot.dividend_score,
+    "upside_potential": StockSnapshot.upside_potential,
+}
+CATEGORICAL_FIELDS = {
+    "market": StockSnapshot.market,
+    "sector": StockSnapshot.sector,
+}
+DEFAULT_SORT = "value_score"
+
+# Filter suffix -> comparison; longest suffixes first so "_pct_min" wins over "_min"
+_RANGE_SUFFIXES = (
+    ("_pct_min", "pct_min"),
+    ("_pct_max", "pct_max"),
+    ("_min", "min"),
+    ("_max", "max"),
+)
+
+
+class Predicate(NamedTuple):
+    """One filter condition; hashable so equal conditions can share a mask"""
+
+    field: str
+    op: str  # min, max, pct_min, pct_max or in
+    value: Any  # float, or a sorted tuple of strings for "in"
+
+
+def compile_filters(
+    filters: Dict[str, Any], ignore_unknown: bool = False
+) -> Tuple[Predicate, ...]:
+    """
+    Turn a screener filter object into predicates
+
+    Empty values (None, "" or []) are ignored, as the screener form sends
+    every field whether it is set or not.
+
+    Args:
+        filters: Screener filter object
+        ignore_unknown: Skip (and log) unknown fields instead of rejecting
+            them, for filters saved before they were validated
+
+    Raises:
+        ValueError: Unknown field or a non-numeric range bound
+    """
+    predicates = []
+    for key, value in filters.items():
+        if value is None or value == "" or value == []:
+            continue
+
+        if key in CATEGORICAL_FIELDS:
+            values = value if isinstance(value, list) else [value]
+            predicates.append(Predicate(key, "in", tuple(sorted(str(v) for v in values))))
+            continue
+
+        for suffix, op in _RANGE_SUFFIXES:
+            name = key[: -len(suffix)]
+            if key.endswith(suffix) and name in NUMERIC_FIELDS:
+                try:
+                    bound = float(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Filter {key} must be a number, got {value!r}")
+                predicates.append(Predicate(name, op, bound))
+                break
+        else:
+            if not ignore_unknown:
+                raise ValueError(f"Unknown screener filter: {key}")
+            logger.warning(f"Ignoring unknown screener filter: {key}")
+
+    return tuple(sorted(predicates))
+
+
+def parse_sort(keys: Sequence[str]) -> List[Tuple[str, bool]]:
+    """
+    Parse sort keys like ["-value_score", "PER"] into (field, descending)
+
+    Raises:
+        ValueError: Unknown sort field
+    """
+    parsed = []
+    for key in keys:
+        descending = key.startswith("-")
+        name = key[1:] if descending else key
+        if name not in NUMERIC_FIELDS:
+            raise ValueError(f"Unknown sort field: {name}")
+        parsed.append((name, descending))
+    return parsed
+
+
+def encode_categories(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Integer codes (-1 for missing) and the label of each code"""
+    codes, labels = pd.factorize(pd.Series(values, dtype=object), sort=True)
+    return codes.astype(np.int32), np.asarray(labels, dtype=object)
+
+
+def _percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """Percentile rank (0-100, ties averaged) of each value; NaN stays NaN"""
+    ranks = np.full(values.shape, np.nan)
+    present = ~np.isnan(values)
+    count = int(present.sum())
+    if count:
+        ranks[present] = pd.Series(values[present]).rank(method="average").to_numpy()
+        ranks[present] = (ranks[present] - 1) / max(count - 1, 1) * 100
+    return ranks
+
+
+@dataclass
+class ScreenerSnapshot:
+    """Latest row per stock as column arrays, sorted by stock code"""
+
+    token: str
+    codes: np.ndarray
+    names: np.ndarray
+    categorical: Dict[str, np.ndarray]  # integer codes, -1 when missing
+    labels: Dict[str, np.ndarray]  # code -> label per categorical field
+    numeric: Dict[str, np.ndarray]
+    percentiles: Dict[str, np.ndarray]
+    score_date: Optional[date] = None
+    metrics_date: Optional[date] = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def predicate_mask(self, predicate: Predicate) -> np.ndarray:
+        """Boolean mask of the stocks matching one predicate"""
+        name, op, value = predicate
+        if op == "in":
+            wanted = np.flatnonzero(np.isin(self.labels[name], value))
+            return np.isin(self.categorical[name], wanted)
+
+        column = self.percentiles[name] if op.startswith("pct_") else self.numeric[name]
+
+        # NaN compares False, so missing values never match
+        with np.errstate(invalid="ignore"):
+            if op.endswith("min"):
+                return column >= value
+            return column <= value
+
+    def mask(
+        self,
+        predicates: Iterable[Predicate],
+        cache: Optional[Dict[Predicate, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        AND of the predicate masks (all stocks when there are none)
+
+        Args:
+            predicates: Compiled filters
+            cache: Masks already computed on this snapshot, shared between
+                screens evaluated together; filled in as a side effect
+        """
+        result = np.ones(len(self), dtype=bool)
+        for predicate in predicates:
+            if cache is None:
+                result &= self.predicate_mask(predicate)
+                continue
+            if predicate not in cache:
+                cache[predicate] = self.predicate_mask(predicate)
+            result &= cache[predicate]
+        return result
+
+    def order(self, mask: np.ndarray, sort: Sequence[Tuple[str, bool]]) -> np.ndarray:
+        """
+        Indices of the matching stocks in sort order
+
+        Missing values sort last in either direction; ties fall back to the
+        stock code so the order is stable across requests.
+        """
+        indices = np.flatnonzero(mask)
+        # np.lexsort treats the last key as primary; the index is the code order
+        keys: List[np.ndarray] = [indices]
+        for name, descending in reversed(sort):
+            values = self.numeric[name][indices]
+            missing = np.isnan(values)
+            values = np.where(missing, 0.0, -values if descending else values)
+            keys.extend([values, missing])
+        return indices[np.lexsort(keys)]
+
+    def after(
+        self, sort: Sequence[Tuple[str, bool]], key: Sequence[Optional[float]], code: str
+    ) -> np.ndarray:
+        """
+        Mask of the stocks that order() places after a given row
+
+        The row is identified by its sort key values (None when missing) and
+        stock code, so a cursor stays valid when that stock drops out of the
+        results between pages.
+        """
+        after = np.zeros(len(self), dtype=bool)
+        tied = np.ones(len(self), dtype=bool)
+        for (name, descending), cursor_value in zip(sort, key):
+            column = self.numeric[name]
+            missing = np.isnan(column)
+            if cursor_value is None:
+                # Missing values sort last, so only other missing values follow
+                tied &= missing
+                continue
+            values = -column if descending else column
+            target = -cursor_value if descending else cursor_value
+            with np.errstate(invalid="ignore"):
+                after |= tied & (missing | (values > target))
+                tied &= values == target
+        after |= tied & (np.arange(len(self)) >= np.searchsorted(self.codes, code, side="right"))
+        return after
+
+    def sort_key(self, sort: Sequence[Tuple[str, bool]], index: int) -> List[Optional[float]]:
+        """Sort key values of one row, for a cursor"""
+        return [self.value(name, index) for name, _ in sort]
+
+    def facet_counts(self, mask: np.ndarray, fields: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """Matching stocks per value of each categorical field (missing values omitted)"""
+        counts = {}
+        for name in fields:
+            if name not in CATEGORICAL_FIELDS:
+                raise ValueError(f"Unknown facet field: {name}")
+            codes = self.categorical[name][mask]
+            labels = self.labels[name]
+            totals = np.bincount(codes[codes >= 0], minlength=len(labels))
+            counts[name] = {
+                str(label): int(total) for label, total in zip(labels, totals) if total
+            }
+        return counts
+
+    def value(self, name: str, index: int) -> Optional[float]:
+        """One cell, or None when missing"""
+        value = self.numeric[name][index]
+        return None if np.isnan(value) else float(value)
+
+
+def load_snapshot(db: Session, token: str = "") -> ScreenerSnapshot:
+    """
+    Read the latest scores and metrics into a snapshot
+
+    Same universe as the original SQL screener: stocks scored on the latest
+    scoring date that also have metrics on the latest metrics date.
+    """
+    score_date, metrics_date = db.query(
+        func.max(StockSnapshot.score_date), func.max(StockSnapshot.metrics_date)
+    ).one()
+
+    columns = {
+        "code": StockSnapshot.stock_code,
+        "name": StockSnapshot.name,
+        **CATEGORICAL_FIELDS,
+        **NUMERIC_FIELDS,
+    }
+    rows = []
+    if score_date and metrics_date:
+        rows = (
+            db.query(*columns.values())
+            .filter(
+                StockSnapshot.score_date == score_date,
+                StockSnapshot.metrics_date == metrics_date,
+            )
+            .order_by(StockSnapshot.stock_code)
+            .all()
+        )
+
+    frame = pd.DataFrame(rows, columns=list(columns))
+    numeric = {
+        name: pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float)
+        for name in NUMERIC_FIELDS
+    }
+    categories = {name: encode_categories(frame[name]) for name in CATEGORICAL_FIELDS}
+    return ScreenerSnapshot(
+        token=token,
+        codes=frame["code"].to_numpy(dtype=object),
+        names=frame["name"].to_numpy(dtype=object),
+        categorical={name: categories[name][0] for name in CATEGORICAL_FIELDS},
+        labels={name: categories[name][1] for name in CATEGORICAL_FIELDS},
+        numeric=numeric,
+        percentiles={name: _percentile_ranks(values) for name, values in numeric.items()},
+        score_date=score_date,
+        metrics_date=metrics_date,
+    )
+
+
+# Snapshots per database URL (one in production; tests use several)
+_snapshots: Dict[str, ScreenerSnapshot] = {}
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot(db: Session) -> ScreenerSnapshot:
+    """
+    Current snapshot, rebuilt when a dataset it is built from has a new epoch
+
+    Concurrent requests that see a new epoch wait for one rebuild.
+    """
+    token = version_token(DatasetEpochs(db).current(*SNAPSHOT_DATASETS))
+    database = str(db.get_bind().url)
+
+    snapshot = _snapshots.get(database)
+    if snapshot is not None and snapshot.token == token:
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshots.get(database)
+        if snapshot is None or snapshot.token != token:
+            started = time.perf_counter()
+            snapshot = load_snapshot(db, token)
+            _snapshots[database] = snapshot
+            logger.info(
+                f"Loaded screener snapshot {token}: {len(snapshot)} stocks "
+                f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+    return snapshot
@@ -0,0 +1,137 @@
+"""On-disk cache for raw DART financial statements
+
+Published statements for a closed reporting period do not change, so they are
+stored as one Parquet file per (corp_code, year, reprt_code) and served from
+disk forever. Reports whose filing deadline has not passed yet may still be
+filed or amended, so those files are only trusted for a limited time and then
+revalidated against DART.
+
+Layout:
+    {STATEMENT_CACHE_DIR}/{dataset}/{corp_code}/{year}_{reprt_code}.parquet
+"""
+
+import logging
+import os
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Period end (month, day) and statutory filing deadline in days per report code
+REPORT_PERIODS = {
+    "11013": ((3, 31), 45),  # Q1
+    "11012": ((6, 30), 45),  # Semi-annual
+    "11014": ((9, 30), 45),  # Q3
+    "11011": ((12, 31), 90),  # Annual
+}
+
+
+class StatementCache:
+    """Parquet cache for raw DART statement rows"""
+
+    def __init__(self, root: Optional[str] = None, revalidate_hours: Optional[float] = None):
+        """
+        Args:
+            root: Cache directory (defaults to settings.STATEMENT_CACHE_DIR)
+            revalidate_hours: Age after which open-period reports are refetched
+        """
+        self.root = Path(root or settings.STATEMENT_CACHE_DIR)
+        self.revalidate_seconds = (
+            revalidate_hours
+            if revalidate_hours is not None
+            else settings.STATEMENT_CACHE_REVALIDATE_HOURS
+        ) * 3600
+
+    @staticmethod
+    def is_final(year: int, reprt_code: str, today: Optional[date] = None) -> bool:
+        """
+        Check whether a report's filing deadline has passed
+
+        Args:
+            year: Fiscal year
+            reprt_code: Report code - 11011=Annual, 11012=Semi-annual, 11013=Q1, 11014=Q3
+            today: Reference date (defaults to today)
+
+        Returns:
+            True if the report can be treated as immutable
+        """
+        if reprt_code not in REPORT_PERIODS:
+            return False
+
+        (month, day), deadline_days = REPORT_PERIODS[reprt_code]
+        deadline = date(year, month, day) + timedelta(days=deadline_days)
+        return (today or date.today()) > deadline
+
+    def _path(self, corp_code: str, year: int, reprt_code: str, dataset: str) -> Path:
+        return self.root / dataset / corp_code / f"{year}_{reprt_code}.parquet"
+
+    def get(
+        self, corp_code: str, year: int, reprt_code: str = "11011", dataset: str = "finstate"
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load cached statement rows
+
+        Args:
+            corp_code: 8-digit DART corporation code
+            year: Fiscal year
+            reprt_code: DART report code
+            dataset: Endpoint the rows came from ("finstate" or "multi")
+
+        Returns:
+            Cached DataFrame, or None if missing or due for revalidation
+        """
+        path = self._path(corp_code, year, reprt_code, dataset)
+
+        try:
+            if not self.is_final(year, reprt_code):
+                age = time.time() - path.stat().st_mtime
+                if age > self.revalidate_seconds:
+                    return None
+            return pd.read_parquet(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable statement cache {path}: {e}")
+            return None
+
+    def put(
+        self,
+        df: pd.DataFrame,
+        corp_code: str,
+        year: int,
+        reprt_code: str = "11011",
+        dataset: str = "finstate",
+    ) -> None:
+        """
+        Store statement rows (written atomically, failures are only logged)
+
+        Args:
+            df: Raw statement rows returned by DART
+            corp_code: 8-digit DART corporation code
+            year: Fiscal year
+            reprt_code: DART report code
+            dataset: Endpoint the rows came from ("finstate" or "multi")
+        """
+        if df is None or df.empty:
+            return
+
+        path = self._path(corp_code, year, reprt_code, dataset)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.reset_index(drop=True).to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write statement cache {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+
+# Singleton instance
+statement_cache = StatementCache()
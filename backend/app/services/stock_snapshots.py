@@ -0,0 +1,178 @@
+"""Materialized latest snapshot per stock
+
+Top picks, the screener, the watchlist and stock detail all need "each
+stock with its latest metrics and scores". Instead of each endpoint finding
+the latest dates and joining stocks, financial_metrics and value_scores, the
+scoring run rebuilds the stock_snapshots table (see
+app.models.stock_snapshot) with one INSERT ... SELECT, and those endpoints
+read a single row per stock.
+
+The stock list and price collectors keep the stock columns (name, price,
+market cap, ...) of the rows current in between, and add rows for newly
+listed stocks, in the same transaction as their stocks/prices epoch bump.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import DateTime, and_, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.models.financial_metrics import FinancialMetrics
+from app.models.stock import Stock
+from app.models.stock_snapshot import StockSnapshot
+from app.models.value_score import ValueScore
+from app.services.dataset_epochs import VALUE_SCORES, DatasetEpochs
+
+logger = logging.getLogger(__name__)
+
+STOCK_COLUMNS = (
+    "name",
+    "market",
+    "sector",
+    "market_cap",
+    "current_price",
+    "change_rate",
+    "updated_at",
+)
+METRIC_COLUMNS = (
+    "per",
+    "pbr",
+    "psr",
+    "ev_ebitda",
+    "roe",
+    "roa",
+    "operating_margin",
+    "net_profit_growth",
+    "debt_ratio",
+    "current_ratio",
+    "interest_coverage",
+    "operating_cashflow",
+    "dividend_yield",
+    "dividend_payout_ratio",
+    "consecutive_dividend_years",
+)
+SCORE_COLUMNS = (
+    "total_score",
+    "valuation_score",
+    "profitability_score",
+    "stability_score",
+    "dividend_score",
+    "upside_potential",
+    "ai_summary",
+    "strengths",
+    "risks",
+)
+
+
+def _by_recency(model, columns: Sequence[str], stock_codes: Optional[Sequence[str]]):
+    """Rows of a dated per-stock table numbered 1, 2, ... from the latest date"""
+    recency = func.row_number().over(
+        partition_by=model.stock_code, order_by=model.date.desc()
+    )
+    query = select(
+        model.stock_code,
+        model.date,
+        *(getattr(model, name) for name in columns),
+        recency.label("recency"),
+    )
+    if stock_codes is not None:
+        query = query.where(model.stock_code.in_(stock_codes))
+    return query.subquery()
+
+
+class StockSnapshotService:
+    """Rebuild the stock_snapshots table"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh(self, stock_codes: Optional[Sequence[str]] = None) -> int:
+        """
+        Rebuild the snapshot rows of all stocks, or of the given ones (caller commits)
+
+        Bumps the value_scores epoch, so cached rankings and screener
+        snapshots built from the previous rows are invalidated on commit.
+
+        Args:
+            stock_codes: Stocks to refresh (default: all)
+
+        Returns:
+            Number of rows written
+        """
+        written = self._rebuild(stock_codes)
+        DatasetEpochs(self.db).bump(VALUE_SCORES)
+
+        logger.info(f"Refreshed {written} stock snapshots")
+        return written
+
+    def refresh_stocks(self, stock_codes: Optional[Sequence[str]] = None) -> int:
+        """
+        Copy the stocks columns into the snapshot rows (caller commits)
+
+        Keeps names, prices and market caps current between scoring runs and
+        adds rows for stocks listed since the last run. Epochs are left to the
+        caller, which bumps stocks or prices for the change it made.
+
+        Args:
+            stock_codes: Stocks to update (default: all)
+
+        Returns:
+            Number of rows updated or added
+        """
+        stale = (
+            update(StockSnapshot)
+            .where(StockSnapshot.stock_code == Stock.code)
+            .values({name: getattr(Stock, name) for name in STOCK_COLUMNS})
+            .execution_options(synchronize_session=False)
+        )
+        missing = select(Stock.code).where(
+            ~select(StockSnapshot.stock_code)
+            .where(StockSnapshot.stock_code == Stock.code)
+            .exists()
+        )
+        if stock_codes is not None:
+            stale = stale.where(StockSnapshot.stock_code.in_(stock_codes))
+            missing = missing.where(Stock.code.in_(stock_codes))
+
+        updated = self.db.execute(stale).rowcount
+        new_codes = self.db.execute(missing).scalars().all()
+        added = self._rebuild(new_codes) if new_codes else 0
+
+        logger.info(f"Updated {updated} stock snapshots and added {added}")
+        return updated + added
+
+    def _rebuild(self, stock_codes: Optional[Sequence[str]]) -> int:
+        scores = _by_recency(ValueScore, SCORE_COLUMNS, stock_codes)
+        previous = _by_recency(ValueScore, ("total_score",), stock_codes)
+        metrics = _by_recency(FinancialMetrics, METRIC_COLUMNS, stock_codes)
+
+        columns = {
+            "stock_code": Stock.code,
+            **{name: getattr(Stock, name) for name in STOCK_COLUMNS},
+            "metrics_date": metrics.c.date,
+            **{name: metrics.c[name] for name in METRIC_COLUMNS},
+            "score_date": scores.c.date,
+            **{name: scores.c[name] for name in SCORE_COLUMNS},
+            "previous_score_date": previous.c.date,
+            "previous_total_score": previous.c.total_score,
+            "total_score_change": scores.c.total_score - previous.c.total_score,
+            "refreshed_at": literal(datetime.utcnow(), DateTime),
+        }
+        source = (
+            select(*columns.values())
+            .select_from(Stock)
+            .outerjoin(scores, and_(scores.c.stock_code == Stock.code, scores.c.recency == 1))
+            .outerjoin(
+                previous, and_(previous.c.stock_code == Stock.code, previous.c.recency == 2)
+            )
+            .outerjoin(metrics, and_(metrics.c.stock_code == Stock.code, metrics.c.recency == 1))
+        )
+        stale = delete(StockSnapshot)
+        if stock_codes is not None:
+            source = source.where(Stock.code.in_(stock_codes))
+            stale = stale.where(StockSnapshot.stock_code.in_(stock_codes))
+
+        self.db.execute(stale)
+        return self.db.execute(insert(StockSnapshot).from_select(list(columns), source)).rowcount
@@ -0,0 +1,482 @@
+"""Synthetic KRX universe for benchmarks and load tests
+
+Fills the schema with a production-sized market that needs no network access:
+stocks, daily OHLCV, quarterly HistoricalFinancialMetrics, recent daily
+FinancialMetrics/ValueScore runs, insider filings and their signals.
+
+Generation is deterministic - the same UniverseSpec always yields the same
+rows - so benchmark results stay comparable between commits. Prices follow a
+one-factor market model, fundamentals drift quarter to quarter around a
+per-stock mean, and valuation ratios are derived from price and fundamentals
+so PER/PBR move with the market like the real thing. Value Scores come from
+ValueScorer itself.
+
+CLI: scripts/generate_synthetic_data.py
+Tests: the `synthetic_db` fixture in tests/conftest.py
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import cached_property
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.db.bulk import bulk_load_frame
+from app.models.backtest import (
+    BacktestRecommendation,
+    HistoricalFinancialMetrics,
+    HistoricalStockPrice,
+)
+from app.models.financial_metrics import FinancialMetrics
+from app.models.insider_signal import InsiderSignal
+from app.models.insider_trading import InsiderTrading
+from app.models.stock import Stock
+from app.models.stock_snapshot import StockSnapshot
+from app.models.value_score import ValueScore
+from app.models.watchlist import Watchlist
+from app.services.dataset_epochs import DATASETS, DatasetEpochs
+from app.services.insider_signal_service import InsiderSignalService
+from app.services.stock_snapshots import StockSnapshotService
+from app.services.value_scorer import ValueScorer
+
+logger = logging.getLogger(__name__)
+
+SECTORS = [
+    "반도체", "전자부품", "자동차", "화학", "제약", "바이오", "은행", "보험",
+    "건설", "철강", "기계", "소프트웨어", "통신", "유통", "음식료", "섬유의복",
+    "운송", "에너지", "엔터테인먼트", "게임",
+]
+NAME_PREFIXES = [
+    "한국", "대한", "동양", "신한", "현대", "삼호", "대성", "세방", "우진", "태평양",
+    "한빛", "동방", "서울", "미래", "새한", "대원", "한솔", "금호", "성진", "유니",
+]
+SURNAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+GIVEN_NAMES = ["민수", "서연", "지훈", "하은", "도윤", "수빈", "현우", "지민", "준호", "예린"]
+POSITIONS = ["대표이사", "사내이사", "부사장", "전무", "상무", "감사", "최대주주"]
+
+# Days between a quarter's end and its filing becoming public (annual reports take longer)
+QUARTERLY_FILING_LAG = 45
+ANNUAL_FILING_LAG = 90
+
+# KRX daily price limit
+DAILY_LIMIT = 0.30
+
+# Tables filled by the generator, children first
+GENERATED_TABLES = [
+    StockSnapshot,
+    InsiderSignal,
+    InsiderTrading,
+    ValueScore,
+    FinancialMetrics,
+    HistoricalFinancialMetrics,
+    HistoricalStockPrice,
+    Stock,
+]
+
+
+@dataclass(frozen=True)
+class UniverseSpec:
+    """Size and shape of a synthetic universe"""
+
+    stocks: int = 2500
+    years: int = 5
+    end_date: date = date(2026, 10, 16)
+    score_days: int = 20  # Daily FinancialMetrics/ValueScore runs up to end_date
+    filings_per_year: float = 4.0  # Insider filings per stock per year
+    seed: int = 42
+
+
+class SyntheticUniverse:
+    """Deterministic generator for a UniverseSpec; frames are built lazily and cached"""
+
+    def __init__(self, spec: UniverseSpec = UniverseSpec()):
+        self.spec = spec
+
+    def _rng(self, stream: int) -> np.random.Generator:
+        # One independent stream per table keeps each frame stable regardless of build order
+        return np.random.default_rng([self.spec.seed, stream])
+
+    @cached_property
+    def trading_days(self) -> pd.DatetimeIndex:
+        end = pd.Timestamp(self.spec.end_date)
+        return pd.bdate_range(end=end, start=end - pd.DateOffset(years=self.spec.years))
+
+    @cached_property
+    def stocks(self) -> pd.DataFrame:
+        """One row per stock with the static traits the other frames are derived from"""
+        rng = self._rng(0)
+        n = self.spec.stocks
+
+        codes = np.sort(rng.choice(np.arange(1000, 1_000_000), size=n, replace=False))
+        kospi = rng.random(n) < 0.35
+        sector = rng.choice(SECTORS, size=n)
+        names = pd.Series(rng.choice(NAME_PREFIXES, size=n)) + pd.Series(sector)
+        repeat = names.groupby(names).cumcount()
+        names = names.where(repeat == 0, names + (repeat + 1).astype(str))
+
+        price0 = np.clip(np.round(rng.lognormal(np.log(15000), 1.0, n), -1), 500, 2_000_000)
+        market_cap0 = np.where(
+            kospi, rng.lognormal(np.log(8e11), 1.6, n), rng.lognormal(np.log(1.5e11), 1.2, n)
+        ).clip(5e9, 4e14)
+
+        return pd.DataFrame(
+            {
+                "code": [f"{code:06d}" for code in codes],
+                "name": names.to_numpy(),
+                "market": np.where(kospi, "KOSPI", "KOSDAQ"),
+                "sector": sector,
+                "price0": price0,
+                "shares": np.maximum(np.round(market_cap0 / price0), 1e5).astype(np.int64),
+                "beta": rng.normal(1.0, 0.3, n).clip(0.2, 2.0),
+                "volatility": np.where(kospi, rng.uniform(0.010, 0.025, n), rng.uniform(0.015, 0.035, n)),
+                "drift": rng.normal(0.0002, 0.0004, n),
+                "roe_mean": rng.normal(7, 6, n),
+                "margin_mean": rng.normal(7, 5, n),
+                "pbr0": rng.lognormal(0.0, 0.5, n),
+                "turnover": rng.lognormal(np.log(0.9), 0.4, n),
+                "debt_ratio": rng.lognormal(np.log(80), 0.6, n),
+                "current_ratio": rng.lognormal(np.log(150), 0.4, n),
+                "interest_coverage": rng.lognormal(np.log(8), 0.8, n),
+                "dividend_payer": rng.random(n) < np.where(kospi, 0.6, 0.35),
+                "payout_ratio": rng.normal(30, 10, n).clip(5, 90),
+                "dividend_years0": rng.integers(0, 20, n),
+            }
+        )
+
+    @cached_property
+    def _price_arrays(self) -> Dict[str, np.ndarray]:
+        """(stocks x trading days) OHLCV matrices"""
+        rng = self._rng(1)
+        stocks = self.stocks
+        n, t = len(stocks), len(self.trading_days)
+        is_kospi = (stocks["market"] == "KOSPI").to_numpy()[:, None]
+
+        market = np.where(
+            is_kospi, rng.normal(0.0003, 0.010, t)[None, :], rng.normal(0.0002, 0.013, t)[None, :]
+        )
+        vol = stocks["volatility"].to_numpy()[:, None]
+        returns = (
+            stocks["drift"].to_numpy()[:, None]
+            + stocks["beta"].to_numpy()[:, None] * market
+            + vol * rng.standard_normal((n, t))
+        ).clip(np.log(1 - DAILY_LIMIT), np.log(1 + DAILY_LIMIT))
+        returns[:, 0] = 0.0
+
+        close = stocks["price0"].to_numpy()[:, None] * np.exp(np.cumsum(returns, axis=1))
+        prev_close = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+        open_ = prev_close * np.exp(0.3 * vol * rng.standard_normal((n, t)))
+        high = np.maximum(open_, close) * np.exp(np.abs(0.5 * vol * rng.standard_normal((n, t))))
+        low = np.minimum(open_, close) * np.exp(-np.abs(0.5 * vol * rng.standard_normal((n, t))))
+        turnover = rng.lognormal(np.log(0.003), 0.6, (n, t))
+        volume = (stocks["shares"].to_numpy()[:, None] * turnover).clip(1, 2**31 - 1)
+
+        return {
+            "open": np.maximum(np.round(open_), 1),
+            "high": np.maximum(np.round(high), 1),
+            "low": np.maximum(np.round(low), 1),
+            "close": np.maximum(np.round(close), 1),
+            "volume": volume.astype(np.int64),
+        }
+
+    @cached_property
+    def prices(self) -> pd.DataFrame:
+        """HistoricalStockPrice rows"""
+        arrays = self._price_arrays
+        n, t = arrays["close"].shape
+        frame = pd.DataFrame(
+            {
+                "stock_code": np.repeat(self.stocks["code"].to_numpy(), t),
+                "date": np.tile(self.trading_days.to_pydatetime(), n),
+            }
+        )
+        for column in ("open", "high", "low", "close", "volume"):
+            frame[column] = arrays[column].ravel()
+        return frame
+
+    @cached_property
+    def _quarters(self) -> pd.DataFrame:
+        """Quarterly fundamentals per stock (long format, ordered by stock then quarter)"""
+        rng = self._rng(2)
+        stocks = self.stocks
+        start = self.trading_days[0] - pd.DateOffset(months=6)
+        report_dates = pd.date_range(start, self.trading_days[-1], freq="Q")
+        n, q = len(stocks), len(report_dates)
+
+        # AR(1) deviations around the per-stock means
+        shocks = rng.normal(0, 3, (n, q))
+        deviation = np.zeros((n, q))
+        for i in range(q):
+            deviation[:, i] = (deviation[:, i - 1] * 0.7 if i else 0) + shocks[:, i]
+        roe = stocks["roe_mean"].to_numpy()[:, None] + deviation
+        margin = stocks["margin_mean"].to_numpy()[:, None] + rng.normal(0, 2, (n, q))
+
+        bps0 = (stocks["price0"] / stocks["pbr0"]).to_numpy()[:, None]
+        bps = bps0 * np.cumprod(1 + roe.clip(-80, None) / 400, axis=1)
+        eps = roe / 100 * bps
+        eps_prev = np.concatenate([np.full((n, 4), np.nan), eps[:, :-4]], axis=1)
+        growth = np.where(
+            (eps > 0) & (eps_prev > 0), (eps / eps_prev - 1) * 100, rng.normal(5, 15, (n, q))
+        )
+
+        def drift(column: str) -> np.ndarray:
+            return stocks[column].to_numpy()[:, None] * np.exp(rng.normal(0, 0.05, (n, q)))
+
+        lag = np.where(report_dates.quarter == 4, ANNUAL_FILING_LAG, QUARTERLY_FILING_LAG)
+        payer = stocks["dividend_payer"].to_numpy()[:, None] & (eps > 0)
+
+        return pd.DataFrame(
+            {
+                "stock_index": np.repeat(np.arange(n), q),
+                "stock_code": np.repeat(stocks["code"].to_numpy(), q),
+                "report_date": np.tile(report_dates.to_pydatetime(), n),
+                "snapshot_date": np.tile((report_dates + pd.to_timedelta(lag, unit="D")).to_pydatetime(), n),
+                "roe": roe.ravel(),
+                "operating_margin": margin.ravel(),
+                "bps": bps.ravel(),
+                "eps": eps.ravel(),
+                "sps": (bps * stocks["turnover"].to_numpy()[:, None]).ravel(),
+                "net_profit_growth": growth.ravel(),
+                "debt_ratio": drift("debt_ratio").ravel(),
+                "current_ratio": drift("current_ratio").ravel(),
+                "interest_coverage": drift("interest_coverage").ravel(),
+                "cashflow_ratio": rng.normal(1.1, 0.3, (n, q)).ravel(),
+                "payout_ratio": np.where(payer, stocks["payout_ratio"].to_numpy()[:, None], 0).ravel(),
+                "dividend_years": np.where(
+                    stocks["dividend_payer"].to_numpy()[:, None],
+                    stocks["dividend_years0"].to_numpy()[:, None] + np.arange(q)[None, :] // 4,
+                    0,
+                ).ravel(),
+            }
+        )
+
+    def _metrics_at(self, quarters: pd.DataFrame, day_index: np.ndarray) -> pd.DataFrame:
+        """Valuation and fundamental metrics for quarter rows priced at the given trading days"""
+        stocks = self.stocks
+        close = self._price_arrays["close"][quarters["stock_index"].to_numpy(), day_index]
+        shares = stocks["shares"].to_numpy()[quarters["stock_index"].to_numpy()]
+        eps = quarters["eps"].to_numpy()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per = np.where(eps > 0, (close / eps).clip(1.5, 999), (close / eps).clip(-999, -2))
+        ev_ebitda = np.where(per > 0, per * 0.55, np.nan).clip(0.5, 99)
+        debt_ratio = quarters["debt_ratio"].to_numpy().clip(5, 900)
+
+        return pd.DataFrame(
+            {
+                "per": per.round(2),
+                "pbr": (close / quarters["bps"].to_numpy()).clip(0.05, 99).round(2),
+                "psr": (close / quarters["sps"].to_numpy()).clip(0.01, 99).round(2),
+                "ev_ebitda": ev_ebitda.round(2),
+                "roe": quarters["roe"].to_numpy().clip(-99, 99).round(2),
+                "roa": (quarters["roe"].to_numpy() / (1 + debt_ratio / 100)).clip(-99, 99).round(2),
+                "operating_margin": quarters["operating_margin"].to_numpy().clip(-99, 99).round(2),
+                "net_profit_growth": quarters["net_profit_growth"].to_numpy().clip(-99, 300).round(2),
+                "debt_ratio": debt_ratio.round(2),
+                "current_ratio": quarters["current_ratio"].to_numpy().clip(20, 999).round(2),
+                "interest_coverage": quarters["interest_coverage"].to_numpy().clip(0.1, 999).round(2),
+                "operating_cashflow": (eps * shares * quarters["cashflow_ratio"].to_numpy()).round(),
+                "dividend_yield": np.where(
+                    per > 0, quarters["payout_ratio"].to_numpy() / per, 0
+                ).clip(0, 30).round(2),
+                "dividend_payout_ratio": quarters["payout_ratio"].to_numpy().round(2),
+                "consecutive_dividend_years": quarters["dividend_years"].to_numpy(),
+                "market_cap": close * shares,
+            }
+        )
+
+    @cached_property
+    def historical_metrics(self) -> pd.DataFrame:
+        """HistoricalFinancialMetrics rows, one per stock and filed quarter"""
+        quarters = self._quarters
+        days = self.trading_days
+        quarters = quarters[
+            (quarters["snapshot_date"] >= days[0]) & (quarters["snapshot_date"] <= days[-1])
+        ].reset_index(drop=True)
+
+        # Price as of the last trading day on or before the filing date
+        day_index = days.searchsorted(quarters["snapshot_date"], side="right") - 1
+        metrics = self._metrics_at(quarters, day_index)
+        metrics["operating_cash_flow"] = metrics.pop("operating_cashflow")
+
+        return pd.concat(
+            [quarters[["stock_code", "snapshot_date", "report_date"]], metrics], axis=1
+        )
+
+    @cached_property
+    def financial_metrics(self) -> pd.DataFrame:
+        """FinancialMetrics rows for each of the last score_days trading days"""
+        quarters = self._quarters
+        days = self.trading_days
+        n = len(self.stocks)
+        per_stock = len(quarters) // n
+        snapshots = quarters["snapshot_date"].to_numpy()[:per_stock]
+
+        frames = []
+        for day_index in range(max(len(days) - self.spec.score_days, 0), len(days)):
+            # Latest quarter already filed on this day
+            latest = np.searchsorted(snapshots, days[day_index].to_datetime64(), side="right") - 1
+            if latest < 0:
+                continue
+            rows = quarters.iloc[np.arange(n) * per_stock + latest].reset_index(drop=True)
+            metrics = self._metrics_at(rows, np.full(n, day_index))
+            metrics.insert(0, "stock_code", rows["stock_code"])
+            metrics.insert(1, "date", days[day_index].date())
+            frames.append(metrics.drop(columns="market_cap"))
+
+        frame = pd.concat(frames, ignore_index=True)
+        frame["operating_cashflow"] = frame["operating_cashflow"].astype("Int64")
+        return frame
+
+    @cached_property
+    def value_scores(self) -> pd.DataFrame:
+        """ValueScore rows computed by ValueScorer from the FinancialMetrics rows"""
+        scorer = ValueScorer(None)
+        rows: List[Dict] = []
+        for metrics in self.financial_metrics.itertuples(index=False):
+            valuation = scorer.calculate_valuation_score(metrics)
+            profitability = scorer.calculate_profitability_score(metrics)
+            stability = scorer.calculate_stability_score(metrics)
+            dividend = scorer.calculate_dividend_score(metrics)
+            total = valuation + profitability + stability + dividend
+            strengths, risks = scorer._generate_strengths_risks(metrics)
+            rows.append(
+                {
+                    "stock_code": metrics.stock_code,
+                    "date": metrics.date,
+                    "total_score": total,
+                    "valuation_score": valuation,
+                    "profitability_score": profitability,
+                    "stability_score": stability,
+                    "dividend_score": dividend,
+                    "upside_potential": (
+                        round((10 - metrics.per) / metrics.per * 100, 2)
+                        if metrics.per < 10
+                        else None
+                    ),
+                    "ai_summary": scorer._generate_simple_summary(
+                        metrics, total, valuation, profitability
+                    ),
+                    "strengths": strengths,
+                    "risks": risks,
+                }
+            )
+        return pd.DataFrame(rows)
+
+    @cached_property
+    def insider_filings(self) -> pd.DataFrame:
+        """InsiderTrading rows (executive and major shareholder ownership reports)"""
+        rng = self._rng(3)
+        stocks = self.stocks
+        days = self.trading_days
+
+        counts = rng.poisson(self.spec.filings_per_year * self.spec.years, len(stocks))
+        stock_index = np.repeat(np.arange(len(stocks)), counts)
+        total = len(stock_index)
+        shares = stocks["shares"].to_numpy()[stock_index]
+
+        frame = pd.DataFrame(
+            {
+                "stock_index": stock_index,
+                "rcept_dt": days[rng.integers(0, len(days), total)].date,
+                # A handful of reporters per company
+                "reporter": rng.integers(0, 5, total),
+                "change": np.where(rng.random(total) < 0.55, 1, -1)
+                * np.maximum(rng.lognormal(np.log(shares * 0.0005), 1.0), 1).round(),
+            }
+        ).sort_values(["stock_index", "rcept_dt"], kind="stable", ignore_index=True)
+
+        index = frame["stock_index"].to_numpy()
+        shares = stocks["shares"].to_numpy()[index]
+        reporter_seed = index * 7 + frame["reporter"].to_numpy()
+        base_holding = (shares * 0.01 * (1 + reporter_seed % 5)).round()
+        holding = (
+            base_holding + frame.groupby(["stock_index", "reporter"])["change"].cumsum()
+        ).clip(lower=0)
+        day_key = pd.Series(frame["rcept_dt"]).map(lambda d: d.strftime("%Y%m%d"))
+        sequence = frame.groupby("rcept_dt").cumcount()
+        created = datetime.combine(self.spec.end_date, datetime.min.time())
+
+        return pd.DataFrame(
+            {
+                "stock_code": stocks["code"].to_numpy()[index],
+                "rcept_no": day_key + sequence.map("{:06d}".format),
+                "rcept_dt": frame["rcept_dt"],
+                "corp_code": [f"{i:08d}" for i in index],
+                "corp_name": stocks["name"].to_numpy()[index],
+                "repror": [
+                    SURNAMES[s % len(SURNAMES)] + GIVEN_NAMES[(s // 3) % len(GIVEN_NAMES)]
+                    for s in reporter_seed
+                ],
+                "isu_exctv_rgist_at": np.where(reporter_seed % 3 == 0, "비등기임원", "등기임원"),
+                "isu_exctv_ofcps": [POSITIONS[s % len(POSITIONS)] for s in reporter_seed],
+                "isu_main_shrholdr": np.where(reporter_seed % 7 == 0, "10%이상주주", "-"),
+                "sp_stock_lmp_cnt": holding.astype(np.int64),
+                "sp_stock_lmp_irds_cnt": frame["change"].astype(np.int64),
+                "sp_stock_lmp_rate": (holding / shares * 100).clip(0, 99).round(4),
+                "sp_stock_lmp_irds_rate": (frame["change"] / shares * 100).clip(-99, 99).round(4),
+                "created_at": created,
+                "updated_at": created,
+            }
+        )
+
+    def stock_rows(self) -> pd.DataFrame:
+        """Stock rows with the last close, market cap and daily change"""
+        close = self._price_arrays["close"]
+        change = (close[:, -1] / close[:, -2] - 1) * 100 if close.shape[1] > 1 else 0.0
+        created = datetime.combine(self.spec.end_date, datetime.min.time())
+        return pd.DataFrame(
+            {
+                "code": self.stocks["code"],
+                "name": self.stocks["name"],
+                "market": self.stocks["market"],
+                "sector": self.stocks["sector"],
+                "market_cap": (close[:, -1] * self.stocks["shares"]).astype(np.int64),
+                "current_price": close[:, -1].astype(np.int64),
+                "change_rate": np.round(change, 2),
+                "created_at": created,
+                "updated_at": created,
+            }
+        )
+
+    def load(self, db: Session) -> Dict[str, int]:
+        """
+        Bulk-load the universe and refresh insider signals (tables must be empty)
+
+        Args:
+            db: Database session (committed here)
+
+        Returns:
+            Rows written per table
+        """
+        started = time.perf_counter()
+        counts = {
+            "stocks": bulk_load_frame(db, Stock, self.stock_rows()),
+            "historical_stock_prices": bulk_load_frame(db, HistoricalStockPrice, self.prices),
+            "historical_financial_metrics": bulk_load_frame(
+                db, HistoricalFinancialMetrics, self.historical_metrics
+            ),
+            "financial_metrics": bulk_load_frame(db, FinancialMetrics, self.financial_metrics),
+            "value_scores": bulk_load_frame(db, ValueScore, self.value_scores),
+            "insider_trading": bulk_load_frame(db, InsiderTrading, self.insider_filings),
+        }
+        counts["insider_signals"] = InsiderSignalService(db).refresh(as_of=self.spec.end_date)
+        counts["stock_snapshots"] = StockSnapshotService(db).refresh()
+        DatasetEpochs(db).bump(*DATASETS)
+        db.commit()
+
+        logger.info(
+            f"Loaded synthetic universe ({self.spec.stocks} stocks x {self.spec.years} years) "
+            f"in {time.perf_counter() - started:.1f}s: {counts}"
+        )
+        return counts
+
+
+def clear_generated_tables(db: Session) -> None:
+    """Delete all rows from the generated tables and the rows referencing stocks (caller commits)"""
+    for model in [Watchlist, BacktestRecommendation, *GENERATED_TABLES]:
+        db.query(model).delete(synchronize_session=False)
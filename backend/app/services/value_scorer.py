@@ -5,13 +5,14 @@
 
 import logging
 from datetime import datetime, date
-from typing import Optional, Dict, Any
+from typing import List, Optional, Dict, Any
 
 from sqlalchemy.orm import Session
 
 from app.models.stock import Stock
 from app.models.financial_metrics import FinancialMetrics
 from app.models.value_score import ValueScore
+from app.services.dataset_epochs import VALUE_SCORES, DatasetEpochs
 
 logger = logging.getLogger(__name__)
 
@@ -328,17 +329,27 @@ class ValueScorer:
 
         return strengths, risks
 
-    def calculate_all_value_scores(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    def calculate_all_value_scores(
+        self,
+        limit: Optional[int] = None,
+        stock_codes: Optional[List[str]] = None,
+        bump_epoch: bool = True,
+    ) -> Dict[str, Any]:
         """
         전체 종목의 Value Score 계산
 
         Args:
             limit: 계산할 종목 수 제한
+            stock_codes: 처리할 종목 코드 목록 (파이프라인 청크)
+            bump_epoch: value_scores epoch 갱신 여부 (파이프라인 청크는 False)
 
         Returns:
             계산 결과 통계
         """
-        stocks = self.db.query(Stock).all()
+        query = self.db.query(Stock)
+        if stock_codes is not None:
+            query = query.filter(Stock.code.in_(stock_codes))
+        stocks = query.all()
 
         if limit:
             stocks = stocks[:limit]
@@ -371,5 +382,9 @@ class ValueScorer:
             "success_rate": f"{(success/total*100):.2f}%" if total > 0 else "0%",
         }
 
+        if success and bump_epoch:
+            DatasetEpochs(self.db).bump(VALUE_SCORES)
+            self.db.commit()
+
         logger.info(f"Value Score calculation completed: {result}")
         return result
@@ -1,14 +1,21 @@
-"""Celery tasks for DART API data collection with rate limiting"""
+"""Celery tasks for DART API data collection
 
+Request pacing is enforced by the shared DART token bucket in
+`app.core.rate_limiter`, so batches are dispatched back to back. Orchestrators
+dispatch chords and return immediately; a callback task aggregates the batch
+results, so no worker slot is held waiting on other tasks.
+"""
+
+import asyncio
 import logging
-import time
-from typing import Optional
+from typing import List, Optional
 
-from celery import group
+from celery import chord
 
 from app.celery_app import celery_app
 from app.db.database import SessionLocal
 from app.services.data_collector import DataCollector
+from app.services.dataset_epochs import FINANCIAL_METRICS, DatasetEpochs
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +39,9 @@ def fetch_dart_financial_metrics_task(self, stock_code: str):
             collector = DataCollector(db)
             success = collector.calculate_financial_metrics(stock_code, use_dart=True)
             status = "success" if success else "failed"
+            if success:
+                DatasetEpochs(db).bump(FINANCIAL_METRICS)
+                db.commit()
             logger.info(f"DART fetch for {stock_code}: {status}")
 
             return {"status": status, "stock_code": stock_code}
@@ -46,19 +56,63 @@ def fetch_dart_financial_metrics_task(self, stock_code: str):
         raise self.retry(exc=exc, countdown=countdown)
 
 
+@celery_app.task(bind=True, max_retries=3)
+def fetch_dart_financial_metrics_batch_task(self, stock_codes: List[str]):
+    """
+    Fetch financial metrics from DART API for a chunk of stocks concurrently
+
+    Key accounts for the chunk come from one multi-company request; fallbacks
+    overlap on one pooled async DART client, so a single worker slot keeps many
+    requests in flight.
+
+    Args:
+        stock_codes: List of 6-digit Korean stock codes
+
+    Returns:
+        Dictionary with batch statistics
+    """
+    try:
+        logger.info(f"Fetching DART metrics for {len(stock_codes)} stocks...")
+
+        db = SessionLocal()
+        try:
+            collector = DataCollector(db)
+            return asyncio.run(collector.calculate_financial_metrics_batch(stock_codes))
+        finally:
+            db.close()
+
+    except Exception as exc:
+        logger.error(f"DART batch metrics fetch failed: {exc}")
+        if self.request.retries >= self.max_retries:
+            # Report the failure instead of raising so the chord callback still runs
+            return {
+                "status": "error",
+                "total": len(stock_codes),
+                "success": 0,
+                "failed": len(stock_codes),
+                "message": str(exc),
+            }
+        countdown = 60 * (3 ** self.request.retries)
+        raise self.retry(exc=exc, countdown=countdown)
+
+
 @celery_app.task(bind=True)
 def fetch_all_dart_financial_metrics_task(
-    self, limit: Optional[int] = None, batch_size: int = 50
+    self, limit: Optional[int] = None, batch_size: int = 100
 ):
     """
-    Fetch DART financial metrics for all stocks in batches with rate limiting
+    Dispatch DART financial metrics collection for all stocks
+
+    Batches run as a chord header; summarize_dart_batches_task aggregates
+    their results once every batch has finished.
 
     Args:
         limit: Maximum number of stocks to process (optional)
-        batch_size: Number of stocks to process per batch (default: 50)
+        batch_size: Number of stocks per batch task (default: 100, one
+            multi-company key-account request)
 
     Returns:
-        Dictionary with collection results and statistics
+        Dictionary with dispatch details (the chord callback holds the results)
     """
     try:
         logger.info("Starting batch DART financial metrics collection...")
@@ -67,67 +121,62 @@ def fetch_all_dart_financial_metrics_task(
         try:
             from app.models.stock import Stock
 
-            stocks = db.query(Stock).all()
-
+            query = db.query(Stock.code).order_by(Stock.code)
             if limit:
-                stocks = stocks[:limit]
-
-            total = len(stocks)
-            success_count = 0
-            failed_count = 0
+                query = query.limit(limit)
+            stock_codes = [code for (code,) in query.all()]
+        finally:
+            db.close()
 
-            logger.info(f"Processing {total} stocks in batches of {batch_size}")
+        total = len(stock_codes)
+        if total == 0:
+            return {"status": "completed", "total": 0, "success": 0, "failed": 0}
 
-            # Process in batches
-            for i in range(0, total, batch_size):
-                batch = stocks[i : i + batch_size]
-                batch_num = i // batch_size + 1
-                end_idx = min(i + batch_size, total)
+        batches = [stock_codes[i : i + batch_size] for i in range(0, total, batch_size)]
+        logger.info(f"Dispatching {total} stocks in {len(batches)} batches of {batch_size}")
 
-                logger.info(
-                    f"Processing batch {batch_num}: stocks {i+1}-{end_idx}/{total}"
-                )
+        # One task per batch; requests inside each batch overlap asynchronously
+        result = chord(
+            fetch_dart_financial_metrics_batch_task.s(batch) for batch in batches
+        )(summarize_dart_batches_task.s(total=total))
 
-                # Create group of tasks for parallel execution within batch
-                job = group(
-                    fetch_dart_financial_metrics_task.s(stock.code) for stock in batch
-                )
+        return {
+            "status": "dispatched",
+            "total": total,
+            "batches": len(batches),
+            "callback_id": result.id,
+        }
 
-                # Execute batch and wait for completion
-                result = job.apply_async()
-                batch_results = result.get()
+    except Exception as exc:
+        logger.error(f"Batch DART financial metrics collection failed: {exc}")
+        return {"status": "error", "message": str(exc)}
 
-                # Count successes and failures
-                for r in batch_results:
-                    if r.get("status") == "success":
-                        success_count += 1
-                    else:
-                        failed_count += 1
 
-                # Sleep between batches to respect rate limits
-                if i + batch_size < total:
-                    logger.info(f"Sleeping 30s before next batch...")
-                    time.sleep(30)
+@celery_app.task
+def summarize_dart_batches_task(batch_results: List[dict], total: int):
+    """
+    Chord callback: aggregate DART batch results
 
-            result_data = {
-                "status": "completed",
-                "total": total,
-                "success": success_count,
-                "failed": failed_count,
-                "success_rate": (
-                    f"{(success_count/total*100):.2f}%" if total > 0 else "0%"
-                ),
-            }
+    Args:
+        batch_results: Return values of fetch_dart_financial_metrics_batch_task
+        total: Number of stocks dispatched
 
-            logger.info(f"Batch DART collection completed: {result_data}")
-            return result_data
+    Returns:
+        Dictionary with collection results and statistics
+    """
+    success_count = sum(r.get("success", 0) for r in batch_results)
+    failed_count = sum(r.get("failed", 0) for r in batch_results)
 
-        finally:
-            db.close()
+    result_data = {
+        "status": "completed",
+        "total": total,
+        "success": success_count,
+        "failed": failed_count,
+        "success_rate": f"{(success_count/total*100):.2f}%" if total > 0 else "0%",
+    }
 
-    except Exception as exc:
-        logger.error(f"Batch DART financial metrics collection failed: {exc}")
-        return {"status": "error", "message": str(exc)}
+    logger.info(f"Batch DART collection completed: {result_data}")
+    return result_data
 
 
 @celery_app.task(bind=True)
@@ -166,9 +215,6 @@ def update_corp_code_cache_task(self):
                         updated += 1
                     else:
                         failed += 1
-
-                    # Rate limiting
-                    time.sleep(0.2)
                 except Exception as e:
                     logger.warning(f"Failed to get corp_code for {stock.code}: {e}")
                     failed += 1
@@ -1,9 +1,24 @@
 """Data Collection Celery Tasks"""
 
 import logging
+
+import redis
+
 from app.celery_app import celery_app
 from app.db.database import SessionLocal
 from app.services.data_collector import DataCollector
+from app.services.dataset_epochs import (
+    FINANCIAL_METRICS,
+    PRICES,
+    DatasetEpochs,
+)
+from app.services.leaderboard_service import (
+    LeaderboardService,
+    publish_leaderboards,
+    refresh_leaderboard_cards,
+)
+from app.services.saved_screens import refresh_saved_screens
+from app.services.stock_snapshots import StockSnapshotService
 from app.services.value_scorer import ValueScorer
 
 logger = logging.getLogger(__name__)
@@ -37,6 +52,11 @@ def collect_stock_prices_task(self, stock_code: str):
         try:
             collector = DataCollector(db)
             success = collector.collect_stock_prices(stock_code)
+            if success:
+                StockSnapshotService(db).refresh_stocks([stock_code])
+                refresh_leaderboard_cards(db, [stock_code])
+                DatasetEpochs(db).bump(PRICES)
+                db.commit()
             return {"status": "success" if success else "failed", "stock_code": stock_code}
         finally:
             db.close()
@@ -72,6 +92,9 @@ def calculate_financial_metrics_task(self, stock_code: str):
         try:
             collector = DataCollector(db)
             success = collector.calculate_financial_metrics(stock_code)
+            if success:
+                DatasetEpochs(db).bump(FINANCIAL_METRICS)
+                db.commit()
             return {"status": "success" if success else "failed", "stock_code": stock_code}
         finally:
             db.close()
@@ -107,6 +130,15 @@ def calculate_value_score_task(self, stock_code: str):
         try:
             scorer = ValueScorer(db)
             value_score = scorer.calculate_value_score(stock_code)
+            if value_score:
+                try:
+                    LeaderboardService(db).publish_stock(stock_code)
+                except (redis.RedisError, OSError) as e:
+                    logger.warning(f"Leaderboard update failed for {stock_code}: {e}")
+                # After the leaderboard update, so ETags never name a stale
+                # ranking (the refresh bumps the value_scores epoch)
+                StockSnapshotService(db).refresh([stock_code])
+                db.commit()
             return {
                 "status": "success" if value_score else "failed",
                 "stock_code": stock_code,
@@ -127,7 +159,12 @@ def calculate_all_value_scores_task(self, limit: int = None):
         db = SessionLocal()
         try:
             scorer = ValueScorer(db)
-            result = scorer.calculate_all_value_scores(limit=limit)
+            # The snapshot refresh bumps value_scores, once for the whole run
+            result = scorer.calculate_all_value_scores(limit=limit, bump_epoch=False)
+            result["stock_snapshots"] = StockSnapshotService(db).refresh()
+            db.commit()
+            result["leaderboards"] = publish_leaderboards(db)
+            result["saved_screens"] = refresh_saved_screens(db)
             logger.info(f"All Value Scores calculation completed: {result}")
             return result
         finally:
@@ -140,43 +177,18 @@ def calculate_all_value_scores_task(self, limit: int = None):
 @celery_app.task(bind=True)
 def full_data_pipeline_task(self, limit: int = None):
     """
-    전체 데이터 파이프라인 실행
+    전체 데이터 파이프라인 실행 (단계별 DAG, app.tasks.pipeline_tasks 참고)
     1. 종목 리스트 수집
-    2. 주가 데이터 수집
-    3. 재무 지표 계산
-    4. Value Score 계산
-    """
-    try:
-        logger.info("Starting full data pipeline...")
-        db = SessionLocal()
-        try:
-            # Step 1: Collect stock list
-            collector = DataCollector(db)
-            stock_count = collector.collect_stock_list()
-            logger.info(f"Step 1: Collected {stock_count} stocks")
-
-            # Step 2: Collect prices
-            price_result = collector.collect_all_stock_prices(limit=limit)
-            logger.info(f"Step 2: Price collection - {price_result}")
+    2. 주가 데이터 수집 / 재무 지표 계산 (병렬)
+    3. Value Score 계산
 
-            # Step 3: Calculate financial metrics
-            metrics_result = collector.collect_all_financial_metrics(limit=limit)
-            logger.info(f"Step 3: Metrics calculation - {metrics_result}")
-
-            # Step 4: Calculate Value Scores
-            scorer = ValueScorer(db)
-            score_result = scorer.calculate_all_value_scores(limit=limit)
-            logger.info(f"Step 4: Value Score calculation - {score_result}")
+    Returns:
+        파이프라인 run_id 및 시작된 단계
+    """
+    from app.tasks.pipeline_tasks import start_pipeline
 
-            return {
-                "status": "success",
-                "stock_count": stock_count,
-                "prices": price_result,
-                "metrics": metrics_result,
-                "scores": score_result,
-            }
-        finally:
-            db.close()
+    try:
+        return start_pipeline(limit=limit)
     except Exception as exc:
-        logger.error(f"Full data pipeline failed: {exc}")
+        logger.error(f"Full data pipeline failed to start: {exc}")
         return {"status": "error", "message": str(exc)}
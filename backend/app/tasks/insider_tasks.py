@@ -1,47 +1,134 @@
 """Celery tasks for insider trading data collection"""
 
 import logging
-import time
-from datetime import datetime
-from typing import Optional
+from datetime import date
+from typing import Any, Dict, List, Optional
 
-from celery import group
+import numpy as np
+import pandas as pd
+from celery import chord
+from sqlalchemy import func
+from sqlalchemy.orm import Session
 
 from app.celery_app import celery_app
+from app.db.bulk import bulk_insert_ignore
 from app.db.database import SessionLocal
 from app.models.stock import Stock
 from app.models.insider_trading import InsiderTrading
 from app.services.dart_service import dart_service
+from app.services.insider_signal_service import InsiderSignalService
 
 logger = logging.getLogger(__name__)
 
 
-def _parse_int(value) -> Optional[int]:
-    """Parse value to integer, handling various formats"""
-    if value is None or value == "" or str(value).strip() == "-":
-        return None
-    try:
-        # Remove commas from formatted numbers
-        clean_value = str(value).replace(",", "")
-        return int(float(clean_value))
-    except (ValueError, TypeError):
-        return None
+def _parse_decimal(values: pd.Series) -> pd.Series:
+    """Parse a column to float, handling thousands separators and '-' (NaN if invalid)"""
+    cleaned = values.astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors="coerce")
 
 
-def _parse_decimal(value) -> Optional[float]:
-    """Parse value to decimal/float"""
-    if value is None or value == "" or str(value).strip() == "-":
-        return None
-    try:
-        return float(str(value).replace(",", ""))
-    except (ValueError, TypeError):
-        return None
+def _parse_int(values: pd.Series) -> pd.Series:
+    """Parse a column to nullable integers (fractions truncated)"""
+    return np.trunc(_parse_decimal(values)).astype("Int64")
+
+
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    """String column, or all-None if DART omitted it"""
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    return df[column]
+
+
+def _build_insider_rows(
+    df: pd.DataFrame, stock_code: str, since: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    Convert DART ownership reports into InsiderTrading rows
+
+    Args:
+        df: elestock DataFrame from DART
+        stock_code: 6-digit Korean stock code
+        since: Only keep filings received on or after this date
+
+    Returns:
+        List of column -> value dictionaries ready for bulk insert
+    """
+    rcept_no = _text(df, "rcept_no").astype(str).str.strip()
+    rcept_dt = pd.to_datetime(_text(df, "rcept_dt"), format="%Y%m%d", errors="coerce")
+    # Receipt numbers start with the receipt date (YYYYMMDD), which recovers
+    # filings whose rcept_dt is missing or malformed (rcept_dt is NOT NULL)
+    rcept_dt = rcept_dt.fillna(
+        pd.to_datetime(rcept_no.str[:8], format="%Y%m%d", errors="coerce")
+    )
+
+    records = pd.DataFrame(
+        {
+            "stock_code": stock_code,
+            "rcept_no": rcept_no,
+            "rcept_dt": rcept_dt.dt.date,
+            "corp_code": _text(df, "corp_code").fillna("").astype(str),
+            "corp_name": _text(df, "corp_name"),
+            "repror": _text(df, "repror"),
+            "isu_exctv_rgist_at": _text(df, "isu_exctv_rgist_at"),
+            "isu_exctv_ofcps": _text(df, "isu_exctv_ofcps"),
+            "isu_main_shrholdr": _text(df, "isu_main_shrholdr"),
+            "sp_stock_lmp_cnt": _parse_int(_text(df, "sp_stock_lmp_cnt")),
+            "sp_stock_lmp_irds_cnt": _parse_int(_text(df, "sp_stock_lmp_irds_cnt")),
+            "sp_stock_lmp_rate": _parse_decimal(_text(df, "sp_stock_lmp_rate")),
+            "sp_stock_lmp_irds_rate": _parse_decimal(_text(df, "sp_stock_lmp_irds_rate")),
+        }
+    )
+
+    # rcept_no and rcept_dt are required
+    has_rcept_no = rcept_no.str.len().gt(0) & rcept_no.ne("None")
+    undated = has_rcept_no & rcept_dt.isna()
+    if undated.any():
+        logger.warning(
+            f"Dropped {int(undated.sum())} insider filings for {stock_code} without a "
+            f"receipt date: {rcept_no[undated].tolist()}"
+        )
+    keep = has_rcept_no & rcept_dt.notna()
+    if since is not None:
+        # Same-day filings may have arrived after the last run; duplicates are
+        # dropped by the unique rcept_no constraint
+        keep &= rcept_dt.dt.date >= since
+    records = records[keep]
+
+    return records.astype(object).where(records.notna(), None).to_dict("records")
+
+
+def save_insider_filings(db: Session, stock_code: str, df: pd.DataFrame) -> Dict[str, int]:
+    """
+    Store filings newer than the latest one already saved for a stock
+
+    Args:
+        db: Database session (caller commits)
+        stock_code: 6-digit Korean stock code
+        df: elestock DataFrame from DART
+
+    Returns:
+        Dictionary with inserted and skipped counts
+    """
+    latest = (
+        db.query(func.max(InsiderTrading.rcept_dt))
+        .filter(InsiderTrading.stock_code == stock_code)
+        .scalar()
+    )
+
+    rows = _build_insider_rows(df, stock_code, since=latest)
+    inserted = bulk_insert_ignore(db, InsiderTrading, rows, ["rcept_no"]) if rows else 0
+
+    return {"inserted": inserted, "skipped": len(df) - inserted}
 
 
 @celery_app.task(bind=True, max_retries=3)
 def fetch_insider_trading_task(self, stock_code: str):
     """
-    Fetch insider trading data from DART API for a single stock
+    Fetch new insider trading filings from DART API for a single stock
+
+    DART's ownership report endpoint has no date filter, so the full list is
+    downloaded, but only filings since the latest stored rcept_dt are parsed
+    and inserted (one INSERT ... ON CONFLICT (rcept_no) DO NOTHING).
 
     Args:
         stock_code: 6-digit Korean stock code
@@ -63,145 +150,122 @@ def fetch_insider_trading_task(self, stock_code: str):
 
         db = SessionLocal()
         try:
-            inserted = 0
-            skipped = 0
-
-            for _, row in df.iterrows():
-                try:
-                    rcept_no = str(row.get("rcept_no", ""))
-                    if not rcept_no:
-                        continue
-
-                    # Check if already exists
-                    existing = (
-                        db.query(InsiderTrading)
-                        .filter(InsiderTrading.rcept_no == rcept_no)
-                        .first()
-                    )
-
-                    if existing:
-                        skipped += 1
-                        continue
-
-                    # Parse date
-                    rcept_dt_str = str(row.get("rcept_dt", ""))
-                    try:
-                        rcept_dt = (
-                            datetime.strptime(rcept_dt_str, "%Y%m%d").date()
-                            if rcept_dt_str
-                            else None
-                        )
-                    except ValueError:
-                        rcept_dt = None
-
-                    # Create new record
-                    record = InsiderTrading(
-                        stock_code=stock_code,
-                        rcept_no=rcept_no,
-                        rcept_dt=rcept_dt,
-                        corp_code=str(row.get("corp_code", "")),
-                        corp_name=row.get("corp_name"),
-                        repror=row.get("repror"),
-                        isu_exctv_rgist_at=row.get("isu_exctv_rgist_at"),
-                        isu_exctv_ofcps=row.get("isu_exctv_ofcps"),
-                        isu_main_shrholdr=row.get("isu_main_shrholdr"),
-                        sp_stock_lmp_cnt=_parse_int(row.get("sp_stock_lmp_cnt")),
-                        sp_stock_lmp_irds_cnt=_parse_int(row.get("sp_stock_lmp_irds_cnt")),
-                        sp_stock_lmp_rate=_parse_decimal(row.get("sp_stock_lmp_rate")),
-                        sp_stock_lmp_irds_rate=_parse_decimal(row.get("sp_stock_lmp_irds_rate")),
-                    )
-                    db.add(record)
-                    inserted += 1
-
-                except Exception as e:
-                    logger.warning(f"Error processing insider record: {e}")
-                    continue
-
+            counts = save_insider_filings(db, stock_code, df)
+            if counts["inserted"]:
+                InsiderSignalService(db).refresh([stock_code])
             db.commit()
-            logger.info(f"Insider trading for {stock_code}: {inserted} inserted, {skipped} skipped")
+            logger.info(
+                f"Insider trading for {stock_code}: "
+                f"{counts['inserted']} inserted, {counts['skipped']} skipped"
+            )
 
-            return {
-                "status": "success",
-                "stock_code": stock_code,
-                "inserted": inserted,
-                "skipped": skipped,
-            }
+            return {"status": "success", "stock_code": stock_code, **counts}
 
         finally:
             db.close()
 
     except Exception as exc:
         logger.error(f"Insider trading fetch failed for {stock_code}: {exc}")
+        if self.request.retries >= self.max_retries:
+            # Report the failure instead of raising so the chord callback still runs
+            return {"status": "error", "stock_code": stock_code, "message": str(exc)}
         countdown = 60 * (3**self.request.retries)
         raise self.retry(exc=exc, countdown=countdown)
 
 
 @celery_app.task(bind=True)
-def fetch_all_insider_trading_task(self, limit: Optional[int] = None, batch_size: int = 50):
+def fetch_all_insider_trading_task(self, limit: Optional[int] = None):
     """
-    Fetch insider trading data for all stocks in batches
+    Dispatch insider trading collection for all stocks
+
+    Per-stock tasks run as a chord header; summarize_insider_trading_task
+    aggregates their results once every stock has finished.
 
     Args:
         limit: Maximum number of stocks to process
-        batch_size: Number of stocks per batch
 
     Returns:
-        Dictionary with collection results
+        Dictionary with dispatch details (the chord callback holds the results)
     """
     try:
         logger.info("Starting batch insider trading collection...")
 
         db = SessionLocal()
         try:
-            stocks = db.query(Stock).all()
-
+            query = db.query(Stock.code).order_by(Stock.code)
             if limit:
-                stocks = stocks[:limit]
+                query = query.limit(limit)
+            stock_codes = [code for (code,) in query.all()]
+        finally:
+            db.close()
 
-            total = len(stocks)
-            success_count = 0
-            failed_count = 0
+        total = len(stock_codes)
+        if total == 0:
+            return {"status": "completed", "total": 0, "success": 0, "failed": 0}
 
-            logger.info(f"Processing {total} stocks in batches of {batch_size}")
+        logger.info(f"Dispatching insider trading collection for {total} stocks")
 
-            for i in range(0, total, batch_size):
-                batch = stocks[i : i + batch_size]
-                batch_num = i // batch_size + 1
+        result = chord(fetch_insider_trading_task.s(code) for code in stock_codes)(
+            summarize_insider_trading_task.s(total=total)
+        )
 
-                logger.info(
-                    f"Processing batch {batch_num}: stocks {i+1}-{min(i+batch_size, total)}/{total}"
-                )
+        return {"status": "dispatched", "total": total, "callback_id": result.id}
 
-                job = group(fetch_insider_trading_task.s(stock.code) for stock in batch)
+    except Exception as exc:
+        logger.error(f"Batch insider trading collection failed: {exc}")
+        return {"status": "error", "message": str(exc)}
 
-                result = job.apply_async()
-                batch_results = result.get()
 
-                for r in batch_results:
-                    if r.get("status") == "success":
-                        success_count += 1
-                    else:
-                        failed_count += 1
+@celery_app.task
+def summarize_insider_trading_task(results: List[dict], total: int):
+    """
+    Chord callback: aggregate per-stock insider trading results
 
-                # Rate limiting between batches
-                if i + batch_size < total:
-                    logger.info("Sleeping 30s before next batch...")
-                    time.sleep(30)
+    Args:
+        results: Return values of fetch_insider_trading_task
+        total: Number of stocks dispatched
 
-            result_data = {
-                "status": "completed",
-                "total": total,
-                "success": success_count,
-                "failed": failed_count,
-                "success_rate": f"{(success_count/total*100):.2f}%" if total > 0 else "0%",
-            }
+    Returns:
+        Dictionary with collection results
+    """
+    success_count = sum(1 for r in results if r.get("status") == "success")
+    failed_count = len(results) - success_count
+    inserted = sum(r.get("inserted", 0) for r in results)
 
-            logger.info(f"Batch insider trading collection completed: {result_data}")
-            return result_data
+    result_data = {
+        "status": "completed",
+        "total": total,
+        "success": success_count,
+        "failed": failed_count,
+        "inserted": inserted,
+        "success_rate": f"{(success_count/total*100):.2f}%" if total > 0 else "0%",
+    }
 
-        finally:
-            db.close()
+    logger.info(f"Batch insider trading collection completed: {result_data}")
+    return result_data
+
+
+@celery_app.task(bind=True, max_retries=3)
+def refresh_insider_signals_task(self):
+    """
+    Recompute insider signals for all stocks
+
+    Signals are refreshed per stock when new filings arrive; this daily pass
+    moves the 30/90/180-day windows forward for stocks without new filings.
+
+    Returns:
+        Dictionary with task status and refreshed count
+    """
+    db = SessionLocal()
+    try:
+        refreshed = InsiderSignalService(db).refresh()
+        db.commit()
+        return {"status": "success", "refreshed": refreshed}
 
     except Exception as exc:
-        logger.error(f"Batch insider trading collection failed: {exc}")
-        return {"status": "error", "message": str(exc)}
+        db.rollback()
+        logger.error(f"Insider signal refresh failed: {exc}")
+        raise self.retry(exc=exc, countdown=300)
+
+    finally:
+        db.close()
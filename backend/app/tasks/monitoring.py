@@ -0,0 +1,111 @@
+"""Celery task lifecycle hooks: metrics, profiling, tracing setup and the Prometheus exporter"""
+
+import cProfile
+import logging
+import os
+import time
+from typing import Dict, Tuple
+
+from celery.signals import (
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_retry,
+    task_success,
+    worker_init,
+    worker_process_shutdown,
+)
+from prometheus_client import multiprocess, start_http_server
+
+from app.core.config import settings
+from app.core.metrics import TASK_DB_QUERIES, TASK_DURATION, TASKS_TOTAL, get_registry
+from app.core.profiling import ProfileSession, profile_id, task_profiling_requested
+from app.core.tracing import setup_tracing
+from app.db.query_stats import QueryStats, start_tracking, stop_tracking
+
+logger = logging.getLogger(__name__)
+
+# task_id -> start time (perf_counter) for tasks running in this process
+_task_started: Dict[str, float] = {}
+
+# task_id -> (query stats, context token) for tasks running in this process
+_task_queries: Dict[str, Tuple[QueryStats, object]] = {}
+
+# task_id -> (profile session, profiler) for tasks sent with the profile header
+_task_profiles: Dict[str, Tuple[ProfileSession, cProfile.Profile]] = {}
+
+
+@task_prerun.connect
+def _record_task_start(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    _task_queries[task_id] = start_tracking()
+
+    if task is not None and task_profiling_requested(task.request):
+        session = ProfileSession()
+        _task_profiles[task_id] = (session, session.start())
+
+
+@task_postrun.connect
+def _record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None and task is not None:
+        TASK_DURATION.labels(task.name, (state or "unknown").lower()).observe(
+            time.perf_counter() - started
+        )
+
+    tracked = _task_queries.pop(task_id, None)
+    if tracked is not None:
+        stats, token = tracked
+        stop_tracking(token)
+        if task is not None:
+            TASK_DB_QUERIES.labels(task.name).observe(stats.count)
+            stats.warn_if_excessive(
+                f"Task {task.name}", max_count=settings.TASK_QUERY_COUNT_WARN_THRESHOLD
+            )
+
+    profiled = _task_profiles.pop(task_id, None)
+    if profiled is not None:
+        session, profiler = profiled
+        session.stop(profiler)
+        session.save(profile_id(f"{task.name if task else 'task'}-{task_id[:8]}"))
+
+
+@task_success.connect
+def _count_success(sender=None, **kwargs):
+    TASKS_TOTAL.labels(sender.name, "success").inc()
+
+
+@task_failure.connect
+def _count_failure(sender=None, **kwargs):
+    TASKS_TOTAL.labels(sender.name, "failure").inc()
+
+
+@task_retry.connect
+def _count_retry(sender=None, **kwargs):
+    TASKS_TOTAL.labels(sender.name, "retry").inc()
+
+
+@worker_init.connect
+def _setup_worker_tracing(**kwargs):
+    # Before the pool forks; span processors reinitialize in child processes
+    setup_tracing("valuehunt-worker")
+
+
+@worker_init.connect
+def start_worker_exporter(**kwargs):
+    """Serve /metrics from the worker's main process (disabled when the port is 0)"""
+    port = settings.CELERY_METRICS_PORT
+    if not port:
+        return
+
+    try:
+        start_http_server(port, registry=get_registry())
+        logger.info(f"Celery metrics exporter listening on :{port}")
+    except OSError as e:
+        logger.warning(f"Celery metrics exporter not started on :{port}: {e}")
+
+
+@worker_process_shutdown.connect
+def _mark_process_dead(pid=None, **kwargs):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,307 @@
+"""Staged data pipeline expressed as a dependency graph of Celery stages
+
+    stock_list ──┬──> prices ──────────────┐
+                 └──> financial_metrics ───┴──> value_scores
+
+A stage starts as soon as all of its inputs have completed. Per-stock stages
+fan out in chunks as a chord header; the chord callback records the stage as
+complete and dispatches the stages that were waiting on it. Chunks commit
+their rows without touching the dataset epochs; the callback bumps the
+stage's epoch once, so caches never pick up a half-finished stage.
+
+Progress is checkpointed in Redis (see app.services.pipeline_checkpoint). If a
+chunk fails after its retries the stage is marked failed and the run stops;
+`run_data_pipeline_task.delay(run_id=...)` resumes it, re-running only the
+unfinished chunks and stages.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from celery import chord
+from sqlalchemy.orm import Session
+
+from app.celery_app import celery_app
+from app.db.database import SessionLocal
+from app.models.stock import Stock
+from app.services.data_collector import DataCollector
+from app.services.dataset_epochs import (
+    FINANCIAL_METRICS,
+    PRICES,
+    VALUE_SCORES,
+    DatasetEpochs,
+)
+from app.services.leaderboard_service import publish_leaderboards, refresh_leaderboard_cards
+from app.services.pipeline_checkpoint import STAGE_DONE, STAGE_FAILED, PipelineCheckpoint
+from app.services.saved_screens import refresh_saved_screens
+from app.services.stock_snapshots import StockSnapshotService
+from app.services.value_scorer import ValueScorer
+
+logger = logging.getLogger(__name__)
+
+# stage -> stages it depends on
+PIPELINE_STAGES: Dict[str, List[str]] = {
+    "stock_list": [],
+    "prices": ["stock_list"],
+    "financial_metrics": ["stock_list"],
+    "value_scores": ["prices", "financial_metrics"],
+}
+
+# Dataset each fan-out stage writes
+STAGE_DATASETS: Dict[str, str] = {
+    "prices": PRICES,
+    "financial_metrics": FINANCIAL_METRICS,
+    "value_scores": VALUE_SCORES,
+}
+
+DEFAULT_CHUNK_SIZE = 100
+
+
+def _collect_prices(db: Session, stock_codes: List[str]) -> Dict[str, Any]:
+    return DataCollector(db).collect_all_stock_prices(stock_codes=stock_codes, bump_epoch=False)
+
+
+def _collect_financial_metrics(db: Session, stock_codes: List[str]) -> Dict[str, Any]:
+    return asyncio.run(
+        DataCollector(db).calculate_financial_metrics_batch(stock_codes, bump_epoch=False)
+    )
+
+
+def _calculate_value_scores(db: Session, stock_codes: List[str]) -> Dict[str, Any]:
+    return ValueScorer(db).calculate_all_value_scores(stock_codes=stock_codes, bump_epoch=False)
+
+
+# Per-chunk work for fan-out stages
+CHUNK_RUNNERS: Dict[str, Callable[[Session, List[str]], Dict[str, Any]]] = {
+    "prices": _collect_prices,
+    "financial_metrics": _collect_financial_metrics,
+    "value_scores": _calculate_value_scores,
+}
+
+
+def ready_stages(checkpoint: PipelineCheckpoint) -> List[str]:
+    """Stages not yet done whose inputs have all completed"""
+    return [
+        stage
+        for stage, inputs in PIPELINE_STAGES.items()
+        if not checkpoint.is_stage_done(stage)
+        and all(checkpoint.is_stage_done(dep) for dep in inputs)
+    ]
+
+
+def _dispatch_ready_stages(checkpoint: PipelineCheckpoint) -> List[str]:
+    dispatched = []
+    for stage in ready_stages(checkpoint):
+        if checkpoint.claim_stage(stage):
+            run_pipeline_stage_task.delay(checkpoint.run_id, stage)
+            dispatched.append(stage)
+    return dispatched
+
+
+def _chunks(checkpoint: PipelineCheckpoint) -> List[List[str]]:
+    stock_codes = checkpoint.get_stock_codes() or []
+    chunk_size = checkpoint.get_params().get("chunk_size") or DEFAULT_CHUNK_SIZE
+    return [stock_codes[i : i + chunk_size] for i in range(0, len(stock_codes), chunk_size)]
+
+
+def start_pipeline(
+    limit: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Start a new pipeline run, or resume an existing one
+
+    Args:
+        limit: Maximum number of stocks to process
+        chunk_size: Stocks per chunk task
+        run_id: Existing run to resume (a new run is started when omitted)
+
+    Returns:
+        Dictionary with run_id and the stages dispatched
+    """
+    resumed = run_id is not None
+    if run_id is None:
+        run_id = f"{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    checkpoint = PipelineCheckpoint(run_id)
+
+    if resumed:
+        if not checkpoint.exists():
+            return {"status": "error", "run_id": run_id, "message": "Unknown pipeline run"}
+        # Let unfinished stages be claimed again
+        for stage in PIPELINE_STAGES:
+            if not checkpoint.is_stage_done(stage):
+                checkpoint.release_stage(stage)
+    else:
+        checkpoint.save_params(
+            {"limit": limit, "chunk_size": chunk_size, "started_at": datetime.now().isoformat()}
+        )
+
+    dispatched = _dispatch_ready_stages(checkpoint)
+    logger.info(
+        f"Pipeline {run_id} {'resumed' if resumed else 'started'}: dispatched {dispatched}"
+    )
+
+    return {"status": "dispatched", "run_id": run_id, "resumed": resumed, "stages": dispatched}
+
+
+@celery_app.task(bind=True)
+def run_data_pipeline_task(
+    self,
+    limit: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    run_id: Optional[str] = None,
+):
+    """
+    Start (or resume with run_id) the staged data pipeline
+
+    Returns:
+        Dictionary with run_id and the stages dispatched
+    """
+    return start_pipeline(limit=limit, chunk_size=chunk_size, run_id=run_id)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def run_pipeline_stage_task(self, run_id: str, stage: str):
+    """
+    Execute one pipeline stage
+
+    stock_list runs inline and freezes the stock universe for the run; the
+    other stages fan out their pending chunks as a chord.
+
+    Args:
+        run_id: Pipeline run identifier
+        stage: Stage name from PIPELINE_STAGES
+    """
+    checkpoint = PipelineCheckpoint(run_id)
+
+    if stage == "stock_list":
+        db = SessionLocal()
+        try:
+            count = DataCollector(db).collect_stock_list()
+
+            query = db.query(Stock.code).order_by(Stock.code)
+            limit = checkpoint.get_params().get("limit")
+            if limit:
+                query = query.limit(limit)
+            stock_codes = [code for (code,) in query.all()]
+        except Exception as exc:
+            logger.error(f"Pipeline {run_id} stage {stage} failed: {exc}")
+            if self.request.retries >= self.max_retries:
+                checkpoint.mark_stage(stage, STAGE_FAILED, {"message": str(exc)})
+                checkpoint.release_stage(stage)
+                return {"status": "failed", "run_id": run_id, "stage": stage}
+            raise self.retry(exc=exc, countdown=300)
+        finally:
+            db.close()
+
+        checkpoint.save_stock_codes(stock_codes)
+        checkpoint.mark_stage(stage, STAGE_DONE, {"count": count, "stocks": len(stock_codes)})
+        dispatched = _dispatch_ready_stages(checkpoint)
+        return {"status": "success", "run_id": run_id, "stage": stage, "next": dispatched}
+
+    chunks = _chunks(checkpoint)
+    completed = checkpoint.completed_chunks(stage)
+    pending = [i for i in range(len(chunks)) if i not in completed]
+
+    logger.info(
+        f"Pipeline {run_id} stage {stage}: {len(pending)}/{len(chunks)} chunks pending"
+    )
+
+    if not pending:
+        complete_pipeline_stage_task.delay([], run_id, stage)
+    else:
+        chord(
+            run_pipeline_chunk_task.s(run_id, stage, i, chunks[i]) for i in pending
+        )(complete_pipeline_stage_task.s(run_id, stage))
+
+    return {"status": "dispatched", "run_id": run_id, "stage": stage, "chunks": len(pending)}
+
+
+@celery_app.task(bind=True, max_retries=2)
+def run_pipeline_chunk_task(
+    self, run_id: str, stage: str, index: int, stock_codes: List[str]
+):
+    """
+    Process one chunk of stocks for a stage and checkpoint the result
+
+    Failures after retries are returned (not raised) so the chord callback
+    still runs; the chunk stays unchecked and is retried on resume.
+    """
+    db = SessionLocal()
+    try:
+        result = CHUNK_RUNNERS[stage](db, stock_codes)
+    except Exception as exc:
+        logger.error(f"Pipeline {run_id} stage {stage} chunk {index} failed: {exc}")
+        if self.request.retries >= self.max_retries:
+            return {"status": "error", "index": index, "message": str(exc)}
+        raise self.retry(exc=exc, countdown=60 * (3 ** self.request.retries))
+    finally:
+        db.close()
+
+    PipelineCheckpoint(run_id).mark_chunk_done(stage, index, result)
+    return {"status": "success", "index": index, **result}
+
+
+@celery_app.task
+def complete_pipeline_stage_task(chunk_results: List[dict], run_id: str, stage: str):
+    """
+    Chord callback: record a stage as done (or failed) and trigger dependents
+
+    Args:
+        chunk_results: Results of the chunks run in this attempt
+        run_id: Pipeline run identifier
+        stage: Stage name
+    """
+    checkpoint = PipelineCheckpoint(run_id)
+    total_chunks = len(_chunks(checkpoint))
+    completed = checkpoint.completed_chunks(stage)
+
+    summary = {
+        "chunks": total_chunks,
+        "completed_chunks": len(completed),
+        "total": sum(r.get("total", 0) for r in completed.values()),
+        "success": sum(r.get("success", 0) for r in completed.values()),
+        "failed": sum(r.get("failed", 0) for r in completed.values()),
+    }
+
+    if len(completed) < total_chunks:
+        checkpoint.mark_stage(stage, STAGE_FAILED, summary)
+        checkpoint.release_stage(stage)
+        logger.error(
+            f"Pipeline {run_id} stage {stage} incomplete ({len(completed)}/{total_chunks} "
+            f"chunks); resume with run_data_pipeline_task.delay(run_id='{run_id}')"
+        )
+        return {"status": "failed", "run_id": run_id, "stage": stage, **summary}
+
+    checkpoint.mark_stage(stage, STAGE_DONE, summary)
+    logger.info(f"Pipeline {run_id} stage {stage} completed: {summary}")
+
+    db = SessionLocal()
+    try:
+        if stage == "value_scores":
+            # The snapshot refresh bumps value_scores, once for the whole run
+            summary["stock_snapshots"] = StockSnapshotService(db).refresh()
+            db.commit()
+            summary["leaderboards"] = publish_leaderboards(db)
+            summary["saved_screens"] = refresh_saved_screens(db)
+        elif summary["success"]:
+            if stage == "prices":
+                # Snapshot and leaderboard prices change with the prices epoch,
+                # not at the next scoring run
+                summary["stock_snapshots"] = StockSnapshotService(db).refresh_stocks()
+                summary["leaderboard_cards"] = refresh_leaderboard_cards(db)
+            DatasetEpochs(db).bump(STAGE_DATASETS[stage])
+            db.commit()
+    finally:
+        db.close()
+
+    dispatched = _dispatch_ready_stages(checkpoint)
+    if all(checkpoint.is_stage_done(s) for s in PIPELINE_STAGES):
+        logger.info(f"Pipeline {run_id} completed")
+
+    return {"status": "success", "run_id": run_id, "stage": stage, "next": dispatched, **summary}
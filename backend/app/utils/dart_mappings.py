@@ -26,6 +26,55 @@ ACCOUNT_NAMES = {
 }
 
 
+# Statement each canonical account is read from (same account names, e.g.
+# 당기순이익, also appear in other statements)
+ACCOUNT_STATEMENTS = {
+    "자산총계": "BS",
+    "부채총계": "BS",
+    "자본총계": "BS",
+    "유동자산": "BS",
+    "유동부채": "BS",
+    "매출액": "IS",
+    "영업이익": "IS",
+    "당기순이익": "IS",
+    "매출원가": "IS",
+    "이자비용": "IS",
+    "영업활동현금흐름": "CF",
+}
+
+# Alternative account names used by some filers (whitespace removed) → canonical name
+ACCOUNT_ALIASES = {
+    "매출": "매출액",
+    "수익(매출액)": "매출액",
+    "영업수익": "매출액",
+    "영업이익(손실)": "영업이익",
+    "당기순이익(손실)": "당기순이익",
+    "연결당기순이익": "당기순이익",
+    "반기순이익": "당기순이익",
+    "분기순이익": "당기순이익",
+    "영업활동으로인한현금흐름": "영업활동현금흐름",
+    "영업활동으로부터의현금흐름": "영업활동현금흐름",
+}
+
+# Metrics that must be present for a row to pass validation
+REQUIRED_METRICS = ["roe", "roa", "operating_margin", "debt_ratio", "current_ratio"]
+
+
+# Accounts required to compute ROE/ROA/operating margin/debt ratio/current ratio.
+# The multi-company key-account endpoint covers all of these (but not cash flow);
+# a company missing any of them is re-fetched with finstate_all.
+KEY_ACCOUNTS = [
+    "자산총계",
+    "부채총계",
+    "자본총계",
+    "유동자산",
+    "유동부채",
+    "매출액",
+    "영업이익",
+    "당기순이익",
+]
+
+
 def extract_account(df: Optional[pd.DataFrame], account_name: str) -> Optional[float]:
     """
     Extract account value from DART DataFrame
@@ -57,6 +106,90 @@ def extract_account(df: Optional[pd.DataFrame], account_name: str) -> Optional[f
         return None
 
 
+def pivot_accounts(df: Optional[pd.DataFrame], key: str = "stock_code") -> pd.DataFrame:
+    """
+    Pivot long-format statement rows for many companies into one row per company
+
+    Account names are normalized (whitespace, aliases) and each account is only
+    taken from its own statement (CIS counts as IS). When a company reports both
+    consolidated (CFS) and separate (OFS) figures, only CFS rows are used.
+
+    Args:
+        df: Statement rows with key, sj_div, account_nm, thstrm_amount (fs_div optional)
+        key: Column identifying the company
+
+    Returns:
+        DataFrame indexed by key with one float column per ACCOUNT_NAMES value
+        (NaN where the account is missing)
+    """
+    columns = list(dict.fromkeys(ACCOUNT_NAMES.values()))
+    if df is None or df.empty:
+        return pd.DataFrame(columns=columns, dtype=float)
+
+    df = df.reset_index(drop=True)
+    companies = df[key].astype(str).str.strip()
+
+    if "fs_div" in df.columns:
+        is_cfs = df["fs_div"] == "CFS"
+        keep = is_cfs | ~is_cfs.groupby(companies).transform("any")
+        df, companies = df[keep], companies[keep]
+
+    names = df["account_nm"].astype(str).str.replace(r"\s+", "", regex=True)
+    names = names.replace(ACCOUNT_ALIASES)
+    statements = df["sj_div"].replace({"CIS": "IS"})
+
+    rows = pd.DataFrame(
+        {
+            key: companies,
+            "account": names.map(ACCOUNT_NAMES),
+            "amount": pd.to_numeric(
+                df["thstrm_amount"].astype(str).str.replace(",", "", regex=False).str.strip(),
+                errors="coerce",
+            ),
+        }
+    )
+    rows = rows[(names.map(ACCOUNT_STATEMENTS) == statements) & rows["amount"].notna()]
+
+    # First occurrence wins, like extract_account
+    rows = rows.drop_duplicates([key, "account"], keep="first")
+
+    return rows.pivot(index=key, columns="account", values="amount").reindex(columns=columns)
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """Percentage ratio rounded to 2 decimals, NaN unless denominator > 0"""
+    return (numerator / denominator * 100).round(2).where(denominator > 0)
+
+
+def calculate_metrics_frame(accounts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate ratio metrics for every company at once
+
+    Column-wise equivalent of calculate_roe/roa/operating_margin/debt_ratio/
+    current_ratio applied to each row of pivot_accounts() output.
+
+    Args:
+        accounts: Output of pivot_accounts
+
+    Returns:
+        DataFrame with roe, roa, operating_margin, debt_ratio, current_ratio and
+        operating_cashflow columns (NaN where inputs are invalid)
+    """
+    return pd.DataFrame(
+        {
+            "roe": _ratio(accounts["net_income"], accounts["total_equity"]),
+            "roa": _ratio(accounts["net_income"], accounts["total_assets"]),
+            "operating_margin": _ratio(accounts["operating_income"], accounts["revenue"]),
+            "debt_ratio": _ratio(accounts["total_liabilities"], accounts["total_equity"]),
+            "current_ratio": _ratio(
+                accounts["current_assets"], accounts["current_liabilities"]
+            ),
+            "operating_cashflow": accounts["operating_cashflow"],
+        },
+        index=accounts.index,
+    )
+
+
 def calculate_roe(
     net_income: Optional[float], total_equity: Optional[float]
 ) -> Optional[float]:
@@ -253,3 +386,28 @@ def validate_metrics(metrics: Dict[str, Any]) -> tuple[bool, list[str]]:
 
     is_valid = len(errors) == 0
     return is_valid, errors
+
+
+def validate_metrics_frame(metrics: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized validate_metrics for a DataFrame of metrics (one row per company)
+
+    Args:
+        metrics: DataFrame with REQUIRED_METRICS columns
+
+    Returns:
+        Boolean error mask with the same index; a row is valid when no column is
+        True, i.e. ``~mask.any(axis=1)``
+    """
+    mask = pd.DataFrame(index=metrics.index)
+
+    for field in REQUIRED_METRICS:
+        mask[f"missing_{field}"] = metrics[field].isna()
+
+    for field in ["roe", "roa", "operating_margin"]:
+        mask[f"invalid_{field}"] = metrics[field].notna() & ~metrics[field].between(-100, 100)
+
+    for field in ["debt_ratio", "current_ratio"]:
+        mask[f"invalid_{field}"] = metrics[field] < 0
+
+    return mask
@@ -0,0 +1 @@
+"""Load tests for the public API (Locust) and a local Gemini stand-in"""
@@ -0,0 +1,181 @@
+"""Local Gemini Stand-in
+
+Answers the REST ``generateContent`` call with canned text shaped like the
+real model's output (JSON for stock analysis and strategies, prose for chat),
+after a configurable, long-tailed delay. Point the API at it with:
+
+    GEMINI_API_KEY=fake GEMINI_API_ENDPOINT=http://localhost:8090
+
+Usage:
+    python -m loadtest.fake_gemini --port 8090 --latency-ms 1500 --latency-sigma 0.4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+from typing import List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+STOCK_CODE = re.compile(r"\b\d{6}\b")
+
+
+def _prompt_text(body: dict) -> str:
+    return "\n".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+
+def _analysis(codes: List[str]) -> str:
+    code = codes[0] if codes else "000000"
+    return json.dumps(
+        {
+            "summary": f"{code}는 업종 평균 대비 낮은 밸류에이션과 안정적인 수익성을 보입니다.",
+            "strengths": ["낮은 PER", "꾸준한 ROE", "양호한 재무구조"],
+            "risks": ["업황 둔화", "환율 변동", "원자재 가격"],
+            "investmentThesis": "중장기 관점에서 분할 매수를 고려할 만합니다.",
+        },
+        ensure_ascii=False,
+    )
+
+
+def _strategy(codes: List[str], count: int = 10) -> str:
+    codes = codes or [f"{i:06d}" for i in range(5930, 5930 + count)]
+    recommendations = [
+        {
+            "stockCode": code,
+            "stockName": f"종목{code}",
+            "market": "KOSPI",
+            "currentPrice": 50000,
+            "targetPrice": 62000,
+            "upsidePotential": "+24%",
+            "rationale": "저평가 구간에서 이익 개선이 확인됩니다.",
+            "metrics": {"PER": 7.5, "PBR": 0.8, "ROE": 12.1, "debtRatio": 45.0},
+            "riskLevel": "medium",
+            "confidenceScore": 70,
+        }
+        for code in codes[:count]
+    ]
+    return json.dumps(
+        {
+            "title": "저평가 우량주",
+            "summary": "밸류에이션 매력이 높은 종목을 선별했습니다.",
+            "recommendations": recommendations,
+            "risks": ["시장 변동성"],
+            "methodology": "정량 스크리닝",
+        },
+        ensure_ascii=False,
+    )
+
+
+def _chat(codes: List[str]) -> str:
+    mention = f" 관련 종목({codes[0]}) 재무제표도 함께 확인해 보세요." if codes else ""
+    return (
+        "PER은 주가를 주당순이익으로 나눈 값으로, 낮을수록 이익 대비 주가가 저렴하다는 뜻입니다. "
+        "다만 업종마다 평균 수준이 다르므로 동종 업계와 비교하는 것이 중요합니다." + mention
+    )
+
+
+def reply_for(prompt: str) -> str:
+    """Pick a response shape the AIService parsers accept for this prompt"""
+    codes = STOCK_CODE.findall(prompt)
+    if '"recommendations"' in prompt:
+        return _strategy(codes)
+    if '"investmentThesis"' in prompt:
+        return _analysis(codes)
+    return _chat(codes)
+
+
+def create_app(
+    latency_ms: float = 1500.0,
+    latency_sigma: float = 0.4,
+    error_rate: float = 0.0,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    """
+    Build the stand-in app
+
+    Args:
+        latency_ms: Median response delay
+        latency_sigma: Log-normal spread of the delay (0 for a fixed delay)
+        error_rate: Fraction of calls answered with 429 RESOURCE_EXHAUSTED
+        seed: Seed for the delay and error draws
+
+    Returns:
+        FastAPI app serving /v1beta/models/{model}:generateContent
+    """
+    rng = random.Random(seed)
+    app = FastAPI(title="Fake Gemini")
+
+    @app.post("/{version}/models/{model}:generateContent")
+    async def generate_content(version: str, model: str, request: Request):
+        body = await request.json()
+        await asyncio.sleep(latency_ms * rng.lognormvariate(0.0, latency_sigma) / 1000.0)
+
+        if rng.random() < error_rate:
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "error": {
+                        "code": 429,
+                        "message": "Resource has been exhausted (e.g. check quota).",
+                        "status": "RESOURCE_EXHAUSTED",
+                    }
+                },
+            )
+
+        prompt = _prompt_text(body)
+        text = reply_for(prompt)
+        return {
+            "candidates": [
+                {
+                    "content": {"parts": [{"text": text}], "role": "model"},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }
+            ],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt) // 4,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": (len(prompt) + len(text)) // 4,
+            },
+            "modelVersion": model,
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local Gemini stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument(
+        "--latency-ms", type=float, default=float(os.getenv("FAKE_GEMINI_LATENCY_MS", 1500))
+    )
+    parser.add_argument(
+        "--latency-sigma", type=float, default=float(os.getenv("FAKE_GEMINI_LATENCY_SIGMA", 0.4))
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=float(os.getenv("FAKE_GEMINI_ERROR_RATE", 0.0))
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(
+        create_app(args.latency_ms, args.latency_sigma, args.error_rate, args.seed),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
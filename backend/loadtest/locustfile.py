@@ -0,0 +1,192 @@
+"""Locust Scenarios for the Public API
+
+Two populations share the run:
+
+- InvestorUser: logs in, browses top picks, opens stock details, runs the
+  screener, keeps a watchlist and asks the AI for analyses and chat answers.
+- BrowserUser: anonymous traffic that only reads top picks and stock details.
+
+Configuration (environment):
+    LOADTEST_USER_POOL      Accounts shared by investor users (default 200)
+    LOADTEST_PASSWORD       Password for those accounts
+    LOADTEST_THINK_MIN/MAX  Seconds between actions (default 1-5)
+
+Usage:
+    locust -f loadtest/locustfile.py --host http://localhost:8000
+    locust -f loadtest/locustfile.py,loadtest/shapes.py --headless \\
+        --host http://localhost:8000 --csv results/run --csv-full-history
+"""
+
+import itertools
+import os
+import random
+
+from locust import HttpUser, between, task
+
+API = "/api/v1"
+USER_POOL = int(os.getenv("LOADTEST_USER_POOL", 200))
+PASSWORD = os.getenv("LOADTEST_PASSWORD", "loadtest-password")
+THINK_TIME = between(
+    float(os.getenv("LOADTEST_THINK_MIN", 1)), float(os.getenv("LOADTEST_THINK_MAX", 5))
+)
+
+MARKETS = [None, "KOSPI", "KOSDAQ"]
+CATEGORIES = [None, None, "valuation", "profitability", "stability", "dividend"]
+SCREENS = [
+    {"PER_max": 10, "ROE_min": 10},
+    {"PBR_max": 1.0, "debt_ratio_max": 100},
+    {"dividend_yield_min": 3, "market": ["KOSPI"]},
+    {"value_score_min": 70},
+    {"market": ["KOSDAQ"], "ROE_min": 15, "PER_max": 15},
+]
+QUESTIONS = [
+    "PER이 낮으면 항상 저평가인가요?",
+    "배당주 투자 시 주의할 점은 무엇인가요?",
+    "ROE와 ROA의 차이를 알려주세요.",
+    "부채비율은 어느 정도가 적정한가요?",
+]
+
+_accounts = itertools.count()
+
+
+def _pick(response, default=None):
+    """Random stock code from a top-picks or screener payload"""
+    try:
+        payload = response.json()
+    except ValueError:
+        return default
+    rows = payload.get("data") or payload.get("results") or []
+    return random.choice(rows)["stock_code"] if rows else default
+
+
+class BrowserUser(HttpUser):
+    """Anonymous visitor reading the public pages"""
+
+    weight = 1
+    wait_time = THINK_TIME
+
+    def on_start(self):
+        self.codes = []
+
+    @task(3)
+    def top_picks(self):
+        params = {"limit": 20}
+        market = random.choice(MARKETS)
+        if market:
+            params["market"] = market
+        response = self.client.get(
+            f"{API}/stocks/top-picks", params=params, name=f"{API}/stocks/top-picks"
+        )
+        if response.ok:
+            self.codes = [row["stock_code"] for row in response.json().get("data", [])]
+
+    @task(5)
+    def stock_detail(self):
+        if not self.codes:
+            return self.top_picks()
+        self.client.get(
+            f"{API}/stocks/{random.choice(self.codes)}", name=f"{API}/stocks/[code]"
+        )
+
+
+class InvestorUser(HttpUser):
+    """Signed-in user running the full research flow"""
+
+    weight = 3
+    wait_time = THINK_TIME
+
+    def on_start(self):
+        self.codes = []
+        self.watchlist = []
+        self.email = f"loadtest+{next(_accounts) % USER_POOL}@example.com"
+        self.login()
+
+    def login(self):
+        credentials = {"email": self.email, "password": PASSWORD}
+        with self.client.post(
+            f"{API}/auth/login", json=credentials, catch_response=True
+        ) as response:
+            if response.status_code == 401:
+                response.success()  # Unknown account on a fresh database
+
+        if response.status_code == 401:
+            self.client.post(f"{API}/auth/register", json={**credentials, "name": "Load Test"})
+            response = self.client.post(f"{API}/auth/login", json=credentials)
+        if response.ok:
+            self.client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    @task(4)
+    def top_picks(self):
+        params = {"limit": random.choice([20, 50])}
+        market = random.choice(MARKETS)
+        category = random.choice(CATEGORIES)
+        if market:
+            params["market"] = market
+        if category:
+            params["category"] = category
+        response = self.client.get(
+            f"{API}/stocks/top-picks", params=params, name=f"{API}/stocks/top-picks"
+        )
+        if response.ok:
+            self.codes = [row["stock_code"] for row in response.json().get("data", [])]
+
+    @task(6)
+    def stock_detail(self):
+        if not self.codes:
+            return self.top_picks()
+        self.client.get(
+            f"{API}/stocks/{random.choice(self.codes)}", name=f"{API}/stocks/[code]"
+        )
+
+    @task(3)
+    def screener(self):
+        body = {"filters": random.choice(SCREENS), "limit": 50}
+        response = self.client.post(f"{API}/screener", json=body)
+        code = _pick(response) if response.ok else None
+        if code:
+            self.codes.append(code)
+
+    @task(2)
+    def watchlist(self):
+        self.client.get(f"{API}/watchlist")
+
+    @task(1)
+    def watch_stock(self):
+        if not self.codes:
+            return
+        if len(self.watchlist) >= 10:
+            item_id = self.watchlist.pop(0)
+            self.client.delete(f"{API}/watchlist/{item_id}", name=f"{API}/watchlist/[id]")
+            return
+
+        with self.client.post(
+            f"{API}/watchlist",
+            json={"stock_code": random.choice(self.codes)},
+            catch_response=True,
+        ) as response:
+            if response.status_code == 400:
+                response.success()  # Already watched
+            elif response.ok:
+                self.watchlist.append(response.json()["id"])
+
+    @task(1)
+    def analyze_stock(self):
+        if not self.codes:
+            return
+        code = random.choice(self.codes)
+        self.client.post(
+            f"{API}/ai/analyze-stock",
+            json={
+                "stockCode": code,
+                "stockName": f"종목{code}",
+                "metrics": {"PER": 8.2, "PBR": 0.9, "ROE": 11.5},
+            },
+        )
+
+    @task(1)
+    def ai_chat(self):
+        context = {"stockCode": random.choice(self.codes)} if self.codes else None
+        self.client.post(
+            f"{API}/ai/chat",
+            json={"message": random.choice(QUESTIONS), "context": context},
+        )
@@ -0,0 +1,33 @@
+"""Step Load Shape
+
+Adds users in equal steps and holds each level long enough for latencies to
+settle, so a run traces throughput and p99 against concurrency. Load it next
+to the scenarios:
+
+    locust -f loadtest/locustfile.py,loadtest/shapes.py --headless ...
+
+Configuration (environment):
+    LOADTEST_STEP_USERS     Users added per step (default 25)
+    LOADTEST_STEP_SECONDS   Hold time per step (default 60)
+    LOADTEST_STEPS          Number of steps (default 8)
+    LOADTEST_SPAWN_RATE     Users started per second (default 10)
+"""
+
+import os
+
+from locust import LoadTestShape
+
+
+class StepLoadShape(LoadTestShape):
+    """Stepwise ramp: step_users, 2 * step_users, ... for step_seconds each"""
+
+    step_users = int(os.getenv("LOADTEST_STEP_USERS", 25))
+    step_seconds = int(os.getenv("LOADTEST_STEP_SECONDS", 60))
+    steps = int(os.getenv("LOADTEST_STEPS", 8))
+    spawn_rate = float(os.getenv("LOADTEST_SPAWN_RATE", 10))
+
+    def tick(self):
+        step = int(self.get_run_time() // self.step_seconds)
+        if step >= self.steps:
+            return None
+        return (step + 1) * self.step_users, self.spawn_rate
@@ -0,0 +1,258 @@
+"""Worker / Connection Pool Sweep
+
+Runs the Locust scenarios with the step load shape against one API server per
+configuration (uvicorn workers x SQLAlchemy pool size), then reports p50/p99
+and throughput per endpoint at each load step and where each endpoint
+saturates. The database, Redis and the Gemini stand-in must already be
+running; the script only starts and stops the API.
+
+A step counts as saturated for an endpoint when its p99 exceeds the SLO,
+more than 1% of its requests fail, or the server stops scaling (aggregate
+requests per second per user falls below 80% of the first step). Steps with
+fewer than 20 requests for an endpoint (e.g. logins, which only happen as
+users start) are not judged.
+
+Usage:
+    python -m loadtest.sweep --workers 1,2,4 --pool-sizes 5,10,20 --out results/sweep
+    python -m loadtest.sweep --summarize results/sweep/w2-p10_stats_history.csv
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+import pandas as pd
+
+HERE = Path(__file__).resolve().parent
+BACKEND = HERE.parent
+
+
+def _is_ai(name: str) -> bool:
+    return "/ai/" in name
+
+
+def summarize(history: pd.DataFrame, min_seconds: int = 5) -> pd.DataFrame:
+    """
+    Reduce a Locust ``--csv-full-history`` frame to one row per endpoint and load step
+
+    A step is a run of rows with the same user count lasting at least
+    ``min_seconds`` (ramps between steps are dropped). Throughput comes from the
+    cumulative counters across the step; percentiles are Locust's rolling
+    window at the end of the step.
+
+    Args:
+        history: Contents of ``<prefix>_stats_history.csv``
+        min_seconds: Shortest run of rows that counts as a held step
+
+    Returns:
+        DataFrame with name, users, requests, rps, fail_ratio, p50, p99
+    """
+    history = history.sort_values(["Timestamp"], kind="stable")
+    runs = (history["User Count"] != history["User Count"].shift()).cumsum()
+    # User count is reported on every row, so run ids must be computed across
+    # all endpoints before splitting by name
+    history = history.assign(run=runs.groupby(history["Timestamp"]).transform("min"))
+
+    rows = []
+    names = (history["Type"].fillna("") + " " + history["Name"]).str.strip()
+    for (name, run), group in history.groupby([names, "run"], sort=False):
+        first, last = group.iloc[0], group.iloc[-1]
+        seconds = last["Timestamp"] - first["Timestamp"]
+        if seconds < min_seconds or last["User Count"] == 0:
+            continue
+        requests = last["Total Request Count"] - first["Total Request Count"]
+        failures = last["Total Failure Count"] - first["Total Failure Count"]
+        rows.append(
+            {
+                "name": name,
+                "users": int(last["User Count"]),
+                "requests": int(requests),
+                "rps": requests / seconds,
+                "fail_ratio": failures / requests if requests else 0.0,
+                "p50": pd.to_numeric(last["50%"], errors="coerce"),
+                "p99": pd.to_numeric(last["99%"], errors="coerce"),
+            }
+        )
+    return pd.DataFrame(
+        rows, columns=["name", "users", "requests", "rps", "fail_ratio", "p50", "p99"]
+    ).sort_values(["name", "users"], ignore_index=True)
+
+
+def saturation(
+    summary: pd.DataFrame,
+    slo_ms: float = 500.0,
+    ai_slo_ms: float = 5000.0,
+    max_fail_ratio: float = 0.01,
+    min_efficiency: float = 0.8,
+    min_requests: int = 20,
+) -> pd.DataFrame:
+    """
+    Find the highest load step each endpoint sustains
+
+    Args:
+        summary: Output of summarize()
+        slo_ms: p99 budget for regular endpoints
+        ai_slo_ms: p99 budget for /ai/ endpoints (bound by upstream latency)
+        max_fail_ratio: Largest tolerated share of failed requests
+        min_efficiency: Smallest tolerated aggregate rps per user, relative to the first step
+        min_requests: Steps with fewer requests for an endpoint are too thin to judge
+
+    Returns:
+        DataFrame per endpoint with max_users (None if no step could be
+        judged or the first one already fails), saturated_at and the
+        rps/p50/p99 measured at max_users
+    """
+    aggregate = summary[summary["name"] == "Aggregated"].set_index("users")["rps"]
+    per_user = aggregate / aggregate.index
+    efficiency = per_user / per_user.iloc[0] if len(per_user) else per_user
+
+    rows = []
+    for name, steps in summary.groupby("name", sort=True):
+        # The aggregate mixes fast reads with upstream-bound AI calls, so it is
+        # judged on scaling and errors only
+        budget = float("inf") if name == "Aggregated" else ai_slo_ms if _is_ai(name) else slo_ms
+        good = None
+        saturated_at = None
+        for step in steps.itertuples(index=False):
+            if step.requests < min_requests:
+                continue
+            ok = (
+                step.fail_ratio <= max_fail_ratio
+                and not step.p99 > budget
+                and efficiency.get(step.users, 1.0) >= min_efficiency
+            )
+            if not ok:
+                saturated_at = step.users
+                break
+            good = step
+        rows.append(
+            {
+                "name": name,
+                "max_users": good.users if good else None,
+                "saturated_at": saturated_at,
+                "rps": good.rps if good else None,
+                "p50": good.p50 if good else None,
+                "p99": good.p99 if good else None,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _wait_healthy(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"API at {url} did not become healthy within {timeout:.0f}s")
+
+
+def run_config(
+    workers: int, pool_size: int, max_overflow: int, port: int, out: Path, locust_args: List[str]
+) -> Path:
+    """Serve the API with one configuration, drive the step load and return the history CSV"""
+    label = f"w{workers}-p{pool_size}"
+    env = {
+        **os.environ,
+        "DB_POOL_SIZE": str(pool_size),
+        "DB_MAX_OVERFLOW": str(max_overflow),
+        # Both API engines: sync routes and async (get_async_db) routes
+        "ASYNC_DB_POOL_SIZE": str(pool_size),
+        "ASYNC_DB_MAX_OVERFLOW": str(max_overflow),
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=BACKEND,
+        env=env,
+    )
+    host = f"http://127.0.0.1:{port}"
+    try:
+        _wait_healthy(host)
+        subprocess.run(
+            [
+                sys.executable, "-m", "locust",
+                "-f", f"{HERE / 'locustfile.py'},{HERE / 'shapes.py'}",
+                "--headless", "--host", host,
+                "--csv", str(out / label), "--csv-full-history", "--only-summary",
+                *locust_args,
+            ],
+            cwd=BACKEND,
+            check=False,
+        )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return out / f"{label}_stats_history.csv"
+
+
+def _report(label: str, summary: pd.DataFrame, limits: pd.DataFrame):
+    print(f"\n== {label} ==")
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+    print("\nSustained load per endpoint:")
+    print(limits.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+
+
+def _ints(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep API workers and DB pool sizes under load")
+    parser.add_argument("--workers", type=_ints, default=[1, 2, 4])
+    parser.add_argument("--pool-sizes", type=_ints, default=[5, 10, 20])
+    parser.add_argument(
+        "--max-overflow", type=int, default=None, help="Defaults to twice the pool size"
+    )
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--out", type=Path, default=Path("results/sweep"))
+    parser.add_argument("--slo-ms", type=float, default=500.0)
+    parser.add_argument("--ai-slo-ms", type=float, default=5000.0)
+    parser.add_argument(
+        "--summarize", type=Path, nargs="*", help="Only analyse existing *_stats_history.csv files"
+    )
+    args, locust_args = parser.parse_known_args()
+
+    if args.summarize:
+        histories = {path.name.replace("_stats_history.csv", ""): path for path in args.summarize}
+    else:
+        args.out.mkdir(parents=True, exist_ok=True)
+        histories: Dict[str, Path] = {}
+        for workers in args.workers:
+            for pool_size in args.pool_sizes:
+                overflow = pool_size * 2 if args.max_overflow is None else args.max_overflow
+                print(
+                    f"\n>> {workers} worker(s), pool {pool_size}+{overflow} per engine "
+                    f"(up to {workers * 2 * (pool_size + overflow)} DB connections)"
+                )
+                path = run_config(workers, pool_size, overflow, args.port, args.out, locust_args)
+                histories[path.name.replace("_stats_history.csv", "")] = path
+
+    ranking = []
+    for label, path in histories.items():
+        summary = summarize(pd.read_csv(path))
+        limits = saturation(summary, args.slo_ms, args.ai_slo_ms)
+        _report(label, summary, limits)
+        aggregate = limits[limits["name"] == "Aggregated"].iloc[0]
+        ranking.append(
+            {"config": label, "max_users": aggregate["max_users"], "rps": aggregate["rps"]}
+        )
+
+    ranking = pd.DataFrame(ranking).sort_values("rps", ascending=False, na_position="last")
+    print("\n== Configurations by sustained throughput ==")
+    print(ranking.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -73,11 +73,50 @@ uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload &
 API_PID=$!
 echo "FastAPI PID: $API_PID"
 
-# Start Celery worker (in another terminal)
-echo -e "${GREEN}Starting Celery worker...${NC}"
-celery -A app.celery_app worker --loglevel=info &
-CELERY_PID=$!
-echo "Celery worker PID: $CELERY_PID"
+# Start Celery workers, one per queue (see task routing in app/celery_app.py)
+#
+#   ingest-io  KRX/DART HTTP crawling. Tasks mostly wait on the network, so a
+#              thread pool with high concurrency; prefetch a few messages per
+#              thread since the tasks are short. (--pool=gevent also works if
+#              gevent is installed.)
+#   compute    Value Score calculation and aggregation. CPU-bound, so prefork
+#              with one process per core and no prefetching beyond one task.
+#   backtest   Long-running backtests, isolated so they never hold up scoring.
+#
+# Concurrency can be overridden with CELERY_IO_CONCURRENCY,
+# CELERY_COMPUTE_CONCURRENCY and CELERY_BACKTEST_CONCURRENCY.
+#
+# Each worker serves Prometheus metrics on its own CELERY_METRICS_PORT
+# (9808-9810). Prefork workers aggregate samples from their pool processes
+# through a per-worker PROMETHEUS_MULTIPROC_DIR, wiped on every start.
+CPU_COUNT=$(nproc 2>/dev/null || sysctl -n hw.ncpu 2>/dev/null || echo 2)
+METRICS_DIR="$PROJECT_ROOT/.prometheus"
+rm -rf "$METRICS_DIR"
+mkdir -p "$METRICS_DIR/compute" "$METRICS_DIR/backtest"
+
+echo -e "${GREEN}Starting Celery ingest-io worker...${NC}"
+CELERY_METRICS_PORT=9808 \
+celery -A app.celery_app worker -Q ingest-io -n ingest-io@%h \
+    --pool=threads --concurrency="${CELERY_IO_CONCURRENCY:-32}" \
+    --prefetch-multiplier=4 --loglevel=info &
+CELERY_IO_PID=$!
+echo "Celery ingest-io worker PID: $CELERY_IO_PID"
+
+echo -e "${GREEN}Starting Celery compute worker...${NC}"
+CELERY_METRICS_PORT=9809 PROMETHEUS_MULTIPROC_DIR="$METRICS_DIR/compute" \
+celery -A app.celery_app worker -Q compute -n compute@%h \
+    --pool=prefork --concurrency="${CELERY_COMPUTE_CONCURRENCY:-$CPU_COUNT}" \
+    --prefetch-multiplier=1 --loglevel=info &
+CELERY_COMPUTE_PID=$!
+echo "Celery compute worker PID: $CELERY_COMPUTE_PID"
+
+echo -e "${GREEN}Starting Celery backtest worker...${NC}"
+CELERY_METRICS_PORT=9810 PROMETHEUS_MULTIPROC_DIR="$METRICS_DIR/backtest" \
+celery -A app.celery_app worker -Q backtest -n backtest@%h \
+    --pool=prefork --concurrency="${CELERY_BACKTEST_CONCURRENCY:-1}" \
+    --prefetch-multiplier=1 --loglevel=info &
+CELERY_BACKTEST_PID=$!
+echo "Celery backtest worker PID: $CELERY_BACKTEST_PID"
 
 # Start Celery beat scheduler (in another terminal)
 echo -e "${GREEN}Starting Celery beat scheduler...${NC}"
@@ -91,20 +130,25 @@ echo -e "${GREEN}All services started successfully${NC}"
 echo -e "${GREEN}================================${NC}"
 echo ""
 echo "Service PIDs:"
-echo "  FastAPI:      $API_PID"
-echo "  Celery:       $CELERY_PID"
-echo "  Celery Beat:  $BEAT_PID"
+echo "  FastAPI:         $API_PID"
+echo "  Celery IO:       $CELERY_IO_PID"
+echo "  Celery Compute:  $CELERY_COMPUTE_PID"
+echo "  Celery Backtest: $CELERY_BACKTEST_PID"
+echo "  Celery Beat:     $BEAT_PID"
 echo ""
 echo "FastAPI will be available at: http://localhost:8000"
 echo "API docs at: http://localhost:8000/docs"
+echo "Metrics at: http://localhost:8000/metrics (workers: :9808 ingest-io, :9809 compute, :9810 backtest)"
 echo ""
 echo "To stop services, run: stop_services.sh"
 echo ""
 
 # Save PIDs to file for shutdown script
 echo "$API_PID" > "$PROJECT_ROOT/.pids_api"
-echo "$CELERY_PID" > "$PROJECT_ROOT/.pids_celery"
+echo "$CELERY_IO_PID" > "$PROJECT_ROOT/.pids_celery_io"
+echo "$CELERY_COMPUTE_PID" > "$PROJECT_ROOT/.pids_celery_compute"
+echo "$CELERY_BACKTEST_PID" > "$PROJECT_ROOT/.pids_celery_backtest"
 echo "$BEAT_PID" > "$PROJECT_ROOT/.pids_beat"
 
 # Wait for all processes
-wait $API_PID $CELERY_PID $BEAT_PID
+wait $API_PID $CELERY_IO_PID $CELERY_COMPUTE_PID $CELERY_BACKTEST_PID $BEAT_PID
@@ -57,7 +57,9 @@ kill_process() {
 
 # Kill services in reverse order
 kill_process "$PROJECT_ROOT/.pids_beat" "Celery Beat"
-kill_process "$PROJECT_ROOT/.pids_celery" "Celery Worker"
+kill_process "$PROJECT_ROOT/.pids_celery_backtest" "Celery Backtest Worker"
+kill_process "$PROJECT_ROOT/.pids_celery_compute" "Celery Compute Worker"
+kill_process "$PROJECT_ROOT/.pids_celery_io" "Celery IO Worker"
 kill_process "$PROJECT_ROOT/.pids_api" "FastAPI"
 
 echo ""
@@ -0,0 +1,138 @@
+"""Benchmark fixtures
+
+Benchmarks run against a production-size synthetic universe (2,500 stocks x
+5 years by default) and are not part of the regular test run. Run them
+explicitly:
+
+    # Measure and store a run under .benchmarks/ (named after the commit)
+    pytest tests/benchmarks --benchmark-autosave
+
+    # Compare against the latest stored run; fail on a >10% mean regression
+    pytest tests/benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+    # Report on stored runs
+    pytest-benchmark compare --group-by=name --columns=mean,median,ops
+
+    # Smaller universe for a quick check
+    pytest tests/benchmarks --synthetic-stocks 300 --synthetic-years 2
+
+The generated database is cached in the system temp directory (keyed by the
+spec and the generator source) so only the first run pays for generation;
+each session works on a private copy, since some benchmarks write.
+"""
+
+import asyncio
+import hashlib
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, get_async_db, get_db
+from app.main import app
+from app.services import synthetic_universe
+from app.services.backtest_engine import BacktestEngine
+from app.services.synthetic_universe import SyntheticUniverse, UniverseSpec
+
+CACHE_DIR = Path(tempfile.gettempdir()) / "valuehunt-benchmarks"
+
+
+def run_async(coro):
+    """Run a service coroutine to completion"""
+    return asyncio.run(coro)
+
+
+def _cached_database(spec: UniverseSpec) -> Path:
+    source = hashlib.sha1(Path(synthetic_universe.__file__).read_bytes()).hexdigest()[:10]
+    path = CACHE_DIR / (
+        f"universe-{spec.stocks}x{spec.years}-{spec.end_date:%Y%m%d}"
+        f"-{spec.score_days}-{spec.filings_per_year:g}-{spec.seed}-{source}.db"
+    )
+    if path.exists():
+        return path
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    partial.unlink(missing_ok=True)
+
+    engine = create_engine(f"sqlite:///{partial}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        SyntheticUniverse(spec).load(db)
+    engine.dispose()
+
+    partial.rename(path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def bench_spec(request) -> UniverseSpec:
+    """Universe size for benchmarks (production scale unless overridden)"""
+    defaults = UniverseSpec()
+    return UniverseSpec(
+        stocks=request.config.getoption("synthetic_stocks") or defaults.stocks,
+        years=request.config.getoption("synthetic_years") or defaults.years,
+    )
+
+
+@pytest.fixture(scope="session")
+def bench_db(bench_spec, tmp_path_factory):
+    """Session factory for a writable copy of the cached synthetic database"""
+    path = tmp_path_factory.mktemp("bench") / "universe.db"
+    shutil.copyfile(_cached_database(bench_spec), path)
+
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def client(bench_db, async_db_override):
+    """API client whose database dependencies point at the benchmark database"""
+
+    def override_get_db():
+        db = bench_db()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = async_db_override(bench_db.kw["bind"])
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+@pytest.fixture(scope="session")
+def simulation_date(bench_spec) -> datetime:
+    """A date with filed fundamentals behind it and a full holding period after it"""
+    end = datetime.combine(bench_spec.end_date, datetime.min.time())
+    return end.replace(year=end.year - max(bench_spec.years // 2, 1))
+
+
+@pytest.fixture(scope="session")
+def completed_backtests(bench_db, simulation_date):
+    """A quarterly Value Score backtest series run once for the analytics benchmarks"""
+    with bench_db() as db:
+        engine = BacktestEngine(db)
+        runs = run_async(
+            engine.create_backtest_series(
+                name="Benchmark series",
+                strategy_type=None,
+                market="ALL",
+                start_date=simulation_date - timedelta(days=270),
+                end_date=simulation_date,
+                lookback_years=5,
+                holding_period_months=6,
+                frequency="quarterly",
+            )
+        )
+        for run in runs:
+            run_async(engine.run_backtest(run.id))
+        return [run.id for run in runs]
@@ -0,0 +1,82 @@
+"""Benchmarks for read-heavy API endpoints"""
+
+import pytest
+
+from app.models.stock import Stock
+
+
+@pytest.fixture(scope="module")
+def stock_code(bench_db):
+    """The largest stock by market cap (detail page with metrics, scores and filings)"""
+    with bench_db() as db:
+        return db.query(Stock.code).order_by(Stock.market_cap.desc()).first()[0]
+
+
+@pytest.mark.benchmark(group="api-stocks")
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"market": "KOSDAQ", "category": "dividend", "limit": 50}],
+    ids=["default", "kosdaq-dividend"],
+)
+def test_top_picks(benchmark, client, params):
+    """GET /stocks/top-picks"""
+    response = benchmark(client.get, "/api/v1/stocks/top-picks", params=params)
+
+    assert response.status_code == 200
+    assert response.json()["data"]
+
+
+@pytest.mark.benchmark(group="api-stocks")
+def test_stock_detail(benchmark, client, stock_code):
+    """GET /stocks/{code}"""
+    response = benchmark(client.get, f"/api/v1/stocks/{stock_code}")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="api-screener")
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"filters": {}, "limit": 100},
+        {
+            "filters": {"market": ["KOSPI"], "PER_max": 15, "ROE_min": 5, "debt_ratio_max": 150},
+            "sort_by": "PER",
+            "order": "asc",
+            "limit": 50,
+        },
+    ],
+    ids=["unfiltered", "filtered"],
+)
+def test_screener(benchmark, client, body):
+    """POST /screener"""
+    response = benchmark(client.post, "/api/v1/screener", json=body)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="api-analytics")
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/api/backtest/analytics/compare",
+        "/api/v1/api/backtest/analytics/summary",
+        "/api/v1/api/backtest/analytics/time-series",
+        "/api/v1/api/backtest/analytics/stock-frequency",
+    ],
+)
+def test_analytics(benchmark, client, completed_backtests, path):
+    """Backtest analytics endpoints over a completed series"""
+    response = benchmark(client.get, path)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="api-analytics")
+def test_analytics_patterns(benchmark, client, completed_backtests):
+    """GET /analytics/runs/{id}/patterns"""
+    response = benchmark(
+        client.get, f"/api/v1/api/backtest/analytics/runs/{completed_backtests[-1]}/patterns"
+    )
+
+    assert response.status_code == 200
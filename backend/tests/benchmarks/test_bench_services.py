@@ -0,0 +1,115 @@
+"""Benchmarks for scoring, backtesting, historical price lookups and screening"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.models.backtest import BacktestRun, BacktestStatus
+from app.models.stock import Stock
+from app.services.backtest_engine import BacktestEngine
+from app.services.historical_data_service import HistoricalDataService
+from app.services.screener_engine import compile_filters, load_snapshot, parse_sort
+from app.services.value_scorer import ValueScorer
+
+
+@pytest.mark.benchmark(group="scoring")
+def test_calculate_all_value_scores(benchmark, bench_db, bench_spec):
+    """Daily scoring pass over the whole universe"""
+    with bench_db() as db:
+        result = benchmark.pedantic(
+            ValueScorer(db).calculate_all_value_scores, rounds=3, iterations=1
+        )
+
+    assert result["success"] == bench_spec.stocks
+
+
+@pytest.mark.benchmark(group="backtest")
+def test_run_backtest(benchmark, bench_db, simulation_date):
+    """Single Value Score backtest (recommendations, performance, statistics)"""
+    with bench_db() as db:
+        engine = BacktestEngine(db)
+
+        def new_run():
+            run = BacktestRun(
+                name="Benchmark run",
+                market="ALL",
+                simulation_date=simulation_date,
+                lookback_years=5,
+                holding_period_months=12,
+                status=BacktestStatus.PENDING,
+            )
+            db.add(run)
+            db.commit()
+            return (run.id,), {}
+
+        backtest = benchmark.pedantic(
+            lambda run_id: asyncio.run(engine.run_backtest(run_id)),
+            setup=new_run,
+            rounds=3,
+            iterations=1,
+        )
+
+        assert backtest.status == BacktestStatus.COMPLETED
+        assert backtest.total_recommendations > 0
+
+
+@pytest.mark.benchmark(group="backtest")
+def test_run_backtest_series(benchmark, bench_db, simulation_date):
+    """Quarterly series over one year, created and executed back to back"""
+    with bench_db() as db:
+        engine = BacktestEngine(db)
+
+        async def series():
+            runs = await engine.create_backtest_series(
+                name="Benchmark series",
+                strategy_type=None,
+                market="KOSPI",
+                start_date=simulation_date - timedelta(days=270),
+                end_date=simulation_date,
+                lookback_years=5,
+                holding_period_months=6,
+                frequency="quarterly",
+            )
+            return [await engine.run_backtest(run.id) for run in runs]
+
+        runs = benchmark.pedantic(lambda: asyncio.run(series()), rounds=2, iterations=1)
+
+        assert all(run.status == BacktestStatus.COMPLETED for run in runs)
+
+
+@pytest.mark.benchmark(group="historical")
+def test_get_price_return(benchmark, bench_db, simulation_date):
+    """Holding-period return for one stock (called per recommendation)"""
+    with bench_db() as db:
+        stock_code = db.query(Stock.code).order_by(Stock.code).first()[0]
+        service = HistoricalDataService(db)
+
+        performance = benchmark(
+            service.get_price_return,
+            stock_code,
+            simulation_date,
+            simulation_date + timedelta(days=360),
+        )
+
+    assert performance["end_price"] > 0
+
+
+@pytest.mark.benchmark(group="screener")
+def test_screener_snapshot_query(benchmark, bench_db):
+    """Mask, multi-key sort and facets on the in-memory snapshot (no SQL)"""
+    with bench_db() as db:
+        snapshot = load_snapshot(db)
+    predicates = compile_filters(
+        {"market": ["KOSPI"], "PER_max": 15, "ROE_pct_min": 50, "debt_ratio_max": 150}
+    )
+    sort = parse_sort(["-value_score", "PER"])
+
+    def screen():
+        mask = snapshot.mask(predicates)
+        return snapshot.order(mask, sort)[:50], snapshot.facet_counts(mask, ["sector"])
+
+    matches, facets = benchmark(screen)
+
+    assert len(matches) > 0
+    assert facets["sector"]
@@ -0,0 +1,115 @@
+"""Shared pytest fixtures"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import app.models  # noqa: F401  (registers all tables on Base.metadata)
+from app.db.database import Base, async_database_url
+from app.db.query_stats import track_queries
+from app.services.statement_cache import statement_cache
+from app.services.synthetic_universe import SyntheticUniverse, UniverseSpec
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("synthetic", "synthetic KRX universe (synthetic_db fixture)")
+    group.addoption(
+        "--synthetic-stocks", type=int, help="Stocks to generate (tests: 100, benchmarks: 2500)"
+    )
+    group.addoption(
+        "--synthetic-years", type=int, help="Years of price history (tests: 2, benchmarks: 5)"
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolated_statement_cache(tmp_path, monkeypatch):
+    """Keep the DART statement cache out of the working tree during tests"""
+    monkeypatch.setattr(statement_cache, "root", tmp_path / "dart_cache")
+    return statement_cache
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fail when a block runs more SQL queries than allowed
+
+    Usage:
+        def test_detail(query_budget):
+            with query_budget(3):
+                service.get_detail("005930")
+    """
+
+    @contextmanager
+    def budget(max_queries: int):
+        with track_queries() as stats:
+            yield stats
+
+        statements = "\n".join(
+            f"  {count}x {' '.join(statement.split())}"
+            for statement, count in stats.statements.most_common()
+        )
+        assert stats.count <= max_queries, (
+            f"{stats.count} queries exceeded the budget of {max_queries}:\n{statements}"
+        )
+
+    return budget
+
+
+@pytest.fixture(scope="session")
+def async_db_override():
+    """
+    Build a get_async_db override on the SQLite file of a sync test engine
+
+    Usage:
+        app.dependency_overrides[get_async_db] = async_db_override(engine)
+
+    Connections are not pooled: TestClient runs each request on a new event
+    loop, and aiosqlite connections belong to the loop that opened them.
+    """
+
+    def build(engine):
+        async_engine = create_async_engine(
+            async_database_url(engine.url.render_as_string(hide_password=False)),
+            poolclass=NullPool,
+        )
+        factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with factory() as db:
+                yield db
+
+        return override_get_async_db
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def synthetic_spec(request) -> UniverseSpec:
+    """Universe size for synthetic_db (production scale: --synthetic-stocks 2500 --synthetic-years 5)"""
+    return UniverseSpec(
+        stocks=request.config.getoption("synthetic_stocks") or 100,
+        years=request.config.getoption("synthetic_years") or 2,
+    )
+
+
+@pytest.fixture(scope="session")
+def synthetic_db(synthetic_spec, tmp_path_factory):
+    """
+    Session factory for a SQLite database filled with a synthetic universe
+
+    Built once per test session; tests must not modify it.
+    """
+    path = tmp_path_factory.mktemp("synthetic") / "universe.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        SyntheticUniverse(synthetic_spec).load(db)
+
+    yield factory
+    engine.dispose()
@@ -0,0 +1,149 @@
+"""Unit tests for the async engine and the routes served from it"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.dependencies import get_current_user
+from app.db.database import Base, async_database_url, get_async_db, get_db
+from app.main import app
+from app.models.backtest import BacktestRecommendation, BacktestRun, BacktestStatus
+from app.models.stock import Stock
+from app.models.watchlist import Watchlist
+
+USER = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+class TestAsyncDatabaseUrl:
+    """Test deriving the asyncio driver URL from DATABASE_URL"""
+
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("postgresql://u:secret@db/valuehunt", "postgresql+asyncpg://u:secret@db/valuehunt"),
+            ("postgresql+psycopg2://u@db/valuehunt", "postgresql+asyncpg://u@db/valuehunt"),
+            ("sqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+        ],
+    )
+    def test_driver(self, url, expected):
+        """The sync driver is swapped and the password kept"""
+        assert async_database_url(url) == expected
+
+    def test_sslmode(self):
+        """libpq's sslmode is passed to asyncpg as ssl"""
+        url = async_database_url("postgresql://u@db/valuehunt?sslmode=require")
+
+        assert url == "postgresql+asyncpg://u@db/valuehunt?ssl=require"
+
+    def test_unsupported(self):
+        """Databases without a configured asyncio driver fail at startup"""
+        with pytest.raises(ValueError):
+            async_database_url("mysql://u@db/valuehunt")
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """One stock and a completed backtest run with two recommendations"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'async.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(Stock(code="005930", name="삼성전자", market="KOSPI", current_price=70000))
+        db.add(
+            BacktestRun(
+                id=1,
+                name="Run",
+                market="KOSPI",
+                simulation_date=datetime(2020, 1, 1),
+                lookback_years=5,
+                holding_period_months=12,
+                status=BacktestStatus.COMPLETED,
+            )
+        )
+        for rank in (1, 2):
+            db.add(
+                BacktestRecommendation(
+                    backtest_run_id=1,
+                    stock_code=f"00000{rank}",
+                    stock_name=f"Stock {rank}",
+                    recommendation_rank=rank,
+                    price_at_recommendation=1000.0,
+                )
+            )
+        db.commit()
+
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def client(session_factory, async_db_override):
+    """Routes on get_async_db must not fall back to the sync session"""
+
+    def no_sync_db():
+        raise AssertionError("route used the sync session")
+
+    user = type("CurrentUser", (), {"id": USER})()
+    app.dependency_overrides[get_async_db] = async_db_override(session_factory.kw["bind"])
+    app.dependency_overrides[get_db] = no_sync_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield TestClient(app)
+    for dependency in (get_async_db, get_db, get_current_user):
+        app.dependency_overrides.pop(dependency, None)
+
+
+class TestAsyncRoutes:
+    """Test routes served from the async session"""
+
+    def test_backtest_detail_includes_recommendations(self, client):
+        """Recommendations are loaded eagerly (no lazy load on the async session)"""
+        body = client.get("/api/v1/api/backtest/runs/1").json()
+
+        assert [item["recommendation_rank"] for item in body["recommendations"]] == [1, 2]
+
+    def test_backtest_detail_not_found(self, client):
+        """Unknown runs are a 404"""
+        assert client.get("/api/v1/api/backtest/runs/99").status_code == 404
+
+    def test_watchlist_round_trip(self, client, session_factory):
+        """Add, update, list and remove commit through the async session"""
+        created = client.post(
+            "/api/v1/watchlist", json={"stock_code": "005930", "target_price": 75000}
+        )
+        assert created.status_code == 201
+        assert created.json()["added_at"] is not None
+        item_id = created.json()["id"]
+
+        duplicate = client.post("/api/v1/watchlist", json={"stock_code": "005930"})
+        assert duplicate.status_code == 400
+
+        updated = client.put(f"/api/v1/watchlist/{item_id}", json={"target_price": 80000})
+        assert updated.json()["target_price"] == 80000
+
+        items = client.get("/api/v1/watchlist").json()["watchlist"]
+        assert [(item["stock_code"], item["current_price"]) for item in items] == [
+            ("005930", 70000)
+        ]
+
+        assert client.delete(f"/api/v1/watchlist/{item_id}").status_code == 204
+        with session_factory() as db:
+            assert db.query(Watchlist).count() == 0
+
+    def test_unknown_stock(self, client):
+        """Adding a stock that does not exist is a 404"""
+        response = client.post("/api/v1/watchlist", json={"stock_code": "999999"})
+
+        assert response.status_code == 404
+
+    def test_queries_counted(self, client):
+        """Async queries still reach the Server-Timing query stats"""
+        response = client.get("/api/v1/api/backtest/runs")
+
+        description = response.headers["server-timing"].split('desc="')[1]
+        assert int(description.split()[0]) >= 2  # epoch read and page
@@ -0,0 +1,70 @@
+"""Unit tests for Celery queue routing"""
+
+import pytest
+
+from app.celery_app import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    QUEUE_BACKTEST,
+    QUEUE_COMPUTE,
+    QUEUE_INGEST_IO,
+    celery_app,
+)
+
+
+def _route(name, args=(), kwargs=None):
+    options = celery_app.amqp.router.route({}, name, args, kwargs or {})
+    return options["queue"].name, options.get("priority")
+
+
+class TestTaskRouting:
+    """Test that tasks land on the queue matching their workload"""
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "app.tasks.dart_tasks.fetch_dart_financial_metrics_batch_task",
+            "app.tasks.dart_tasks.update_corp_code_cache_task",
+            "app.tasks.insider_tasks.fetch_insider_trading_task",
+            "app.tasks.data_tasks.collect_all_stock_prices_task",
+        ],
+    )
+    def test_crawling_goes_to_ingest_io(self, name):
+        """HTTP-bound collection runs on the I/O queue"""
+        assert _route(name)[0] == QUEUE_INGEST_IO
+
+    def test_scoring_goes_to_compute(self):
+        """Value Score calculation runs on the compute queue"""
+        assert _route("app.tasks.data_tasks.calculate_all_value_scores_task") == (
+            QUEUE_COMPUTE,
+            PRIORITY_LOW,
+        )
+
+    def test_callbacks_have_high_priority(self):
+        """Chord callbacks outrank the bulk work queued before them"""
+        assert _route("app.tasks.dart_tasks.summarize_dart_batches_task") == (
+            QUEUE_COMPUTE,
+            PRIORITY_HIGH,
+        )
+
+    def test_backtests_are_isolated(self):
+        """Backtest tasks get their own queue"""
+        assert _route("app.tasks.backtest_tasks.run_backtest_task")[0] == QUEUE_BACKTEST
+
+    def test_unrouted_task_uses_default_queue(self):
+        """Unknown tasks fall back to compute"""
+        assert _route("app.tasks.other.some_task")[0] == QUEUE_COMPUTE
+
+    @pytest.mark.parametrize(
+        "stage,queue",
+        [
+            ("prices", QUEUE_INGEST_IO),
+            ("financial_metrics", QUEUE_INGEST_IO),
+            ("value_scores", QUEUE_COMPUTE),
+        ],
+    )
+    def test_pipeline_chunks_routed_by_stage(self, stage, queue):
+        """Pipeline chunks follow the workload of their stage"""
+        name = "app.tasks.pipeline_tasks.run_pipeline_chunk_task"
+        assert _route(name, args=("run-1", stage, 0, [])) == (queue, PRIORITY_LOW)
+        assert _route(name, kwargs={"run_id": "run-1", "stage": stage})[0] == queue
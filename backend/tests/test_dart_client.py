@@ -0,0 +1,197 @@
+"""Unit tests for the async DART API client"""
+
+import io
+import zipfile
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.services import dart_client as dart_client_module
+from app.services.dart_client import DART_API_BASE_URL, AsyncDartClient
+from app.services.dart_service import DartService
+
+
+FINSTATE_RECORDS = [
+    {"sj_div": "BS", "account_nm": "자산총계", "thstrm_amount": "1000000000"},
+    {"sj_div": "BS", "account_nm": "부채총계", "thstrm_amount": "400000000"},
+    {"sj_div": "BS", "account_nm": "자본총계", "thstrm_amount": "600000000"},
+    {"sj_div": "BS", "account_nm": "유동자산", "thstrm_amount": "400000000"},
+    {"sj_div": "BS", "account_nm": "유동부채", "thstrm_amount": "200000000"},
+    {"sj_div": "IS", "account_nm": "매출액", "thstrm_amount": "800000000"},
+    {"sj_div": "IS", "account_nm": "영업이익", "thstrm_amount": "120000000"},
+    {"sj_div": "IS", "account_nm": "당기순이익", "thstrm_amount": "80000000"},
+    {"sj_div": "CF", "account_nm": "영업활동현금흐름", "thstrm_amount": "100000000"},
+]
+
+
+MULTI_ACCOUNT_RECORDS = [
+    {"stock_code": "005930", "fs_div": "CFS", "sj_div": r["sj_div"], "account_nm": r["account_nm"],
+     "thstrm_amount": f"{int(r['thstrm_amount']):,}"}
+    for r in FINSTATE_RECORDS
+    if r["sj_div"] != "CF"
+] + [
+    # Separate statements only count when consolidated ones are absent
+    {"stock_code": "005930", "fs_div": "OFS", "sj_div": "BS", "account_nm": "자산총계",
+     "thstrm_amount": "1"},
+    # 000660 is missing most key accounts -> per-company fallback
+    {"stock_code": "000660", "fs_div": "CFS", "sj_div": "BS", "account_nm": "자산총계",
+     "thstrm_amount": "5,000"},
+]
+
+
+def _corp_code_zip() -> bytes:
+    xml = (
+        "<result>"
+        "<list><corp_code>00126380</corp_code><corp_name>삼성전자</corp_name>"
+        "<stock_code>005930</stock_code><modify_date>20240101</modify_date></list>"
+        "<list><corp_code>00164779</corp_code><corp_name>SK하이닉스</corp_name>"
+        "<stock_code>000660</stock_code><modify_date>20240101</modify_date></list>"
+        "<list><corp_code>00999999</corp_code><corp_name>비상장</corp_name>"
+        "<stock_code> </stock_code><modify_date>20240101</modify_date></list>"
+        "</result>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("CORPCODE.xml", xml.encode("utf-8"))
+    return buffer.getvalue()
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/fnlttSinglAcntAll.json"):
+        if request.url.params["corp_code"] == "00000000":
+            return httpx.Response(200, json={"status": "013", "message": "no data"})
+        return httpx.Response(200, json={"status": "000", "list": FINSTATE_RECORDS})
+    if request.url.path.endswith("/fnlttMultiAcnt.json"):
+        return httpx.Response(200, json={"status": "000", "list": MULTI_ACCOUNT_RECORDS})
+    if request.url.path.endswith("/elestock.json"):
+        return httpx.Response(
+            200,
+            json={"status": "000", "list": [{"rcept_no": "20240101000001", "repror": "홍길동"}]},
+        )
+    if request.url.path.endswith("/corpCode.xml"):
+        return httpx.Response(200, content=_corp_code_zip())
+    if request.url.path.endswith("/limited.json"):
+        return httpx.Response(200, json={"status": "020", "message": "rate limit"})
+    return httpx.Response(404)
+
+
+@pytest.fixture
+async def client():
+    """AsyncDartClient backed by a mock transport, without rate limiting"""
+    dart_client_module._corp_code_map.clear()
+    client = AsyncDartClient(api_key="test-key", max_concurrency=4)
+    await client.open()
+    await client._client.aclose()
+    client._client = httpx.AsyncClient(
+        base_url=DART_API_BASE_URL, transport=httpx.MockTransport(_handler)
+    )
+
+    with patch(
+        "app.services.dart_client.dart_rate_limiter.acquire_async", new=AsyncMock()
+    ):
+        yield client
+
+    await client.close()
+    dart_client_module._corp_code_map.clear()
+
+
+class TestAsyncDartClient:
+    """Test async DART endpoints"""
+
+    async def test_fetch_financial_statements(self, client):
+        """Statements are split by sj_div"""
+        statements = await client.fetch_financial_statements("00126380", 2024)
+
+        assert set(statements) == {"BS", "IS", "CF"}
+        assert len(statements["BS"]) == 5
+        assert len(statements["IS"]) == 3
+
+    async def test_fetch_financial_statements_no_data(self, client):
+        """DART status 013 returns None"""
+        assert await client.fetch_financial_statements("00000000", 2024) is None
+
+    async def test_error_status_returns_none(self, client):
+        """Non-OK DART statuses are logged and return None"""
+        assert await client._get_list("/limited.json", {}) is None
+
+    async def test_fetch_insider_trading(self, client):
+        """Ownership reports are returned as a DataFrame"""
+        df = await client.fetch_insider_trading("00126380")
+        assert list(df["rcept_no"]) == ["20240101000001"]
+
+    async def test_get_corp_code(self, client):
+        """Listed companies are mapped, unlisted ones skipped"""
+        assert await client.get_corp_code("005930") == "00126380"
+        assert await client.get_corp_code("999999") is None
+
+
+class TestDartServiceAsync:
+    """Test DartService async helpers on top of the client"""
+
+    async def test_get_financial_metrics(self, client):
+        """Metrics are parsed from async-fetched statements"""
+        service = DartService()
+        service.api_key = "test-key"
+
+        metrics = await service.get_financial_metrics("005930", 2024, client=client)
+
+        assert metrics["roe"] == round(80000000 / 600000000 * 100, 2)
+        assert metrics["debt_ratio"] == round(400000000 / 600000000 * 100, 2)
+
+    async def test_get_financial_metrics_batch(self, client):
+        """Key accounts come from one multi-company call; incomplete ones fall back"""
+        service = DartService()
+        service.api_key = "test-key"
+
+        with patch.object(
+            client, "fetch_statement_rows", wraps=client.fetch_statement_rows
+        ) as finstate:
+            results = await service.get_financial_metrics_batch(
+                ["005930", "000660", "123456"], 2024, client=client
+            )
+
+        assert results["005930"]["roe"] == round(80000000 / 600000000 * 100, 2)
+        assert results["005930"]["roa"] == 8.0
+        assert results["000660"] is not None  # From finstate_all fallback
+        assert results["123456"] is None  # Unknown corp_code
+        finstate.assert_called_once_with("00164779", 2024, "11011")
+
+    async def test_multi_company_amounts_are_numeric(self, client):
+        """Thousands separators are stripped"""
+        df = await client.fetch_multi_company_accounts(["00126380"], 2024)
+        assert df.loc[df["account_nm"] == "자산총계", "thstrm_amount"].max() == 1000000000
+
+    async def test_financial_statements_cached_on_disk(self, client):
+        """A closed reporting period is fetched from DART only once"""
+        service = DartService()
+        service.api_key = "test-key"
+
+        with patch.object(
+            client, "fetch_statement_rows", wraps=client.fetch_statement_rows
+        ) as fetch:
+            first = await service.get_financial_metrics("005930", 2020, client=client)
+            second = await service.get_financial_metrics("005930", 2020, client=client)
+
+        assert first == second
+        fetch.assert_called_once()
+
+    async def test_multi_company_accounts_cached_on_disk(self, client):
+        """Only companies missing from the cache are requested again"""
+        service = DartService()
+        service.api_key = "test-key"
+
+        await service.get_financial_metrics_batch(["005930"], 2020, client=client)
+        with patch.object(
+            client, "fetch_multi_company_accounts", wraps=client.fetch_multi_company_accounts
+        ) as fetch:
+            results = await service.get_financial_metrics_batch(["005930"], 2020, client=client)
+
+        assert results["005930"]["roa"] == 8.0
+        fetch.assert_not_called()
+
+    async def test_get_financial_metrics_without_key(self):
+        """No API key means no request"""
+        service = DartService()
+        service.api_key = ""
+        assert await service.get_financial_metrics("005930") is None
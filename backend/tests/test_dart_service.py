@@ -10,8 +10,11 @@ from app.utils.dart_mappings import (
     calculate_debt_ratio,
     calculate_operating_margin,
     calculate_roa,
+    calculate_metrics_frame,
     calculate_roe,
     extract_account,
+    pivot_accounts,
+    validate_metrics_frame,
 )
 
 
@@ -301,6 +304,110 @@ class TestIntegrationWithMockedAPI:
         # Verify API was called
         mock_instance.list.assert_called()
 
+    @patch("app.services.dart_service.OpenDartReader")
+    def test_single_company_cis_filer(self, mock_reader, mock_dart_data):
+        """Revenue and net income filed under CIS reach the metrics on the fallback path"""
+        cis_only = mock_dart_data.assign(
+            sj_div=mock_dart_data["sj_div"].replace({"IS": "CIS"})
+        )
+        service = DartService()
+        service.dart = Mock()
+        service.dart.finstate_all.return_value = cis_only
+        service._configured = True
+
+        statements = service.fetch_financial_statements("00126380", 2024)
+        metrics = service.parse_financial_metrics(statements)
+
+        assert len(statements["IS"]) == 3
+        assert metrics["roe"] == calculate_roe(80000000, 600000000)
+        assert metrics["operating_margin"] == calculate_operating_margin(120000000, 800000000)
+
+
+class TestVectorizedParsing:
+    """Test single-pass parsing of many companies"""
+
+    @pytest.fixture
+    def multi_company_rows(self, mock_dart_data):
+        """Long-format rows for two companies, one with aliases and OFS duplicates"""
+        first = mock_dart_data.assign(stock_code="005930", fs_div="CFS")
+        second = pd.DataFrame(
+            {
+                "stock_code": ["000660"] * 6,
+                "fs_div": ["CFS", "CFS", "CFS", "CFS", "CFS", "OFS"],
+                "sj_div": ["BS", "BS", "BS", "CIS", "CIS", "BS"],
+                "account_nm": [
+                    "자산 총계",
+                    "자본총계",
+                    "부채총계",
+                    "수익(매출액)",
+                    "당기순이익(손실)",
+                    "유동자산",
+                ],
+                "thstrm_amount": ["2,000", "1,000", "1,000", "500", "-100", "999"],
+            }
+        )
+        return pd.concat([first, second])
+
+    def test_pivot_accounts(self, multi_company_rows):
+        """One row per company, aliases resolved, OFS ignored when CFS exists"""
+        accounts = pivot_accounts(multi_company_rows)
+
+        assert list(accounts.index) == ["000660", "005930"]
+        assert accounts.loc["005930", "total_assets"] == 1000000000
+        assert accounts.loc["000660", "total_assets"] == 2000
+        assert accounts.loc["000660", "revenue"] == 500
+        assert accounts.loc["000660", "net_income"] == -100
+        assert pd.isna(accounts.loc["000660", "current_assets"])
+
+    def test_pivot_accounts_uses_own_statement(self):
+        """Net income is read from the income statement, not the cash flow statement"""
+        rows = pd.DataFrame(
+            {
+                "stock_code": ["005930", "005930"],
+                "sj_div": ["CF", "IS"],
+                "account_nm": ["당기순이익", "당기순이익"],
+                "thstrm_amount": [1, 2],
+            }
+        )
+        assert pivot_accounts(rows).loc["005930", "net_income"] == 2
+
+    def test_metrics_match_scalar_calculations(self, multi_company_rows):
+        """Column operations agree with the per-company helpers"""
+        metrics = calculate_metrics_frame(pivot_accounts(multi_company_rows))
+
+        assert metrics.loc["005930", "roe"] == calculate_roe(80000000, 600000000)
+        assert metrics.loc["005930", "debt_ratio"] == calculate_debt_ratio(
+            400000000, 600000000
+        )
+        assert metrics.loc["000660", "roa"] == -5.0
+        assert pd.isna(metrics.loc["000660", "current_ratio"])
+
+    def test_validate_metrics_frame(self):
+        """Per-row error mask mirrors validate_metrics"""
+        metrics = pd.DataFrame(
+            {
+                "roe": [10.0, 150.0, None],
+                "roa": [5.0, 5.0, 5.0],
+                "operating_margin": [10.0, 10.0, 10.0],
+                "debt_ratio": [50.0, -1.0, 50.0],
+                "current_ratio": [120.0, 120.0, 120.0],
+            }
+        )
+        mask = validate_metrics_frame(metrics)
+
+        assert list(~mask.any(axis=1)) == [True, False, False]
+        assert mask.loc[1, "invalid_roe"] and mask.loc[1, "invalid_debt_ratio"]
+        assert mask.loc[2, "missing_roe"]
+
+    def test_parse_financial_metrics_frame(self, multi_company_rows):
+        """Completeness and validity are flagged per company"""
+        service = DartService()
+        metrics = service.parse_financial_metrics_frame(multi_company_rows)
+
+        assert metrics.loc["005930", "complete"]
+        assert metrics.loc["005930", "is_valid"]
+        assert not metrics.loc["000660", "complete"]
+
 
 @pytest.mark.parametrize(
     "input_value,expected",
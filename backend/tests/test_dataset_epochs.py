@@ -0,0 +1,190 @@
+"""Unit tests for dataset epoch counters"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.dataset_version import DatasetVersion
+from app.services import dataset_epochs
+from app.services.dataset_epochs import (
+    EPOCHS_KEY,
+    PRICES,
+    VALUE_SCORES,
+    DatasetEpochs,
+    version_token,
+)
+
+
+class FakeRedis:
+    """Dict-backed hash store that runs the set-max script in Python"""
+
+    def __init__(self):
+        self.data = {}
+
+    def hmget(self, key, fields):
+        return [self.data.get(key, {}).get(field) for field in fields]
+
+    def eval(self, script, numkeys, key, *args):
+        assert script == dataset_epochs._SET_MAX_SCRIPT and numkeys == 1
+        stored = self.data.setdefault(key, {})
+        for field, value in zip(args[::2], args[1::2]):
+            if int(value) > int(stored.get(field, -1)):
+                stored[field] = str(value)
+        return 1
+
+    def hdel(self, key, *fields):
+        stored = self.data.get(key, {})
+        return sum(stored.pop(field, None) is not None for field in fields)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(dataset_epochs, "_redis_down_until", 0.0)
+    with patch.object(dataset_epochs, "get_redis", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory SQLite with a seeded prices row (value_scores left unseeded)"""
+    engine = create_engine("sqlite:///:memory:")
+    DatasetVersion.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(DatasetVersion(dataset=PRICES, epoch=0))
+        db.commit()
+    return factory
+
+
+class TestBump:
+    """Test advancing epochs"""
+
+    def test_increments_existing_row(self, session_factory, fake_redis):
+        """Each bump moves the seeded counter forward by one"""
+        with session_factory() as db:
+            assert DatasetEpochs(db).bump(PRICES) == {PRICES: 1}
+            assert DatasetEpochs(db).bump(PRICES) == {PRICES: 2}
+            db.commit()
+
+    def test_inserts_missing_row(self, session_factory, fake_redis):
+        """A dataset without a row starts at epoch 1"""
+        with session_factory() as db:
+            assert DatasetEpochs(db).bump(VALUE_SCORES) == {VALUE_SCORES: 1}
+            db.commit()
+            assert db.get(DatasetVersion, VALUE_SCORES).epoch == 1
+
+    def test_unknown_dataset(self, session_factory):
+        """Typos fail loudly instead of creating a stray counter"""
+        with session_factory() as db:
+            with pytest.raises(ValueError):
+                DatasetEpochs(db).bump("valuescores")
+
+    def test_published_after_commit(self, session_factory, fake_redis):
+        """Redis sees the new epoch only once the transaction commits"""
+        with session_factory() as db:
+            DatasetEpochs(db).bump(PRICES)
+            assert fake_redis.hmget(EPOCHS_KEY, [PRICES]) == [None]
+
+            db.commit()
+
+        assert fake_redis.hmget(EPOCHS_KEY, [PRICES]) == ["1"]
+
+    def test_rollback_discards(self, session_factory, fake_redis):
+        """A rolled-back bump is neither stored nor published"""
+        with session_factory() as db:
+            DatasetEpochs(db).bump(PRICES)
+            db.rollback()
+            db.commit()
+
+            assert db.get(DatasetVersion, PRICES).epoch == 0
+        assert fake_redis.hmget(EPOCHS_KEY, [PRICES]) == [None]
+
+    def test_publish_never_moves_backwards(self, fake_redis):
+        """A late commit of an older epoch keeps the newer value"""
+        dataset_epochs._publish({PRICES: 5})
+        dataset_epochs._publish({PRICES: 3})
+
+        assert fake_redis.hmget(EPOCHS_KEY, [PRICES]) == ["5"]
+
+    def test_publish_failure_keeps_commit(self, session_factory, monkeypatch):
+        """A Redis outage after commit is logged; the database keeps the bump"""
+        failing = MagicMock()
+        failing.eval.side_effect = redis.ConnectionError("refused")
+        monkeypatch.setattr(dataset_epochs, "_redis_down_until", 0.0)
+
+        with patch.object(dataset_epochs, "get_redis", return_value=failing):
+            with session_factory() as db:
+                DatasetEpochs(db).bump(PRICES)
+                db.commit()
+                assert db.get(DatasetVersion, PRICES).epoch == 1
+
+    def test_publish_failure_falls_back_to_database(self, session_factory, fake_redis, monkeypatch):
+        """A failed publish never leaves readers on the stale Redis epoch"""
+        with session_factory() as db:
+            DatasetEpochs(db).current(PRICES)  # Seeds Redis with epoch 0
+
+            with patch.object(fake_redis, "eval", side_effect=redis.TimeoutError("timed out")):
+                DatasetEpochs(db).bump(PRICES)
+                db.commit()
+
+            # During the backoff, from the database
+            assert DatasetEpochs(db).current(PRICES) == {PRICES: 1}
+
+            # After it, the stale field is gone, so Redis is re-seeded
+            monkeypatch.setattr(dataset_epochs, "_redis_down_until", 0.0)
+            assert DatasetEpochs(db).current(PRICES) == {PRICES: 1}
+
+        assert fake_redis.hmget(EPOCHS_KEY, [PRICES]) == ["1"]
+
+
+class TestCurrent:
+    """Test reading epochs"""
+
+    def test_reads_redis_without_database(self, session_factory, fake_redis, query_budget):
+        """Published epochs are served from Redis alone"""
+        with session_factory() as db:
+            DatasetEpochs(db).bump(PRICES, VALUE_SCORES)
+            db.commit()
+
+            with query_budget(0):
+                assert DatasetEpochs(db).current(PRICES, VALUE_SCORES) == {
+                    PRICES: 1,
+                    VALUE_SCORES: 1,
+                }
+
+    def test_missing_key_falls_back_and_reseeds(self, session_factory, fake_redis):
+        """An empty Redis is filled from the database on first read"""
+        with session_factory() as db:
+            epochs = DatasetEpochs(db).current()
+
+        assert epochs[PRICES] == 0
+        assert epochs[VALUE_SCORES] == 0
+        assert fake_redis.hmget(EPOCHS_KEY, [PRICES, VALUE_SCORES]) == ["0", "0"]
+
+    def test_redis_outage_backs_off(self, session_factory, monkeypatch):
+        """A connection error reads the database and skips Redis for a while"""
+        failing = MagicMock()
+        failing.hmget.side_effect = redis.ConnectionError("refused")
+        monkeypatch.setattr(dataset_epochs, "_redis_down_until", 0.0)
+
+        with patch.object(dataset_epochs, "get_redis", return_value=failing):
+            with session_factory() as db:
+                assert DatasetEpochs(db).current(PRICES) == {PRICES: 0}
+                assert DatasetEpochs(db).current(PRICES) == {PRICES: 0}
+
+        assert failing.hmget.call_count == 1
+
+
+class TestVersionToken:
+    """Test cache-key tokens"""
+
+    def test_sorted_and_stable(self):
+        """Argument order does not change the token"""
+        assert version_token({VALUE_SCORES: 42, PRICES: 17}) == "prices.17-value_scores.42"
+        assert version_token({PRICES: 17, VALUE_SCORES: 42}) == version_token(
+            {VALUE_SCORES: 42, PRICES: 17}
+        )
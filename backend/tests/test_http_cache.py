@@ -0,0 +1,153 @@
+"""Unit tests for ETag / If-None-Match on read-heavy routes"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.http_cache import ConditionalGet, etag_matches
+from app.db.database import get_async_db, get_db
+from app.main import app
+from app.services import dataset_epochs, leaderboard_service
+from app.services.dataset_epochs import EPOCHS_KEY
+
+
+class FakeRedis:
+    """Epoch hash only; tests set versions directly"""
+
+    def __init__(self):
+        self.data = {EPOCHS_KEY: {name: "1" for name in dataset_epochs.DATASETS}}
+
+    def hmget(self, key, fields):
+        return [self.data.get(key, {}).get(field) for field in fields]
+
+    def bump(self, dataset):
+        epochs = self.data[EPOCHS_KEY]
+        epochs[dataset] = str(int(epochs[dataset]) + 1)
+
+
+@pytest.fixture
+def epochs(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(dataset_epochs, "_redis_down_until", 0.0)
+    # Serve top picks from SQL so the read path does touch the database
+    monkeypatch.setattr(leaderboard_service, "_redis_down_until", float("inf"))
+    with patch.object(dataset_epochs, "get_redis", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def client(synthetic_db, async_db_override):
+    def override_get_db():
+        db = synthetic_db()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = async_db_override(synthetic_db.kw["bind"])
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+def _queries(response) -> int:
+    description = response.headers["server-timing"].split('desc="')[1]
+    return int(description.split()[0])
+
+
+class TestEtagMatches:
+    """Test If-None-Match parsing"""
+
+    def test_weak_comparison(self):
+        """Strong and weak forms of the same tag match"""
+        assert etag_matches('"prices.1"', 'W/"prices.1"')
+        assert etag_matches('W/"prices.1"', 'W/"prices.1"')
+
+    def test_list_and_wildcard(self):
+        """Any tag in a list matches, and * matches everything"""
+        assert etag_matches('W/"a", W/"prices.1"', 'W/"prices.1"')
+        assert etag_matches("*", 'W/"prices.1"')
+        assert not etag_matches('W/"prices.2"', 'W/"prices.1"')
+        assert not etag_matches(None, 'W/"prices.1"')
+
+    def test_unknown_dataset(self):
+        """Misspelled datasets fail at import time, not on the first request"""
+        with pytest.raises(ValueError):
+            ConditionalGet("valuescores")
+
+
+class TestConditionalGet:
+    """Test 304 handling on the stock, screener and backtest analytics routes"""
+
+    def test_top_picks_not_modified(self, client, epochs):
+        """A matching If-None-Match gets 304 without any SQL query"""
+        first = client.get("/api/v1/stocks/top-picks")
+        assert first.status_code == 200
+        assert _queries(first) > 0
+
+        repeat = client.get(
+            "/api/v1/stocks/top-picks", headers={"If-None-Match": first.headers["etag"]}
+        )
+
+        assert repeat.status_code == 304
+        assert repeat.content == b""
+        assert repeat.headers["etag"] == first.headers["etag"]
+        assert repeat.headers["cache-control"] == first.headers["cache-control"]
+        assert _queries(repeat) == 0
+
+    def test_cache_control_for_cdn(self, client, epochs):
+        """GET responses are public with a shared-cache lifetime"""
+        response = client.get("/api/v1/stocks/top-picks")
+
+        assert response.headers["cache-control"].startswith("public")
+        assert "s-maxage=" in response.headers["cache-control"]
+        assert response.headers["etag"].startswith('W/"')
+
+    def test_new_scores_change_etag(self, client, epochs):
+        """A scoring run invalidates the tag and the full response comes back"""
+        etag = client.get("/api/v1/stocks/top-picks").headers["etag"]
+        epochs.bump(dataset_epochs.VALUE_SCORES)
+
+        response = client.get("/api/v1/stocks/top-picks", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_stock_detail_not_modified(self, client, epochs):
+        """Detail pages revalidate against the insider dataset as well"""
+        code = client.get("/api/v1/stocks/top-picks").json()["data"][0]["stock_code"]
+        url = f"/api/v1/stocks/{code}"
+        etag = client.get(url).headers["etag"]
+
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        epochs.bump(dataset_epochs.INSIDER)
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+    def test_screener_etag_covers_body(self, client, epochs):
+        """Different filters get different tags; POST is never answered with 304"""
+        cheap = {"filters": {"PER_max": 10}, "limit": 20}
+        profitable = {"filters": {"ROE_min": 15}, "limit": 20}
+        first = client.post("/api/v1/screener", json=cheap)
+
+        assert first.headers["cache-control"].startswith("private")
+        other = client.post("/api/v1/screener", json=profitable)
+        assert other.headers["etag"] != first.headers["etag"]
+        repeat = client.post(
+            "/api/v1/screener", json=cheap, headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert repeat.status_code == 200
+        assert repeat.headers["etag"] == first.headers["etag"]
+        assert repeat.json()["results"] == first.json()["results"]
+
+    def test_analytics_ignore_scoring(self, client, epochs):
+        """Backtest analytics only revalidate when backtest runs change"""
+        url = "/api/v1/api/backtest/analytics/summary"
+        etag = client.get(url).headers["etag"]
+
+        epochs.bump(dataset_epochs.VALUE_SCORES)
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        epochs.bump(dataset_epochs.BACKTESTS)
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,158 @@
+"""Unit tests for precomputed insider trading signals"""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.dataset_version import DatasetVersion
+from app.models.insider_signal import InsiderSignal
+from app.models.insider_trading import InsiderTrading
+from app.models.stock import Stock
+from app.services.insider_signal_service import (
+    InsiderSignalService,
+    compute_insider_signals,
+)
+
+AS_OF = date(2024, 6, 30)
+
+
+def _filing(stock_code, rcept_no, days_ago, repror, change, rate=None):
+    return InsiderTrading(
+        stock_code=stock_code,
+        rcept_no=rcept_no,
+        rcept_dt=AS_OF - timedelta(days=days_ago),
+        corp_code="00000000",
+        repror=repror,
+        sp_stock_lmp_irds_cnt=change,
+        sp_stock_lmp_rate=rate,
+    )
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with stocks, filings, signals and dataset epochs"""
+    engine = create_engine("sqlite:///:memory:")
+    for model in (Stock, InsiderTrading, InsiderSignal, DatasetVersion):
+        model.__table__.create(engine)
+
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            Stock(code="005930", name="삼성전자", market="KOSPI"),
+            Stock(code="000660", name="SK하이닉스", market="KOSPI"),
+            Stock(code="035720", name="카카오", market="KOSDAQ"),
+            # 005930: two buyers within 90 days, one old sale
+            _filing("005930", "1", 10, "홍길동", 1000, 1.5),
+            _filing("005930", "2", 60, "김철수", 500, 3.0),
+            _filing("005930", "3", 150, "김철수", -300, 2.5),
+            _filing("005930", "4", 400, "이영희", 99999),  # Outside lookback
+            # 000660: one buyer
+            _filing("000660", "5", 20, "박민수", 2000, 0.5),
+            # 035720: net selling
+            _filing("035720", "6", 5, "최지우", -100),
+            DatasetVersion(dataset="insider", epoch=0),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestComputeSignals:
+    """Test vectorized aggregation"""
+
+    def test_windows_and_counts(self):
+        """Net shares are summed per rolling window"""
+        filings = pd.DataFrame(
+            {
+                "stock_code": ["A", "A", "A"],
+                "rcept_no": ["1", "2", "3"],
+                "rcept_dt": [AS_OF - timedelta(days=d) for d in (10, 60, 150)],
+                "repror": ["x", "y", "y"],
+                "sp_stock_lmp_irds_cnt": [1000, 500, -300],
+                "sp_stock_lmp_rate": [1.5, 3.0, 2.5],
+            }
+        )
+        signal = compute_insider_signals(filings, AS_OF).loc["A"]
+
+        assert signal["net_shares_30d"] == 1000
+        assert signal["net_shares_90d"] == 1500
+        assert signal["net_shares_180d"] == 1200
+        assert signal["buy_count"] == 2
+        assert signal["sell_count"] == 1
+        assert signal["distinct_buyers_90d"] == 2
+        assert signal["recent_trend"] == "매수우세"
+
+    def test_largest_holder_uses_latest_filing(self):
+        """A reporter's most recent holding rate counts, not their historical peak"""
+        filings = pd.DataFrame(
+            {
+                "stock_code": ["A", "A", "A"],
+                "rcept_no": ["1", "2", "3"],
+                "rcept_dt": [AS_OF - timedelta(days=d) for d in (100, 10, 50)],
+                "repror": ["x", "x", "y"],
+                "sp_stock_lmp_irds_cnt": [0, -100, 0],
+                "sp_stock_lmp_rate": [9.0, 1.0, 5.0],
+            }
+        )
+        signal = compute_insider_signals(filings, AS_OF).loc["A"]
+
+        assert signal["largest_holder"] == "y"
+        assert signal["largest_holding_rate"] == 5.0
+
+
+class TestInsiderSignalService:
+    """Test refresh and reads against the database"""
+
+    def test_refresh_all(self, db):
+        """One signal row per stock with filings in the lookback window"""
+        assert InsiderSignalService(db).refresh(as_of=AS_OF) == 3
+        db.commit()
+
+        signal = InsiderSignalService(db).get_signal("005930")
+        assert signal.net_shares_180d == 1200
+        assert signal.last_rcept_dt == AS_OF - timedelta(days=10)
+        assert signal.largest_holder == "김철수"
+
+    def test_refresh_single_stock(self, db):
+        """Refreshing one stock leaves the others untouched"""
+        service = InsiderSignalService(db)
+        service.refresh(as_of=AS_OF)
+        db.add(_filing("000660", "7", 1, "박민수", 3000))
+        service.refresh(["000660"], as_of=AS_OF)
+        db.commit()
+
+        assert service.get_signal("000660").net_shares_30d == 5000
+        assert service.get_signal("005930").net_shares_30d == 1000
+
+    def test_top_buying_ranking(self, db):
+        """Net buyers only, ordered by distinct buyers then net shares"""
+        service = InsiderSignalService(db)
+        service.refresh(as_of=AS_OF)
+        db.commit()
+
+        ranked = [stock.code for _, stock in service.get_top_buying()]
+        assert ranked == ["005930", "000660"]
+        assert service.get_top_buying(market="KOSDAQ") == []
+
+
+class TestQueryBudget:
+    """Guard the hot insider signal paths against query-per-stock regressions"""
+
+    def test_refresh_budget(self, db, query_budget):
+        """Refreshing all stocks is one read, one delete, one bulk insert and the epoch bump"""
+        with query_budget(4):
+            InsiderSignalService(db).refresh(as_of=AS_OF)
+
+    def test_top_buying_budget(self, db, query_budget):
+        """The ranking loads signals and stocks in a single joined query"""
+        service = InsiderSignalService(db)
+        service.refresh(as_of=AS_OF)
+        db.commit()
+
+        with query_budget(1):
+            for signal, stock in service.get_top_buying(limit=10):
+                assert stock.name and signal.net_shares_90d > 0
@@ -0,0 +1,138 @@
+"""Unit tests for insider trading ingestion"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.insider_trading import InsiderTrading
+from app.models.stock import Stock
+from app.tasks.insider_tasks import (
+    _build_insider_rows,
+    _parse_decimal,
+    _parse_int,
+    save_insider_filings,
+)
+
+
+def _filing(rcept_no: str, rcept_dt: str, change: str = "1,000") -> dict:
+    return {
+        "rcept_no": rcept_no,
+        "rcept_dt": rcept_dt,
+        "corp_code": "00126380",
+        "corp_name": "삼성전자",
+        "repror": "홍길동",
+        "isu_exctv_rgist_at": "등기임원",
+        "isu_exctv_ofcps": "이사",
+        "isu_main_shrholdr": "-",
+        "sp_stock_lmp_cnt": "10,000",
+        "sp_stock_lmp_irds_cnt": change,
+        "sp_stock_lmp_rate": "0.01",
+        "sp_stock_lmp_irds_rate": "-",
+    }
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with only the tables insider ingestion needs"""
+    engine = create_engine("sqlite:///:memory:")
+    Stock.__table__.create(engine)
+    InsiderTrading.__table__.create(engine)
+
+    session = sessionmaker(bind=engine)()
+    session.add(Stock(code="005930", name="삼성전자", market="KOSPI"))
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestParsing:
+    """Test column-wise parsing"""
+
+    def test_parse_int(self):
+        """Commas stripped, fractions truncated, blanks and '-' become NA"""
+        result = _parse_int(pd.Series(["1,234", "-5.7", "-", "", None]))
+        assert result.tolist()[:2] == [1234, -5]
+        assert result.isna().tolist() == [False, False, True, True, True]
+
+    def test_parse_decimal(self):
+        """Decimals keep precision"""
+        result = _parse_decimal(pd.Series(["0.35", "1,000.5", "-"]))
+        assert result.tolist()[:2] == [0.35, 1000.5]
+        assert pd.isna(result.iloc[2])
+
+    def test_build_rows_filters_old_and_invalid(self):
+        """Only filings since the cutoff with a receipt number are kept"""
+        df = pd.DataFrame(
+            [
+                _filing("20240101000001", "20240101"),
+                _filing("20240301000001", "20240301"),
+                _filing("", "20240301"),
+            ]
+        )
+        rows = _build_insider_rows(df, "005930", since=date(2024, 2, 1))
+
+        assert [r["rcept_no"] for r in rows] == ["20240301000001"]
+        assert rows[0]["sp_stock_lmp_irds_cnt"] == 1000
+        assert rows[0]["sp_stock_lmp_irds_rate"] is None
+        assert rows[0]["rcept_dt"] == date(2024, 3, 1)
+
+
+    def test_bad_rcept_dt_falls_back_to_receipt_number(self, caplog):
+        """A malformed date is taken from the receipt number; undatable filings are logged"""
+        df = pd.DataFrame(
+            [_filing("20240302000001", "bad"), _filing("20240303000001", None), _filing("X1", "bad")]
+        )
+
+        rows = _build_insider_rows(df, "005930")
+
+        assert [(r["rcept_no"], r["rcept_dt"]) for r in rows] == [
+            ("20240302000001", date(2024, 3, 2)),
+            ("20240303000001", date(2024, 3, 3)),
+        ]
+        assert "Dropped 1 insider filings for 005930" in caplog.text
+
+
+class TestIncrementalIngestion:
+    """Test bulk insert with rcept_no deduplication"""
+
+    def test_first_run_inserts_all(self, db):
+        """All filings are inserted when nothing is stored yet"""
+        df = pd.DataFrame(
+            [_filing("20240101000001", "20240101"), _filing("20240301000001", "20240301")]
+        )
+
+        counts = save_insider_filings(db, "005930", df)
+        db.commit()
+
+        assert counts == {"inserted": 2, "skipped": 0}
+        assert db.query(InsiderTrading).count() == 2
+
+    def test_rerun_inserts_only_new_filings(self, db):
+        """Existing rcept_no values are skipped without per-row queries"""
+        save_insider_filings(db, "005930", pd.DataFrame([_filing("20240301000001", "20240301")]))
+        db.commit()
+
+        statements = []
+        event.listen(
+            db.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        df = pd.DataFrame(
+            [
+                _filing("20240101000001", "20240101"),  # Older than latest stored
+                _filing("20240301000001", "20240301"),  # Already stored
+                _filing("20240301000002", "20240301"),  # Same day, new
+            ]
+        )
+        counts = save_insider_filings(db, "005930", df)
+        executed = len(statements)
+        db.commit()
+
+        assert counts["inserted"] == 1
+        assert executed == 2  # max(rcept_dt) + one INSERT
+        assert db.query(InsiderTrading).count() == 2
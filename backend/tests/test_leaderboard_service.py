@@ -0,0 +1,311 @@
+"""Unit tests for the Redis top-pick leaderboards"""
+
+import shutil
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+import redis
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import get_db
+from app.api.stocks import get_top_picks
+from app.main import app
+from app.models.stock import Stock
+from app.models.value_score import ValueScore
+from app.services import data_collector, dataset_epochs, leaderboard_service
+from app.services.data_collector import DataCollector
+from app.services.leaderboard_service import LATEST_KEY, LeaderboardService
+
+
+class FakePipeline:
+    """Queues calls and runs them on execute(), like a redis-py pipeline"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+        return lambda *args, **kwargs: self.calls.append((method, args, kwargs))
+
+    def execute(self):
+        return [method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """Dict-backed subset of the redis-py string/hash/sorted-set API"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttl = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def expire(self, key, seconds):
+        if key in self.data:
+            self.ttl[key] = seconds
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def hmget(self, key, fields):
+        return [self.data.get(key, {}).get(field) for field in fields]
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def _ranked(self, key):
+        members = self.data.get(key, {})
+        return sorted(members, key=lambda m: (members[m], m), reverse=True)
+
+    def zrevrange(self, key, start, end):
+        return self._ranked(key)[start : end + 1]
+
+    def zcard(self, key):
+        return len(self.data.get(key, {}))
+
+    def zcount(self, key, low, high):
+        assert low.startswith("(") and high == "+inf"
+        return sum(score > float(low[1:]) for score in self.data.get(key, {}).values())
+
+    def zscore(self, key, member):
+        return self.data.get(key, {}).get(member)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(leaderboard_service, "_redis_down_until", 0.0)
+    with patch.object(leaderboard_service, "get_redis", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def published(synthetic_db, fake_redis):
+    with synthetic_db() as db:
+        result = LeaderboardService(db).publish()
+    assert result["status"] == "success"
+    return result
+
+
+@pytest.fixture
+def client(synthetic_db):
+    def override_get_db():
+        db = synthetic_db()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+class TestPublish:
+    """Test building leaderboards from the latest scores"""
+
+    def test_publishes_latest_date(self, published, fake_redis, synthetic_spec):
+        """The pointer names the latest scoring date and every stock is ranked"""
+        assert fake_redis.get(LATEST_KEY) == synthetic_spec.end_date.isoformat()
+        assert published["stocks"] == synthetic_spec.stocks
+
+    def test_market_boards_partition_all(self, published, fake_redis):
+        """KOSPI and KOSDAQ boards together hold exactly the ALL board"""
+        day = published["date"]
+        kospi = fake_redis.data[f"valuehunt:leaderboard:{day}:KOSPI:total"]
+        kosdaq = fake_redis.data[f"valuehunt:leaderboard:{day}:KOSDAQ:total"]
+        everyone = fake_redis.data[f"valuehunt:leaderboard:{day}:ALL:total"]
+
+        assert set(kospi) | set(kosdaq) == set(everyone)
+        assert not set(kospi) & set(kosdaq)
+
+    def test_newer_date_expires_previous(self, synthetic_db, fake_redis, synthetic_spec):
+        """Moving the pointer forward leaves the old ranking to expire"""
+        older = synthetic_spec.end_date - timedelta(days=1)
+        with synthetic_db() as db:
+            service = LeaderboardService(db)
+            service.publish(score_date=older)
+            service.publish()
+
+        assert fake_redis.get(LATEST_KEY) == synthetic_spec.end_date.isoformat()
+        assert f"valuehunt:leaderboard:{older.isoformat()}:cards" in fake_redis.ttl
+
+    def test_backfill_does_not_move_pointer(self, published, synthetic_db, fake_redis):
+        """Publishing an older date keeps readers on the newest one"""
+        older = published["date"]
+        with synthetic_db() as db:
+            latest = db.query(ValueScore.date).order_by(ValueScore.date).first()[0]
+            LeaderboardService(db).publish(score_date=latest)
+
+        assert fake_redis.get(LATEST_KEY) == older
+
+
+class TestRead:
+    """Test leaderboard reads"""
+
+    def test_top_picks_sorted_by_category(self, published):
+        """Cards come back in descending category score"""
+        items, total, _ = LeaderboardService().top_picks(category="dividend", limit=50)
+
+        scores = [item.category_scores.dividend for item in items]
+        assert scores == sorted(scores, reverse=True)
+        assert total == published["stocks"]
+
+    def test_offset_pages_continue(self, published):
+        """A second page picks up where the first stopped"""
+        service = LeaderboardService()
+        first, _, _ = service.top_picks(limit=10)
+        second, _, _ = service.top_picks(limit=10, offset=10)
+        both, _, _ = service.top_picks(limit=20)
+
+        assert [i.stock_code for i in first + second] == [i.stock_code for i in both]
+        assert second[0].rank == 11
+
+    def test_rank_matches_position(self, published):
+        """rank() agrees with the position in top_picks()"""
+        service = LeaderboardService()
+        items, _, _ = service.top_picks(market="KOSPI", category="valuation", limit=20)
+        pick = items[7]
+
+        ranked = service.rank(pick.stock_code, "KOSPI", "valuation")
+
+        # Ties share the best position among them
+        first_tied = next(
+            i for i in items if i.category_scores.valuation == pick.category_scores.valuation
+        )
+        assert ranked["rank"] == first_tied.rank
+        assert ranked["score"] == pytest.approx(float(pick.category_scores.valuation))
+
+    def test_reads_do_not_query_database(self, published, query_budget):
+        """Top picks and ranks are served from Redis alone"""
+        service = LeaderboardService()
+        with query_budget(0):
+            items, _, _ = service.top_picks(limit=20)
+            service.rank(items[0].stock_code)
+
+    def test_unpublished_returns_none(self, fake_redis):
+        """Without a pointer the caller falls back to SQL"""
+        assert LeaderboardService().top_picks() is None
+        assert LeaderboardService().rank("005930") is None
+
+    def test_redis_outage_backs_off(self, monkeypatch):
+        """A connection error skips Redis for a while instead of failing requests"""
+        failing = MagicMock()
+        failing.get.side_effect = redis.ConnectionError("refused")
+        monkeypatch.setattr(leaderboard_service, "_redis_down_until", 0.0)
+
+        with patch.object(leaderboard_service, "get_redis", return_value=failing):
+            assert LeaderboardService().top_picks() is None
+            assert LeaderboardService().top_picks() is None
+
+        assert failing.get.call_count == 1
+
+
+class TestRefreshCards:
+    """Test keeping card prices current between scoring runs"""
+
+    @pytest.fixture
+    def db(self, synthetic_db, fake_redis, tmp_path):
+        """Writable copy of the synthetic universe with published leaderboards"""
+        path = tmp_path / "universe.db"
+        shutil.copyfile(synthetic_db.kw["bind"].url.database, path)
+        engine = create_engine(f"sqlite:///{path}")
+        with patch.object(dataset_epochs, "get_redis", side_effect=redis.ConnectionError("down")):
+            with sessionmaker(bind=engine)() as session:
+                LeaderboardService(session).publish()
+                yield session
+        engine.dispose()
+
+    def test_collected_prices_reach_top_picks(self, db):
+        """Top picks from Redis show the prices collected after publishing"""
+        code = get_top_picks(market=None, limit=10, offset=0, category=None, db=db).data[0].stock_code
+        daily = pd.DataFrame({"Close": [1000, 1100]})
+
+        with patch.object(data_collector.fdr, "DataReader", return_value=daily), patch.object(
+            data_collector, "fdr_rate_limiter", MagicMock()
+        ):
+            DataCollector(db).collect_all_stock_prices(stock_codes=[code])
+
+        card = get_top_picks(market=None, limit=10, offset=0, category=None, db=db).data[0]
+        assert (card.stock_code, card.current_price, float(card.change_rate)) == (code, 1100, 10.0)
+
+    def test_only_named_cards_rewritten(self, db, fake_redis):
+        """Other cards, and codes without a card, are left alone"""
+        items, _, _ = LeaderboardService().top_picks(limit=10)
+        first, second = items[0].stock_code, items[1].stock_code
+        db.get(Stock, first).current_price = 1
+        db.get(Stock, second).current_price = 2
+
+        assert LeaderboardService(db).refresh_cards([first, "999999"]) == 1
+
+        refreshed = {item.stock_code: item for item in LeaderboardService().top_picks(limit=10)[0]}
+        assert refreshed[first].current_price == 1
+        assert refreshed[second].current_price == items[1].current_price
+
+    def test_unpublished_is_noop(self, fake_redis, synthetic_db):
+        """Nothing to refresh before the first publish"""
+        with synthetic_db() as db:
+            assert LeaderboardService(db).refresh_cards() == 0
+
+
+class TestTopPicksApi:
+    """Test the top-picks and rank routes on both read paths"""
+
+    def test_leaderboard_matches_sql(self, client, fake_redis, synthetic_db):
+        """The published ranking returns the same cards as the SQL query"""
+        params = {"market": "KOSDAQ", "category": "profitability", "limit": 30, "offset": 5}
+        from_sql = client.get("/api/v1/stocks/top-picks", params=params).json()
+        with synthetic_db() as db:
+            LeaderboardService(db).publish()
+        from_redis = client.get("/api/v1/stocks/top-picks", params=params).json()
+
+        assert from_redis["total_count"] == from_sql["total_count"]
+        assert from_redis["updated_at"] == from_sql["updated_at"]
+        # Scores tie often; order within a tie is not defined on either path
+        assert [i["category_scores"]["profitability"] for i in from_redis["data"]] == [
+            i["category_scores"]["profitability"] for i in from_sql["data"]
+        ]
+        sql_cards = {i["stock_code"]: i for i in from_sql["data"]}
+        for item in from_redis["data"]:
+            if item["stock_code"] in sql_cards:
+                expected = sql_cards[item["stock_code"]]
+                assert {**item, "rank": None} == {**expected, "rank": None}
+        assert from_redis["data"][0]["rank"] == 6
+
+    def test_rank_route(self, client, fake_redis, synthetic_db):
+        """The rank route answers from SQL or Redis with the same score"""
+        code = client.get("/api/v1/stocks/top-picks").json()["data"][0]["stock_code"]
+
+        from_sql = client.get(f"/api/v1/stocks/{code}/rank").json()
+        with synthetic_db() as db:
+            LeaderboardService(db).publish()
+        from_redis = client.get(f"/api/v1/stocks/{code}/rank").json()
+
+        assert from_sql["rank"] == from_redis["rank"] == 1
+        assert from_sql["score"] == pytest.approx(from_redis["score"])
+        assert from_sql["total_count"] == from_redis["total_count"]
+
+    def test_rank_unknown_stock(self, client, fake_redis):
+        """Unranked codes are 404"""
+        response = client.get("/api/v1/stocks/999999/rank")
+
+        assert response.status_code == 404
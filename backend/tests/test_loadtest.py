@@ -0,0 +1,123 @@
+"""Unit tests for the load-test Gemini stand-in and sweep analysis"""
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.schemas.ai import StockAnalysisRequest, StrategyRequest, StrategyType
+from app.services.ai_service import AIService
+from loadtest.fake_gemini import create_app, reply_for
+from loadtest.sweep import saturation, summarize
+
+
+def _generate(client: TestClient, prompt: str):
+    return client.post(
+        "/v1beta/models/gemini-2.5-flash:generateContent",
+        json={"contents": [{"role": "user", "parts": [{"text": prompt}]}]},
+    )
+
+
+def _history(steps):
+    """Stats history rows for (users, seconds, requests, p99) steps on one endpoint"""
+    rows = []
+    timestamp, total = 1000, 0
+    for users, seconds, requests, p99 in steps:
+        for second in range(seconds + 1):
+            count = total + requests * second // seconds
+            for name in ("/api/v1/stocks/top-picks", "Aggregated"):
+                rows.append(
+                    {
+                        "Timestamp": timestamp + second,
+                        "User Count": users,
+                        "Type": "GET" if name != "Aggregated" else None,
+                        "Name": name,
+                        "50%": 10,
+                        "99%": p99,
+                        "Total Request Count": count,
+                        "Total Failure Count": 0,
+                    }
+                )
+        timestamp += seconds + 1
+        total += requests
+    return pd.DataFrame(rows)
+
+
+class TestFakeGemini:
+    """Test the Gemini stand-in"""
+
+    def test_analysis_reply_parses(self):
+        """Analysis prompts get JSON the service parses without falling back"""
+        service = AIService()
+        prompt = service._build_stock_analysis_prompt(
+            StockAnalysisRequest(stockCode="005930", stockName="삼성전자")
+        )
+
+        result = service._parse_stock_analysis(reply_for(prompt))
+
+        assert "005930" in result.summary
+        assert result.strengths != ["분석 데이터 처리 중"]
+
+    def test_strategy_reply_parses(self):
+        """Strategy prompts get valid recommendations"""
+        service = AIService()
+        request = StrategyRequest(strategyType=StrategyType.UNDERVALUED_SCREENER)
+        prompt = service._build_strategy_prompt(request)
+
+        result = service._parse_strategy_response(reply_for(prompt), request.strategyType)
+
+        assert len(result.recommendations) == 10
+        assert result.recommendations[0].stockCode
+
+    def test_generate_content_shape(self):
+        """Responses follow the REST generateContent schema"""
+        client = TestClient(create_app(latency_ms=0, latency_sigma=0))
+
+        response = _generate(client, "ROE가 뭔가요?")
+
+        assert response.status_code == 200
+        candidate = response.json()["candidates"][0]
+        assert candidate["finishReason"] == "STOP"
+        assert candidate["content"]["parts"][0]["text"]
+
+    def test_error_rate(self):
+        """Injected errors look like quota exhaustion"""
+        client = TestClient(create_app(latency_ms=0, latency_sigma=0, error_rate=1.0))
+
+        response = _generate(client, "ROE가 뭔가요?")
+
+        assert response.status_code == 429
+        assert response.json()["error"]["status"] == "RESOURCE_EXHAUSTED"
+
+
+class TestSweepAnalysis:
+    """Test reduction of Locust stats history"""
+
+    def test_summarize_per_step(self):
+        """Each held user count becomes one row with its own throughput"""
+        summary = summarize(_history([(10, 10, 100, 50), (20, 10, 200, 80)]))
+        top_picks = summary[summary["name"] == "GET /api/v1/stocks/top-picks"]
+
+        assert top_picks["users"].tolist() == [10, 20]
+        assert top_picks["rps"].tolist() == [10.0, 20.0]
+        assert top_picks["p99"].tolist() == [50, 80]
+
+    def test_saturation_on_slo(self):
+        """The step where p99 breaks the SLO is reported as saturated"""
+        summary = summarize(
+            _history([(10, 10, 100, 50), (20, 10, 200, 80), (30, 10, 300, 900)])
+        )
+
+        limits = saturation(summary, slo_ms=500).set_index("name")
+
+        assert limits.loc["GET /api/v1/stocks/top-picks", "max_users"] == 20
+        assert limits.loc["GET /api/v1/stocks/top-picks", "saturated_at"] == 30
+
+    def test_saturation_on_throughput(self):
+        """Throughput that stops growing with users marks saturation"""
+        summary = summarize(
+            _history([(10, 10, 100, 50), (20, 10, 200, 60), (40, 10, 220, 70)])
+        )
+
+        limits = saturation(summary, slo_ms=500).set_index("name")
+
+        assert limits.loc["Aggregated", "max_users"] == 20
+        assert limits.loc["Aggregated", "saturated_at"] == 40
@@ -0,0 +1,99 @@
+"""Unit tests for Prometheus task, upstream and queue metrics"""
+
+from unittest.mock import MagicMock
+
+import pytest
+import redis
+from prometheus_client import REGISTRY
+
+from app.core.metrics import QueueDepthCollector, track_upstream
+from app.tasks import dart_tasks
+from app.tasks import monitoring  # noqa: F401  (registers task signal handlers)
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestUpstreamMetrics:
+    """Test upstream latency tracking"""
+
+    def test_records_success(self):
+        """Successful calls are observed with outcome=ok"""
+        before = _sample(
+            "valuehunt_upstream_request_duration_seconds_count",
+            upstream="krx",
+            operation="test_ok",
+            outcome="ok",
+        )
+        with track_upstream("krx", "test_ok"):
+            pass
+
+        assert (
+            _sample(
+                "valuehunt_upstream_request_duration_seconds_count",
+                upstream="krx",
+                operation="test_ok",
+                outcome="ok",
+            )
+            == before + 1
+        )
+
+    def test_records_error_and_reraises(self):
+        """Exceptions propagate and are observed with outcome=error"""
+        with pytest.raises(ValueError):
+            with track_upstream("dart", "test_error"):
+                raise ValueError("boom")
+
+        assert (
+            _sample(
+                "valuehunt_upstream_request_duration_seconds_count",
+                upstream="dart",
+                operation="test_error",
+                outcome="error",
+            )
+            == 1
+        )
+
+
+class TestTaskMetrics:
+    """Test Celery signal handlers"""
+
+    def test_task_duration_and_outcome(self):
+        """Running a task records its duration and success count"""
+        name = dart_tasks.summarize_dart_batches_task.name
+        before = _sample("valuehunt_celery_tasks_total", task=name, state="success")
+
+        dart_tasks.summarize_dart_batches_task.apply(args=([], 0))
+
+        assert _sample("valuehunt_celery_tasks_total", task=name, state="success") == before + 1
+        assert (
+            _sample("valuehunt_celery_task_duration_seconds_count", task=name, state="success")
+            >= 1
+        )
+
+
+class TestQueueDepth:
+    """Test queue depth sampling"""
+
+    def test_sums_priority_lists(self):
+        """Depth is the sum of every priority list of a queue"""
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = [3] + [1] * 9 + [0] * 10
+        collector = QueueDepthCollector(queues=["ingest-io", "compute"], client=client)
+
+        (family,) = list(collector.collect())
+
+        keys = [call.args[0] for call in client.pipeline.return_value.llen.call_args_list]
+        assert keys[:2] == ["ingest-io", "ingest-io:1"]
+        assert {s.labels["queue"]: s.value for s in family.samples} == {
+            "ingest-io": 12,
+            "compute": 0,
+        }
+
+    def test_redis_unavailable(self):
+        """Broker errors skip the metric instead of failing the scrape"""
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+
+        assert list(QueueDepthCollector(queues=["compute"], client=client).collect()) == []
@@ -0,0 +1,175 @@
+"""Unit tests for keyset pagination of the backtest listings"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.database import Base, get_async_db
+from app.main import app
+from app.models.backtest import BacktestRecommendation, BacktestRun, BacktestStatus
+from app.services import dataset_epochs
+from app.services.dataset_epochs import EPOCHS_KEY
+
+RUNS_URL = "/api/v1/api/backtest/runs"
+
+
+class FakeRedis:
+    """Epoch hash only; tests set versions directly"""
+
+    def __init__(self):
+        self.data = {EPOCHS_KEY: {name: "1" for name in dataset_epochs.DATASETS}}
+
+    def hmget(self, key, fields):
+        return [self.data.get(key, {}).get(field) for field in fields]
+
+
+@pytest.fixture
+def epochs(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(dataset_epochs, "_redis_down_until", 0.0)
+    with patch.object(dataset_epochs, "get_redis", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Nine runs, several created in the same instant, and 12 recommendations for run 1"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'backtests.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+
+    created = datetime(2026, 10, 1, 9, 0)
+    with factory() as db:
+        for i in range(9):
+            db.add(
+                BacktestRun(
+                    name=f"Run {i}",
+                    market="KOSPI" if i % 3 else "KOSDAQ",
+                    simulation_date=datetime(2020, 1, 1),
+                    lookback_years=5,
+                    holding_period_months=12,
+                    status=BacktestStatus.COMPLETED,
+                    created_at=created + timedelta(hours=i // 3),
+                )
+            )
+        for i in range(12):
+            db.add(
+                BacktestRecommendation(
+                    backtest_run_id=1,
+                    stock_code=f"{i:06d}",
+                    stock_name=f"Stock {i}",
+                    recommendation_rank=i // 2 + 1,
+                    price_at_recommendation=1000.0,
+                )
+            )
+        db.commit()
+
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def client(session_factory, epochs, async_db_override):
+    app.dependency_overrides[get_async_db] = async_db_override(session_factory.kw["bind"])
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+def _pages(client, url, **params):
+    """Follow the Link headers; returns (responses, ids)"""
+    responses, ids = [], []
+    response = client.get(url, params=params)
+    while True:
+        assert response.status_code == 200
+        responses.append(response)
+        ids.extend(item["id"] for item in response.json())
+        if "link" not in response.headers:
+            return responses, ids
+        next_url = response.headers["link"].split(">")[0].lstrip("<")
+        response = client.get(next_url)
+
+
+class TestCursor:
+    """Test cursor encoding"""
+
+    def test_round_trip(self):
+        """Cursors are URL-safe and decode to the same payload"""
+        cursor = encode_cursor({"created_at": "2026-10-01T09:00:00", "id": 7})
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == {"created_at": "2026-10-01T09:00:00", "id": 7}
+
+    @pytest.mark.parametrize("cursor", ["%%%", "bm90IGpzb24", "WzEsMl0"])
+    def test_invalid(self, cursor):
+        """Undecodable cursors and non-object payloads are a 400"""
+        with pytest.raises(HTTPException) as error:
+            decode_cursor(cursor)
+
+        assert error.value.status_code == 400
+
+
+class TestRunListing:
+    """Test GET /runs paging"""
+
+    def test_pages_cover_all_runs(self, client):
+        """Following the cursor returns every run once, newest first then highest id"""
+        responses, ids = _pages(client, RUNS_URL, limit=4)
+
+        assert len(responses) == 3
+        assert ids == [9, 8, 7, 6, 5, 4, 3, 2, 1]
+        assert all(r.headers["x-total-count"] == "9" for r in responses)
+        assert "x-next-cursor" not in responses[-1].headers
+
+    def test_filters_apply_to_every_page(self, client):
+        """The total and later pages respect the filters of the first request"""
+        responses, ids = _pages(client, RUNS_URL, limit=2, market="KOSDAQ")
+
+        assert ids == [7, 4, 1]
+        assert responses[-1].headers["x-total-count"] == "3"
+
+    def test_total_carried_in_cursor(self, client, epochs, session_factory):
+        """Later pages reuse the count until the backtests epoch changes"""
+        first = client.get(RUNS_URL, params={"limit": 4})
+        cursor = first.headers["x-next-cursor"]
+        with session_factory() as db:
+            db.query(BacktestRun).filter(BacktestRun.id == 1).delete()
+            db.commit()
+
+        stale = client.get(RUNS_URL, params={"limit": 4, "cursor": cursor})
+        assert stale.headers["x-total-count"] == "9"
+
+        epochs.data[EPOCHS_KEY][dataset_epochs.BACKTESTS] = "2"
+        fresh = client.get(RUNS_URL, params={"limit": 4, "cursor": cursor})
+        assert fresh.headers["x-total-count"] == "8"
+
+    def test_offset_still_supported(self, client):
+        """Existing offset clients get the same order"""
+        response = client.get(RUNS_URL, params={"limit": 3, "offset": 3})
+
+        assert [item["id"] for item in response.json()] == [6, 5, 4]
+
+    def test_cursor_missing_fields_is_400(self, client):
+        """A cursor from another listing is rejected"""
+        cursor = encode_cursor({"rank": 1, "id": 1})
+
+        assert client.get(RUNS_URL, params={"cursor": cursor}).status_code == 400
+
+
+class TestRecommendationListing:
+    """Test GET /runs/{id}/recommendations paging"""
+
+    def test_pages_cover_all_recommendations(self, client):
+        """Equal ranks are split across pages without gaps or repeats"""
+        responses, ids = _pages(client, f"{RUNS_URL}/1/recommendations", limit=5)
+
+        assert len(responses) == 3
+        assert ids == list(range(1, 13))
+        assert all(r.headers["x-total-count"] == "12" for r in responses)
@@ -0,0 +1,219 @@
+"""Unit tests for the staged data pipeline and its checkpoints"""
+
+from fnmatch import fnmatch
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import pipeline_checkpoint
+from app.services.pipeline_checkpoint import STAGE_DONE, STAGE_FAILED, PipelineCheckpoint
+from app.tasks import pipeline_tasks
+
+
+class FakeRedis:
+    """Dict-backed subset of the redis-py hash API used by PipelineCheckpoint"""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hsetnx(self, key, field, value):
+        fields = self.hashes.setdefault(key, {})
+        if field in fields:
+            return 0
+        fields[field] = value
+        return 1
+
+    def hdel(self, key, field):
+        self.hashes.get(key, {}).pop(field, None)
+
+    def hscan_iter(self, key, match="*"):
+        return [(f, v) for f, v in self.hashes.get(key, {}).items() if fnmatch(f, match)]
+
+    def exists(self, key):
+        return int(key in self.hashes)
+
+    def expire(self, key, seconds):
+        return True
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch.object(pipeline_checkpoint, "get_redis", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+def checkpoint(fake_redis):
+    checkpoint = PipelineCheckpoint("run-1")
+    checkpoint.save_params({"limit": None, "chunk_size": 2})
+    checkpoint.save_stock_codes(["000001", "000002", "000003", "000004", "000005"])
+    return checkpoint
+
+
+class TestPipelineCheckpoint:
+    """Test checkpoint bookkeeping"""
+
+    def test_claim_is_exclusive(self, checkpoint):
+        """A stage can only be claimed once until released"""
+        assert checkpoint.claim_stage("prices") is True
+        assert checkpoint.claim_stage("prices") is False
+        checkpoint.release_stage("prices")
+        assert checkpoint.claim_stage("prices") is True
+
+    def test_completed_chunks_per_stage(self, checkpoint):
+        """Chunk results are kept separately per stage"""
+        checkpoint.mark_chunk_done("prices", 0, {"success": 2})
+        checkpoint.mark_chunk_done("prices", 2, {"success": 1})
+        checkpoint.mark_chunk_done("value_scores", 1, {"success": 2})
+
+        assert checkpoint.completed_chunks("prices") == {0: {"success": 2}, 2: {"success": 1}}
+
+
+class TestPipelineDag:
+    """Test stage dependencies and dispatch"""
+
+    def test_ready_stages_follow_dependencies(self, checkpoint):
+        """prices and financial_metrics run in parallel; value_scores waits for both"""
+        assert pipeline_tasks.ready_stages(checkpoint) == ["stock_list"]
+
+        checkpoint.mark_stage("stock_list", STAGE_DONE)
+        assert pipeline_tasks.ready_stages(checkpoint) == ["prices", "financial_metrics"]
+
+        checkpoint.mark_stage("prices", STAGE_DONE)
+        assert pipeline_tasks.ready_stages(checkpoint) == ["financial_metrics"]
+
+        checkpoint.mark_stage("financial_metrics", STAGE_DONE)
+        assert pipeline_tasks.ready_stages(checkpoint) == ["value_scores"]
+
+    def test_start_dispatches_stock_list(self, fake_redis):
+        """A new run records its parameters and starts at the root stage"""
+        with patch.object(pipeline_tasks.run_pipeline_stage_task, "delay") as delay:
+            result = pipeline_tasks.start_pipeline(limit=10, chunk_size=50)
+
+        assert result["stages"] == ["stock_list"]
+        delay.assert_called_once_with(result["run_id"], "stock_list")
+        params = PipelineCheckpoint(result["run_id"]).get_params()
+        assert params["limit"] == 10
+        assert params["chunk_size"] == 50
+
+    def test_stage_fans_out_pending_chunks(self, checkpoint):
+        """Only chunks without a checkpoint are dispatched"""
+        checkpoint.mark_chunk_done("prices", 1, {"success": 2})
+
+        with patch.object(pipeline_tasks, "chord") as mock_chord:
+            result = pipeline_tasks.run_pipeline_stage_task.run("run-1", "prices")
+
+        header = list(mock_chord.call_args.args[0])
+        assert [sig.args[2:] for sig in header] == [
+            (0, ["000001", "000002"]),
+            (2, ["000005"]),
+        ]
+        assert result["chunks"] == 2
+
+    def test_last_input_dispatches_downstream_once(self, checkpoint):
+        """value_scores is dispatched once, by whichever input finishes last"""
+        checkpoint.mark_stage("stock_list", STAGE_DONE)
+        checkpoint.claim_stage("prices")
+        checkpoint.claim_stage("financial_metrics")
+        for i in range(3):
+            checkpoint.mark_chunk_done("prices", i, {"total": 2, "success": 2, "failed": 0})
+            checkpoint.mark_chunk_done("financial_metrics", i, {"total": 2, "success": 2})
+
+        with patch.object(pipeline_tasks.run_pipeline_stage_task, "delay") as delay, patch.object(
+            pipeline_tasks, "SessionLocal"
+        ), patch.object(pipeline_tasks, "DatasetEpochs"):
+            first = pipeline_tasks.complete_pipeline_stage_task.run([], "run-1", "prices")
+            second = pipeline_tasks.complete_pipeline_stage_task.run(
+                [], "run-1", "financial_metrics"
+            )
+            again = pipeline_tasks.complete_pipeline_stage_task.run(
+                [], "run-1", "financial_metrics"
+            )
+
+        assert first["next"] == []
+        assert second["next"] == ["value_scores"]
+        assert again["next"] == []
+        delay.assert_called_once_with("run-1", "value_scores")
+        assert first["success"] == 6
+
+    def test_epoch_bumped_once_per_stage(self, checkpoint):
+        """Chunks leave the epoch alone; the callback bumps it after every chunk committed"""
+        checkpoint.mark_stage("stock_list", STAGE_DONE)
+        checkpoint.claim_stage("prices")
+        for i in range(3):
+            checkpoint.mark_chunk_done("prices", i, {"total": 2, "success": 2, "failed": 0})
+
+        with patch.object(pipeline_tasks.run_pipeline_stage_task, "delay"), patch.object(
+            pipeline_tasks, "SessionLocal"
+        ) as session_local, patch.object(pipeline_tasks, "DatasetEpochs") as epochs, patch.object(
+            pipeline_tasks, "StockSnapshotService"
+        ) as snapshots, patch.object(pipeline_tasks, "refresh_leaderboard_cards") as cards:
+            pipeline_tasks.complete_pipeline_stage_task.run([], "run-1", "prices")
+
+        epochs.return_value.bump.assert_called_once_with("prices")
+        session_local.return_value.commit.assert_called_once()
+        # Snapshot and card prices are refreshed before the bump commits
+        snapshots.return_value.refresh_stocks.assert_called_once_with()
+        cards.assert_called_once_with(session_local.return_value)
+
+    def test_chunk_runners_do_not_bump(self):
+        """Pipeline chunks ask the services not to bump their dataset epochs"""
+        with patch.object(pipeline_tasks, "ValueScorer") as scorer:
+            pipeline_tasks._calculate_value_scores(MagicMock(), ["000001"])
+
+        scorer.return_value.calculate_all_value_scores.assert_called_once_with(
+            stock_codes=["000001"], bump_epoch=False
+        )
+
+    def test_incomplete_stage_fails_and_resumes(self, checkpoint):
+        """A stage with missing chunks is marked failed and picked up again on resume"""
+        checkpoint.mark_stage("stock_list", STAGE_DONE)
+        checkpoint.claim_stage("prices")
+        checkpoint.mark_chunk_done("prices", 0, {"success": 2})
+
+        with patch.object(pipeline_tasks.run_pipeline_stage_task, "delay") as delay:
+            result = pipeline_tasks.complete_pipeline_stage_task.run([], "run-1", "prices")
+            delay.assert_not_called()
+            assert result["status"] == "failed"
+            assert checkpoint.stage_status("prices") == STAGE_FAILED
+
+            checkpoint.claim_stage("financial_metrics")
+            resumed = pipeline_tasks.start_pipeline(run_id="run-1")
+
+        assert resumed["resumed"] is True
+        assert resumed["stages"] == ["prices", "financial_metrics"]
+
+    def test_resume_unknown_run(self, fake_redis):
+        """Resuming a run without checkpoints is an error"""
+        result = pipeline_tasks.start_pipeline(run_id="missing")
+        assert result["status"] == "error"
+
+
+class TestPipelineChunk:
+    """Test chunk execution"""
+
+    def test_chunk_checkpointed_on_success(self, checkpoint):
+        """The chunk result is stored for resume"""
+        runner = MagicMock(return_value={"total": 2, "success": 2, "failed": 0})
+        with patch.object(pipeline_tasks, "SessionLocal"), patch.dict(
+            pipeline_tasks.CHUNK_RUNNERS, {"prices": runner}
+        ):
+            result = pipeline_tasks.run_pipeline_chunk_task.run(
+                "run-1", "prices", 0, ["000001", "000002"]
+            )
+
+        assert result["status"] == "success"
+        assert checkpoint.completed_chunks("prices") == {0: runner.return_value}
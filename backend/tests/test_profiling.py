@@ -0,0 +1,95 @@
+"""Unit tests for on-demand request and task profiling"""
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiling import PROFILE_ID_HEADER, ProfiledRoute, ProfilingMiddleware
+from app.tasks import dart_tasks
+from app.tasks import monitoring  # noqa: F401  (registers task signal handlers)
+
+
+def slow_sync_work():
+    return sum(i * i for i in range(10_000))
+
+
+async def slow_async_work():
+    return sum(i * i for i in range(10_000))
+
+
+@pytest.fixture
+def profiling(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    router = APIRouter(route_class=ProfiledRoute)
+
+    @router.get("/sync")
+    def sync_endpoint():
+        return {"value": slow_sync_work()}
+
+    @router.get("/async")
+    async def async_endpoint():
+        return {"value": await slow_async_work()}
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(router)
+    return TestClient(app)
+
+
+class TestRequestProfiling:
+    """Test the X-Profile request header"""
+
+    @pytest.mark.parametrize(
+        "path,function", [("/sync", "slow_sync_work"), ("/async", "slow_async_work")]
+    )
+    def test_profiles_endpoint(self, client, profiling, path, function):
+        """Sync (threadpool) and async endpoints both show up in the stored profile"""
+        response = client.get(path, headers={"X-Profile": "secret"})
+
+        assert response.status_code == 200
+        name = response.headers[PROFILE_ID_HEADER]
+        assert (profiling / f"{name}.prof").exists()
+        assert function in (profiling / f"{name}.txt").read_text()
+
+    def test_wrong_token(self, client, profiling):
+        """Requests without the admin token are served unprofiled"""
+        response = client.get("/sync", headers={"X-Profile": "guess"})
+
+        assert PROFILE_ID_HEADER not in response.headers
+        assert list(profiling.iterdir()) == []
+
+    def test_disabled_by_default(self, client, tmp_path, monkeypatch):
+        """The header is ignored unless profiling is enabled"""
+        monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+        monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+
+        response = client.get("/sync", headers={"X-Profile": "secret"})
+
+        assert PROFILE_ID_HEADER not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestTaskProfiling:
+    """Test the Celery profile header"""
+
+    def test_profiles_task_with_header(self, profiling):
+        """A task sent with headers={"profile": True} stores a profile"""
+        dart_tasks.summarize_dart_batches_task.apply(args=([], 0), headers={"profile": True})
+
+        reports = list(profiling.glob("*.txt"))
+        assert len(reports) == 1
+        assert "summarize_dart_batches_task" in reports[0].name
+
+    def test_task_without_header(self, profiling):
+        """Tasks are not profiled unless asked"""
+        dart_tasks.summarize_dart_batches_task.apply(args=([], 0))
+
+        assert list(profiling.iterdir()) == []
@@ -0,0 +1,110 @@
+"""Query budgets for the hot read paths and the backtest run"""
+
+import asyncio
+import shutil
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+import redis
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import stocks
+from app.models.backtest import BacktestRun, BacktestStatus
+from app.models.stock import Stock
+from app.services import dataset_epochs, leaderboard_service
+from app.services.backtest_engine import BacktestEngine
+from app.services.historical_data_service import HistoricalDataService
+
+
+@pytest.fixture
+def db(synthetic_db):
+    with synthetic_db() as session:
+        yield session
+
+
+@pytest.fixture
+def writable_db(synthetic_db, tmp_path):
+    """Private copy of the synthetic database, for paths that write"""
+    path = tmp_path / "universe.db"
+    shutil.copyfile(synthetic_db.kw["bind"].url.database, path)
+    engine = create_engine(f"sqlite:///{path}")
+
+    # Epochs live in the database here; Redis is unreachable
+    with patch.object(dataset_epochs, "get_redis", side_effect=redis.ConnectionError("down")):
+        with sessionmaker(bind=engine)() as session:
+            yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def simulation_date(synthetic_spec) -> datetime:
+    """A year before the end of the universe, so the holding period has prices"""
+    end = datetime.combine(synthetic_spec.end_date, datetime.min.time())
+    return end.replace(year=end.year - 1)
+
+
+class TestStockReads:
+    """Test the query count of the stock routes"""
+
+    def test_detail_budget(self, db, query_budget):
+        """Detail reads the snapshot row and the last four quarters"""
+        code = db.query(Stock.code).first()[0]
+
+        with query_budget(4):
+            detail = stocks.get_stock_detail(code, db)
+
+        assert detail.stock_info.code == code
+        assert detail.financial_metrics["historical"]
+
+    @pytest.mark.parametrize("market, category", [(None, None), ("KOSPI", "dividend")])
+    def test_top_picks_sql_budget(self, db, query_budget, monkeypatch, market, category):
+        """Without a published leaderboard, top picks run a fixed number of queries"""
+        monkeypatch.setattr(leaderboard_service, "_redis_down_until", float("inf"))
+
+        with query_budget(3):
+            picks = stocks.get_top_picks(
+                market=market, limit=50, offset=0, category=category, db=db
+            )
+
+        assert picks.data
+
+
+class TestBacktestRun:
+    """Test the query count of a backtest run"""
+
+    def test_run_budget(self, writable_db, simulation_date, synthetic_spec, query_budget):
+        """Lookups are batched; only the top 20 recommendations are written row by row"""
+        run = BacktestRun(
+            name="Budget run",
+            market="ALL",
+            simulation_date=simulation_date,
+            lookback_years=5,
+            holding_period_months=6,
+            status=BacktestStatus.PENDING,
+        )
+        writable_db.add(run)
+        writable_db.commit()
+
+        with query_budget(45):
+            backtest = asyncio.run(BacktestEngine(writable_db).run_backtest(run.id))
+
+        assert backtest.status == BacktestStatus.COMPLETED
+        assert backtest.total_recommendations == min(20, synthetic_spec.stocks)
+
+    def test_batch_lookups_match_single_lookups(self, db, simulation_date):
+        """Batched price, metrics and return lookups agree with the per-stock ones"""
+        service = HistoricalDataService(db)
+        codes = [code for code, in db.query(Stock.code).limit(10)] + ["KS11", "999999"]
+        end_date = simulation_date.replace(year=simulation_date.year + 1)
+
+        prices = service.get_historical_price_batch(codes, simulation_date)
+        metrics = service.get_historical_metrics_batch(codes, simulation_date)
+        returns = service.get_price_return_batch(codes, simulation_date, end_date)
+
+        for code in codes:
+            assert prices.get(code) is service.get_historical_price(code, simulation_date)
+            assert metrics.get(code) is service.get_historical_metrics(code, simulation_date)
+            assert returns.get(code) == service.get_price_return(code, simulation_date, end_date)
+        assert "999999" not in prices
@@ -0,0 +1,115 @@
+"""Unit tests for SQL query accounting and the Server-Timing middleware"""
+
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.middleware import QueryStatsMiddleware
+from app.db.query_stats import track_queries
+from app.models.stock import Stock
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Stock.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+
+    with factory() as db:
+        db.add_all([Stock(code=f"{i:06d}", name=f"종목{i}", market="KOSPI") for i in range(20)])
+        db.commit()
+    return factory
+
+
+class TestTrackQueries:
+    """Test query counting"""
+
+    def test_counts_queries_in_block(self, session_factory):
+        """Only queries inside the block are counted"""
+        with session_factory() as db:
+            db.execute(text("SELECT 1"))
+            with track_queries() as stats:
+                db.execute(text("SELECT 1"))
+                db.query(Stock).count()
+
+        assert stats.count == 2
+        assert stats.duration_ms >= 0
+
+    def test_detects_repeated_statement(self, session_factory, caplog):
+        """A query-per-item loop is reported as a possible N+1"""
+        with session_factory() as db, track_queries() as stats:
+            for i in range(15):
+                db.query(Stock).filter(Stock.code == f"{i:06d}").first()
+
+        statement, repeats = stats.most_repeated()
+        assert repeats == 15
+        assert "FROM stocks" in statement
+
+        with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+            assert stats.warn_if_excessive("loop", max_repeats=10)
+        assert "possible N+1" in caplog.text
+
+    def test_within_thresholds(self, session_factory):
+        """No warning below every threshold"""
+        with session_factory() as db, track_queries() as stats:
+            db.query(Stock).all()
+
+        assert not stats.warn_if_excessive("single", max_count=5, max_ms=10_000, max_repeats=5)
+
+    def test_query_budget_fixture_fails_over_budget(self, session_factory, query_budget):
+        """The budget fixture lists the offending statements"""
+        with session_factory() as db:
+            with pytest.raises(AssertionError, match="2 queries exceeded the budget of 1"):
+                with query_budget(1):
+                    db.query(Stock).count()
+                    db.query(Stock).first()
+
+
+class TestQueryStatsMiddleware:
+    """Test per-request accounting"""
+
+    @pytest.fixture
+    def client(self, session_factory):
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        def get_db():
+            with session_factory() as db:
+                yield db
+
+        @app.get("/stocks")
+        def list_stocks(db: Session = Depends(get_db)):
+            return [stock.code for stock in db.query(Stock).limit(3)]
+
+        @app.get("/stocks/n-plus-one")
+        def n_plus_one(db: Session = Depends(get_db)):
+            codes = [code for (code,) in db.query(Stock.code)]
+            return [db.query(Stock).filter(Stock.code == code).first().name for code in codes]
+
+        return TestClient(app)
+
+    def test_server_timing_header(self, client):
+        """Responses report query count and DB time"""
+        response = client.get("/stocks")
+
+        assert response.status_code == 200
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert 'desc="1 queries"' in response.headers["server-timing"]
+
+    def test_warns_on_n_plus_one(self, client, caplog):
+        """A query-per-row endpoint is logged with its path"""
+        with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+            response = client.get("/stocks/n-plus-one")
+
+        assert 'desc="21 queries"' in response.headers["server-timing"]
+        assert "GET /stocks/n-plus-one" in caplog.text
+        assert "possible N+1" in caplog.text
@@ -0,0 +1,88 @@
+"""Unit tests for the distributed token-bucket rate limiter"""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import redis
+
+from app.core.rate_limiter import TokenBucketRateLimiter
+
+
+@pytest.fixture
+def offline_limiter():
+    """Limiter whose Redis connection always fails (forces in-process bucket)"""
+    limiter = TokenBucketRateLimiter("test", rate=10.0, capacity=2)
+    limiter._redis_down_until = float("inf")
+    return limiter
+
+
+class TestLocalBucket:
+    """Test in-process fallback bucket"""
+
+    def test_burst_is_free(self, offline_limiter):
+        """Requests within burst capacity do not wait"""
+        assert offline_limiter._reserve(1) == 0.0
+        assert offline_limiter._reserve(1) == 0.0
+
+    def test_reservations_are_spaced_at_rate(self, offline_limiter):
+        """Requests beyond the burst are spaced 1/rate apart"""
+        offline_limiter._reserve(2)
+        first = offline_limiter._reserve(1)
+        second = offline_limiter._reserve(1)
+
+        assert first == pytest.approx(0.1, abs=0.01)
+        assert second == pytest.approx(0.2, abs=0.01)
+
+    def test_acquire_sleeps_for_reservation(self, offline_limiter):
+        """acquire() blocks until the reservation is valid"""
+        offline_limiter._reserve(2)
+
+        start = time.monotonic()
+        offline_limiter.acquire()
+        elapsed = time.monotonic() - start
+
+        assert elapsed >= 0.08
+
+    @pytest.mark.asyncio
+    async def test_acquire_async(self, offline_limiter):
+        """acquire_async() waits without a Redis connection"""
+        offline_limiter._reserve(2)
+        waited = await offline_limiter.acquire_async()
+        assert waited > 0
+
+    def test_invalid_rate(self):
+        """Non-positive rates are rejected"""
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter("bad", rate=0)
+
+
+class TestRedisBucket:
+    """Test Redis-backed reservations"""
+
+    def test_uses_redis_script(self):
+        """Wait time returned by the Lua script is honoured"""
+        limiter = TokenBucketRateLimiter("dart-test", rate=2.0)
+        script = Mock(return_value="0.25")
+
+        with patch("app.core.rate_limiter.get_redis") as mock_get_redis:
+            mock_get_redis.return_value.register_script.return_value = script
+            wait = limiter._reserve(1)
+
+        assert wait == 0.25
+        script.assert_called_once_with(
+            keys=["valuehunt:ratelimit:dart-test"], args=[2.0, 1, 1]
+        )
+
+    def test_falls_back_when_redis_unreachable(self):
+        """Connection errors switch to the in-process bucket"""
+        limiter = TokenBucketRateLimiter("dart-test", rate=2.0)
+
+        with patch("app.core.rate_limiter.get_redis") as mock_get_redis:
+            mock_get_redis.return_value.register_script.side_effect = (
+                redis.ConnectionError("refused")
+            )
+            wait = limiter._reserve(1)
+
+        assert wait == 0.0
+        assert not limiter._redis_available()
@@ -0,0 +1,287 @@
+"""Unit tests for saved screen materialization"""
+
+import uuid
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import redis
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.dependencies import get_current_user
+from app.db.database import Base, get_db
+from app.main import app
+from app.models.screener_filter import ScreenerFilter
+from app.services import saved_screens
+from app.services.saved_screens import (
+    SavedScreenService,
+    diff_codes,
+    refresh_saved_screens,
+    unpack_codes,
+)
+from app.services.screener_engine import ScreenerSnapshot, _percentile_ranks, encode_categories
+
+USER = uuid.UUID("00000000-0000-0000-0000-000000000001")
+OTHER_USER = uuid.UUID("00000000-0000-0000-0000-000000000002")
+
+
+def _snapshot(token, PER):
+    """Five stocks 000001..000005 with the given PER column"""
+    codes = np.array([f"00000{i}" for i in range(1, 6)], dtype=object)
+    numeric = {"PER": np.array(PER, dtype=float)}
+    market, labels = encode_categories(["KOSPI", "KOSDAQ", "KOSPI", "KOSDAQ", "KOSPI"])
+    return ScreenerSnapshot(
+        token=token,
+        codes=codes,
+        names=codes.copy(),
+        categorical={"market": market},
+        labels={"market": labels},
+        numeric=numeric,
+        percentiles={name: _percentile_ranks(values) for name, values in numeric.items()},
+    )
+
+
+class FakePipeline:
+    """Queues calls and runs them on execute(), like a redis-py pipeline"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+        return lambda *args, **kwargs: self.calls.append((method, args, kwargs))
+
+    def execute(self):
+        return [method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """Hashes only, which is all saved screens use"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttl = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def hmget(self, key, fields):
+        return [self.data.get(key, {}).get(field) for field in fields]
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def expire(self, key, seconds):
+        self.ttl[key] = seconds
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(saved_screens, "_redis_down_until", 0.0)
+    with patch.object(saved_screens, "get_redis", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def snapshot():
+    """Current snapshot, replaceable by tests"""
+    holder = {"snapshot": _snapshot("epoch-1", [5, 12, 8, 20, 9])}
+    with patch.object(saved_screens, "get_snapshot", side_effect=lambda db: holder["snapshot"]):
+        yield holder
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine, tables=[ScreenerFilter.__table__])
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            ScreenerFilter(id=1, user_id=USER, name="Cheap", filters={"PER_max": 10}),
+            ScreenerFilter(
+                id=2, user_id=USER, name="Cheap KOSPI", filters={"PER_max": 10, "market": ["KOSPI"]}
+            ),
+            ScreenerFilter(id=3, user_id=OTHER_USER, name="Also cheap", filters={"PER_max": 10.0}),
+            ScreenerFilter(id=4, user_id=USER, name="Typo", filters={"PER_max": "ten"}),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestEvaluateAll:
+    """Test the batch evaluation after a scoring run"""
+
+    def test_stores_sorted_codes(self, db, fake_redis, snapshot):
+        """Each valid screen gets a hash of sorted matching codes; invalid ones are skipped"""
+        result = SavedScreenService(db).evaluate_all()
+
+        assert result["evaluated"] == 3
+        assert result["invalid"] == 1
+        assert fake_redis.data["valuehunt:screen:1"]["codes"] == "000001,000003,000005"
+        assert fake_redis.data["valuehunt:screen:2"]["codes"] == "000001,000003,000005"
+        assert "valuehunt:screen:4" not in fake_redis.data
+        assert fake_redis.ttl["valuehunt:screen:1"] == saved_screens.SCREEN_TTL_SECONDS
+
+    def test_shared_predicates_computed_once(self, db, fake_redis, snapshot):
+        """Equal filters share a result and overlapping filters share masks"""
+        original = ScreenerSnapshot.predicate_mask
+        with patch.object(
+            ScreenerSnapshot, "predicate_mask", autospec=True, side_effect=original
+        ) as predicate_mask:
+            SavedScreenService(db).evaluate_all()
+
+        assert predicate_mask.call_count == 2  # PER <= 10 and market in (KOSPI)
+
+    def test_diffs_between_runs(self, db, fake_redis, snapshot):
+        """The next scoring run records which stocks entered and left each screen"""
+        SavedScreenService(db).evaluate_all()
+        assert fake_redis.data["valuehunt:screen:1"]["added"] == ""
+
+        snapshot["snapshot"] = _snapshot("epoch-2", [5, 7, 11, 20, 9])
+        result = SavedScreenService(db).evaluate_all()
+
+        screen = fake_redis.data["valuehunt:screen:1"]
+        assert screen["codes"] == "000001,000002,000005"
+        assert screen["added"] == "000002"
+        assert screen["removed"] == "000003"
+        assert result["with_new_matches"] == 2
+
+    def test_rerun_keeps_diffs(self, db, fake_redis, snapshot):
+        """Evaluating twice on the same snapshot does not clear the new matches"""
+        SavedScreenService(db).evaluate_all()
+        snapshot["snapshot"] = _snapshot("epoch-2", [5, 7, 11, 20, 9])
+        SavedScreenService(db).evaluate_all()
+
+        result = SavedScreenService(db).evaluate_all()
+
+        assert result["unchanged"] == 3
+        assert fake_redis.data["valuehunt:screen:1"]["added"] == "000002"
+
+    def test_edited_filters_reset_diffs(self, db, fake_redis, snapshot):
+        """A screen whose filters changed starts over instead of diffing unrelated results"""
+        SavedScreenService(db).evaluate_all()
+        db.get(ScreenerFilter, 1).filters = {"PER_max": 15}
+        db.commit()
+
+        SavedScreenService(db).evaluate_all()
+
+        screen = fake_redis.data["valuehunt:screen:1"]
+        assert screen["codes"] == "000001,000002,000003,000005"
+        assert screen["added"] == screen["removed"] == ""
+
+    def test_redis_outage_is_reported(self, db, snapshot):
+        """The scoring task keeps going when Redis is down"""
+        with patch.object(saved_screens, "get_redis", side_effect=redis.ConnectionError("down")):
+            result = refresh_saved_screens(db)
+
+        assert result["status"] == "error"
+
+
+class TestDiffCodes:
+    """Test the sorted-array set differences"""
+
+    def test_added_and_removed(self):
+        """Codes are compared as sets of sorted strings"""
+        added, removed = diff_codes(unpack_codes("000010,000020"), unpack_codes("000020,000030"))
+
+        assert added.tolist() == ["000030"]
+        assert removed.tolist() == ["000010"]
+
+    def test_empty(self):
+        """Empty results unpack to empty arrays"""
+        assert unpack_codes("").tolist() == []
+        assert unpack_codes(None).tolist() == []
+
+
+class TestSavedScreenApi:
+    """Test GET /screener/saved/{id}"""
+
+    @pytest.fixture
+    def client(self, db, fake_redis, snapshot):
+        user = type("CurrentUser", (), {"id": USER})()
+        app.dependency_overrides[get_db] = lambda: db
+        app.dependency_overrides[get_current_user] = lambda: user
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def test_reads_stored_result(self, client, db, fake_redis, snapshot):
+        """An evaluated screen is served from its hash"""
+        SavedScreenService(db).evaluate_all()
+        snapshot["snapshot"] = _snapshot("epoch-2", [5, 7, 11, 20, 9])
+        SavedScreenService(db).evaluate_all()
+
+        body = client.get("/api/v1/screener/saved/1").json()
+
+        assert body["stock_codes"] == ["000001", "000002", "000005"]
+        assert body["total_count"] == 3
+        assert body["added"] == ["000002"]
+        assert body["removed"] == ["000003"]
+
+    def test_evaluates_on_miss(self, client, fake_redis):
+        """A screen saved after the last run is evaluated when first opened"""
+        body = client.get("/api/v1/screener/saved/2").json()
+
+        assert body["stock_codes"] == ["000001", "000003", "000005"]
+        assert "valuehunt:screen:2" in fake_redis.data
+
+    def test_other_users_screen_is_404(self, client, db):
+        """Stored results are only returned to the screen's owner"""
+        SavedScreenService(db).evaluate_all()
+
+        assert client.get("/api/v1/screener/saved/3").status_code == 404
+
+    def test_deleted_screen_is_404(self, client, db, fake_redis):
+        """A stored result does not outlive its screen"""
+        SavedScreenService(db).evaluate_all()
+        db.delete(db.get(ScreenerFilter, 1))
+        db.commit()
+
+        assert "valuehunt:screen:1" in fake_redis.data
+        assert client.get("/api/v1/screener/saved/1").status_code == 404
+
+    def test_edited_screen_is_reevaluated(self, client, db, fake_redis):
+        """A result stored for the old filters is not served for the new ones"""
+        SavedScreenService(db).evaluate_all()
+        db.get(ScreenerFilter, 1).filters = {"PER_max": 6}
+        db.commit()
+
+        body = client.get("/api/v1/screener/saved/1").json()
+
+        assert body["stock_codes"] == ["000001"]
+        assert fake_redis.data["valuehunt:screen:1"]["codes"] == "000001"
+
+    def test_invalid_filters_are_400(self, client):
+        """A saved screen with a non-numeric bound reports the error"""
+        assert client.get("/api/v1/screener/saved/4").status_code == 400
+
+    def test_legacy_keys_are_ignored(self, client, db, fake_redis, snapshot):
+        """Fields saved before filters were validated do not invalidate the screen"""
+        db.add(
+            ScreenerFilter(
+                id=5, user_id=USER, name="Legacy", filters={"PER_max": 10, "PE_max": 10}
+            )
+        )
+        db.commit()
+
+        result = SavedScreenService(db).evaluate_all()
+
+        assert result["invalid"] == 1  # only "Typo"
+        legacy, cheap = fake_redis.data["valuehunt:screen:5"], fake_redis.data["valuehunt:screen:1"]
+        assert legacy["fingerprint"] == cheap["fingerprint"]
+        assert legacy["codes"] == "000001,000003,000005"
+        body = client.get("/api/v1/screener/saved/5").json()
+        assert body["stock_codes"] == ["000001", "000003", "000005"]
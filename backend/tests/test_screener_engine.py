@@ -0,0 +1,276 @@
+"""Unit tests for the columnar screener snapshot"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from app.db.database import get_db
+from app.main import app
+from app.models.financial_metrics import FinancialMetrics
+from app.models.stock import Stock
+from app.models.value_score import ValueScore
+from app.services import dataset_epochs, screener_engine
+from app.services.dataset_epochs import EPOCHS_KEY
+from app.services.screener_engine import (
+    Predicate,
+    ScreenerSnapshot,
+    _percentile_ranks,
+    compile_filters,
+    encode_categories,
+    get_snapshot,
+    parse_sort,
+)
+
+NAN = np.nan
+
+
+def _snapshot(**numeric):
+    """Five stocks 000001..000005 with the given numeric columns"""
+    codes = np.array([f"00000{i}" for i in range(1, 6)], dtype=object)
+    numeric = {name: np.array(values, dtype=float) for name, values in numeric.items()}
+    categories = {
+        "market": encode_categories(["KOSPI", "KOSDAQ", "KOSPI", "KOSDAQ", "KOSPI"]),
+        "sector": encode_categories(["IT", "IT", None, "금융", "IT"]),
+    }
+    return ScreenerSnapshot(
+        token="test",
+        codes=codes,
+        names=codes.copy(),
+        categorical={name: encoded for name, (encoded, _) in categories.items()},
+        labels={name: labels for name, (_, labels) in categories.items()},
+        numeric=numeric,
+        percentiles={name: _percentile_ranks(values) for name, values in numeric.items()},
+    )
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {EPOCHS_KEY: {name: "1" for name in dataset_epochs.DATASETS}}
+
+    def hmget(self, key, fields):
+        return [self.data.get(key, {}).get(field) for field in fields]
+
+
+@pytest.fixture
+def epochs(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(dataset_epochs, "_redis_down_until", 0.0)
+    monkeypatch.setattr(screener_engine, "_snapshots", {})
+    with patch.object(dataset_epochs, "get_redis", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def client(synthetic_db, epochs):
+    def override_get_db():
+        db = synthetic_db()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+class TestCompileFilters:
+    """Test parsing the filter object"""
+
+    def test_legacy_keys(self):
+        """The original hard-coded filters still work"""
+        predicates = compile_filters({"PER_max": 15, "ROE_min": "5", "market": ["KOSPI"]})
+
+        assert set(predicates) == {
+            Predicate("PER", "max", 15.0),
+            Predicate("ROE", "min", 5.0),
+            Predicate("market", "in", ("KOSPI",)),
+        }
+
+    def test_any_numeric_field(self):
+        """Every metric and score accepts ranges and percentile bounds"""
+        predicates = compile_filters({"EV_EBITDA_max": 8, "stability_score_pct_min": 90})
+
+        assert Predicate("EV_EBITDA", "max", 8.0) in predicates
+        assert Predicate("stability_score", "pct_min", 90.0) in predicates
+
+    def test_empty_values_ignored(self):
+        """Unset form fields do not filter"""
+        assert compile_filters({"PER_max": None, "sector": [], "market": ""}) == ()
+
+    def test_zero_is_a_bound(self):
+        """0 is a real bound, not an unset field"""
+        assert compile_filters({"ROE_min": 0}) == (Predicate("ROE", "min", 0.0),)
+
+    def test_equal_filters_compile_equal(self):
+        """Key order does not matter, so equal screens can share masks"""
+        assert compile_filters({"PER_max": 10, "market": "KOSPI"}) == compile_filters(
+            {"market": ["KOSPI"], "PER_max": 10.0}
+        )
+
+    @pytest.mark.parametrize("filters", [{"PE_max": 10}, {"PER_below": 10}, {"PER_max": "low"}])
+    def test_invalid(self, filters):
+        """Unknown fields and non-numeric bounds are rejected"""
+        with pytest.raises(ValueError):
+            compile_filters(filters)
+
+    def test_ignore_unknown(self):
+        """Unknown fields can be skipped, but bad bounds are still rejected"""
+        assert compile_filters({"PE_max": 10, "PER_max": 15}, ignore_unknown=True) == (
+            Predicate("PER", "max", 15.0),
+        )
+        with pytest.raises(ValueError):
+            compile_filters({"PER_max": "low"}, ignore_unknown=True)
+
+
+class TestSnapshot:
+    """Test mask, sort and facet evaluation"""
+
+    def test_missing_values_never_match(self):
+        """NaN fails both min and max bounds"""
+        snapshot = _snapshot(PER=[5, NAN, 20, 8, 12])
+
+        mask = snapshot.mask(compile_filters({"PER_max": 10}))
+
+        assert snapshot.codes[mask].tolist() == ["000001", "000004"]
+
+    def test_percentile_filter(self):
+        """Percentile bounds rank within the whole universe"""
+        snapshot = _snapshot(ROE=[1, 2, 3, 4, 5])
+
+        mask = snapshot.mask(compile_filters({"ROE_pct_min": 75}))
+
+        assert snapshot.codes[mask].tolist() == ["000004", "000005"]
+
+    def test_multi_key_sort(self):
+        """Later keys break ties; missing values sort last; then stock code"""
+        snapshot = _snapshot(value_score=[70, 80, 70, NAN, 70], PER=[9, 5, 3, 1, 9])
+        everyone = np.ones(5, dtype=bool)
+
+        order = snapshot.order(everyone, parse_sort(["-value_score", "PER"]))
+
+        assert snapshot.codes[order].tolist() == ["000002", "000003", "000001", "000005", "000004"]
+
+    def test_shared_mask_cache(self):
+        """Screens evaluated together compute each predicate once"""
+        snapshot = _snapshot(PER=[5, 6, 7, 8, 9], ROE=[1, 2, 3, 4, 5])
+        cache = {}
+
+        snapshot.mask(compile_filters({"PER_max": 8, "ROE_min": 2}), cache)
+        snapshot.mask(compile_filters({"PER_max": 8}), cache)
+
+        assert len(cache) == 2
+
+    def test_after_continues_order(self):
+        """Rows after a cursor are the rest of order(), missing values included"""
+        snapshot = _snapshot(value_score=[70, 80, 70, NAN, 70], PER=[9, 5, 3, 1, NAN])
+        sort = parse_sort(["-value_score", "PER"])
+        everyone = np.ones(5, dtype=bool)
+        order = snapshot.order(everyone, sort)
+
+        for position, index in enumerate(order):
+            key = snapshot.sort_key(sort, index)
+            rest = snapshot.order(snapshot.after(sort, key, snapshot.codes[index]), sort)
+            assert rest.tolist() == order[position + 1 :].tolist()
+
+    def test_after_removed_row(self):
+        """A cursor still works when its row is no longer in the snapshot"""
+        snapshot = _snapshot(value_score=[90, 80, 70, 60, 50])
+        sort = parse_sort(["-value_score"])
+
+        rest = snapshot.after(sort, [75.0], "000009")
+
+        assert snapshot.codes[rest].tolist() == ["000003", "000004", "000005"]
+
+    def test_facets(self):
+        """Facet counts cover the matching stocks, skipping missing values"""
+        snapshot = _snapshot(PER=[5, 6, 7, 8, 9])
+
+        facets = snapshot.facet_counts(snapshot.mask(()), ["market", "sector"])
+
+        assert facets == {"market": {"KOSDAQ": 2, "KOSPI": 3}, "sector": {"IT": 3, "금융": 1}}
+
+
+class TestScreenerApi:
+    """Test POST /screener on the synthetic universe"""
+
+    def test_matches_brute_force(self, client, synthetic_db):
+        """Results equal the SQL screener's rows for the same filters"""
+        body = {
+            "filters": {"market": ["KOSPI"], "PER_max": 15, "ROE_min": 5},
+            "sort_by": "PER",
+            "order": "asc",
+            "limit": 100,
+        }
+        response = client.post("/api/v1/screener", json=body).json()
+
+        with synthetic_db() as db:
+            score_date = db.query(func.max(ValueScore.date)).scalar()
+            metrics_date = db.query(func.max(FinancialMetrics.date)).scalar()
+            expected = (
+                db.query(FinancialMetrics.per, Stock.code)
+                .join(FinancialMetrics, Stock.code == FinancialMetrics.stock_code)
+                .join(ValueScore, Stock.code == ValueScore.stock_code)
+                .filter(FinancialMetrics.date == metrics_date, ValueScore.date == score_date)
+                .filter(Stock.market == "KOSPI")
+                .filter(FinancialMetrics.per <= 15, FinancialMetrics.roe >= 5)
+                .all()
+            )
+        assert response["total_count"] == len(expected)
+        assert [r["stock_code"] for r in response["results"]] == [
+            code for _, code in sorted(expected)
+        ][:100]
+
+    def test_total_count_and_facets(self, client):
+        """total_count counts every match, not just the returned page"""
+        response = client.post(
+            "/api/v1/screener", json={"filters": {}, "limit": 10, "facets": ["market"]}
+        ).json()
+
+        assert len(response["results"]) == 10
+        assert sum(response["facets"]["market"].values()) == response["total_count"] > 10
+
+    def test_cursor_pages_cover_all_matches(self, client):
+        """Following next_cursor returns every match exactly once, in order"""
+        body = {"filters": {"market": ["KOSDAQ"]}, "sort": ["-PER", "ROE"], "limit": 100}
+        expected = client.post("/api/v1/screener", json=body).json()
+        assert expected["next_cursor"] is None
+        assert len(expected["results"]) == expected["total_count"]
+
+        codes, cursor = [], None
+        while True:
+            page = client.post("/api/v1/screener", json={**body, "limit": 7, "cursor": cursor}).json()
+            assert page["total_count"] == expected["total_count"]
+            codes.extend(r["stock_code"] for r in page["results"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert codes == [r["stock_code"] for r in expected["results"]]
+
+    @pytest.mark.parametrize("cursor", ["not a cursor", "eyJzb3J0IjpbXX0"])
+    def test_bad_cursor_is_400(self, client, cursor):
+        """Garbage cursors and cursors for another sort order are rejected"""
+        response = client.post("/api/v1/screener", json={"filters": {}, "cursor": cursor})
+
+        assert response.status_code == 400
+
+    def test_invalid_filter_is_400(self, client):
+        """Typos in filter names are reported instead of silently ignored"""
+        response = client.post("/api/v1/screener", json={"filters": {"PRE_max": 10}})
+
+        assert response.status_code == 400
+        assert "PRE_max" in response.json()["detail"]
+
+    def test_snapshot_reused_until_epoch_changes(self, synthetic_db, epochs, query_budget):
+        """The snapshot is read from the database once per scoring epoch"""
+        with synthetic_db() as db:
+            first = get_snapshot(db)
+            with query_budget(0):
+                assert get_snapshot(db) is first
+
+            epochs.data[EPOCHS_KEY][dataset_epochs.VALUE_SCORES] = "2"
+            assert get_snapshot(db) is not first
@@ -0,0 +1,86 @@
+"""Unit tests for the on-disk DART statement cache"""
+
+import os
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from app.services.statement_cache import StatementCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache rooted in a temporary directory"""
+    return StatementCache(root=tmp_path, revalidate_hours=1)
+
+
+@pytest.fixture
+def rows():
+    """Raw statement rows as returned by DART"""
+    return pd.DataFrame(
+        {
+            "sj_div": ["BS", "IS"],
+            "account_nm": ["자산총계", "매출액"],
+            "thstrm_amount": ["1000", "800"],
+        }
+    )
+
+
+class TestStatementCache:
+    """Test cache storage and revalidation"""
+
+    def test_roundtrip(self, cache, rows):
+        """Stored rows are returned unchanged"""
+        cache.put(rows, "00126380", 2020)
+        pd.testing.assert_frame_equal(cache.get("00126380", 2020), rows)
+
+    def test_miss(self, cache):
+        """Unknown keys return None"""
+        assert cache.get("00126380", 2020) is None
+
+    def test_datasets_are_separate(self, cache, rows):
+        """Multi-company rows do not shadow full statements"""
+        cache.put(rows, "00126380", 2020, dataset="multi")
+        assert cache.get("00126380", 2020) is None
+        assert cache.get("00126380", 2020, dataset="multi") is not None
+
+    def test_empty_frames_not_stored(self, cache):
+        """Empty responses are never cached"""
+        cache.put(pd.DataFrame(), "00126380", 2020)
+        assert cache.get("00126380", 2020) is None
+
+    def test_final_report_never_expires(self, cache, rows):
+        """Closed reporting periods are served regardless of file age"""
+        cache.put(rows, "00126380", 2020)
+        path = cache._path("00126380", 2020, "11011", "finstate")
+        old = time.time() - 365 * 24 * 3600
+        os.utime(path, (old, old))
+
+        assert cache.get("00126380", 2020) is not None
+
+    def test_open_report_is_revalidated(self, cache, rows):
+        """Reports still open to filing expire after the revalidation window"""
+        year = date.today().year
+        cache.put(rows, "00126380", year)
+        assert cache.get("00126380", year) is not None
+
+        path = cache._path("00126380", year, "11011", "finstate")
+        old = time.time() - 2 * 3600
+        os.utime(path, (old, old))
+        assert cache.get("00126380", year) is None
+
+    @pytest.mark.parametrize(
+        "year,reprt_code,today,expected",
+        [
+            (2023, "11011", date(2024, 3, 15), False),  # Annual report not yet due
+            (2023, "11011", date(2024, 4, 30), True),
+            (2024, "11013", date(2024, 5, 10), False),  # Q1 due mid-May
+            (2024, "11013", date(2024, 6, 1), True),
+            (2024, "99999", date(2030, 1, 1), False),  # Unknown report code
+        ],
+    )
+    def test_is_final(self, year, reprt_code, today, expected):
+        """Reports become immutable once the filing deadline has passed"""
+        assert StatementCache.is_final(year, reprt_code, today) is expected
@@ -0,0 +1,257 @@
+"""Unit tests for the materialized per-stock snapshot"""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+import redis
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.stocks import get_stock_detail
+from app.core.dependencies import get_current_user
+from app.db.database import Base, get_async_db
+from app.main import app
+from app.models.financial_metrics import FinancialMetrics
+from app.models.stock import Stock
+from app.models.stock_snapshot import StockSnapshot
+from app.models.value_score import ValueScore
+from app.models.watchlist import Watchlist
+from app.services import data_collector, dataset_epochs
+from app.services.data_collector import DataCollector
+from app.services.stock_snapshots import StockSnapshotService
+from app.tasks import data_tasks
+
+USER = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Two stocks: 005930 scored on three days, 000660 listed but never scored"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'snapshots.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            Stock(code="005930", name="삼성전자", market="KOSPI", current_price=70000),
+            Stock(code="000660", name="SK하이닉스", market="KOSPI", current_price=180000),
+        ]
+    )
+    for day, total, per in [(14, 60, 11), (15, 62.5, 10), (16, 59, 9)]:
+        session.add(ValueScore(stock_code="005930", date=date(2026, 10, day), total_score=total))
+        session.add(FinancialMetrics(stock_code="005930", date=date(2026, 10, day), per=per))
+    session.add(Watchlist(user_id=USER, stock_code="005930", added_at=datetime(2026, 10, 1)))
+    session.add(Watchlist(user_id=USER, stock_code="000660", added_at=datetime(2026, 10, 2)))
+    session.commit()
+
+    # Epochs live in the database here; Redis is unreachable
+    with patch.object(dataset_epochs, "get_redis", side_effect=redis.ConnectionError("down")):
+        yield session
+    session.close()
+    engine.dispose()
+
+
+class TestRefresh:
+    """Test rebuilding the snapshot"""
+
+    def test_latest_rows_and_delta(self, db):
+        """Each stock gets its latest metrics and score and the change since the previous run"""
+        assert StockSnapshotService(db).refresh() == 2
+        db.commit()
+
+        row = db.get(StockSnapshot, "005930")
+        assert row.name == "삼성전자"
+        assert row.current_price == 70000
+        assert row.metrics_date == date(2026, 10, 16)
+        assert row.per == Decimal("9")
+        assert row.score_date == date(2026, 10, 16)
+        assert row.total_score == Decimal("59")
+        assert row.previous_score_date == date(2026, 10, 15)
+        assert row.total_score_change == Decimal("-3.5")
+
+    def test_unscored_stock_kept(self, db):
+        """Stocks without scores still have a row, with empty score columns"""
+        StockSnapshotService(db).refresh()
+
+        row = db.get(StockSnapshot, "000660")
+        assert row.score_date is None
+        assert row.total_score is None
+        assert row.total_score_change is None
+
+    def test_partial_refresh(self, db):
+        """Re-scoring one stock rewrites only its row"""
+        StockSnapshotService(db).refresh()
+        db.commit()
+        db.add(ValueScore(stock_code="005930", date=date(2026, 10, 17), total_score=70))
+        db.get(Stock, "000660").current_price = 1
+
+        assert StockSnapshotService(db).refresh(["005930"]) == 1
+        db.commit()
+        db.expire_all()
+
+        assert db.get(StockSnapshot, "005930").total_score_change == Decimal("11")
+        assert db.get(StockSnapshot, "000660").current_price == 180000
+
+    def test_bumps_value_scores_epoch(self, db):
+        """Cached rankings built on the old rows are invalidated"""
+        before = dataset_epochs.DatasetEpochs(db).current(dataset_epochs.VALUE_SCORES)
+
+        StockSnapshotService(db).refresh()
+        db.commit()
+
+        after = dataset_epochs.DatasetEpochs(db).current(dataset_epochs.VALUE_SCORES)
+        assert after[dataset_epochs.VALUE_SCORES] == before[dataset_epochs.VALUE_SCORES] + 1
+
+
+class TestRefreshStocks:
+    """Test keeping the stock columns current between scoring runs"""
+
+    def test_updates_stock_columns_and_keeps_scores(self, db):
+        """Names and prices follow the stocks table; score columns are left alone"""
+        StockSnapshotService(db).refresh()
+        db.commit()
+        stock = db.get(Stock, "005930")
+        stock.name = "삼성전자우"
+        stock.current_price = 71000
+        stock.change_rate = 1.43
+
+        assert StockSnapshotService(db).refresh_stocks() == 2
+        db.commit()
+        db.expire_all()
+
+        row = db.get(StockSnapshot, "005930")
+        assert (row.name, row.current_price, row.change_rate) == ("삼성전자우", 71000, Decimal("1.43"))
+        assert row.total_score == Decimal("59")
+        assert row.total_score_change == Decimal("-3.5")
+
+    def test_adds_rows_for_new_stocks(self, db):
+        """Stocks listed since the last scoring run get a row"""
+        StockSnapshotService(db).refresh()
+        db.commit()
+        db.add(Stock(code="035420", name="NAVER", market="KOSPI"))
+        db.get(Stock, "000660").current_price = 1
+
+        assert StockSnapshotService(db).refresh_stocks(["035420"]) == 1
+        db.commit()
+        db.expire_all()
+
+        assert db.get(StockSnapshot, "035420").score_date is None
+        assert db.get(StockSnapshot, "000660").current_price == 180000
+
+    def test_leaves_epochs_to_the_caller(self, db):
+        """Only the stocks/prices bump of the caller invalidates caches"""
+        epochs = dataset_epochs.DatasetEpochs(db)
+        before = epochs.current()
+
+        StockSnapshotService(db).refresh_stocks()
+        db.commit()
+
+        assert epochs.current() == before
+
+    def test_new_listing_has_detail(self, db):
+        """A stock added by the stock list collector is served before it is scored"""
+        StockSnapshotService(db).refresh()
+        db.commit()
+        listing = pd.DataFrame(
+            [
+                {"Code": "005930", "Name": "삼성전자", "Market": "KOSPI", "Marcap": 4e14},
+                {"Code": "035420", "Name": "NAVER", "Market": "KOSPI", "Marcap": 3e13},
+            ]
+        )
+
+        with patch.object(data_collector.fdr, "StockListing", return_value=listing), patch.object(
+            data_collector, "fdr_rate_limiter", MagicMock()
+        ):
+            assert DataCollector(db).collect_stock_list() == 2
+
+        detail = get_stock_detail("035420", db)
+        assert detail.stock_info.name == "NAVER"
+        assert detail.value_score["total"] == 0
+
+
+class TestPriceCollection:
+    """Test that collected prices reach the snapshot with the prices epoch"""
+
+    @pytest.fixture
+    def prices(self, db):
+        StockSnapshotService(db).refresh()
+        db.commit()
+        daily = pd.DataFrame({"Close": [70000, 77000]})
+        with patch.object(data_collector.fdr, "DataReader", return_value=daily), patch.object(
+            data_collector, "fdr_rate_limiter", MagicMock()
+        ):
+            yield
+
+    def test_collect_all_updates_snapshot(self, db, prices):
+        """The batch collector refreshes snapshot prices before it bumps prices"""
+        before = dataset_epochs.DatasetEpochs(db).current(dataset_epochs.PRICES)
+
+        DataCollector(db).collect_all_stock_prices(stock_codes=["005930"])
+        db.expire_all()
+
+        row = db.get(StockSnapshot, "005930")
+        assert (row.current_price, row.change_rate) == (77000, Decimal("10"))
+        after = dataset_epochs.DatasetEpochs(db).current(dataset_epochs.PRICES)
+        assert after[dataset_epochs.PRICES] == before[dataset_epochs.PRICES] + 1
+
+    def test_single_stock_task_updates_snapshot(self, db, prices):
+        """The per-stock task refreshes that stock's snapshot row"""
+        with patch.object(data_tasks, "SessionLocal", return_value=db):
+            assert data_tasks.collect_stock_prices_task.run("005930")["status"] == "success"
+
+        assert db.get(StockSnapshot, "005930").current_price == 77000
+        assert db.get(StockSnapshot, "000660").current_price == 180000
+
+
+class TestScoringTask:
+    """Test the standalone scoring task"""
+
+    def test_value_scores_bumped_by_refresh_only(self, db):
+        """Scores are not announced before the snapshot that serves them is rebuilt"""
+        epochs = dataset_epochs.DatasetEpochs(db)
+        before = epochs.current(dataset_epochs.VALUE_SCORES)[dataset_epochs.VALUE_SCORES]
+
+        with patch.object(data_tasks, "SessionLocal", return_value=db), patch.object(
+            data_tasks, "publish_leaderboards", return_value={"status": "skipped"}
+        ), patch.object(data_tasks, "refresh_saved_screens"):
+            result = data_tasks.calculate_all_value_scores_task.run()
+
+        assert result["stock_snapshots"] == 2
+        after = epochs.current(dataset_epochs.VALUE_SCORES)[dataset_epochs.VALUE_SCORES]
+        assert after == before + 1
+
+
+class TestWatchlist:
+    """Test GET /watchlist on the snapshot"""
+
+    @pytest.fixture
+    def client(self, db, async_db_override):
+        StockSnapshotService(db).refresh()
+        db.commit()
+        user = type("CurrentUser", (), {"id": USER})()
+        app.dependency_overrides[get_async_db] = async_db_override(db.get_bind())
+        app.dependency_overrides[get_current_user] = lambda: user
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def test_one_item_per_stock(self, client):
+        """Score history no longer duplicates watchlist items"""
+        items = client.get("/api/v1/watchlist").json()["watchlist"]
+
+        assert [item["stock_code"] for item in items] == ["000660", "005930"]
+
+    def test_latest_score_and_change(self, client):
+        """Items show the latest score and its change since the previous run"""
+        items = {item["stock_code"]: item for item in client.get("/api/v1/watchlist").json()["watchlist"]}
+
+        assert float(items["005930"]["value_score"]) == 59
+        assert items["005930"]["value_score_change"] == "-3.5"
+        assert items["000660"]["value_score"] is None
+        assert items["000660"]["value_score_change"] is None
@@ -0,0 +1,141 @@
+"""Unit tests for the synthetic KRX universe generator"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import func
+
+from app.models.backtest import HistoricalStockPrice
+from app.models.financial_metrics import FinancialMetrics
+from app.models.insider_signal import InsiderSignal
+from app.models.stock import Stock
+from app.models.value_score import ValueScore
+from app.services.synthetic_universe import DAILY_LIMIT, SyntheticUniverse, UniverseSpec
+
+SMALL = UniverseSpec(stocks=40, years=2, score_days=5)
+
+
+@pytest.fixture(scope="module")
+def universe():
+    return SyntheticUniverse(SMALL)
+
+
+class TestDeterminism:
+    """Test reproducibility"""
+
+    def test_same_spec_same_rows(self, universe):
+        """Two generators with one spec produce identical frames"""
+        other = SyntheticUniverse(SMALL)
+
+        pd.testing.assert_frame_equal(universe.prices, other.prices)
+        pd.testing.assert_frame_equal(universe.financial_metrics, other.financial_metrics)
+        pd.testing.assert_frame_equal(universe.insider_filings, other.insider_filings)
+
+    def test_build_order_does_not_matter(self):
+        """Each frame draws from its own random stream"""
+        first = SyntheticUniverse(SMALL)
+        first.insider_filings
+        second = SyntheticUniverse(SMALL)
+
+        pd.testing.assert_frame_equal(first.prices, second.prices)
+
+    def test_seed_changes_data(self, universe):
+        """A different seed gives a different market"""
+        other = SyntheticUniverse(UniverseSpec(stocks=40, years=2, score_days=5, seed=7))
+
+        assert not universe.stocks["code"].equals(other.stocks["code"])
+
+
+class TestShape:
+    """Test that generated rows look like market data"""
+
+    def test_prices_are_consistent_ohlc(self, universe):
+        """Lows and highs bracket open and close, moves respect the daily limit"""
+        prices = universe.prices
+
+        assert len(prices) == SMALL.stocks * len(universe.trading_days)
+        assert (prices["low"] <= prices[["open", "close"]].min(axis=1)).all()
+        assert (prices["high"] >= prices[["open", "close"]].max(axis=1)).all()
+        assert (prices["volume"] > 0).all()
+
+        returns = prices.groupby("stock_code")["close"].pct_change().dropna()
+        assert returns.abs().max() <= DAILY_LIMIT + 0.01
+
+    def test_codes_are_unique_krx_codes(self, universe):
+        """Six-digit codes, one row per stock"""
+        codes = universe.stocks["code"]
+
+        assert codes.is_unique
+        assert codes.str.fullmatch(r"\d{6}").all()
+        assert set(universe.stocks["market"]) == {"KOSPI", "KOSDAQ"}
+
+    def test_historical_metrics_filed_after_quarter_end(self, universe):
+        """Snapshots become available only after the reporting period"""
+        metrics = universe.historical_metrics
+
+        assert (metrics["snapshot_date"] > metrics["report_date"]).all()
+        assert metrics.groupby("stock_code").size().nunique() == 1
+
+    def test_financial_metrics_history(self, universe):
+        """One snapshot per stock for each recent scoring day, ending on end_date"""
+        metrics = universe.financial_metrics
+
+        assert metrics["date"].nunique() == SMALL.score_days
+        assert metrics["date"].max() == SMALL.end_date
+        assert not metrics.duplicated(["stock_code", "date"]).any()
+        # Numeric(5, 2) columns stay representable
+        assert metrics[["roe", "debt_ratio", "current_ratio"]].abs().max().max() < 1000
+
+    def test_value_scores_match_components(self, universe):
+        """Totals are the sum of ValueScorer's components and stay in range"""
+        scores = universe.value_scores
+        components = scores[
+            ["valuation_score", "profitability_score", "stability_score", "dividend_score"]
+        ].sum(axis=1)
+
+        assert np.allclose(scores["total_score"], components)
+        assert scores["total_score"].between(0, 100).all()
+        assert scores["total_score"].nunique() > 5
+
+    def test_insider_receipt_numbers_unique(self, universe):
+        """rcept_no is 14 digits and unique like DART receipt numbers"""
+        filings = universe.insider_filings
+
+        assert filings["rcept_no"].is_unique
+        assert filings["rcept_no"].str.fullmatch(r"\d{14}").all()
+        assert (filings["sp_stock_lmp_cnt"] >= 0).all()
+
+
+class TestSyntheticDb:
+    """Test the bulk-loaded fixture database"""
+
+    def test_tables_populated(self, synthetic_db, synthetic_spec):
+        """Every generated table is filled"""
+        with synthetic_db() as db:
+            assert db.query(Stock).count() == synthetic_spec.stocks
+            assert db.query(HistoricalStockPrice).count() > synthetic_spec.stocks * 250
+            assert db.query(InsiderSignal).count() > 0
+
+            latest = db.query(func.max(ValueScore.date)).scalar()
+            assert latest == synthetic_spec.end_date
+            assert (
+                db.query(ValueScore).filter(ValueScore.date == latest).count()
+                == synthetic_spec.stocks
+            )
+
+    def test_rows_round_trip_through_orm(self, synthetic_db):
+        """Loaded values read back with the model types"""
+        with synthetic_db() as db:
+            score = db.query(ValueScore).order_by(ValueScore.total_score.desc()).first()
+            metrics = (
+                db.query(FinancialMetrics)
+                .filter(FinancialMetrics.stock_code == score.stock_code)
+                .order_by(FinancialMetrics.date.desc())
+                .first()
+            )
+
+        assert isinstance(score.date, date)
+        assert isinstance(score.strengths, list)
+        assert metrics.per is not None
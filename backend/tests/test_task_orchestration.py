@@ -0,0 +1,93 @@
+"""Unit tests for chord-based Celery orchestrators"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.tasks import dart_tasks, insider_tasks
+
+
+@pytest.fixture
+def stock_codes():
+    return [f"{i:06d}" for i in range(250)]
+
+
+def _session_with_codes(codes):
+    db = MagicMock()
+    db.query.return_value.order_by.return_value.all.return_value = [(c,) for c in codes]
+    db.query.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        (c,) for c in codes
+    ]
+    return db
+
+
+class TestDartOrchestration:
+    """Test DART metrics fan-out"""
+
+    def test_dispatches_chord_without_waiting(self, stock_codes):
+        """Batches become a chord header; the orchestrator never calls .get()"""
+        with patch.object(
+            dart_tasks, "SessionLocal", return_value=_session_with_codes(stock_codes)
+        ), patch.object(dart_tasks, "chord") as mock_chord:
+            mock_chord.return_value.return_value.id = "callback-id"
+            result = dart_tasks.fetch_all_dart_financial_metrics_task.run(batch_size=100)
+
+        header = list(mock_chord.call_args.args[0])
+        assert [len(sig.args[0]) for sig in header] == [100, 100, 50]
+        callback = mock_chord.return_value.call_args.args[0]
+        assert callback.kwargs == {"total": 250}
+        assert result == {
+            "status": "dispatched",
+            "total": 250,
+            "batches": 3,
+            "callback_id": "callback-id",
+        }
+        mock_chord.return_value.return_value.get.assert_not_called()
+
+    def test_no_stocks(self):
+        """Nothing is dispatched for an empty stock table"""
+        with patch.object(
+            dart_tasks, "SessionLocal", return_value=_session_with_codes([])
+        ), patch.object(dart_tasks, "chord") as mock_chord:
+            result = dart_tasks.fetch_all_dart_financial_metrics_task.run()
+
+        mock_chord.assert_not_called()
+        assert result["total"] == 0
+
+    def test_summarize_batches(self):
+        """Callback sums batch statistics"""
+        result = dart_tasks.summarize_dart_batches_task.run(
+            [{"success": 90, "failed": 10}, {"success": 40, "failed": 10}], total=150
+        )
+        assert result["success"] == 130
+        assert result["failed"] == 20
+        assert result["success_rate"] == "86.67%"
+
+
+class TestInsiderOrchestration:
+    """Test insider trading fan-out"""
+
+    def test_dispatches_chord(self, stock_codes):
+        """One header task per stock, aggregated by the callback"""
+        with patch.object(
+            insider_tasks, "SessionLocal", return_value=_session_with_codes(stock_codes[:3])
+        ), patch.object(insider_tasks, "chord") as mock_chord:
+            result = insider_tasks.fetch_all_insider_trading_task.run()
+
+        header = list(mock_chord.call_args.args[0])
+        assert [sig.args[0] for sig in header] == stock_codes[:3]
+        assert result["status"] == "dispatched"
+
+    def test_summarize_results(self):
+        """Callback counts successes and new filings"""
+        result = insider_tasks.summarize_insider_trading_task.run(
+            [
+                {"status": "success", "inserted": 3},
+                {"status": "no_data"},
+                {"status": "error", "message": "boom"},
+            ],
+            total=3,
+        )
+        assert result["success"] == 1
+        assert result["failed"] == 2
+        assert result["inserted"] == 3
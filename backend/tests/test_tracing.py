@@ -0,0 +1,101 @@
+"""Unit tests for OpenTelemetry tracing helpers"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.core import metrics, tracing
+from app.core.metrics import track_upstream
+from app.core.tracing import JsonLinesSpanExporter, setup_tracing
+
+
+@pytest.fixture
+def span_exporter():
+    """Route spans from the shared tracer into memory without touching the global provider"""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    with patch.object(metrics, "tracer", provider.get_tracer("test")):
+        yield exporter, provider
+
+
+class TestTrackUpstreamSpans:
+    """Test spans around upstream calls"""
+
+    def test_records_span_with_attributes(self, span_exporter):
+        """Each upstream call becomes a span named after the source and operation"""
+        exporter, _ = span_exporter
+
+        with track_upstream("krx", "daily_prices"):
+            pass
+
+        (span,) = exporter.get_finished_spans()
+        assert span.name == "krx daily_prices"
+        assert span.attributes["upstream"] == "krx"
+        assert span.attributes["upstream.operation"] == "daily_prices"
+        assert span.status.is_ok
+
+    def test_exception_marks_span_as_error(self, span_exporter):
+        """Failed calls are recorded on the span and re-raised"""
+        exporter, _ = span_exporter
+
+        with pytest.raises(RuntimeError):
+            with track_upstream("gemini", "chat"):
+                raise RuntimeError("quota exceeded")
+
+        (span,) = exporter.get_finished_spans()
+        assert not span.status.is_ok
+        assert span.events[0].name == "exception"
+
+    def test_nested_under_parent_span(self, span_exporter):
+        """Upstream spans join the caller's trace"""
+        exporter, provider = span_exporter
+
+        with provider.get_tracer("test").start_as_current_span("DartService.get_financial_metrics"):
+            with track_upstream("dart", "finstate_all"):
+                pass
+
+        child, parent = exporter.get_finished_spans()
+        assert child.parent.span_id == parent.context.span_id
+        assert child.context.trace_id == parent.context.trace_id
+
+
+class TestJsonLinesSpanExporter:
+    """Test the file exporter"""
+
+    def test_writes_one_span_per_line(self, tmp_path):
+        """Spans are appended as JSON objects"""
+        path = tmp_path / "traces" / "spans.jsonl"
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(JsonLinesSpanExporter(str(path))))
+        tracer = provider.get_tracer("test")
+
+        with tracer.start_as_current_span("backtest.generate_recommendations"):
+            pass
+        with tracer.start_as_current_span("backtest.calculate_performance"):
+            pass
+
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)["name"] for line in lines] == [
+            "backtest.generate_recommendations",
+            "backtest.calculate_performance",
+        ]
+
+
+class TestSetupTracing:
+    """Test tracing configuration"""
+
+    def test_disabled_by_default(self):
+        """Nothing is instrumented unless TRACING_ENABLED is set"""
+        with patch.object(tracing.settings, "TRACING_ENABLED", False):
+            assert setup_tracing("valuehunt-test") is False
+
+    def test_unknown_exporter(self):
+        """A misconfigured exporter fails loudly"""
+        with patch.object(tracing.settings, "TRACING_EXPORTER", "zipkin"):
+            with pytest.raises(ValueError, match="zipkin"):
+                tracing._span_processor()
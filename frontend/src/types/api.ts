@@ -168,7 +168,10 @@ export interface ScreenerRequest {
   filters: ScreenerFilters
   sort_by?: string
   order?: 'asc' | 'desc'
+  sort?: string[]
+  facets?: string[]
   limit?: number
+  cursor?: string | null
 }
 
 export interface ScreenerResult {
@@ -185,6 +188,18 @@ export interface ScreenerResponse {
   results: ScreenerResult[]
   total_count: number
   filters_applied: ScreenerFilters
+  facets?: Record<string, Record<string, number>> | null
+  next_cursor?: string | null
+}
+
+export interface SavedScreenResult {
+  filter_id: number
+  stock_codes: string[]
+  total_count: number
+  added: string[]
+  removed: string[]
+  score_date: string | null
+  evaluated_at: string
 }
 
 // Watchlist Types